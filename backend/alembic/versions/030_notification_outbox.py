@@ -0,0 +1,48 @@
+"""Add notification_outbox table for asynchronous push delivery
+
+Revision ID: 030
+Revises: 029
+Create Date: 2026-03-06
+
+Notifications and their pending push jobs are written in one transaction;
+a Celery beat task drains the outbox in batches.
+"""
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision = "030"
+down_revision = "029"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "notification_outbox",
+        sa.Column("id", postgresql.UUID(as_uuid=True), server_default=sa.text("gen_random_uuid()"), primary_key=True),
+        sa.Column("notification_id", postgresql.UUID(as_uuid=True), sa.ForeignKey("notifications.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("user_id", postgresql.UUID(as_uuid=True), sa.ForeignKey("users.id"), nullable=False, index=True),
+        sa.Column("title", sa.String(255), nullable=False),
+        sa.Column("body", sa.Text(), nullable=True),
+        sa.Column("data", postgresql.JSONB, nullable=True),
+        sa.Column("status", sa.String(20), nullable=False, server_default=sa.text("'pending'")),
+        sa.Column("attempts", sa.Integer(), nullable=False, server_default=sa.text("0")),
+        sa.Column("last_error", sa.Text(), nullable=True),
+        sa.Column("dispatched_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+    )
+    # Partial index keeps the dispatcher's scan proportional to the backlog,
+    # not to the history of delivered pushes.
+    op.create_index(
+        "ix_notification_outbox_status_created",
+        "notification_outbox",
+        ["status", "created_at"],
+        postgresql_where=sa.text("status = 'pending'"),
+    )
+
+
+def downgrade():
+    op.drop_index("ix_notification_outbox_status_created", table_name="notification_outbox")
+    op.drop_table("notification_outbox")
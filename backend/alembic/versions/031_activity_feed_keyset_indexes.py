@@ -0,0 +1,29 @@
+"""Add (timestamp, id) indexes for the keyset-paginated activity feed
+
+Revision ID: 031
+Revises: 030
+Create Date: 2026-03-09
+
+Each branch of the feed's UNION ALL walks one of these indexes backwards
+from the cursor position and stops after a page, instead of loading the
+whole time window.
+"""
+
+from alembic import op
+
+revision = "031"
+down_revision = "030"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index("ix_transactions_created_at_id", "transactions", ["created_at", "id"])
+    op.create_index("ix_tier_history_achieved_at_id", "tier_history", ["achieved_at", "id"])
+    op.create_index("ix_users_created_at_id", "users", ["created_at", "id"])
+
+
+def downgrade():
+    op.drop_index("ix_users_created_at_id", table_name="users")
+    op.drop_index("ix_tier_history_achieved_at_id", table_name="tier_history")
+    op.drop_index("ix_transactions_created_at_id", table_name="transactions")
@@ -0,0 +1,52 @@
+"""Add comp rollup, comp recipient and rollup watermark tables
+
+Revision ID: 032
+Revises: 031
+Create Date: 2026-03-10
+
+The transparency dashboard reads comp totals, prize tier counts and
+distinct recipients from these tables instead of aggregating the whole
+transactions ledger per request. A Celery task folds closed hours into
+comp_rollups and a nightly task reconciles them against the ledger.
+"""
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision = "032"
+down_revision = "031"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "comp_rollups",
+        sa.Column("id", postgresql.UUID(as_uuid=True), server_default=sa.text("gen_random_uuid()"), primary_key=True),
+        sa.Column("bucket_start", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("type", sa.String(20), nullable=False),
+        sa.Column("amount_bucket", sa.String(10), nullable=False),
+        sa.Column("tx_count", sa.Integer(), nullable=False, server_default=sa.text("0")),
+        sa.Column("amount_total", sa.Numeric(18, 2), nullable=False, server_default=sa.text("0")),
+        sa.UniqueConstraint("bucket_start", "type", "amount_bucket", name="uq_comp_rollups_bucket"),
+    )
+    op.create_table(
+        "comp_recipients",
+        sa.Column("id", postgresql.UUID(as_uuid=True), server_default=sa.text("gen_random_uuid()"), primary_key=True),
+        sa.Column("user_id", postgresql.UUID(as_uuid=True), sa.ForeignKey("users.id"), nullable=False, unique=True),
+        sa.Column("first_comped_at", sa.DateTime(timezone=True), nullable=False),
+    )
+    op.create_table(
+        "rollup_watermarks",
+        sa.Column("id", postgresql.UUID(as_uuid=True), server_default=sa.text("gen_random_uuid()"), primary_key=True),
+        sa.Column("name", sa.String(100), nullable=False, unique=True),
+        sa.Column("position", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+    )
+
+
+def downgrade():
+    op.drop_table("rollup_watermarks")
+    op.drop_table("comp_recipients")
+    op.drop_table("comp_rollups")
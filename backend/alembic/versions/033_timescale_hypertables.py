@@ -0,0 +1,126 @@
+"""Opt-in TimescaleDB hypertables and continuous aggregates
+
+Revision ID: 033
+Revises: 032
+Create Date: 2026-03-11
+
+Runs whenever the timescaledb extension is available on the server, so the
+schema does not depend on TIMESCALE_ENABLED being set in whichever process
+runs migrations; on vanilla PostgreSQL it is a no-op and timescale_service
+keeps using plain date_trunc() queries. TIMESCALE_ENABLED only decides, at
+runtime, whether reads use the continuous aggregates.
+
+treasury_snapshots and transparency_metrics become hypertables with
+compression and a retention policy on raw rows. Two real-time continuous
+aggregates back the dashboard reads:
+  - treasury_snapshots_daily     (get_treasury_sparkline)
+  - transparency_metrics_hourly  (get_metric_history)
+Their refresh policies only look back a few days, so materialized buckets
+survive after retention drops the raw chunks.
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.core.config import settings
+
+revision = "033"
+down_revision = "032"
+branch_labels = None
+depends_on = None
+
+# table -> compression segment column
+_HYPERTABLES = {
+    "treasury_snapshots": "pool_type",
+    "transparency_metrics": "metric_type",
+}
+
+
+def _timescale_available() -> bool:
+    available = op.get_bind().execute(
+        sa.text("SELECT 1 FROM pg_available_extensions WHERE name = 'timescaledb'")
+    ).scalar()
+    return available is not None
+
+
+def upgrade():
+    if not _timescale_available():
+        return
+
+    op.execute("CREATE EXTENSION IF NOT EXISTS timescaledb")
+
+    for table, segment_by in _HYPERTABLES.items():
+        # Unique indexes on a hypertable must include the time column.
+        op.execute(f"ALTER TABLE {table} DROP CONSTRAINT IF EXISTS {table}_pkey")
+        op.execute(f"ALTER TABLE {table} ADD PRIMARY KEY (id, timestamp)")
+        op.execute(
+            f"SELECT create_hypertable('{table}', 'timestamp', "
+            f"migrate_data => TRUE, if_not_exists => TRUE)"
+        )
+        op.execute(
+            f"ALTER TABLE {table} SET (timescaledb.compress, "
+            f"timescaledb.compress_segmentby = '{segment_by}', "
+            f"timescaledb.compress_orderby = 'timestamp DESC')"
+        )
+        op.execute(
+            f"SELECT add_compression_policy('{table}', "
+            f"INTERVAL '{settings.TIMESCALE_COMPRESS_AFTER_DAYS} days', if_not_exists => TRUE)"
+        )
+        op.execute(
+            f"SELECT add_retention_policy('{table}', "
+            f"INTERVAL '{settings.TIMESCALE_RETENTION_DAYS} days', if_not_exists => TRUE)"
+        )
+
+    # Continuous aggregates (and their initial materialization) cannot be
+    # created inside a transaction block.
+    with op.get_context().autocommit_block():
+        op.execute("""
+            CREATE MATERIALIZED VIEW IF NOT EXISTS treasury_snapshots_daily
+            WITH (timescaledb.continuous, timescaledb.materialized_only = false) AS
+            SELECT
+                time_bucket('1 day', timestamp) AS day,
+                pool_type,
+                AVG(onchain_balance) AS avg_onchain,
+                AVG(bank_balance)    AS avg_bank
+            FROM treasury_snapshots
+            GROUP BY day, pool_type
+        """)
+        op.execute("""
+            CREATE MATERIALIZED VIEW IF NOT EXISTS transparency_metrics_hourly
+            WITH (timescaledb.continuous, timescaledb.materialized_only = false) AS
+            SELECT
+                time_bucket('1 hour', timestamp) AS hour,
+                metric_type,
+                AVG(metric_value) AS avg_value,
+                MAX(metric_value) AS max_value
+            FROM transparency_metrics
+            GROUP BY hour, metric_type
+        """)
+
+    op.execute("""
+        SELECT add_continuous_aggregate_policy('treasury_snapshots_daily',
+            start_offset => INTERVAL '3 days',
+            end_offset => INTERVAL '1 hour',
+            schedule_interval => INTERVAL '1 hour',
+            if_not_exists => TRUE)
+    """)
+    op.execute("""
+        SELECT add_continuous_aggregate_policy('transparency_metrics_hourly',
+            start_offset => INTERVAL '1 day',
+            end_offset => INTERVAL '10 minutes',
+            schedule_interval => INTERVAL '15 minutes',
+            if_not_exists => TRUE)
+    """)
+
+
+def downgrade():
+    # Hypertables cannot be converted back in place; drop the aggregates and
+    # policies so the tables behave like plain PostgreSQL tables again.
+    if not _timescale_available():
+        return
+
+    op.execute("DROP MATERIALIZED VIEW IF EXISTS transparency_metrics_hourly")
+    op.execute("DROP MATERIALIZED VIEW IF EXISTS treasury_snapshots_daily")
+    for table in _HYPERTABLES:
+        op.execute(f"SELECT remove_retention_policy('{table}', if_exists => TRUE)")
+        op.execute(f"SELECT remove_compression_policy('{table}', if_exists => TRUE)")
@@ -0,0 +1,44 @@
+"""Add guaranteed_comp_runs table for the set-based monthly comp job
+
+Revision ID: 034
+Revises: 033
+Create Date: 2026-03-12
+
+One row per month: checkpoint (last committed user id chunk) and run report.
+The unique month makes the monthly job idempotent.
+"""
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision = "034"
+down_revision = "033"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "guaranteed_comp_runs",
+        sa.Column("id", postgresql.UUID(as_uuid=True), server_default=sa.text("gen_random_uuid()"), primary_key=True),
+        sa.Column("month", sa.String(7), nullable=False, unique=True),
+        sa.Column("status", sa.String(20), nullable=False, server_default=sa.text("'running'")),
+        sa.Column("last_user_id", postgresql.UUID(as_uuid=True), nullable=True),
+        sa.Column("chunks", sa.Integer(), nullable=False, server_default=sa.text("0")),
+        sa.Column("users_scanned", sa.Integer(), nullable=False, server_default=sa.text("0")),
+        sa.Column("comps_awarded", sa.Integer(), nullable=False, server_default=sa.text("0")),
+        sa.Column("amount_awarded", sa.Numeric(18, 2), nullable=False, server_default=sa.text("0")),
+        sa.Column("last_error", sa.Text(), nullable=True),
+        sa.Column("finished_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+    )
+    # The eligibility CTE aggregates each chunk's comp history per user.
+    op.create_index(
+        "ix_transactions_user_type_created", "transactions", ["user_id", "type", "created_at"]
+    )
+
+
+def downgrade():
+    op.drop_index("ix_transactions_user_type_created", table_name="transactions")
+    op.drop_table("guaranteed_comp_runs")
@@ -0,0 +1,32 @@
+"""Unique weekly pool share per affiliate
+
+Revision ID: 035
+Revises: 034
+Create Date: 2026-03-13
+
+The bulk weekly affiliate payout skips affiliates that already have a
+pool_share payout for the ISO week; this partial unique index guarantees a
+concurrent or repeated run can never pay the same affiliate twice.
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "035"
+down_revision = "034"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index(
+        "uq_affiliate_payouts_pool_share_week",
+        "affiliate_payouts",
+        ["affiliate_id", "period_start"],
+        unique=True,
+        postgresql_where=sa.text("payout_type = 'pool_share'"),
+    )
+
+
+def downgrade():
+    op.drop_index("uq_affiliate_payouts_pool_share_week", table_name="affiliate_payouts")
@@ -0,0 +1,49 @@
+"""Add referral_stats counters and downline keyset index
+
+Revision ID: 036
+Revises: 035
+Create Date: 2026-03-14
+
+One row per referred member, created at attribution time and bumped by the
+scan and reward-match paths, so the downline page no longer counts scans per
+row. Existing referrals are backfilled with their scan counts; earnings start
+at zero because historic affiliate matches were not linked to the member
+that generated them.
+"""
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision = "036"
+down_revision = "035"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "referral_stats",
+        sa.Column("id", postgresql.UUID(as_uuid=True), server_default=sa.text("gen_random_uuid()"), primary_key=True),
+        sa.Column("user_id", postgresql.UUID(as_uuid=True), sa.ForeignKey("users.id"), nullable=False, unique=True),
+        sa.Column("scan_count", sa.Integer(), nullable=False, server_default=sa.text("0")),
+        sa.Column("earnings_generated", sa.Numeric(18, 2), nullable=False, server_default=sa.text("0")),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+    )
+    op.execute("""
+        INSERT INTO referral_stats (user_id, scan_count)
+        SELECT u.id, COUNT(s.id)
+        FROM users u
+        LEFT JOIN scans s ON s.user_id = u.id
+        WHERE u.referred_by IS NOT NULL
+        GROUP BY u.id
+    """)
+    op.create_index(
+        "ix_users_referred_by_created_at_id", "users", ["referred_by", "created_at", "id"]
+    )
+
+
+def downgrade():
+    op.drop_index("ix_users_referred_by_created_at_id", table_name="users")
+    op.drop_table("referral_stats")
@@ -0,0 +1,40 @@
+"""Mark vault bonus chips with their month; index chip jobs
+
+Revision ID: 037
+Revises: 036
+Create Date: 2026-03-15
+
+bonus_month lets the set-based vault bonus job skip affiliates already paid
+for the month, so re-running it never mints twice. The partial indexes serve
+the bonus and expiry jobs without scanning every chip.
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "037"
+down_revision = "036"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column("affiliate_chips", sa.Column("bonus_month", sa.String(7), nullable=True))
+    op.create_index(
+        "ix_affiliate_chips_affiliate_bonus_month",
+        "affiliate_chips",
+        ["affiliate_id", "bonus_month"],
+        postgresql_where=sa.text("bonus_month IS NOT NULL"),
+    )
+    op.create_index(
+        "ix_affiliate_chips_vault_expiry",
+        "affiliate_chips",
+        ["vault_expiry"],
+        postgresql_where=sa.text("is_vaulted AND NOT is_expired"),
+    )
+
+
+def downgrade():
+    op.drop_index("ix_affiliate_chips_vault_expiry", table_name="affiliate_chips")
+    op.drop_index("ix_affiliate_chips_affiliate_bonus_month", table_name="affiliate_chips")
+    op.drop_column("affiliate_chips", "bonus_month")
@@ -0,0 +1,46 @@
+"""Add affiliate_stats referred-tin counters
+
+Revision ID: 038
+Revises: 037
+Create Date: 2026-03-16
+
+One counter row per affiliate, kept current by the order paths so the
+permanent tier check reads a single row instead of summing every order of
+every referral. Backfilled here from order history; the nightly
+reconcile_affiliate_stats task repairs any drift.
+"""
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision = "038"
+down_revision = "037"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "affiliate_stats",
+        sa.Column("id", postgresql.UUID(as_uuid=True), server_default=sa.text("gen_random_uuid()"), primary_key=True),
+        sa.Column("affiliate_id", postgresql.UUID(as_uuid=True), sa.ForeignKey("affiliates.id"), nullable=False, unique=True),
+        sa.Column("referred_tins", sa.Integer(), nullable=False, server_default=sa.text("0")),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+    )
+    op.execute("""
+        INSERT INTO affiliate_stats (affiliate_id, referred_tins)
+        SELECT a.id, COALESCE(SUM(oi.quantity), 0)
+        FROM affiliates a
+        LEFT JOIN users u ON u.referred_by = a.user_id
+        LEFT JOIN orders o
+            ON o.user_id = u.id
+           AND o.status IN ('completed', 'shipped', 'delivered', 'pending')
+        LEFT JOIN order_items oi ON oi.order_id = o.id
+        GROUP BY a.id
+    """)
+
+
+def downgrade():
+    op.drop_table("affiliate_stats")
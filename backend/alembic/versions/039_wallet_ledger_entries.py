@@ -0,0 +1,53 @@
+"""Add wallet_ledger_entries, the append-only source of truth for wallet balances
+
+Revision ID: 039
+Revises: 038
+Create Date: 2026-03-17
+
+Credits become plain inserts instead of in-place updates of the wallet row,
+so a popular affiliate's wallet is no longer a lock hotspot. Existing
+wallets.balance_available values are the starting snapshot; the
+materializer task folds new entries into it.
+"""
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision = "039"
+down_revision = "038"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "wallet_ledger_entries",
+        sa.Column("id", postgresql.UUID(as_uuid=True), server_default=sa.text("gen_random_uuid()"), primary_key=True),
+        sa.Column("wallet_id", postgresql.UUID(as_uuid=True), sa.ForeignKey("wallets.id"), nullable=False),
+        sa.Column("amount", sa.Numeric(18, 2), nullable=False),
+        sa.Column("entry_type", sa.String(30), nullable=False),
+        sa.Column("reference_id", postgresql.UUID(as_uuid=True), nullable=True),
+        sa.Column("materialized_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+    )
+    op.create_index(
+        "ix_wallet_ledger_entries_wallet_created", "wallet_ledger_entries", ["wallet_id", "created_at"]
+    )
+    op.create_index(
+        "ix_wallet_ledger_entries_unmaterialized",
+        "wallet_ledger_entries",
+        ["wallet_id"],
+        postgresql_where=sa.text("materialized_at IS NULL"),
+    )
+    op.create_index(
+        "uq_wallet_ledger_entries_reference",
+        "wallet_ledger_entries",
+        ["entry_type", "reference_id"],
+        unique=True,
+        postgresql_where=sa.text("reference_id IS NOT NULL"),
+    )
+
+
+def downgrade():
+    op.drop_table("wallet_ledger_entries")
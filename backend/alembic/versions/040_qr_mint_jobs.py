@@ -0,0 +1,50 @@
+"""Add qr_mint_jobs and qr_codes.mint_job_id for bulk print-run minting
+
+Revision ID: 040
+Revises: 039
+Create Date: 2026-03-18
+
+A mint job generates its codes in chunks (COPY into a staging table, then
+INSERT ... ON CONFLICT DO NOTHING) and records progress per chunk; the
+export endpoint streams a job's codes by mint_job_id.
+"""
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision = "040"
+down_revision = "039"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "qr_mint_jobs",
+        sa.Column("id", postgresql.UUID(as_uuid=True), server_default=sa.text("gen_random_uuid()"), primary_key=True),
+        sa.Column("product_id", postgresql.UUID(as_uuid=True), sa.ForeignKey("products.id"), nullable=False),
+        sa.Column("product_code", sa.String(100), nullable=False),
+        sa.Column("quantity", sa.Integer(), nullable=False),
+        sa.Column("minted", sa.Integer(), nullable=False, server_default=sa.text("0")),
+        sa.Column("collisions", sa.Integer(), nullable=False, server_default=sa.text("0")),
+        sa.Column("status", sa.String(20), nullable=False, server_default=sa.text("'queued'")),
+        sa.Column("requested_by", postgresql.UUID(as_uuid=True), sa.ForeignKey("users.id"), nullable=True),
+        sa.Column("last_error", sa.Text(), nullable=True),
+        sa.Column("finished_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+    )
+    op.create_index("ix_qr_mint_jobs_product_id", "qr_mint_jobs", ["product_id"])
+    op.add_column(
+        "qr_codes",
+        sa.Column("mint_job_id", postgresql.UUID(as_uuid=True), sa.ForeignKey("qr_mint_jobs.id"), nullable=True),
+    )
+    op.create_index("ix_qr_codes_mint_job_id", "qr_codes", ["mint_job_id"])
+
+
+def downgrade():
+    op.drop_index("ix_qr_codes_mint_job_id", table_name="qr_codes")
+    op.drop_column("qr_codes", "mint_job_id")
+    op.drop_index("ix_qr_mint_jobs_product_id", table_name="qr_mint_jobs")
+    op.drop_table("qr_mint_jobs")
@@ -0,0 +1,29 @@
+"""Add (created_at, id) indexes for keyset-paginated QR code and scan listings
+
+Revision ID: 041
+Revises: 040
+Create Date: 2026-03-19
+
+/admin/qr-codes and /scans/history page by cursor on (created_at, id);
+each page is an index range scan from the cursor position instead of an
+OFFSET that reads and discards every earlier row.
+"""
+
+from alembic import op
+
+revision = "041"
+down_revision = "040"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index("ix_qr_codes_created_at_id", "qr_codes", ["created_at", "id"])
+    op.create_index("ix_qr_codes_product_created_at_id", "qr_codes", ["product_id", "created_at", "id"])
+    op.create_index("ix_scans_user_created_at_id", "scans", ["user_id", "created_at", "id"])
+
+
+def downgrade():
+    op.drop_index("ix_scans_user_created_at_id", table_name="scans")
+    op.drop_index("ix_qr_codes_product_created_at_id", table_name="qr_codes")
+    op.drop_index("ix_qr_codes_created_at_id", table_name="qr_codes")
@@ -0,0 +1,42 @@
+"""Add (owner, created_at, id) indexes for keyset-paginated list endpoints
+
+Revision ID: 042
+Revises: 041
+Create Date: 2026-03-20
+
+Notifications, wallet transactions, shop orders, wholesale accounts and
+orders, and affiliate payout history page through app.services.pagination
+on (created_at, id); each cursor page is a range scan of one of these
+indexes.
+"""
+
+from alembic import op
+
+revision = "042"
+down_revision = "041"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index("ix_notifications_user_created_at_id", "notifications", ["user_id", "created_at", "id"])
+    op.create_index("ix_transactions_user_created_at_id", "transactions", ["user_id", "created_at", "id"])
+    op.create_index("ix_orders_user_created_at_id", "orders", ["user_id", "created_at", "id"])
+    op.create_index("ix_wholesale_accounts_created_at_id", "wholesale_accounts", ["created_at", "id"])
+    op.create_index("ix_wholesale_orders_created_at_id", "wholesale_orders", ["created_at", "id"])
+    op.create_index(
+        "ix_wholesale_orders_account_created_at_id", "wholesale_orders", ["account_id", "created_at", "id"]
+    )
+    op.create_index(
+        "ix_affiliate_payouts_affiliate_created_at_id", "affiliate_payouts", ["affiliate_id", "created_at", "id"]
+    )
+
+
+def downgrade():
+    op.drop_index("ix_affiliate_payouts_affiliate_created_at_id", table_name="affiliate_payouts")
+    op.drop_index("ix_wholesale_orders_account_created_at_id", table_name="wholesale_orders")
+    op.drop_index("ix_wholesale_orders_created_at_id", table_name="wholesale_orders")
+    op.drop_index("ix_wholesale_accounts_created_at_id", table_name="wholesale_accounts")
+    op.drop_index("ix_orders_user_created_at_id", table_name="orders")
+    op.drop_index("ix_transactions_user_created_at_id", table_name="transactions")
+    op.drop_index("ix_notifications_user_created_at_id", table_name="notifications")
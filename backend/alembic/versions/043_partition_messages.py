@@ -0,0 +1,219 @@
+"""Range-partition messages and message_reactions by month
+
+Revision ID: 043
+Revises: 042
+Create Date: 2026-03-21
+
+messages is rebuilt as a table partitioned by RANGE (created_at), and
+message_reactions as one partitioned by RANGE (message_created_at), a new
+column copying the parent message's created_at. A reaction therefore sits
+in the same month as its message, and retention
+(app.services.message_partitions) drops both months together instead of
+batch-deleting rows.
+
+A partitioned table's primary key must include the partition key, so the
+primary keys become (id, created_at) and (id, message_created_at). Nothing
+can reference messages(id) on its own any more. This migration drops the
+foreign keys from message_reactions, chat_reports,
+social_message_translations and the reply_to self-reference; those ids may
+now outlive the message they point at.
+
+Partitions are created for every month from the oldest message through
+three months ahead, plus a DEFAULT partition for stragglers. After that,
+the nightly chat-partitions beat task keeps future months ready.
+"""
+
+from datetime import date, datetime, timezone
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects.postgresql import UUID
+
+revision = "043"
+down_revision = "042"
+branch_labels = None
+depends_on = None
+
+MONTHS_AHEAD = 3
+
+
+def _add_months(day, months):
+    index = day.year * 12 + day.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def _create_partitions(table, first, last):
+    month = first
+    while month <= last:
+        op.execute(
+            f"CREATE TABLE IF NOT EXISTS {table}_{month:%Y_%m} PARTITION OF {table} "
+            f"FOR VALUES FROM ('{month.isoformat()} 00:00:00+00') "
+            f"TO ('{_add_months(month, 1).isoformat()} 00:00:00+00')"
+        )
+        month = _add_months(month, 1)
+    op.execute(f"CREATE TABLE IF NOT EXISTS {table}_default PARTITION OF {table} DEFAULT")
+
+
+def upgrade():
+    # -- Drop foreign keys into messages(id) --
+    op.execute("ALTER TABLE chat_reports DROP CONSTRAINT IF EXISTS chat_reports_message_id_fkey")
+    op.execute(
+        "ALTER TABLE social_message_translations "
+        "DROP CONSTRAINT IF EXISTS social_message_translations_message_id_fkey"
+    )
+
+    # -- Move the plain tables aside; their constraint and index names are reused below --
+    op.rename_table("message_reactions", "message_reactions_legacy")
+    op.rename_table("messages", "messages_legacy")
+    op.execute("ALTER TABLE message_reactions_legacy RENAME CONSTRAINT message_reactions_pkey TO message_reactions_legacy_pkey")
+    op.execute("ALTER TABLE message_reactions_legacy RENAME CONSTRAINT uq_reaction_per_user TO uq_reaction_per_user_legacy")
+    op.execute("ALTER TABLE messages_legacy RENAME CONSTRAINT messages_pkey TO messages_legacy_pkey")
+    for index in ("ix_message_reactions_message_id", "ix_message_reactions_user_id"):
+        op.execute(f"ALTER INDEX {index} RENAME TO {index}_legacy")
+    for index in (
+        "ix_messages_channel_id",
+        "ix_messages_user_id",
+        "ix_messages_reply_to_id",
+        "ix_messages_channel_sequence",
+    ):
+        op.execute(f"ALTER INDEX {index} RENAME TO {index}_legacy")
+
+    # -- Partitioned parents --
+    op.create_table(
+        "messages",
+        sa.Column("id", UUID(as_uuid=True), server_default=sa.text("gen_random_uuid()"), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+        sa.Column("channel_id", UUID(as_uuid=True), sa.ForeignKey("channels.id"), nullable=False),
+        sa.Column("user_id", UUID(as_uuid=True), sa.ForeignKey("users.id"), nullable=False),
+        sa.Column("content", sa.String(2000), nullable=False),
+        sa.Column("sequence", sa.BigInteger(), nullable=True),
+        sa.Column("original_language", sa.String(10), nullable=True),
+        sa.Column("reply_to_id", UUID(as_uuid=True), nullable=True),
+        sa.Column("is_system", sa.Boolean(), server_default=sa.text("false"), nullable=False),
+        sa.Column("is_pinned", sa.Boolean(), server_default=sa.text("false"), nullable=False),
+        sa.Column("is_deleted", sa.Boolean(), server_default=sa.text("false"), nullable=False),
+        sa.PrimaryKeyConstraint("id", "created_at", name="messages_pkey"),
+        postgresql_partition_by="RANGE (created_at)",
+    )
+    op.create_table(
+        "message_reactions",
+        sa.Column("id", UUID(as_uuid=True), server_default=sa.text("gen_random_uuid()"), nullable=False),
+        sa.Column("message_created_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("message_id", UUID(as_uuid=True), nullable=False),
+        sa.Column("user_id", UUID(as_uuid=True), sa.ForeignKey("users.id"), nullable=False),
+        sa.Column("emoji", sa.String(50), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+        sa.PrimaryKeyConstraint("id", "message_created_at", name="message_reactions_pkey"),
+        sa.UniqueConstraint("message_id", "user_id", "emoji", "message_created_at", name="uq_reaction_per_user"),
+        postgresql_partition_by="RANGE (message_created_at)",
+    )
+
+    # -- Monthly partitions: oldest message through MONTHS_AHEAD months out --
+    oldest = op.get_bind().execute(sa.text("SELECT min(created_at) FROM messages_legacy")).scalar()
+    this_month = datetime.now(timezone.utc).date().replace(day=1)
+    first = min(oldest.date().replace(day=1), this_month) if oldest else this_month
+    last = _add_months(this_month, MONTHS_AHEAD)
+    _create_partitions("messages", first, last)
+    _create_partitions("message_reactions", first, last)
+
+    # -- Copy rows, then index the filled partitions --
+    op.execute(
+        "INSERT INTO messages (id, created_at, channel_id, user_id, content, sequence, original_language, "
+        "reply_to_id, is_system, is_pinned, is_deleted) "
+        "SELECT id, created_at, channel_id, user_id, content, sequence, original_language, "
+        "reply_to_id, is_system, is_pinned, is_deleted FROM messages_legacy"
+    )
+    op.execute(
+        "INSERT INTO message_reactions (id, message_created_at, message_id, user_id, emoji, created_at) "
+        "SELECT r.id, m.created_at, r.message_id, r.user_id, r.emoji, r.created_at "
+        "FROM message_reactions_legacy r JOIN messages_legacy m ON m.id = r.message_id"
+    )
+    op.drop_table("message_reactions_legacy")
+    op.drop_table("messages_legacy")
+
+    op.create_index("ix_messages_channel_id", "messages", ["channel_id"])
+    op.create_index("ix_messages_user_id", "messages", ["user_id"])
+    op.create_index("ix_messages_reply_to_id", "messages", ["reply_to_id"])
+    op.create_index("ix_messages_channel_sequence", "messages", ["channel_id", "sequence"])
+    op.create_index("ix_message_reactions_message_id", "message_reactions", ["message_id"])
+    op.create_index("ix_message_reactions_user_id", "message_reactions", ["user_id"])
+
+
+def downgrade():
+    # Rebuild plain tables from the partitioned ones. Reactions, reports and
+    # translations whose message was already dropped cannot get their
+    # foreign keys back, so they are removed first.
+    op.execute("DELETE FROM message_reactions r WHERE NOT EXISTS (SELECT 1 FROM messages m WHERE m.id = r.message_id)")
+    op.execute("UPDATE messages SET reply_to_id = NULL WHERE reply_to_id NOT IN (SELECT id FROM messages)")
+    op.execute("UPDATE chat_reports SET message_id = NULL WHERE message_id NOT IN (SELECT id FROM messages)")
+    op.execute(
+        "DELETE FROM social_message_translations WHERE message_id NOT IN (SELECT id FROM messages)"
+    )
+
+    op.rename_table("message_reactions", "message_reactions_partitioned")
+    op.rename_table("messages", "messages_partitioned")
+    op.execute("ALTER TABLE message_reactions_partitioned RENAME CONSTRAINT message_reactions_pkey TO message_reactions_partitioned_pkey")
+    op.execute("ALTER TABLE message_reactions_partitioned RENAME CONSTRAINT uq_reaction_per_user TO uq_reaction_per_user_partitioned")
+    op.execute("ALTER TABLE messages_partitioned RENAME CONSTRAINT messages_pkey TO messages_partitioned_pkey")
+    for index in (
+        "ix_messages_channel_id",
+        "ix_messages_user_id",
+        "ix_messages_reply_to_id",
+        "ix_messages_channel_sequence",
+        "ix_message_reactions_message_id",
+        "ix_message_reactions_user_id",
+    ):
+        op.execute(f"ALTER INDEX {index} RENAME TO {index}_partitioned")
+
+    op.create_table(
+        "messages",
+        sa.Column("id", UUID(as_uuid=True), server_default=sa.text("gen_random_uuid()"), nullable=False),
+        sa.Column("channel_id", UUID(as_uuid=True), sa.ForeignKey("channels.id"), nullable=False),
+        sa.Column("user_id", UUID(as_uuid=True), sa.ForeignKey("users.id"), nullable=False),
+        sa.Column("content", sa.String(2000), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+        sa.Column("original_language", sa.String(10), nullable=True),
+        sa.Column("reply_to_id", UUID(as_uuid=True), nullable=True),
+        sa.Column("is_system", sa.Boolean(), server_default=sa.text("false"), nullable=False),
+        sa.Column("is_pinned", sa.Boolean(), server_default=sa.text("false"), nullable=False),
+        sa.Column("is_deleted", sa.Boolean(), server_default=sa.text("false"), nullable=False),
+        sa.Column("sequence", sa.BigInteger(), nullable=True),
+        sa.PrimaryKeyConstraint("id", name="messages_pkey"),
+    )
+    op.execute(
+        "INSERT INTO messages (id, channel_id, user_id, content, created_at, original_language, "
+        "reply_to_id, is_system, is_pinned, is_deleted, sequence) "
+        "SELECT id, channel_id, user_id, content, created_at, original_language, "
+        "reply_to_id, is_system, is_pinned, is_deleted, sequence FROM messages_partitioned"
+    )
+    op.create_table(
+        "message_reactions",
+        sa.Column("id", UUID(as_uuid=True), primary_key=True, server_default=sa.text("gen_random_uuid()")),
+        sa.Column("message_id", UUID(as_uuid=True), sa.ForeignKey("messages.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("user_id", UUID(as_uuid=True), sa.ForeignKey("users.id"), nullable=False),
+        sa.Column("emoji", sa.String(50), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+        sa.UniqueConstraint("message_id", "user_id", "emoji", name="uq_reaction_per_user"),
+    )
+    op.execute(
+        "INSERT INTO message_reactions (id, message_id, user_id, emoji, created_at) "
+        "SELECT id, message_id, user_id, emoji, created_at FROM message_reactions_partitioned"
+    )
+    op.execute("DROP TABLE message_reactions_partitioned CASCADE")
+    op.execute("DROP TABLE messages_partitioned CASCADE")
+
+    op.create_index("ix_messages_channel_id", "messages", ["channel_id"])
+    op.create_index("ix_messages_user_id", "messages", ["user_id"])
+    op.create_index("ix_messages_reply_to_id", "messages", ["reply_to_id"])
+    op.create_index("ix_messages_channel_sequence", "messages", ["channel_id", "sequence"])
+    op.create_index("ix_message_reactions_message_id", "message_reactions", ["message_id"])
+    op.create_index("ix_message_reactions_user_id", "message_reactions", ["user_id"])
+    op.create_foreign_key("fk_messages_reply_to", "messages", "messages", ["reply_to_id"], ["id"])
+    op.create_foreign_key("chat_reports_message_id_fkey", "chat_reports", "messages", ["message_id"], ["id"])
+    op.create_foreign_key(
+        "social_message_translations_message_id_fkey",
+        "social_message_translations",
+        "messages",
+        ["message_id"],
+        ["id"],
+    )
@@ -0,0 +1,114 @@
+"""Range-partition scans by calendar quarter
+
+Revision ID: 044
+Revises: 043
+Create Date: 2026-03-22
+
+scans is rebuilt as a table partitioned by RANGE (created_at), one
+partition per calendar quarter (scans_YYYY_qN), with bounds matching
+tier.quarter_range. Quarterly tier counts filter on the same range, so
+they are pruned to the active partition. The partitioned
+ix_scans_user_created_at_id index gives every partition its own
+(user_id, created_at, id) index, which replaces the plain ix_scans_user_id.
+
+The primary key becomes (id, created_at), so affiliate_chips.source_scan_id
+loses its foreign key to scans(id).
+
+Partitions are created for every quarter from the oldest scan through the
+next quarter, plus a DEFAULT partition. After that, the nightly
+scan-partitions beat task keeps the next quarter ready.
+"""
+
+from datetime import date, datetime, timezone
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects.postgresql import UUID
+
+revision = "044"
+down_revision = "043"
+branch_labels = None
+depends_on = None
+
+_COLUMNS = "id, created_at, user_id, qr_code_id, usdc_earned, tier_multiplier, streak_day"
+
+
+def _quarter_start(day):
+    return date(day.year, (day.month - 1) // 3 * 3 + 1, 1)
+
+
+def _next_quarter(day):
+    start = _quarter_start(day)
+    return date(start.year + 1, 1, 1) if start.month == 10 else date(start.year, start.month + 3, 1)
+
+
+def upgrade():
+    op.execute("ALTER TABLE affiliate_chips DROP CONSTRAINT IF EXISTS affiliate_chips_source_scan_id_fkey")
+
+    # -- Move the plain table aside; its constraint and index names are reused below --
+    op.rename_table("scans", "scans_legacy")
+    op.execute("ALTER TABLE scans_legacy RENAME CONSTRAINT scans_pkey TO scans_legacy_pkey")
+    for index in ("ix_scans_user_id", "ix_scans_qr_code_id", "ix_scans_user_created_at_id"):
+        op.execute(f"ALTER INDEX {index} RENAME TO {index}_legacy")
+
+    op.create_table(
+        "scans",
+        sa.Column("id", UUID(as_uuid=True), server_default=sa.text("gen_random_uuid()"), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+        sa.Column("user_id", UUID(as_uuid=True), sa.ForeignKey("users.id"), nullable=False),
+        sa.Column("qr_code_id", UUID(as_uuid=True), sa.ForeignKey("qr_codes.id"), nullable=False),
+        sa.Column("usdc_earned", sa.Numeric(12, 2), nullable=False),
+        sa.Column("tier_multiplier", sa.Numeric(4, 2), nullable=True),
+        sa.Column("streak_day", sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint("id", "created_at", name="scans_pkey"),
+        postgresql_partition_by="RANGE (created_at)",
+    )
+
+    # -- Quarterly partitions: oldest scan through next quarter --
+    oldest = op.get_bind().execute(sa.text("SELECT min(created_at) FROM scans_legacy")).scalar()
+    this_quarter = _quarter_start(datetime.now(timezone.utc).date())
+    quarter = min(_quarter_start(oldest.date()), this_quarter) if oldest else this_quarter
+    last = _next_quarter(this_quarter)
+    while quarter <= last:
+        op.execute(
+            f"CREATE TABLE IF NOT EXISTS scans_{quarter.year}_q{(quarter.month - 1) // 3 + 1} "
+            f"PARTITION OF scans FOR VALUES FROM ('{quarter.isoformat()} 00:00:00+00') "
+            f"TO ('{_next_quarter(quarter).isoformat()} 00:00:00+00')"
+        )
+        quarter = _next_quarter(quarter)
+    op.execute("CREATE TABLE IF NOT EXISTS scans_default PARTITION OF scans DEFAULT")
+
+    # -- Copy rows, then index the filled partitions --
+    op.execute(f"INSERT INTO scans ({_COLUMNS}) SELECT {_COLUMNS} FROM scans_legacy")
+    op.drop_table("scans_legacy")
+
+    op.create_index("ix_scans_qr_code_id", "scans", ["qr_code_id"])
+    op.create_index("ix_scans_user_created_at_id", "scans", ["user_id", "created_at", "id"])
+
+
+def downgrade():
+    op.rename_table("scans", "scans_partitioned")
+    op.execute("ALTER TABLE scans_partitioned RENAME CONSTRAINT scans_pkey TO scans_partitioned_pkey")
+    for index in ("ix_scans_qr_code_id", "ix_scans_user_created_at_id"):
+        op.execute(f"ALTER INDEX {index} RENAME TO {index}_partitioned")
+
+    op.create_table(
+        "scans",
+        sa.Column("id", UUID(as_uuid=True), server_default=sa.text("gen_random_uuid()"), nullable=False),
+        sa.Column("user_id", UUID(as_uuid=True), sa.ForeignKey("users.id"), nullable=False),
+        sa.Column("qr_code_id", UUID(as_uuid=True), sa.ForeignKey("qr_codes.id"), nullable=False),
+        sa.Column("usdc_earned", sa.Numeric(12, 2), nullable=False),
+        sa.Column("streak_day", sa.Integer(), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+        sa.Column("tier_multiplier", sa.Numeric(4, 2), nullable=True),
+        sa.PrimaryKeyConstraint("id", name="scans_pkey"),
+    )
+    op.execute(f"INSERT INTO scans ({_COLUMNS}) SELECT {_COLUMNS} FROM scans_partitioned")
+    op.execute("DROP TABLE scans_partitioned CASCADE")
+
+    op.create_index("ix_scans_user_id", "scans", ["user_id"])
+    op.create_index("ix_scans_qr_code_id", "scans", ["qr_code_id"])
+    op.create_index("ix_scans_user_created_at_id", "scans", ["user_id", "created_at", "id"])
+    op.create_foreign_key(
+        "affiliate_chips_source_scan_id_fkey", "affiliate_chips", "scans", ["source_scan_id"], ["id"]
+    )
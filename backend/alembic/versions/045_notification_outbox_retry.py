@@ -0,0 +1,56 @@
+"""Back off failed notification outbox jobs
+
+Revision ID: 045
+Revises: 044
+Create Date: 2026-03-24
+
+notification_outbox gets next_attempt_at. The dispatcher only claims
+pending jobs that are due and orders them by that column, so a failed
+batch waits out an exponential backoff at the back of the queue instead
+of being reclaimed at once. The partial pending index moves to the
+column the claim now filters and sorts on, and a plain index on
+dispatched_at serves the retention purge of sent jobs.
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+revision = "045"
+down_revision = "044"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column(
+        "notification_outbox",
+        sa.Column(
+            "next_attempt_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+    )
+    op.execute("UPDATE notification_outbox SET next_attempt_at = created_at")
+    op.drop_index("ix_notification_outbox_status_created", table_name="notification_outbox")
+    op.create_index(
+        "ix_notification_outbox_pending_next_attempt",
+        "notification_outbox",
+        ["next_attempt_at"],
+        postgresql_where=sa.text("status = 'pending'"),
+    )
+    op.create_index(
+        "ix_notification_outbox_dispatched_at", "notification_outbox", ["dispatched_at"]
+    )
+
+
+def downgrade():
+    op.drop_index("ix_notification_outbox_dispatched_at", table_name="notification_outbox")
+    op.drop_index("ix_notification_outbox_pending_next_attempt", table_name="notification_outbox")
+    op.create_index(
+        "ix_notification_outbox_status_created",
+        "notification_outbox",
+        ["status", "created_at"],
+        postgresql_where=sa.text("status = 'pending'"),
+    )
+    op.drop_column("notification_outbox", "next_attempt_at")
@@ -0,0 +1,39 @@
+"""Freeze weekly affiliate pool chip counts
+
+Revision ID: 046
+Revises: 045
+Create Date: 2026-03-25
+
+affiliate_pool_shares holds each affiliate's live chip count for a pool
+week, written once when that week's payout starts. The payout divides the
+pool by these rows instead of counting affiliate_chips per chunk, so chips
+minted or expired mid-run (or between a crash and the resume) no longer
+change anyone's share.
+"""
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects.postgresql import UUID
+
+revision = "046"
+down_revision = "045"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "affiliate_pool_shares",
+        sa.Column("id", UUID(as_uuid=True), primary_key=True, server_default=sa.text("gen_random_uuid()")),
+        sa.Column("period_start", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("affiliate_id", UUID(as_uuid=True), sa.ForeignKey("affiliates.id"), nullable=False),
+        sa.Column("chips", sa.Integer(), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+        sa.UniqueConstraint("period_start", "affiliate_id", name="uq_affiliate_pool_shares_week_affiliate"),
+    )
+    op.create_index("ix_affiliate_pool_shares_affiliate_id", "affiliate_pool_shares", ["affiliate_id"])
+
+
+def downgrade():
+    op.drop_index("ix_affiliate_pool_shares_affiliate_id", table_name="affiliate_pool_shares")
+    op.drop_table("affiliate_pool_shares")
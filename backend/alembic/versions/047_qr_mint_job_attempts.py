@@ -0,0 +1,29 @@
+"""Count claims on qr_mint_jobs so failed runs are retried a bounded number of times
+
+Revision ID: 047
+Revises: 046
+Create Date: 2026-03-26
+
+Every claim of a mint job increments attempts. The resume beat task
+re-queues failed jobs, and running jobs whose updated_at heartbeat has gone
+stale, until attempts reaches the cap.
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+revision = "047"
+down_revision = "046"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column(
+        "qr_mint_jobs",
+        sa.Column("attempts", sa.Integer(), nullable=False, server_default=sa.text("0")),
+    )
+
+
+def downgrade():
+    op.drop_column("qr_mint_jobs", "attempts")
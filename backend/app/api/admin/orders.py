@@ -0,0 +1,37 @@
+"""Admin order endpoints — fulfilment and cancellation.
+
+Status changes go through shop_service.update_order_status, which keeps the
+referrer's affiliate_stats tin counter in step when an order is cancelled
+or refunded.
+"""
+
+import uuid
+
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.deps import get_current_user, get_db
+from app.api.schemas.shop import OrderOut, OrderStatusUpdate
+from app.api.shop import _order_to_response
+from app.models.user import User
+from app.services.shop_service import update_order_status
+
+router = APIRouter(prefix="/admin/orders", tags=["admin-orders"])
+
+
+def require_admin(user: User = Depends(get_current_user)) -> User:
+    if not user.is_admin:
+        raise HTTPException(status.HTTP_403_FORBIDDEN, "Admin access required")
+    return user
+
+
+@router.patch("/{order_id}/status", response_model=OrderOut)
+async def admin_update_order_status(
+    order_id: uuid.UUID,
+    body: OrderStatusUpdate,
+    admin: User = Depends(require_admin),
+    db: AsyncSession = Depends(get_db),
+):
+    """Move an order to a new status (e.g. ``shipped``, ``cancelled``, ``refunded``)."""
+    order = await update_order_status(db, order_id, body.status)
+    return _order_to_response(order)
@@ -0,0 +1,43 @@
+"""Admin product endpoints — catalog management.
+
+Every write bumps the catalog version, so each API process reloads its
+in-memory catalog (see product_catalog) on its next version check.
+"""
+
+import uuid
+
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.deps import get_current_user, get_db
+from app.api.schemas.shop import ProductCreate, ProductOut, ProductUpdate
+from app.models.user import User
+from app.services.shop_service import create_product, update_product
+
+router = APIRouter(prefix="/admin/products", tags=["admin-products"])
+
+
+def require_admin(user: User = Depends(get_current_user)) -> User:
+    if not user.is_admin:
+        raise HTTPException(status.HTTP_403_FORBIDDEN, "Admin access required")
+    return user
+
+
+@router.post("", response_model=ProductOut, status_code=status.HTTP_201_CREATED)
+async def admin_create_product(
+    body: ProductCreate,
+    admin: User = Depends(require_admin),
+    db: AsyncSession = Depends(get_db),
+):
+    return await create_product(db, **body.model_dump())
+
+
+@router.patch("/{product_id}", response_model=ProductOut)
+async def admin_update_product(
+    product_id: uuid.UUID,
+    body: ProductUpdate,
+    admin: User = Depends(require_admin),
+    db: AsyncSession = Depends(get_db),
+):
+    """Update only the fields sent; deactivate with ``is_active: false``."""
+    return await update_product(db, product_id, **body.model_dump(exclude_unset=True))
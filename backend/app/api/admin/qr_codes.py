@@ -1,7 +1,8 @@
 import uuid
 
 from fastapi import APIRouter, Depends, HTTPException, Query, status
-from sqlalchemy import func, select
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.deps import get_current_user, get_db
@@ -10,10 +11,20 @@ from app.api.schemas.scan import (
     QRCodeGenerateResponse,
     QRCodeListPage,
     QRCodeResponse,
+    QRMintJobCreate,
+    QRMintJobResponse,
 )
 from app.models.qr_code import QRCode
+from app.models.qr_mint_job import QRMintJob
 from app.models.user import User
+from app.services.pagination import PageParams, page_params, paginate
 from app.services.qr_code import generate_qr_codes
+from app.services.qr_mint_service import (
+    EXPORT_FORMATS,
+    create_mint_job,
+    get_mint_job,
+    stream_mint_job_codes,
+)
 
 router = APIRouter(prefix="/admin/qr-codes", tags=["admin-qr"])
 
@@ -34,48 +45,100 @@ async def generate(
     return QRCodeGenerateResponse(generated=len(codes), codes=codes)
 
 
+def _mint_job_response(job: QRMintJob) -> QRMintJobResponse:
+    return QRMintJobResponse(
+        id=job.id,
+        product_id=job.product_id,
+        product_code=job.product_code,
+        quantity=job.quantity,
+        minted=job.minted,
+        collisions=job.collisions,
+        status=job.status,
+        progress=round(job.minted / job.quantity, 4) if job.quantity else 1.0,
+        last_error=job.last_error,
+        created_at=job.created_at,
+        finished_at=job.finished_at,
+    )
+
+
+async def _get_mint_job_or_404(db: AsyncSession, job_id: uuid.UUID) -> QRMintJob:
+    job = await get_mint_job(db, job_id)
+    if job is None:
+        raise HTTPException(status.HTTP_404_NOT_FOUND, "Mint job not found")
+    return job
+
+
+@router.post("/mint-jobs", response_model=QRMintJobResponse, status_code=status.HTTP_202_ACCEPTED)
+async def start_mint_job(
+    body: QRMintJobCreate,
+    admin: User = Depends(require_admin),
+    db: AsyncSession = Depends(get_db),
+):
+    """Queue a print run; poll the job for progress, then download its export."""
+    from app.tasks.qr_codes import mint_qr_codes
+
+    try:
+        job = await create_mint_job(db, body.product_id, body.quantity, requested_by=admin.id)
+    except ValueError as exc:
+        raise HTTPException(status.HTTP_404_NOT_FOUND, str(exc))
+    mint_qr_codes.delay(str(job.id))
+    return _mint_job_response(job)
+
+
+@router.get("/mint-jobs/{job_id}", response_model=QRMintJobResponse)
+async def get_mint_job_progress(
+    job_id: uuid.UUID,
+    admin: User = Depends(require_admin),
+    db: AsyncSession = Depends(get_db),
+):
+    return _mint_job_response(await _get_mint_job_or_404(db, job_id))
+
+
+@router.get("/mint-jobs/{job_id}/export")
+async def export_mint_job(
+    job_id: uuid.UUID,
+    format: str = Query("csv", pattern="^(csv|ndjson)$"),
+    admin: User = Depends(require_admin),
+    db: AsyncSession = Depends(get_db),
+):
+    """Stream a completed job's codes as CSV or NDJSON."""
+    job = await _get_mint_job_or_404(db, job_id)
+    if job.status != "completed":
+        raise HTTPException(status.HTTP_409_CONFLICT, f"Mint job is {job.status}")
+    return StreamingResponse(
+        stream_mint_job_codes(db, job_id, format),
+        media_type=EXPORT_FORMATS[format],
+        headers={"Content-Disposition": f'attachment; filename="qr-codes-{job_id}.{format}"'},
+    )
+
+
 @router.get("", response_model=QRCodeListPage)
 async def list_qr_codes(
-    page: int = Query(1, ge=1),
-    per_page: int = Query(50, ge=1, le=200),
+    params: PageParams = Depends(page_params(default_per_page=50, max_per_page=200)),
     product_id: uuid.UUID | None = None,
     is_used: bool | None = None,
     admin: User = Depends(require_admin),
     db: AsyncSession = Depends(get_db),
 ):
+    """QR codes, newest first; ``total=estimate`` uses planner statistics."""
     base = select(QRCode)
     if product_id is not None:
         base = base.where(QRCode.product_id == product_id)
     if is_used is not None:
         base = base.where(QRCode.is_used == is_used)
 
-    count_result = await db.execute(
-        select(func.count()).select_from(base.subquery())
-    )
-    total = count_result.scalar_one()
-
-    result = await db.execute(
-        base.order_by(QRCode.created_at.desc())
-        .offset((page - 1) * per_page)
-        .limit(per_page)
-    )
-    items = result.scalars().all()
-
-    return QRCodeListPage(
-        items=[
-            QRCodeResponse(
-                id=qr.id,
-                product_code=qr.product_code,
-                unique_id=qr.unique_id,
-                full_code=qr.unique_id,
-                is_used=qr.is_used,
-                scanned_by=qr.scanned_by,
-                scanned_at=qr.scanned_at,
-                created_at=qr.created_at,
-            )
-            for qr in items
-        ],
-        total=total,
-        page=page,
-        per_page=per_page,
-    )
+    result = await paginate(db, base, (QRCode.created_at.desc(), QRCode.id.desc()), **params.as_kwargs())
+    result["items"] = [
+        QRCodeResponse(
+            id=qr.id,
+            product_code=qr.product_code,
+            unique_id=qr.unique_id,
+            full_code=qr.unique_id,
+            is_used=qr.is_used,
+            scanned_by=qr.scanned_by,
+            scanned_at=qr.scanned_at,
+            created_at=qr.created_at,
+        )
+        for qr in result["items"]
+    ]
+    return QRCodeListPage(**result)
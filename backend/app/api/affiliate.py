@@ -2,7 +2,7 @@
 
 import uuid
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.deps import get_current_user, get_db
@@ -27,6 +27,7 @@ from app.services.affiliate_service import (
     unvault_chips,
     vault_chips,
 )
+from app.services.pagination import PageParams, page_params
 
 router = APIRouter(prefix="/affiliate", tags=["affiliate"])
 
@@ -87,13 +88,12 @@ async def update_referral_code(
 
 @router.get("/me/downline", response_model=DownlineList)
 async def downline_list(
-    page: int = Query(1, ge=1),
-    per_page: int = Query(20, ge=1, le=100),
+    params: PageParams = Depends(page_params()),
     user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ):
     affiliate = await get_or_create_affiliate(db, user.id)
-    return await get_downline(db, affiliate.id, page, per_page)
+    return await get_downline(db, affiliate.id, params.page, params.per_page, cursor=params.cursor)
 
 
 @router.get("/me/chips", response_model=ChipSummary)
@@ -129,13 +129,12 @@ async def unvault_user_chips(
 
 @router.get("/me/payouts", response_model=PayoutList)
 async def payout_history(
-    page: int = Query(1, ge=1),
-    per_page: int = Query(20, ge=1, le=100),
+    params: PageParams = Depends(page_params()),
     user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ):
     affiliate = await get_or_create_affiliate(db, user.id)
-    return await get_payout_history(db, affiliate.id, page, per_page)
+    return await get_payout_history(db, affiliate.id, **params.as_kwargs())
 
 
 @router.get("/sunset", response_model=SunsetProgress)
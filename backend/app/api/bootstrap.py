@@ -1,90 +1,34 @@
 """Bootstrap endpoint — fetches all initial app data in a single call."""
 
-import asyncio
-import logging
-
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.deps import get_current_user, get_db
+from app.core.serialization import FastJSONResponse
 from app.models.user import User
-
-logger = logging.getLogger(__name__)
+from app.services.bootstrap_service import get_bootstrap
 
 router = APIRouter(prefix="/bootstrap", tags=["bootstrap"])
 
 
 @router.get("")
 async def bootstrap(
+    request: Request,
     current_user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ):
-    """Fetch user profile, wallet, unread count, and active votes in parallel."""
-    from sqlalchemy import select
-    from sqlalchemy.orm import selectinload
-
-    from app.services.governance_service import get_active_votes
-    from app.services.notification_service import get_unread_count
-    from app.services.wallet_service import get_user_wallet_balance
-
-    async def fetch_profile():
-        try:
-            result = await db.execute(
-                select(User).options(selectinload(User.tier)).where(User.id == current_user.id)
-            )
-            user = result.scalar_one()
-            tier = None
-            if user.tier is not None:
-                tier = {
-                    "name": user.tier.name,
-                    "color": user.tier.color,
-                    "benefits": user.tier.benefits_json,
-                }
-            return {
-                "id": str(user.id),
-                "email": user.email,
-                "first_name": user.first_name,
-                "last_name": user.last_name,
-                "username": user.username,
-                "avatar_url": user.avatar_url,
-                "tier": tier,
-            }
-        except Exception:
-            logger.exception("Bootstrap: failed to fetch profile")
-            return None
-
-    async def fetch_wallet():
-        try:
-            return await get_user_wallet_balance(db, current_user.id)
-        except Exception:
-            logger.exception("Bootstrap: failed to fetch wallet")
-            return None
-
-    async def fetch_unread_count():
-        try:
-            return await get_unread_count(db, current_user.id)
-        except Exception:
-            logger.exception("Bootstrap: failed to fetch unread count")
-            return 0
+    """Fetch user profile, wallet, unread count, and active votes.
 
-    async def fetch_active_votes():
-        try:
-            votes = await get_active_votes(db, current_user.id)
-            return len(votes)
-        except Exception:
-            logger.exception("Bootstrap: failed to fetch active votes")
-            return 0
+    Served from a per-user cache with an ``ETag``; a launch that sends the
+    last ETag in ``If-None-Match`` gets an empty 304 when nothing changed.
+    The payload is already JSON-ready, so it is rendered as-is without
+    another pass through ``jsonable_encoder``.
+    """
+    payload, etag = await get_bootstrap(db, current_user.id)
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
 
-    profile, wallet, unread_count, active_vote_count = await asyncio.gather(
-        fetch_profile(),
-        fetch_wallet(),
-        fetch_unread_count(),
-        fetch_active_votes(),
-    )
+    if_none_match = request.headers.get("if-none-match", "")
+    if etag in {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}:
+        return Response(status_code=304, headers=headers)
 
-    return {
-        "user": profile,
-        "wallet": wallet,
-        "unread_notification_count": unread_count,
-        "active_vote_count": active_vote_count,
-    }
+    return FastJSONResponse(payload, headers=headers)
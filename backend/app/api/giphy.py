@@ -3,6 +3,7 @@
 from fastapi import APIRouter, Depends, Query
 
 from app.api.deps import get_current_user
+from app.core.serialization import FastJSONResponse
 from app.models.user import User
 from app.services.giphy_service import get_trending_gifs, search_gifs
 
@@ -16,9 +17,12 @@ async def gif_search(
     offset: int = Query(0, ge=0),
     _user: User = Depends(get_current_user),
 ):
-    """Search Giphy for GIFs. Results cached in Redis for 5 minutes."""
+    """Search Giphy for GIFs. Results cached in Redis for 5 minutes.
+
+    Results are plain JSON (from Giphy or the cache) and are rendered directly.
+    """
     results = await search_gifs(q, limit=limit, offset=offset)
-    return {"results": results, "count": len(results)}
+    return FastJSONResponse({"results": results, "count": len(results)})
 
 
 @router.get("/trending")
@@ -28,4 +32,4 @@ async def gif_trending(
 ):
     """Return trending GIFs from Giphy. Cached in Redis for 10 minutes."""
     results = await get_trending_gifs(limit=limit)
-    return {"results": results, "count": len(results)}
+    return FastJSONResponse({"results": results, "count": len(results)})
@@ -1,63 +1,70 @@
 """Insights API — public transparency endpoints, no authentication required.
 
-All endpoints delegate directly to insights_service aggregator functions and
-return the raw dict. No Pydantic response model is used so the schema can
-evolve freely as new data sources are added.
+Dashboard endpoints are served from precomputed Redis snapshots (see
+insights_snapshot_service). ``X-Snapshot`` is ``hit`` when the response came
+from a stored snapshot, with ``Age`` reporting how old it is, and ``miss``
+when it was computed for the request. The activity feed is parameterised and
+queried live, one keyset page at a time. All endpoints return the raw dict.
+No Pydantic response model is used so the schema can evolve freely as new
+data sources are added.
 """
 
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.deps import get_db
 from app.api.deps import get_current_user
 from app.models.user import User
-from app.services.insights_service import (
-    get_activity_feed,
-    get_comp_stats,
-    get_overview,
-    get_partner_stats,
-    get_systems_health,
-    get_treasury_insights,
-)
+from app.services.insights_service import InvalidFeedCursor, get_activity_feed
+from app.services.insights_snapshot_service import get_snapshot
 
 router = APIRouter(prefix="/insights", tags=["insights"])
 
 
 def require_admin(user: User = Depends(get_current_user)) -> User:
-    from fastapi import HTTPException, status
     if not user.is_admin:
         raise HTTPException(status.HTTP_403_FORBIDDEN, "Admin access required")
     return user
 
 
+async def _serve_snapshot(name: str, response: Response, db: AsyncSession) -> dict:
+    data, age = await get_snapshot(name, db)
+    if age is None:
+        response.headers["X-Snapshot"] = "miss"
+    else:
+        response.headers["X-Snapshot"] = "hit"
+        response.headers["Age"] = str(age)
+    return data
+
+
 @router.get("/overview")
-async def insights_overview(db: AsyncSession = Depends(get_db)) -> dict:
+async def insights_overview(response: Response, db: AsyncSession = Depends(get_db)) -> dict:
     """Public overview: scan count, active members, 24h payouts, velocity, recent activity."""
-    return await get_overview(db)
+    return await _serve_snapshot("overview", response, db)
 
 
 @router.get("/treasury")
-async def insights_treasury(db: AsyncSession = Depends(get_db)) -> dict:
+async def insights_treasury(response: Response, db: AsyncSession = Depends(get_db)) -> dict:
     """Public treasury: pool balances, bank balances, 90-day sparklines, blockchain health."""
-    return await get_treasury_insights(db)
+    return await _serve_snapshot("treasury", response, db)
 
 
 @router.get("/systems")
-async def insights_systems(db: AsyncSession = Depends(get_db)) -> dict:
+async def insights_systems(response: Response, db: AsyncSession = Depends(get_db)) -> dict:
     """Public systems health: scan velocity, node health, Teller sync, tier distribution."""
-    return await get_systems_health(db)
+    return await _serve_snapshot("systems", response, db)
 
 
 @router.get("/comps")
-async def insights_comps(db: AsyncSession = Depends(get_db)) -> dict:
+async def insights_comps(response: Response, db: AsyncSession = Depends(get_db)) -> dict:
     """Public comp stats: prize tier counts, total comps paid, active members comped."""
-    return await get_comp_stats(db)
+    return await _serve_snapshot("comps", response, db)
 
 
 @router.get("/partners")
-async def insights_partners(db: AsyncSession = Depends(get_db)) -> dict:
+async def insights_partners(response: Response, db: AsyncSession = Depends(get_db)) -> dict:
     """Public partner stats: affiliate count, wholesale account count."""
-    return await get_partner_stats(db)
+    return await _serve_snapshot("partners", response, db)
 
 
 @router.get("/dwolla-balance")
@@ -71,9 +78,12 @@ async def insights_dwolla_balance(admin: User = Depends(require_admin)) -> dict:
 @router.get("/feed")
 async def insights_feed(
     hours: int = Query(default=24, ge=1, le=720, description="Hours of history to include"),
-    page: int = Query(default=1, ge=1, description="Page number (1-based)"),
+    cursor: str | None = Query(default=None, description="next_cursor from the previous page"),
     per_page: int = Query(default=20, ge=1, le=100, description="Items per page"),
     db: AsyncSession = Depends(get_db),
 ) -> dict:
-    """Public activity feed: comp payouts, tier upgrades, new members — paginated."""
-    return await get_activity_feed(db, hours=hours, page=page, per_page=per_page)
+    """Public activity feed: comp payouts, tier upgrades, new members — cursor-paginated."""
+    try:
+        return await get_activity_feed(db, hours=hours, cursor=cursor, per_page=per_page)
+    except InvalidFeedCursor as e:
+        raise HTTPException(status.HTTP_400_BAD_REQUEST, str(e))
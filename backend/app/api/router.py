@@ -4,6 +4,8 @@ from app.api.auth import router as auth_router
 from app.api.users import router as users_router
 from app.api.scans import router as scans_router
 from app.api.admin.qr_codes import router as admin_qr_router
+from app.api.admin.products import router as admin_products_router
+from app.api.admin.orders import router as admin_orders_router
 from app.api.wallet import router as wallet_router
 from app.api.treasury import router as treasury_router
 from app.api.shop import router as shop_router
@@ -31,6 +33,8 @@ api_router.include_router(admin_qr_router)
 api_router.include_router(wallet_router)
 api_router.include_router(treasury_router)
 api_router.include_router(shop_router)
+api_router.include_router(admin_products_router)
+api_router.include_router(admin_orders_router)
 api_router.include_router(notifications_router)
 api_router.include_router(social_router)
 api_router.include_router(admin_social_router)
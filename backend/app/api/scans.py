@@ -1,7 +1,10 @@
-from fastapi import APIRouter, Depends, Query
+import logging
+from dataclasses import replace
+
+from fastapi import APIRouter, Depends
 from slowapi import Limiter
 from slowapi.util import get_remote_address
-from sqlalchemy import func, select
+from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 from starlette.requests import Request
@@ -16,8 +19,12 @@ from app.api.schemas.scan import (
 from app.models.qr_code import QRCode
 from app.models.scan import Scan
 from app.models.user import User
+from app.services import redis_service
+from app.services.pagination import PageParams, count_rows, page_params, paginate
 from app.services.qr_code import submit_scan
 
+logger = logging.getLogger(__name__)
+
 limiter = Limiter(key_func=get_remote_address)
 
 router = APIRouter(prefix="/scans", tags=["scans"])
@@ -60,37 +67,38 @@ async def scans_recent(
 
 @router.get("/history", response_model=ScanHistoryPage)
 async def scans_history(
-    page: int = Query(1, ge=1),
-    per_page: int = Query(20, ge=1, le=100),
+    params: PageParams = Depends(page_params()),
     current_user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ):
-    base = select(Scan).where(Scan.user_id == current_user.id)
-
-    count_result = await db.execute(
-        select(func.count()).select_from(base.subquery())
-    )
-    total = count_result.scalar_one()
-
-    result = await db.execute(
-        base
+    """A member's scans, newest first; ``total=estimate`` uses the maintained scan counter."""
+    query = (
+        select(Scan)
+        .where(Scan.user_id == current_user.id)
         .options(selectinload(Scan.qr_code).selectinload(QRCode.product))
-        .order_by(Scan.created_at.desc())
-        .offset((page - 1) * per_page)
-        .limit(per_page)
     )
-    scans = result.scalars().all()
-
-    return ScanHistoryPage(
-        items=[
-            ScanHistoryItem(
-                id=s.id,
-                product_name=s.qr_code.product.name if s.qr_code and s.qr_code.product else None,
-                scanned_at=s.created_at,
-            )
-            for s in scans
-        ],
-        total=total,
-        page=page,
-        per_page=per_page,
+    estimate = params.total == "estimate"
+    result = await paginate(
+        db,
+        query,
+        (Scan.created_at.desc(), Scan.id.desc()),
+        **replace(params, total="none" if estimate else params.total).as_kwargs(),
     )
+    if estimate:
+        # The all-time leaderboard score is this member's maintained scan count.
+        try:
+            result["total"] = await redis_service.get_user_scan_total(str(current_user.id))
+            result["total_estimated"] = True
+        except Exception as exc:
+            logger.warning("Scan total counter unavailable, counting rows: %s", exc)
+            result["total"] = await count_rows(db, query, "exact")
+
+    result["items"] = [
+        ScanHistoryItem(
+            id=s.id,
+            product_name=s.qr_code.product.name if s.qr_code and s.qr_code.product else None,
+            scanned_at=s.created_at,
+        )
+        for s in result["items"]
+    ]
+    return ScanHistoryPage(**result)
@@ -37,6 +37,8 @@ class DownlineList(BaseModel):
     total: int
     page: int
     per_page: int
+    next_cursor: str | None = None
+    prev_cursor: str | None = None
 
 
 class ChipSummary(BaseModel):
@@ -65,9 +67,11 @@ class PayoutOut(BaseModel):
 
 class PayoutList(BaseModel):
     items: list[PayoutOut]
-    total: int
+    total: int | None  # None when requested with total=none (the default for cursor pages)
     page: int
     per_page: int
+    next_cursor: str | None = None
+    prev_cursor: str | None = None
 
 
 class SunsetProgress(BaseModel):
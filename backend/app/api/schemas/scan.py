@@ -47,9 +47,12 @@ class ScanHistoryItem(BaseModel):
 
 class ScanHistoryPage(BaseModel):
     items: list[ScanHistoryItem]
-    total: int
+    total: int | None  # None when requested with total=none
+    total_estimated: bool = False
     page: int
     per_page: int
+    next_cursor: str | None = None
+    prev_cursor: str | None = None
 
 
 class QRCodeResponse(BaseModel):
@@ -75,8 +78,30 @@ class QRCodeGenerateResponse(BaseModel):
     codes: list[str]
 
 
+class QRMintJobCreate(BaseModel):
+    product_id: uuid.UUID
+    quantity: int = Field(ge=1, le=1_000_000)
+
+
+class QRMintJobResponse(BaseModel):
+    id: uuid.UUID
+    product_id: uuid.UUID
+    product_code: str
+    quantity: int
+    minted: int
+    collisions: int
+    status: str
+    progress: float
+    last_error: str | None
+    created_at: datetime
+    finished_at: datetime | None
+
+
 class QRCodeListPage(BaseModel):
     items: list[QRCodeResponse]
-    total: int
+    total: int | None  # None when requested with total=none
+    total_estimated: bool = False
     page: int
     per_page: int
+    next_cursor: str | None = None
+    prev_cursor: str | None = None
@@ -27,6 +27,28 @@ class ProductList(BaseModel):
     total: int
 
 
+class ProductCreate(BaseModel):
+    name: str = Field(min_length=1, max_length=200)
+    description: str | None = None
+    price: Decimal = Field(gt=0, max_digits=10, decimal_places=2)
+    flavor: str | None = Field(None, max_length=100)
+    nicotine_strength: str | None = Field(None, max_length=20)
+    image_url: str | None = None
+    stock: int = Field(0, ge=0)
+    is_active: bool = True
+
+
+class ProductUpdate(BaseModel):
+    name: str | None = Field(None, min_length=1, max_length=200)
+    description: str | None = None
+    price: Decimal | None = Field(None, gt=0, max_digits=10, decimal_places=2)
+    flavor: str | None = Field(None, max_length=100)
+    nicotine_strength: str | None = Field(None, max_length=20)
+    image_url: str | None = None
+    stock: int | None = Field(None, ge=0)
+    is_active: bool | None = None
+
+
 # --- Cart ---
 
 
@@ -85,6 +107,10 @@ class OrderCreate(BaseModel):
     payment_method_token: str | None = None
 
 
+class OrderStatusUpdate(BaseModel):
+    status: str = Field(min_length=1, max_length=20)
+
+
 class OrderItemOut(BaseModel):
     product_id: uuid.UUID
     product_name: str
@@ -112,6 +138,8 @@ class OrderOut(BaseModel):
 
 class OrderList(BaseModel):
     items: list[OrderOut]
-    total: int
+    total: int | None  # None when requested with total=none (the default for cursor pages)
     page: int
     per_page: int
+    next_cursor: str | None = None
+    prev_cursor: str | None = None
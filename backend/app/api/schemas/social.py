@@ -85,6 +85,21 @@ class TranslateResponse(BaseModel):
     target_lang: str
 
 
+class BatchTranslateRequest(BaseModel):
+    message_ids: list[uuid.UUID] = Field(min_length=1, max_length=100)
+    target_lang: str = Field(min_length=2, max_length=10)
+
+
+class TranslatedMessageOut(BaseModel):
+    message_id: uuid.UUID
+    translated_text: str
+
+
+class BatchTranslateResponse(BaseModel):
+    target_lang: str
+    translations: list[TranslatedMessageOut]
+
+
 # ── Admin ────────────────────────────────────────────────────────────
 
 
@@ -67,9 +67,11 @@ class NotificationResponse(BaseModel):
 
 class PaginatedNotifications(BaseModel):
     items: list[NotificationResponse]
-    total: int
+    total: int | None  # None when requested with total=none (the default for cursor pages)
     page: int
     page_size: int
+    next_cursor: str | None = None
+    prev_cursor: str | None = None
 
 
 class UsernameCheckResponse(BaseModel):
@@ -33,6 +33,8 @@ class TransactionResponse(BaseModel):
 class TransactionListResponse(BaseModel):
     transactions: list[TransactionResponse]
     count: int
+    next_cursor: str | None = None
+    prev_cursor: str | None = None
 
 
 class CompPayoutChoiceResponse(BaseModel):
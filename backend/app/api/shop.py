@@ -19,6 +19,7 @@ from app.api.schemas.shop import (
     TaxEstimate,
 )
 from app.models.user import User
+from app.services.pagination import PageParams, page_params
 from app.services.shop_service import (
     add_to_cart,
     create_order,
@@ -133,18 +134,13 @@ async def checkout(
 
 @router.get("/orders", response_model=OrderList)
 async def order_history(
-    page: int = Query(1, ge=1),
-    per_page: int = Query(10, ge=1, le=50),
+    params: PageParams = Depends(page_params(default_per_page=10, max_per_page=50)),
     user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ):
-    result = await get_orders(db, user.id, page=page, per_page=per_page)
-    return OrderList(
-        items=[_order_to_response(o) for o in result["items"]],
-        total=result["total"],
-        page=result["page"],
-        per_page=result["per_page"],
-    )
+    result = await get_orders(db, user.id, **params.as_kwargs())
+    result["items"] = [_order_to_response(o) for o in result["items"]]
+    return OrderList(**result)
 
 
 @router.get("/orders/{order_id}", response_model=OrderOut)
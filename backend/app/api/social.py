@@ -5,19 +5,26 @@ import uuid
 from fastapi import APIRouter, Depends, HTTPException, Query, status
 from slowapi import Limiter
 from slowapi.util import get_remote_address
+from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 from starlette.requests import Request
 
 from app.api.deps import get_current_user, get_db
 from app.api.schemas.social import (
+    BatchTranslateRequest,
+    BatchTranslateResponse,
     ChannelOut,
     MessageCreate,
     MessageOut,
     ReactionCreate,
     ReportCreate,
+    TranslatedMessageOut,
     TranslateRequest,
     TranslateResponse,
 )
+from app.api.social_ws import manager as ws_manager
+from app.models.channel import Channel
+from app.models.message import Message
 from app.models.user import User
 from app.services.chat_service import (
     delete_message,
@@ -32,8 +39,11 @@ from app.services.reaction_service import (
     get_reactions as svc_get_reactions,
     remove_reaction as svc_remove_reaction,
 )
-from app.services.translation_service import detect_language, translate_message
-from app.api.social_ws import manager as ws_manager
+from app.services.translation_service import (
+    detect_language,
+    translate_message,
+    translate_messages,
+)
 
 limiter = Limiter(key_func=get_remote_address)
 
@@ -114,8 +124,6 @@ async def create_reaction(
     result = await svc_add_reaction(db, message_id, user.id, body.emoji)
 
     # Broadcast reaction update to WebSocket clients via Redis pub/sub
-    from sqlalchemy import select
-    from app.models.message import Message
     msg_result = await db.execute(select(Message.channel_id).where(Message.id == message_id))
     channel_id = msg_result.scalar_one_or_none()
     if channel_id:
@@ -143,8 +151,6 @@ async def destroy_reaction(
         raise HTTPException(status.HTTP_404_NOT_FOUND, "Reaction not found")
 
     # Broadcast reaction update to WebSocket clients via Redis pub/sub
-    from sqlalchemy import select
-    from app.models.message import Message
     msg_result = await db.execute(select(Message.channel_id).where(Message.id == message_id))
     channel_id = msg_result.scalar_one_or_none()
     if channel_id:
@@ -209,10 +215,6 @@ async def translate(
     user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ):
-    from sqlalchemy import select
-    from app.models.message import Message
-    from app.models.channel import Channel
-
     msg_result = await db.execute(select(Message).where(Message.id == body.message_id))
     msg = msg_result.scalar_one_or_none()
     if msg is None:
@@ -228,10 +230,43 @@ async def translate(
         raise HTTPException(status.HTTP_404_NOT_FOUND, "Channel not found")
 
     source_lang = msg.original_language or await detect_language(msg.content)
-    translated = await translate_message(db, str(msg.id), msg.content, body.target_lang)
+    translated = await translate_message(
+        db, msg.id, msg.content, body.target_lang, source_language=source_lang
+    )
     return TranslateResponse(
         original_text=msg.content,
         translated_text=translated,
         source_lang=source_lang,
         target_lang=body.target_lang,
     )
+
+
+@router.post("/channels/{channel_id}/translate/batch", response_model=BatchTranslateResponse)
+async def translate_batch(
+    channel_id: uuid.UUID,
+    body: BatchTranslateRequest,
+    user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+):
+    """Translate a page of channel history with a single provider call."""
+    result = await db.execute(
+        select(Message.id, Message.content).where(
+            Message.id.in_(body.message_ids),
+            Message.channel_id == channel_id,
+            Message.is_deleted == False,  # noqa: E712
+        )
+    )
+    rows = result.all()
+
+    # Source language is left to the provider: a history page can mix languages.
+    translations = await translate_messages(
+        db, [(row.id, row.content) for row in rows], body.target_lang, source_language=None
+    )
+    return BatchTranslateResponse(
+        target_lang=body.target_lang,
+        translations=[
+            TranslatedMessageOut(message_id=row.id, translated_text=translations[str(row.id)])
+            for row in rows
+            if str(row.id) in translations
+        ],
+    )
@@ -14,13 +14,22 @@ Redis Key Schema (used by this handler + chat_buffer/chat_presence):
     chat:rate:{user_id}                   — Rate limit timestamp
     chat:spam:{user_id}                   — Spam detection list
 
+Translated fan-out:
+    Connections may declare a preferred language (``?lang=es`` on connect,
+    ``lang`` in the auth message, or a ``set_language`` message). For every
+    new_message, every pod looks at the languages its local subscribers
+    want and races for a Redis SET NX claim per (message, language). The
+    winner translates the message once and publishes a ``translation`` frame
+    on the channel, which every pod delivers to its subscribers of that
+    language. Translation runs in the background with a deadline and never
+    delays the original delivery.
+
 WebSocket Close Codes:
     4000 — Resumable disconnect (missed pongs, server restart)
     4001 — Auth failure (not resumable, do not reconnect)
 """
 
 import asyncio
-import json
 import logging
 import time
 import uuid
@@ -32,6 +41,7 @@ from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.security import decode_token
+from app.core.serialization import dumps, dumps_str, loads
 from app.db.session import async_session_factory
 from app.models.channel import Channel
 from app.models.message import Message
@@ -56,11 +66,24 @@ from app.services.chat_service import (
     send_message,
 )
 from app.services.redis_client import get_redis
+from app.services.redis_service import claim_translation_fanout
+from app.services.translation_service import is_supported_language, translate_message
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(tags=["social-ws"])
 
+# Max seconds to spend translating one message for one language group
+TRANSLATION_FANOUT_DEADLINE = 3.0
+
+
+def _normalize_language(value: str | None) -> str | None:
+    """Reduce a client language tag (e.g. ``es-MX``) to a supported ISO 639-1 code."""
+    if not value:
+        return None
+    code = value.strip().lower().replace("_", "-").split("-", 1)[0]
+    return code if is_supported_language(code) else None
+
 
 # ── Per-connection state ─────────────────────────────────────────────
 
@@ -78,6 +101,7 @@ class ConnectionState:
     missed_pongs: int = 0
     username: str = "Unknown"
     avatar_url: str | None = None
+    preferred_language: str | None = None
 
 
 # ── Connection manager (Redis pub/sub) ───────────────────────────────
@@ -89,6 +113,10 @@ class ConnectionManager:
     Every broadcast is published to Redis so that all backend pods receive
     the message.  A background subscriber task listens on ``chat:*`` and
     delivers incoming messages to the local WebSocket connections.
+
+    Frames go through ``app.core.serialization``: a message is encoded once
+    per delivery and the same text frame is sent to every local socket,
+    rather than once per socket as ``send_json`` would.
     """
 
     CHANNEL_PREFIX = "chat:"
@@ -100,6 +128,8 @@ class ConnectionManager:
         self.channels: dict[uuid.UUID, set[str]] = {}
         self._subscriber_task: asyncio.Task | None = None
         self._running = False
+        # In-flight translation fan-outs (held so they are not garbage collected)
+        self._translation_tasks: set[asyncio.Task] = set()
 
     # ── lifecycle ────────────────────────────────────────────────────
 
@@ -144,7 +174,7 @@ class ConnectionManager:
                     except (ValueError, IndexError):
                         continue
 
-                    data: dict = json.loads(raw_msg["data"])
+                    data: dict = loads(raw_msg["data"])
                     await self._deliver_local(channel_id, data)
 
                 await pubsub.punsubscribe()
@@ -162,8 +192,12 @@ class ConnectionManager:
             return
 
         msg_type = message.get("type")
+        if msg_type == "translation":
+            await self._deliver_translation(message, conn_ids)
+            return
         sequence = message.get("sequence")
         exclude_connection = message.pop("_exclude_connection", None)
+        frame = dumps_str(message)
 
         for conn_id in list(conn_ids):
             if conn_id == exclude_connection:
@@ -172,13 +206,104 @@ class ConnectionManager:
             if not state:
                 continue
             try:
-                await state.websocket.send_json(message)
+                await state.websocket.send_text(frame)
                 # Track ACK for new_message events only
                 if msg_type == "new_message" and sequence and state.ack_tracker:
                     await state.ack_tracker.track(channel_id, sequence, message)
             except Exception:
                 pass
 
+        if msg_type == "new_message":
+            self._schedule_translations(channel_id, message, conn_ids)
+
+    # ── translated fan-out ───────────────────────────────────────────
+
+    def _language_groups(self, conn_ids: set[str], message: dict) -> dict[str, list[str]]:
+        """Group connections that want *message* translated by their language."""
+        sender = message.get("user_id")
+        source_language = message.get("original_language")
+        groups: dict[str, list[str]] = {}
+        for conn_id in conn_ids:
+            state = self.connections.get(conn_id)
+            if not state or not state.preferred_language:
+                continue
+            if state.preferred_language == source_language or str(state.user_id) == sender:
+                continue
+            groups.setdefault(state.preferred_language, []).append(conn_id)
+        return groups
+
+    def _schedule_translations(self, channel_id: uuid.UUID, message: dict, conn_ids: set[str]):
+        """Start a background fan-out for each language wanted by local subscribers."""
+        if not message.get("id") or not message.get("content"):
+            return
+        languages = list(self._language_groups(conn_ids, message))
+        if not languages:
+            return
+        task = asyncio.create_task(self._fan_out_translations(channel_id, message, languages))
+        self._translation_tasks.add(task)
+        task.add_done_callback(self._translation_tasks.discard)
+
+    async def _fan_out_translations(
+        self, channel_id: uuid.UUID, message: dict, languages: list[str]
+    ):
+        await asyncio.gather(
+            *(self._translate_and_publish(channel_id, message, language) for language in languages)
+        )
+
+    async def _translate_and_publish(self, channel_id: uuid.UUID, message: dict, language: str):
+        """Translate *message* into *language* and publish the frame, unless another pod claimed it."""
+        try:
+            if not await claim_translation_fanout(message["id"], language):
+                return
+        except Exception:
+            logger.debug("Translation claim unavailable, translating %s locally", message["id"])
+
+        try:
+            async with async_session_factory() as db:
+                translated = await asyncio.wait_for(
+                    translate_message(
+                        db,
+                        uuid.UUID(message["id"]),
+                        message["content"],
+                        language,
+                        source_language=message.get("original_language"),
+                    ),
+                    timeout=TRANSLATION_FANOUT_DEADLINE,
+                )
+        except asyncio.TimeoutError:
+            logger.debug("Translation to %s missed deadline for message %s", language, message["id"])
+            return
+        except Exception:
+            logger.warning("Translation fan-out to %s failed for message %s", language, message["id"])
+            return
+
+        if translated is None:
+            return
+
+        await self.broadcast(channel_id, {
+            "type": "translation",
+            "channel_id": str(channel_id),
+            "message_id": message["id"],
+            "sequence": message.get("sequence"),
+            "language": language,
+            "translated_text": translated,
+            "_sender_id": message.get("user_id"),
+        })
+
+    async def _deliver_translation(self, message: dict, conn_ids: set[str]):
+        """Send a published translation frame to local subscribers of its language."""
+        language = message.get("language")
+        sender = message.pop("_sender_id", None)
+        frame = dumps_str(message)
+        for conn_id in list(conn_ids):
+            state = self.connections.get(conn_id)
+            if not state or state.preferred_language != language or str(state.user_id) == sender:
+                continue
+            try:
+                await state.websocket.send_text(frame)
+            except Exception:
+                pass
+
     # ── public API ───────────────────────────────────────────────────
 
     def register(self, state: ConnectionState):
@@ -224,7 +349,7 @@ class ConnectionManager:
             redis = await get_redis()
             await redis.publish(
                 f"{self.CHANNEL_PREFIX}{channel_id}",
-                json.dumps(message, default=str),
+                dumps(message),
             )
         except Exception:
             logger.exception("Failed to publish chat message to Redis")
@@ -240,7 +365,7 @@ class ConnectionManager:
         state = self.connections.get(connection_id)
         if state:
             try:
-                await state.websocket.send_json(message)
+                await state.websocket.send_text(dumps_str(message))
             except Exception:
                 pass
 
@@ -257,6 +382,7 @@ async def websocket_endpoint(websocket: WebSocket):
 
     # Authenticate via query param or first message
     token = websocket.query_params.get("token")
+    preferred_language = _normalize_language(websocket.query_params.get("lang"))
     user_id: uuid.UUID | None = None
 
     if token:
@@ -268,6 +394,7 @@ async def websocket_endpoint(websocket: WebSocket):
             data = await websocket.receive_json()
             if data.get("type") == "auth" and data.get("token"):
                 user_id = _authenticate_token(data["token"])
+                preferred_language = _normalize_language(data.get("lang")) or preferred_language
         except Exception:
             pass
 
@@ -297,6 +424,7 @@ async def websocket_endpoint(websocket: WebSocket):
         user_id=user_id,
         username=username,
         avatar_url=avatar_url,
+        preferred_language=preferred_language,
     )
     conn_state.ack_tracker = AckTracker(conn_state.connection_id, websocket)
     await conn_state.ack_tracker.start()
@@ -306,6 +434,7 @@ async def websocket_endpoint(websocket: WebSocket):
         "type": "auth_success",
         "session_id": conn_state.connection_id,
         "user_id": str(user_id),
+        "language": conn_state.preferred_language,
     })
 
     # ── Ping loop with pong validation ──
@@ -350,6 +479,21 @@ async def websocket_endpoint(websocket: WebSocket):
                 await websocket.send_json({"type": "pong"})
                 continue
 
+            # ── set_language ──
+            if msg_type == "set_language":
+                language = data.get("language")
+                normalized = _normalize_language(language)
+                if language and normalized is None:
+                    await websocket.send_json({
+                        "type": "error",
+                        "code": "UNSUPPORTED_LANGUAGE",
+                        "message": "Language not supported",
+                    })
+                    continue
+                conn_state.preferred_language = normalized
+                await websocket.send_json({"type": "language_set", "language": normalized})
+                continue
+
             # ── join_channel ──
             if msg_type == "join_channel":
                 channel_id = uuid.UUID(data["channel_id"])
@@ -472,8 +616,7 @@ async def websocket_endpoint(websocket: WebSocket):
                 })
 
                 for msg in missed:
-                    replay_msg = {**msg, "type": "replay_message"}
-                    await websocket.send_json(replay_msg)
+                    await websocket.send_text(dumps_str({**msg, "type": "replay_message"}))
 
                 await websocket.send_json({
                     "type": "replay_end",
@@ -534,6 +677,7 @@ async def websocket_endpoint(websocket: WebSocket):
                             "username": username,
                             "avatar_url": avatar_url,
                             "content": result.content,
+                            "original_language": result.original_language,
                             "sequence": result.sequence,
                             "timestamp": result.created_at.isoformat() if result.created_at else None,
                             "reply_to_id": str(result.reply_to_id) if result.reply_to_id else None,
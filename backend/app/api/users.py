@@ -26,6 +26,9 @@ from app.services.username_service import validate_username_format, is_profane,
 from app.models.notification import Notification
 from app.models.scan import Scan
 from app.models.user import User
+from app.services.bootstrap_service import invalidate_bootstrap
+from app.services.notification_service import mark_as_read
+from app.services.pagination import PageParams, page_params, paginate
 from app.services.tier import get_current_quarter_range, get_user_tier_info
 
 limiter = Limiter(key_func=get_remote_address)
@@ -126,6 +129,7 @@ async def change_username(
     current_user.username_lower = body.username.lower()
     current_user.username_changed_at = datetime.now(timezone.utc)
     await db.commit()
+    await invalidate_bootstrap(current_user.id)
 
     return {"message": "Username updated", "username": body.username}
 
@@ -164,6 +168,7 @@ async def update_me(
         setattr(current_user, field, value)
     await db.commit()
     await db.refresh(current_user)
+    await invalidate_bootstrap(current_user.id)
 
     # Reload with tier
     result = await db.execute(
@@ -214,33 +219,21 @@ async def get_my_stats(
 
 @router.get("/me/notifications", response_model=PaginatedNotifications)
 async def get_my_notifications(
-    page: int = Query(1, ge=1),
-    page_size: int = Query(20, ge=1, le=100),
+    params: PageParams = Depends(page_params(per_page_alias="page_size")),
     current_user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ):
-    base_query = select(Notification).where(Notification.user_id == current_user.id)
-
-    # Total count
-    count_result = await db.execute(
-        select(func.count()).select_from(base_query.subquery())
+    query = select(Notification).where(Notification.user_id == current_user.id)
+    result = await paginate(
+        db, query, (Notification.created_at.desc(), Notification.id.desc()), **params.as_kwargs()
     )
-    total = count_result.scalar_one()
-
-    # Paginated results
-    result = await db.execute(
-        base_query
-        .order_by(Notification.created_at.desc())
-        .offset((page - 1) * page_size)
-        .limit(page_size)
-    )
-    items = list(result.scalars().all())
-
     return PaginatedNotifications(
-        items=[NotificationResponse.model_validate(n) for n in items],
-        total=total,
-        page=page,
-        page_size=page_size,
+        items=[NotificationResponse.model_validate(n) for n in result["items"]],
+        total=result["total"],
+        page=result["page"],
+        page_size=result["per_page"],
+        next_cursor=result["next_cursor"],
+        prev_cursor=result["prev_cursor"],
     )
 
 
@@ -250,18 +243,8 @@ async def mark_notification_read(
     current_user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ):
-    result = await db.execute(
-        select(Notification).where(
-            Notification.id == notification_id,
-            Notification.user_id == current_user.id,
-        )
-    )
-    notification = result.scalar_one_or_none()
-    if notification is None:
+    if not await mark_as_read(db, notification_id, current_user.id):
         raise HTTPException(status.HTTP_404_NOT_FOUND, "Notification not found")
-
-    notification.is_read = True
-    await db.commit()
     return {"message": "Notification marked as read"}
 
 
@@ -335,6 +318,7 @@ async def upload_avatar(
     current_user.avatar_url = avatar_path
     current_user.avatar_updated_at = now
     await db.commit()
+    await invalidate_bootstrap(current_user.id)
 
     # Step 8: Return URLs
     return AvatarUploadResponse(
@@ -357,5 +341,6 @@ async def delete_avatar(
     current_user.avatar_url = None
     current_user.avatar_updated_at = datetime.now(timezone.utc)
     await db.commit()
+    await invalidate_bootstrap(current_user.id)
 
     return {"message": "Avatar removed"}
@@ -1,6 +1,6 @@
 """Wallet endpoints — balance, transactions, withdrawal."""
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from slowapi import Limiter
 from slowapi.util import get_remote_address
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -17,6 +17,7 @@ from app.api.schemas.wallet import (
     WithdrawRequest,
 )
 from app.models.user import User
+from app.services.pagination import PageParams, page_params
 from app.services.wallet_service import (
     apply_comp_payout_choice,
     get_user_transactions,
@@ -43,16 +44,20 @@ async def get_wallet(
 
 @router.get("/transactions", response_model=TransactionListResponse)
 async def get_transactions(
-    limit: int = 20,
-    offset: int = 0,
+    params: PageParams = Depends(page_params(per_page_alias="limit")),
+    offset: int = Query(0, ge=0),
     user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ):
-    """Get paginated transaction history."""
-    txns = await get_user_transactions(db, user.id, limit=limit, offset=offset)
+    """Get paginated transaction history; follow ``next_cursor`` instead of raising ``offset``."""
+    result = await get_user_transactions(
+        db, user.id, limit=params.per_page, offset=offset, cursor=params.cursor, total="none"
+    )
     return TransactionListResponse(
-        transactions=[TransactionResponse.model_validate(t) for t in txns],
-        count=len(txns),
+        transactions=[TransactionResponse.model_validate(t) for t in result["items"]],
+        count=len(result["items"]),
+        next_cursor=result["next_cursor"],
+        prev_cursor=result["prev_cursor"],
     )
 
 
@@ -8,6 +8,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.deps import get_current_user, get_db
 from app.models.user import User
+from app.services.pagination import PageParams, page_params
 from app.services.wholesale_service import (
     approve_wholesale_account,
     create_order,
@@ -128,8 +129,7 @@ async def apply_for_account(
 @router.get("/wholesale/orders")
 async def list_my_orders(
     status_filter: str | None = Query(None, alias="status"),
-    page: int = Query(1, ge=1),
-    per_page: int = Query(20, ge=1, le=100),
+    params: PageParams = Depends(page_params()),
     user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ):
@@ -138,19 +138,8 @@ async def list_my_orders(
     if account is None:
         raise HTTPException(status.HTTP_404_NOT_FOUND, "Wholesale account not found")
 
-    result = await list_orders(
-        db,
-        account_id=account.id,
-        status=status_filter,
-        page=page,
-        per_page=per_page,
-    )
-    return {
-        "items": [_serialize_order(o) for o in result["items"]],
-        "total": result["total"],
-        "page": result["page"],
-        "per_page": result["per_page"],
-    }
+    result = await list_orders(db, account_id=account.id, status=status_filter, **params.as_kwargs())
+    return _page_response(result, _serialize_order)
 
 
 @router.post("/wholesale/orders", status_code=status.HTTP_201_CREATED)
@@ -201,19 +190,13 @@ async def get_order_detail(
 
 @router.get("/admin/wholesale/accounts")
 async def admin_list_accounts(
-    page: int = Query(1, ge=1),
-    per_page: int = Query(20, ge=1, le=100),
+    params: PageParams = Depends(page_params()),
     admin: User = Depends(require_admin),
     db: AsyncSession = Depends(get_db),
 ):
     """Admin: list all wholesale accounts (paginated)."""
-    result = await list_wholesale_accounts(db, page=page, per_page=per_page)
-    return {
-        "items": [_serialize_account(a) for a in result["items"]],
-        "total": result["total"],
-        "page": result["page"],
-        "per_page": result["per_page"],
-    }
+    result = await list_wholesale_accounts(db, **params.as_kwargs())
+    return _page_response(result, _serialize_account)
 
 
 @router.post("/admin/wholesale/accounts/{account_id}/approve")
@@ -231,25 +214,13 @@ async def admin_approve_account(
 async def admin_list_orders(
     status_filter: str | None = Query(None, alias="status"),
     account_id: uuid.UUID | None = Query(None),
-    page: int = Query(1, ge=1),
-    per_page: int = Query(20, ge=1, le=100),
+    params: PageParams = Depends(page_params()),
     admin: User = Depends(require_admin),
     db: AsyncSession = Depends(get_db),
 ):
     """Admin: list all wholesale orders with optional status and account filters."""
-    result = await list_orders(
-        db,
-        account_id=account_id,
-        status=status_filter,
-        page=page,
-        per_page=per_page,
-    )
-    return {
-        "items": [_serialize_order(o) for o in result["items"]],
-        "total": result["total"],
-        "page": result["page"],
-        "per_page": result["per_page"],
-    }
+    result = await list_orders(db, account_id=account_id, status=status_filter, **params.as_kwargs())
+    return _page_response(result, _serialize_order)
 
 
 @router.patch("/admin/wholesale/orders/{order_id}/status")
@@ -300,3 +271,14 @@ def _serialize_order(order) -> dict:
         "notes": order.notes,
         "created_at": order.created_at,
     }
+
+
+def _page_response(result: dict, serialize) -> dict:
+    return {
+        "items": [serialize(item) for item in result["items"]],
+        "total": result["total"],
+        "page": result["page"],
+        "per_page": result["per_page"],
+        "next_cursor": result["next_cursor"],
+        "prev_cursor": result["prev_cursor"],
+    }
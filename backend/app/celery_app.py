@@ -1,4 +1,4 @@
-"""Celery application instance with Redis broker and 5 beat schedule entries.
+"""Celery application instance with Redis broker and beat schedule.
 
 Beat schedule:
   - treasury_snapshot:     hourly
@@ -6,6 +6,22 @@ Beat schedule:
   - affiliate_payout:      Sunday 3AM UTC
   - guaranteed_comps:      1st of month 2AM UTC
   - leaderboard_reconcile: daily midnight UTC
+  - chat_purge:            nightly 2AM UTC
+  - chat_partitions:       nightly 1:45AM UTC
+  - chat_stream_cleanup:   nightly 2:30AM UTC
+  - notification_outbox:   every 10 seconds
+  - outbox_purge:          daily 3:15AM UTC
+  - insights_snapshots:    every 30 seconds
+  - comp_rollups:          every 5 minutes
+  - comp_rollup_reconcile: daily 1AM UTC
+  - vault_chip_expiry:     daily 0:30AM UTC
+  - vault_bonuses:         1st of month 3AM UTC
+  - affiliate_stats:       daily 1:30AM UTC
+  - scan_events:           every 5 seconds
+  - scan_partitions:       nightly 1:50AM UTC
+  - wallet_ledger:         every 15 seconds
+  - cart_flush:            every minute
+  - qr_mint_resume:        every 5 minutes
 """
 
 from celery import Celery
@@ -23,6 +39,12 @@ celery_app = Celery(
         "app.tasks.affiliate",
         "app.tasks.comps",
         "app.tasks.chat_cleanup",
+        "app.tasks.notifications",
+        "app.tasks.insights",
+        "app.tasks.scan_events",
+        "app.tasks.wallet",
+        "app.tasks.qr_codes",
+        "app.tasks.shop",
     ],
 )
 
@@ -71,9 +93,79 @@ celery_app.conf.beat_schedule = {
         "task": "app.tasks.chat_cleanup.purge_old_messages",
         "schedule": crontab(minute=0, hour=2),
     },
+    # Scans partitions for the current and next quarter — nightly 1:50 AM UTC
+    "scan-partitions-nightly": {
+        "task": "app.tasks.scan_events.create_scan_partitions",
+        "schedule": crontab(minute=50, hour=1),
+    },
+    # Message partitions for upcoming months — nightly 1:45 AM UTC
+    "chat-partitions-nightly": {
+        "task": "app.tasks.chat_cleanup.create_message_partitions",
+        "schedule": crontab(minute=45, hour=1),
+    },
     # Orphaned stream cleanup — nightly 2:30 AM UTC
     "chat-stream-cleanup-nightly": {
         "task": "app.tasks.chat_cleanup.cleanup_orphaned_streams",
         "schedule": crontab(minute=30, hour=2),
     },
+    # Notification outbox dispatcher — every 10 seconds
+    "notification-outbox-10s": {
+        "task": "app.tasks.notifications.dispatch_notification_outbox",
+        "schedule": 10.0,
+    },
+    # Sent notification outbox jobs past retention — daily 3:15 AM UTC
+    "notification-outbox-purge-daily": {
+        "task": "app.tasks.notifications.purge_notification_outbox",
+        "schedule": crontab(minute=15, hour=3),
+    },
+    # Comp rollups for the transparency dashboard — every 5 minutes
+    "comp-rollups-5m": {
+        "task": "app.tasks.comps.roll_up_comp_transactions",
+        "schedule": crontab(minute="*/5"),
+    },
+    # Comp rollup reconciliation against the ledger — daily 1:00 AM UTC
+    "comp-rollups-reconcile-daily": {
+        "task": "app.tasks.comps.reconcile_comp_rollups",
+        "schedule": crontab(minute=0, hour=1),
+    },
+    # Vaulted chip expiry — daily 0:30 AM UTC
+    "vault-chip-expiry-daily": {
+        "task": "app.tasks.affiliate.expire_vaulted_chips",
+        "schedule": crontab(minute=30, hour=0),
+    },
+    # Vault bonus chips — 1st of month 3:00 AM UTC (after the day's expiry run)
+    "vault-bonuses-monthly": {
+        "task": "app.tasks.affiliate.process_vault_bonuses",
+        "schedule": crontab(minute=0, hour=3, day_of_month=1),
+    },
+    # Affiliate referred-tin counter reconciliation — daily 1:30 AM UTC
+    "affiliate-stats-reconcile-daily": {
+        "task": "app.tasks.affiliate.reconcile_affiliate_stats",
+        "schedule": crontab(minute=30, hour=1),
+    },
+    # Scan event consumers (comps, chips, counters, tier history) — every 5 seconds
+    "scan-events-5s": {
+        "task": "app.tasks.scan_events.dispatch_scan_event_consumers",
+        "schedule": 5.0,
+    },
+    # Wallet ledger materializer — every 15 seconds
+    "wallet-ledger-materialize-15s": {
+        "task": "app.tasks.wallet.materialize_wallet_ledger",
+        "schedule": 15.0,
+    },
+    # Insights dashboard snapshots — every 30 seconds
+    "insights-snapshots-30s": {
+        "task": "app.tasks.insights.refresh_insights_snapshots",
+        "schedule": 30.0,
+    },
+    # Idle Redis carts → cart_items — every minute
+    "cart-idle-flush-60s": {
+        "task": "app.tasks.shop.flush_idle_carts",
+        "schedule": 60.0,
+    },
+    # Failed or orphaned QR mint jobs → re-queued — every 5 minutes
+    "qr-mint-resume-5m": {
+        "task": "app.tasks.qr_codes.resume_mint_jobs",
+        "schedule": crontab(minute="*/5"),
+    },
 }
@@ -15,12 +15,25 @@ class Settings(BaseSettings):
     ENVIRONMENT: str = "development"
     CORS_ORIGINS: list[str] = []
 
+    # -------------------------------------------------------------------------
+    # TimescaleDB (opt-in)
+    # -------------------------------------------------------------------------
+    # When enabled (and the timescaledb extension is available), migration 033
+    # turns treasury_snapshots / transparency_metrics into compressed hypertables
+    # with retention, and timescale_service reads their continuous aggregates.
+    TIMESCALE_ENABLED: bool = False
+    TIMESCALE_COMPRESS_AFTER_DAYS: int = 7
+    TIMESCALE_RETENTION_DAYS: int = 730  # raw rows; continuous aggregates are kept
+
     # -------------------------------------------------------------------------
     # Redis
     # -------------------------------------------------------------------------
     REDIS_URL: str = "redis://localhost:6379/0"
     REDIS_CLUSTER_ENABLED: bool = False
     REDIS_SSL_ENABLED: bool = False
+    # Scan side effects (comps, chips, leaderboard, tier history) are fanned out
+    # over a Redis Stream; "memory" keeps them in-process for tests and local dev.
+    SCAN_EVENTS_BACKEND: str = "redis"
 
     # -------------------------------------------------------------------------
     # Celery
@@ -155,6 +168,7 @@ class Settings(BaseSettings):
         "en", "es", "fr", "de", "pt", "it", "ja", "ko", "zh", "ar",
     ]
     TRANSLATION_CACHE_TTL: int = 86400  # 24 hours in seconds
+    TRANSLATION_PROVIDER: str = "google"  # "google" | "fake" (offline, deterministic)
 
     # -------------------------------------------------------------------------
     # Google Analytics
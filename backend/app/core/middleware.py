@@ -0,0 +1,169 @@
+"""Pure ASGI middleware for response headers and conditional GETs.
+
+Both middlewares wrap ``send`` and edit the ``http.response.start``
+message in place. Unlike BaseHTTPMiddleware they add no extra task or
+body stream per request, and streaming responses pass through untouched.
+"""
+
+import hashlib
+from collections.abc import Mapping
+from dataclasses import dataclass
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+SECURITY_HEADERS: dict[str, str] = {
+    "X-Content-Type-Options": "nosniff",
+    "X-Frame-Options": "DENY",
+    "X-XSS-Protection": "1; mode=block",
+    "Strict-Transport-Security": "max-age=31536000; includeSubDomains",
+    "Referrer-Policy": "strict-origin-when-cross-origin",
+    "Permissions-Policy": "camera=(), microphone=(), geolocation=()",
+}
+
+
+class SecurityHeadersMiddleware:
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        async def send_with_headers(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(scope=message)
+                for name, value in SECURITY_HEADERS.items():
+                    headers[name] = value
+            await send(message)
+
+        await self.app(scope, receive, send_with_headers)
+
+
+# ---------------------------------------------------------------------------
+# Cache-Control rules
+# ---------------------------------------------------------------------------
+
+
+@dataclass(frozen=True)
+class CacheRule:
+    """Cache-Control value for a route, and whether GETs get a weak ETag."""
+
+    header: str
+    etag: bool = False
+
+
+class RuleTrie:
+    """Path-segment trie of cache rules.
+
+    A key like ``/api/shop/products`` matches that exact path; a key ending
+    in ``/*`` matches everything below it. ``match`` walks the request path
+    once, so lookup cost is independent of the number of rules, and the
+    deepest match wins.
+    """
+
+    _EXACT = "\x00exact"
+    _SUBTREE = "\x00subtree"
+
+    def __init__(self, rules: Mapping[str, CacheRule]) -> None:
+        self._root: dict = {}
+        for path, rule in rules.items():
+            subtree = path.endswith("/*")
+            node = self._root
+            for segment in self._segments(path.removesuffix("/*")):
+                node = node.setdefault(segment, {})
+            node[self._SUBTREE if subtree else self._EXACT] = rule
+
+    @staticmethod
+    def _segments(path: str) -> list[str]:
+        return [segment for segment in path.split("/") if segment]
+
+    def match(self, path: str) -> CacheRule | None:
+        node = self._root
+        best = node.get(self._SUBTREE)
+        for segment in self._segments(path):
+            node = node.get(segment)
+            if node is None:
+                return best
+            best = node.get(self._SUBTREE, best)
+        return node.get(self._EXACT, best)
+
+
+class CacheControlMiddleware:
+    """Set Cache-Control on matching GET responses; optionally answer If-None-Match.
+
+    For rules with ``etag=True`` a successful response body is buffered
+    (these are small JSON payloads) and hashed into a weak ETag. A request
+    whose If-None-Match already holds that tag gets an empty 304. The
+    handler still runs; only the transfer is saved. Responses that set
+    their own ETag are left alone.
+    """
+
+    def __init__(self, app: ASGIApp, rules: Mapping[str, CacheRule]) -> None:
+        self.app = app
+        self.rules = RuleTrie(rules)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] != "GET":
+            await self.app(scope, receive, send)
+            return
+        rule = self.rules.match(scope["path"])
+        if rule is None:
+            await self.app(scope, receive, send)
+            return
+
+        if not rule.etag:
+            async def send_with_cache_control(message: Message) -> None:
+                if message["type"] == "http.response.start":
+                    MutableHeaders(scope=message)["Cache-Control"] = rule.header
+                await send(message)
+
+            await self.app(scope, receive, send_with_cache_control)
+            return
+
+        if_none_match = Headers(scope=scope).get("if-none-match")
+        start: Message | None = None
+        passthrough = False
+        chunks: list[bytes] = []
+
+        async def send_with_etag(message: Message) -> None:
+            nonlocal start, passthrough
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(scope=message)
+                headers["Cache-Control"] = rule.header
+                if message["status"] != 200 or "etag" in headers:
+                    passthrough = True
+                    await send(message)
+                else:
+                    start = message
+                return
+            if passthrough or message["type"] != "http.response.body":
+                await send(message)
+                return
+
+            chunks.append(message.get("body", b""))
+            if message.get("more_body", False):
+                return
+
+            body = b"".join(chunks)
+            etag = 'W/"' + hashlib.sha1(body, usedforsecurity=False).hexdigest() + '"'
+            headers = MutableHeaders(scope=start)
+            headers["ETag"] = etag
+            if if_none_match and _etag_matches(if_none_match, etag):
+                start["status"] = 304
+                del headers["content-length"]
+                del headers["content-type"]
+                body = b""
+            await send(start)
+            await send({"type": "http.response.body", "body": body})
+
+        await self.app(scope, receive, send_with_etag)
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    """Weak comparison (RFC 9110 §13.1.2): the W/ prefix is ignored on both sides."""
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == opaque for tag in if_none_match.split(","))
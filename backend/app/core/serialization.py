@@ -0,0 +1,68 @@
+"""Fast JSON encoding for hot responses, WebSocket frames and Redis payloads.
+
+``dumps`` / ``loads`` use orjson when it is installed and fall back to the
+standard library otherwise; both backends produce the same compact output
+for the types the app sends (``datetime`` and ``date`` as ISO 8601, ``UUID``
+and ``Decimal`` as strings, anything else through ``str``).
+
+Routes with a ``response_model`` (or a return annotation) are already
+validated and serialized to bytes by Pydantic's core and do not need this
+module. ``FastJSONResponse`` is for handlers that return a prebuilt,
+JSON-ready payload, such as one read back from a cache, and want to skip
+``jsonable_encoder``.
+"""
+
+import datetime
+import json
+from typing import Any
+
+from starlette.responses import JSONResponse
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - exercised only without orjson
+    orjson = None
+
+BACKEND = "orjson" if orjson is not None else "json"
+
+
+def _default(obj: Any) -> Any:
+    """Encode types the fast path does not handle natively."""
+    if isinstance(obj, (datetime.datetime, datetime.date, datetime.time)):
+        return obj.isoformat()
+    return str(obj)
+
+
+if orjson is not None:
+    _OPTIONS = orjson.OPT_NON_STR_KEYS
+
+    def dumps(obj: Any) -> bytes:
+        """Encode ``obj`` as compact UTF-8 JSON."""
+        return orjson.dumps(obj, default=_default, option=_OPTIONS)
+
+    def loads(data: str | bytes) -> Any:
+        """Decode JSON from ``str`` or ``bytes``. Raises ``ValueError`` if the input is invalid."""
+        return orjson.loads(data)
+
+else:
+
+    def dumps(obj: Any) -> bytes:
+        """Encode ``obj`` as compact UTF-8 JSON."""
+        return json.dumps(obj, default=_default, ensure_ascii=False, separators=(",", ":")).encode()
+
+    def loads(data: str | bytes) -> Any:
+        """Decode JSON from ``str`` or ``bytes``. Raises ``ValueError`` if the input is invalid."""
+        return json.loads(data)
+
+
+def dumps_str(obj: Any) -> str:
+    """``dumps`` decoded to ``str``, for text WebSocket frames."""
+    return dumps(obj).decode()
+
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse rendered with ``dumps``, which also accepts UUID, datetime and Decimal values."""
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
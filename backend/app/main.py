@@ -7,13 +7,15 @@ from fastapi.middleware.cors import CORSMiddleware
 from prometheus_fastapi_instrumentator import Instrumentator
 from slowapi import _rate_limit_exceeded_handler
 from slowapi.errors import RateLimitExceeded
-from starlette.middleware.base import BaseHTTPMiddleware
 from starlette.requests import Request
+from starlette.responses import JSONResponse
 
 from app.api.auth import limiter
 from app.api.router import api_router
 from app.api.social_ws import manager as ws_manager, router as social_ws_router
 from app.core.config import settings, validate_settings
+from app.core.middleware import CacheControlMiddleware, CacheRule, SecurityHeadersMiddleware
+from app.services.pagination import InvalidCursor
 from app.services.redis_client import close_redis, get_redis, ping_redis
 
 logger = logging.getLogger(__name__)
@@ -64,46 +66,18 @@ async def lifespan(app: FastAPI):
 
 
 # ---------------------------------------------------------------------------
-# Security headers middleware
+# Cache-Control rules (see app.core.middleware.RuleTrie for key syntax)
 # ---------------------------------------------------------------------------
 
-class SecurityHeadersMiddleware(BaseHTTPMiddleware):
-    async def dispatch(self, request: Request, call_next):
-        response = await call_next(request)
-        response.headers["X-Content-Type-Options"] = "nosniff"
-        response.headers["X-Frame-Options"] = "DENY"
-        response.headers["X-XSS-Protection"] = "1; mode=block"
-        response.headers["Strict-Transport-Security"] = "max-age=31536000; includeSubDomains"
-        response.headers["Referrer-Policy"] = "strict-origin-when-cross-origin"
-        response.headers["Permissions-Policy"] = "camera=(), microphone=(), geolocation=()"
-        return response
-
-
-# ---------------------------------------------------------------------------
-# Cache-Control headers middleware
-# ---------------------------------------------------------------------------
-
-CACHE_CONTROL_RULES: dict[str, str] = {
-    "/api/shop/products": "public, max-age=300",
-    "/api/giphy/trending": "public, max-age=600",
-    "/api/insights/overview": "public, max-age=30",
-    "/api/governance/proposals": "public, max-age=60",
-    "/api/social/channels": "private, max-age=60",
+CACHE_CONTROL_RULES: dict[str, CacheRule] = {
+    "/api/shop/products": CacheRule("public, max-age=300", etag=True),
+    "/api/giphy/trending": CacheRule("public, max-age=600", etag=True),
+    "/api/insights/overview": CacheRule("public, max-age=30", etag=True),
+    "/api/governance/proposals": CacheRule("public, max-age=60", etag=True),
+    "/api/social/channels": CacheRule("private, max-age=60", etag=True),
 }
 
 
-class CacheControlMiddleware(BaseHTTPMiddleware):
-    async def dispatch(self, request: Request, call_next):
-        response = await call_next(request)
-        if request.method == "GET":
-            path = request.url.path
-            for prefix, header in CACHE_CONTROL_RULES.items():
-                if path == prefix or path.startswith(prefix + "?"):
-                    response.headers["Cache-Control"] = header
-                    break
-        return response
-
-
 # ---------------------------------------------------------------------------
 # App
 # ---------------------------------------------------------------------------
@@ -113,6 +87,13 @@ app = FastAPI(title="BlakJaks Platform", version="0.1.0", lifespan=lifespan)
 app.state.limiter = limiter
 app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
 
+
+@app.exception_handler(InvalidCursor)
+async def _invalid_cursor_handler(request: Request, exc: InvalidCursor) -> JSONResponse:
+    # Raised by paginate() for any keyset-paginated listing
+    return JSONResponse(status_code=400, content={"detail": str(exc)})
+
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=settings.CORS_ORIGINS,
@@ -121,7 +102,7 @@ app.add_middleware(
     allow_headers=["*"],
 )
 app.add_middleware(SecurityHeadersMiddleware)
-app.add_middleware(CacheControlMiddleware)
+app.add_middleware(CacheControlMiddleware, rules=CACHE_CONTROL_RULES)
 
 app.include_router(api_router)
 app.include_router(social_ws_router)
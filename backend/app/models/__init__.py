@@ -13,6 +13,7 @@ from app.models.message import Message
 from app.models.affiliate import Affiliate
 from app.models.comp_pool import CompPool
 from app.models.notification import Notification
+from app.models.notification_outbox import NotificationOutbox
 from app.models.cart_item import CartItem
 from app.models.device_token import DeviceToken
 from app.models.message_reaction import MessageReaction
@@ -20,6 +21,7 @@ from app.models.chat_mute import ChatMute
 from app.models.chat_report import ChatReport
 from app.models.affiliate_chip import AffiliateChip
 from app.models.affiliate_payout import AffiliatePayout
+from app.models.affiliate_pool_share import AffiliatePoolShare
 from app.models.sunset_status import SunsetStatus
 from app.models.vote import Vote
 from app.models.vote_ballot import VoteBallot
@@ -34,6 +36,14 @@ from app.models.tier_history import TierHistory
 from app.models.social_message_translation import SocialMessageTranslation
 from app.models.channel_tier_access import ChannelTierAccess
 from app.models.saved_emote import SavedEmote
+from app.models.comp_rollup import CompRollup
+from app.models.comp_recipient import CompRecipient
+from app.models.rollup_watermark import RollupWatermark
+from app.models.guaranteed_comp_run import GuaranteedCompRun
+from app.models.referral_stats import ReferralStats
+from app.models.affiliate_stats import AffiliateStats
+from app.models.wallet_ledger_entry import WalletLedgerEntry
+from app.models.qr_mint_job import QRMintJob
 
 __all__ = [
     "Base",
@@ -51,6 +61,7 @@ __all__ = [
     "Affiliate",
     "CompPool",
     "Notification",
+    "NotificationOutbox",
     "CartItem",
     "DeviceToken",
     "MessageReaction",
@@ -58,6 +69,7 @@ __all__ = [
     "ChatReport",
     "AffiliateChip",
     "AffiliatePayout",
+    "AffiliatePoolShare",
     "SunsetStatus",
     "Vote",
     "VoteBallot",
@@ -72,4 +84,12 @@ __all__ = [
     "SocialMessageTranslation",
     "ChannelTierAccess",
     "SavedEmote",
+    "CompRollup",
+    "CompRecipient",
+    "RollupWatermark",
+    "GuaranteedCompRun",
+    "ReferralStats",
+    "AffiliateStats",
+    "WalletLedgerEntry",
+    "QRMintJob",
 ]
@@ -1,7 +1,7 @@
 import uuid
 from datetime import datetime
 
-from sqlalchemy import Boolean, DateTime, ForeignKey, text
+from sqlalchemy import Boolean, DateTime, ForeignKey, Index, String, text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -18,13 +18,33 @@ class AffiliateChip(UUIDPrimaryKey, TimestampMixin, Base):
         UUID(as_uuid=True), ForeignKey("users.id"), nullable=False, index=True
     )
     source_scan_id: Mapped[uuid.UUID] = mapped_column(
-        UUID(as_uuid=True), ForeignKey("scans.id"), nullable=False, index=True
-    )
+        UUID(as_uuid=True), nullable=False, index=True
+    )  # no FK: scans is partitioned by quarter and keyed on (id, created_at)
     is_vaulted: Mapped[bool] = mapped_column(Boolean, server_default=text("false"), nullable=False)
     vault_date: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
     vault_expiry: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
     is_expired: Mapped[bool] = mapped_column(Boolean, server_default=text("false"), nullable=False)
+    # "YYYY-MM" for chips minted by the monthly vault bonus job, NULL for scan chips
+    bonus_month: Mapped[str | None] = mapped_column(String(7), nullable=True)
 
     affiliate = relationship("Affiliate")
     source_user = relationship("User")
-    source_scan = relationship("Scan")
+    source_scan = relationship(
+        "Scan", primaryjoin="foreign(AffiliateChip.source_scan_id) == Scan.id", viewonly=True
+    )
+
+    __table_args__ = (
+        # Vault bonus job: which affiliates already got this month's bonus
+        Index(
+            "ix_affiliate_chips_affiliate_bonus_month",
+            "affiliate_id",
+            "bonus_month",
+            postgresql_where=text("bonus_month IS NOT NULL"),
+        ),
+        # Vault expiry job: live vaulted chips by expiry date
+        Index(
+            "ix_affiliate_chips_vault_expiry",
+            "vault_expiry",
+            postgresql_where=text("is_vaulted AND NOT is_expired"),
+        ),
+    )
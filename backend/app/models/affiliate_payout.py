@@ -2,7 +2,7 @@ import uuid
 from datetime import datetime
 from decimal import Decimal
 
-from sqlalchemy import DateTime, ForeignKey, Numeric, String, text
+from sqlalchemy import DateTime, ForeignKey, Index, Numeric, String, text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -25,3 +25,17 @@ class AffiliatePayout(UUIDPrimaryKey, TimestampMixin, Base):
     tx_hash: Mapped[str | None] = mapped_column(String(100), nullable=True)
 
     affiliate = relationship("Affiliate")
+
+    __table_args__ = (
+        # One pool share per affiliate per week — backstop for the weekly payout job
+        Index(
+            "uq_affiliate_payouts_pool_share_week",
+            "affiliate_id",
+            "period_start",
+            unique=True,
+            postgresql_where=text("payout_type = 'pool_share'"),
+            sqlite_where=text("payout_type = 'pool_share'"),
+        ),
+        # Keyset order for an affiliate's payout history
+        Index("ix_affiliate_payouts_affiliate_created_at_id", "affiliate_id", "created_at", "id"),
+    )
@@ -0,0 +1,28 @@
+import uuid
+from datetime import datetime
+
+from sqlalchemy import DateTime, ForeignKey, Integer, UniqueConstraint
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.base import Base, TimestampMixin, UUIDPrimaryKey
+
+
+class AffiliatePoolShare(UUIDPrimaryKey, TimestampMixin, Base):
+    """One affiliate's chip count for a weekly pool, frozen when the payout starts.
+
+    Every chunk of the payout, and any resumed run, divides the pool by
+    these counts, so shares cannot move while the week is being paid.
+    """
+
+    __tablename__ = "affiliate_pool_shares"
+
+    period_start: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    affiliate_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), ForeignKey("affiliates.id"), nullable=False, index=True
+    )
+    chips: Mapped[int] = mapped_column(Integer, nullable=False)
+
+    __table_args__ = (
+        UniqueConstraint("period_start", "affiliate_id", name="uq_affiliate_pool_shares_week_affiliate"),
+    )
@@ -0,0 +1,21 @@
+import uuid
+
+from sqlalchemy import ForeignKey, Integer, text
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.base import Base, UpdateTimestampMixin, UUIDPrimaryKey
+
+
+class AffiliateStats(UUIDPrimaryKey, UpdateTimestampMixin, Base):
+    """Running lifetime counters for one affiliate, maintained as orders change."""
+
+    __tablename__ = "affiliate_stats"
+
+    affiliate_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), ForeignKey("affiliates.id"), nullable=False, unique=True
+    )
+    # Tins in live orders placed by referred members (drives the permanent tier)
+    referred_tins: Mapped[int] = mapped_column(
+        Integer, nullable=False, default=0, server_default=text("0")
+    )
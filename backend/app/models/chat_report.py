@@ -14,8 +14,8 @@ class ChatReport(UUIDPrimaryKey, TimestampMixin, Base):
         UUID(as_uuid=True), ForeignKey("users.id"), nullable=False, index=True
     )
     message_id: Mapped[uuid.UUID | None] = mapped_column(
-        UUID(as_uuid=True), ForeignKey("messages.id"), nullable=True, index=True
-    )
+        UUID(as_uuid=True), nullable=True, index=True
+    )  # no FK into partitioned messages; retention deletes reports with their month
     reported_user_id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True), ForeignKey("users.id"), nullable=False, index=True
     )
@@ -24,4 +24,4 @@ class ChatReport(UUIDPrimaryKey, TimestampMixin, Base):
 
     reporter = relationship("User", foreign_keys=[reporter_id])
     reported_user = relationship("User", foreign_keys=[reported_user_id])
-    message = relationship("Message")
+    message = relationship("Message", primaryjoin="foreign(ChatReport.message_id) == Message.id", viewonly=True)
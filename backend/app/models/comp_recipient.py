@@ -0,0 +1,19 @@
+import uuid
+from datetime import datetime
+
+from sqlalchemy import DateTime, ForeignKey
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.base import Base, UUIDPrimaryKey
+
+
+class CompRecipient(UUIDPrimaryKey, Base):
+    """First completed comp received by a member — one row per distinct recipient."""
+
+    __tablename__ = "comp_recipients"
+
+    user_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), ForeignKey("users.id"), nullable=False, unique=True
+    )
+    first_comped_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
@@ -0,0 +1,29 @@
+from datetime import datetime
+from decimal import Decimal
+
+from sqlalchemy import DateTime, Integer, Numeric, String, UniqueConstraint, text
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.base import Base, UUIDPrimaryKey
+
+
+class CompRollup(UUIDPrimaryKey, Base):
+    """Completed comp transactions aggregated per time bucket, type and amount bucket.
+
+    Rows are hourly while recent and compacted to one row per day (bucket_start
+    at midnight UTC) once the day is old. Maintained by ``comp_rollup_service``.
+    """
+
+    __tablename__ = "comp_rollups"
+
+    bucket_start: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    type: Mapped[str] = mapped_column(String(20), nullable=False)
+    amount_bucket: Mapped[str] = mapped_column(String(10), nullable=False)  # 0, 100, 1000, 10000, 200000
+    tx_count: Mapped[int] = mapped_column(Integer, nullable=False, server_default=text("0"))
+    amount_total: Mapped[Decimal] = mapped_column(
+        Numeric(18, 2), nullable=False, server_default=text("0")
+    )
+
+    __table_args__ = (
+        UniqueConstraint("bucket_start", "type", "amount_bucket", name="uq_comp_rollups_bucket"),
+    )
@@ -0,0 +1,37 @@
+import uuid
+from datetime import datetime
+from decimal import Decimal
+
+from sqlalchemy import DateTime, Integer, Numeric, String, Text, text
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.base import Base, TimestampMixin, UUIDPrimaryKey
+
+
+class GuaranteedCompRun(UUIDPrimaryKey, TimestampMixin, Base):
+    """One monthly guaranteed comp run — checkpoint and report.
+
+    ``last_user_id`` is the upper bound of the last committed user id chunk,
+    so an interrupted run resumes where it stopped.
+    """
+
+    __tablename__ = "guaranteed_comp_runs"
+
+    month: Mapped[str] = mapped_column(String(7), nullable=False, unique=True)  # e.g. "2026-03"
+    status: Mapped[str] = mapped_column(
+        String(20), nullable=False, default="running", server_default=text("'running'")
+    )  # running | completed | failed
+    last_user_id: Mapped[uuid.UUID | None] = mapped_column(UUID(as_uuid=True), nullable=True)
+    chunks: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default=text("0"))
+    users_scanned: Mapped[int] = mapped_column(
+        Integer, nullable=False, default=0, server_default=text("0")
+    )
+    comps_awarded: Mapped[int] = mapped_column(
+        Integer, nullable=False, default=0, server_default=text("0")
+    )
+    amount_awarded: Mapped[Decimal] = mapped_column(
+        Numeric(18, 2), nullable=False, default=Decimal("0"), server_default=text("0")
+    )
+    last_error: Mapped[str | None] = mapped_column(Text, nullable=True)
+    finished_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
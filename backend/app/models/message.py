@@ -1,18 +1,41 @@
 import uuid
+from datetime import datetime
 
-from sqlalchemy import BigInteger, Boolean, ForeignKey, Index, String, Text, text
+from sqlalchemy import BigInteger, Boolean, DateTime, ForeignKey, Index, String, text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
-from app.models.base import Base, TimestampMixin, UUIDPrimaryKey
+from app.models.base import Base
 
 
-class Message(UUIDPrimaryKey, TimestampMixin, Base):
+class Message(Base):
+    """A chat message.
+
+    The table is range-partitioned by month on created_at (migration 043,
+    app.services.message_partitions), so its primary key is (id,
+    created_at). The mapper still identifies rows by id alone, and nothing
+    holds a foreign key to messages: partitions are dropped whole at the
+    end of the retention window.
+    """
+
     __tablename__ = "messages"
     __table_args__ = (
         Index("ix_messages_channel_sequence", "channel_id", "sequence"),
+        {"postgresql_partition_by": "RANGE (created_at)"},
     )
 
+    id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        primary_key=True,
+        server_default=text("gen_random_uuid()"),
+        default=uuid.uuid4,
+    )
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        primary_key=True,
+        server_default=text("now()"),
+        nullable=False,
+    )
     channel_id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True), ForeignKey("channels.id"), nullable=False, index=True
     )
@@ -23,13 +46,24 @@ class Message(UUIDPrimaryKey, TimestampMixin, Base):
     sequence: Mapped[int | None] = mapped_column(BigInteger, nullable=True)
     original_language: Mapped[str | None] = mapped_column(String(10), nullable=True)
     reply_to_id: Mapped[uuid.UUID | None] = mapped_column(
-        UUID(as_uuid=True), ForeignKey("messages.id"), nullable=True, index=True
-    )
+        UUID(as_uuid=True), nullable=True, index=True
+    )  # may outlive its target once the target's month is dropped
     is_system: Mapped[bool] = mapped_column(Boolean, server_default=text("false"), nullable=False)
     is_pinned: Mapped[bool] = mapped_column(Boolean, server_default=text("false"), nullable=False)
     is_deleted: Mapped[bool] = mapped_column(Boolean, server_default=text("false"), nullable=False)
 
+    __mapper_args__ = {"primary_key": [id]}
+
     channel = relationship("Channel", back_populates="messages")
     user = relationship("User", back_populates="messages")
-    reply_to = relationship("Message", remote_side="Message.id", foreign_keys=[reply_to_id])
-    reactions = relationship("MessageReaction", back_populates="message", cascade="all, delete-orphan")
+    reply_to = relationship(
+        "Message",
+        primaryjoin="foreign(Message.reply_to_id) == remote(Message.id)",
+        viewonly=True,
+    )
+    reactions = relationship(
+        "MessageReaction",
+        primaryjoin="Message.id == foreign(MessageReaction.message_id)",
+        back_populates="message",
+        cascade="all, delete-orphan",
+    )
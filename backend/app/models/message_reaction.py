@@ -1,25 +1,49 @@
 import uuid
+from datetime import datetime
 
-from sqlalchemy import ForeignKey, String, UniqueConstraint
+from sqlalchemy import DateTime, ForeignKey, String, UniqueConstraint, text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
-from app.models.base import Base, TimestampMixin, UUIDPrimaryKey
+from app.models.base import Base
 
 
-class MessageReaction(UUIDPrimaryKey, TimestampMixin, Base):
+class MessageReaction(Base):
+    """An emoji reaction, partitioned alongside its message.
+
+    message_created_at copies the message's partition key, so a reaction
+    lives in the same month as its message and is dropped with it.
+    """
+
     __tablename__ = "message_reactions"
     __table_args__ = (
-        UniqueConstraint("message_id", "user_id", "emoji", name="uq_reaction_per_user"),
+        UniqueConstraint("message_id", "user_id", "emoji", "message_created_at", name="uq_reaction_per_user"),
+        {"postgresql_partition_by": "RANGE (message_created_at)"},
     )
 
-    message_id: Mapped[uuid.UUID] = mapped_column(
-        UUID(as_uuid=True), ForeignKey("messages.id", ondelete="CASCADE"), nullable=False, index=True
+    id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        primary_key=True,
+        server_default=text("gen_random_uuid()"),
+        default=uuid.uuid4,
+    )
+    message_created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), primary_key=True)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        server_default=text("now()"),
+        nullable=False,
     )
+    message_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), nullable=False, index=True)
     user_id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True), ForeignKey("users.id"), nullable=False, index=True
     )
     emoji: Mapped[str] = mapped_column(String(50), nullable=False)
 
-    message = relationship("Message", back_populates="reactions")
+    __mapper_args__ = {"primary_key": [id]}
+
+    message = relationship(
+        "Message",
+        primaryjoin="foreign(MessageReaction.message_id) == Message.id",
+        back_populates="reactions",
+    )
     user = relationship("User")
@@ -1,6 +1,6 @@
 import uuid
 
-from sqlalchemy import Boolean, ForeignKey, String, Text, text
+from sqlalchemy import Boolean, ForeignKey, Index, String, Text, text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -9,6 +9,10 @@ from app.models.base import Base, TimestampMixin, UUIDPrimaryKey
 
 class Notification(UUIDPrimaryKey, TimestampMixin, Base):
     __tablename__ = "notifications"
+    __table_args__ = (
+        # Keyset order for a member's notification list
+        Index("ix_notifications_user_created_at_id", "user_id", "created_at", "id"),
+    )
 
     user_id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True), ForeignKey("users.id"), nullable=False, index=True
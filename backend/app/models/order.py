@@ -1,7 +1,7 @@
 import uuid
 from decimal import Decimal
 
-from sqlalchemy import ForeignKey, Numeric, String, Text
+from sqlalchemy import ForeignKey, Index, Numeric, String, Text
 from sqlalchemy.dialects.postgresql import JSONB, UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -10,6 +10,10 @@ from app.models.base import Base, UpdateTimestampMixin, UUIDPrimaryKey
 
 class Order(UUIDPrimaryKey, UpdateTimestampMixin, Base):
     __tablename__ = "orders"
+    __table_args__ = (
+        # Keyset order for a member's order history
+        Index("ix_orders_user_created_at_id", "user_id", "created_at", "id"),
+    )
 
     user_id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True), ForeignKey("users.id"), nullable=False, index=True
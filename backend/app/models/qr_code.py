@@ -1,7 +1,7 @@
 import uuid
 from datetime import datetime
 
-from sqlalchemy import Boolean, DateTime, ForeignKey, String, text
+from sqlalchemy import Boolean, DateTime, ForeignKey, Index, String, text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -10,6 +10,11 @@ from app.models.base import Base, TimestampMixin, UUIDPrimaryKey
 
 class QRCode(UUIDPrimaryKey, TimestampMixin, Base):
     __tablename__ = "qr_codes"
+    __table_args__ = (
+        # Keyset order for the admin QR code listing, unfiltered and per product
+        Index("ix_qr_codes_created_at_id", "created_at", "id"),
+        Index("ix_qr_codes_product_created_at_id", "product_id", "created_at", "id"),
+    )
 
     product_code: Mapped[str] = mapped_column(String(100), nullable=False, index=True)
     unique_id: Mapped[str] = mapped_column(String(255), unique=True, nullable=False, index=True)
@@ -22,6 +27,9 @@ class QRCode(UUIDPrimaryKey, TimestampMixin, Base):
         UUID(as_uuid=True), ForeignKey("users.id"), nullable=True, index=True
     )
     scanned_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    mint_job_id: Mapped[uuid.UUID | None] = mapped_column(
+        UUID(as_uuid=True), ForeignKey("qr_mint_jobs.id"), nullable=True, index=True
+    )  # set for codes minted by an asynchronous print-run job
 
     product = relationship("Product", back_populates="qr_codes")
     scanner = relationship("User", foreign_keys=[scanned_by])
@@ -0,0 +1,36 @@
+import uuid
+from datetime import datetime
+
+from sqlalchemy import DateTime, ForeignKey, Integer, String, Text, text
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.base import Base, UpdateTimestampMixin, UUIDPrimaryKey
+
+
+class QRMintJob(UUIDPrimaryKey, UpdateTimestampMixin, Base):
+    """One asynchronous QR code print run — request, progress and outcome.
+
+    ``minted`` is committed together with each chunk of codes, so a failed
+    job resumes from where it stopped. Each chunk commit also moves
+    ``updated_at``, which serves as the running job's heartbeat.
+    """
+
+    __tablename__ = "qr_mint_jobs"
+
+    product_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), ForeignKey("products.id"), nullable=False, index=True
+    )
+    product_code: Mapped[str] = mapped_column(String(100), nullable=False)
+    quantity: Mapped[int] = mapped_column(Integer, nullable=False)
+    minted: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default=text("0"))
+    collisions: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default=text("0"))
+    attempts: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default=text("0"))
+    status: Mapped[str] = mapped_column(
+        String(20), nullable=False, default="queued", server_default=text("'queued'")
+    )  # queued | running | completed | failed
+    requested_by: Mapped[uuid.UUID | None] = mapped_column(
+        UUID(as_uuid=True), ForeignKey("users.id"), nullable=True
+    )
+    last_error: Mapped[str | None] = mapped_column(Text, nullable=True)
+    finished_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
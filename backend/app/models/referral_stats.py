@@ -0,0 +1,24 @@
+import uuid
+from decimal import Decimal
+
+from sqlalchemy import ForeignKey, Integer, Numeric, text
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.base import Base, UpdateTimestampMixin, UUIDPrimaryKey
+
+
+class ReferralStats(UUIDPrimaryKey, UpdateTimestampMixin, Base):
+    """Running counters for one referred member, shown in their referrer's downline."""
+
+    __tablename__ = "referral_stats"
+
+    user_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), ForeignKey("users.id"), nullable=False, unique=True
+    )
+    scan_count: Mapped[int] = mapped_column(
+        Integer, nullable=False, default=0, server_default=text("0")
+    )
+    earnings_generated: Mapped[Decimal] = mapped_column(
+        Numeric(18, 2), nullable=False, default=Decimal("0"), server_default=text("0")
+    )
@@ -1,18 +1,45 @@
 import uuid
+from datetime import datetime
 from decimal import Decimal
 
-from sqlalchemy import ForeignKey, Integer, Numeric
+from sqlalchemy import DateTime, ForeignKey, Index, Integer, Numeric, text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
-from app.models.base import Base, TimestampMixin, UUIDPrimaryKey
+from app.models.base import Base
 
 
-class Scan(UUIDPrimaryKey, TimestampMixin, Base):
+class Scan(Base):
+    """One scanned tin.
+
+    The table is range-partitioned by calendar quarter on created_at
+    (migration 044, app.services.scan_partitions), with partition bounds
+    from tier.quarter_range, so quarterly tier counts read a single
+    partition. The primary key is (id, created_at); the mapper identifies
+    rows by id alone.
+    """
+
     __tablename__ = "scans"
+    __table_args__ = (
+        # Quarterly tier counts, streaks and the keyset order for a member's scan history
+        Index("ix_scans_user_created_at_id", "user_id", "created_at", "id"),
+        {"postgresql_partition_by": "RANGE (created_at)"},
+    )
 
+    id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        primary_key=True,
+        server_default=text("gen_random_uuid()"),
+        default=uuid.uuid4,
+    )
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        primary_key=True,
+        server_default=text("now()"),
+        nullable=False,
+    )
     user_id: Mapped[uuid.UUID] = mapped_column(
-        UUID(as_uuid=True), ForeignKey("users.id"), nullable=False, index=True
+        UUID(as_uuid=True), ForeignKey("users.id"), nullable=False
     )
     qr_code_id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True), ForeignKey("qr_codes.id"), nullable=False, index=True
@@ -21,5 +48,7 @@ class Scan(UUIDPrimaryKey, TimestampMixin, Base):
     tier_multiplier: Mapped[Decimal | None] = mapped_column(Numeric(4, 2), nullable=True)
     streak_day: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
 
+    __mapper_args__ = {"primary_key": [id]}
+
     user = relationship("User", back_populates="scans")
     qr_code = relationship("QRCode")
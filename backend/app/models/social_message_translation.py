@@ -1,7 +1,7 @@
 import uuid
 from datetime import datetime
 
-from sqlalchemy import DateTime, ForeignKey, String, Text, UniqueConstraint
+from sqlalchemy import DateTime, String, Text, UniqueConstraint
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column
 
@@ -12,8 +12,8 @@ class SocialMessageTranslation(UUIDPrimaryKey, Base):
     __tablename__ = "social_message_translations"
 
     message_id: Mapped[uuid.UUID] = mapped_column(
-        UUID(as_uuid=True), ForeignKey("messages.id"), nullable=False, index=True
-    )
+        UUID(as_uuid=True), nullable=False, index=True
+    )  # no FK: messages are dropped a month partition at a time
     language: Mapped[str] = mapped_column(String(5), nullable=False)  # ISO 639-1 e.g. "es"
     translated_text: Mapped[str] = mapped_column(Text, nullable=False)
     translated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
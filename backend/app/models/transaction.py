@@ -1,7 +1,7 @@
 import uuid
 from decimal import Decimal
 
-from sqlalchemy import ForeignKey, Numeric, String
+from sqlalchemy import ForeignKey, Index, Numeric, String
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -23,3 +23,12 @@ class Transaction(UUIDPrimaryKey, TimestampMixin, Base):
     payout_destination: Mapped[str | None] = mapped_column(String(10), nullable=True)
 
     user = relationship("User", back_populates="transactions")
+
+    __table_args__ = (
+        # Keyset order for the insights activity feed
+        Index("ix_transactions_created_at_id", "created_at", "id"),
+        # Per-user comp history for the monthly guaranteed comp job
+        Index("ix_transactions_user_type_created", "user_id", "type", "created_at"),
+        # Keyset order for a member's transaction history
+        Index("ix_transactions_user_created_at_id", "user_id", "created_at", "id"),
+    )
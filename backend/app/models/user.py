@@ -2,7 +2,7 @@ import uuid
 from datetime import date, datetime
 from decimal import Decimal
 
-from sqlalchemy import Boolean, Date, DateTime, ForeignKey, Numeric, String, Text, text
+from sqlalchemy import Boolean, Date, DateTime, ForeignKey, Index, Numeric, String, Text, text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -52,3 +52,10 @@ class User(UUIDPrimaryKey, UpdateTimestampMixin, Base):
     messages = relationship("Message", back_populates="user")
     affiliate = relationship("Affiliate", back_populates="user", uselist=False)
     notifications = relationship("Notification", back_populates="user")
+
+    __table_args__ = (
+        # Keyset order for the insights activity feed
+        Index("ix_users_created_at_id", "created_at", "id"),
+        # Keyset order for an affiliate's downline
+        Index("ix_users_referred_by_created_at_id", "referred_by", "created_at", "id"),
+    )
@@ -15,6 +15,8 @@ class Wallet(UUIDPrimaryKey, UpdateTimestampMixin, Base):
         UUID(as_uuid=True), ForeignKey("users.id"), unique=True, nullable=False, index=True
     )
     address: Mapped[str] = mapped_column(String(255), unique=True, nullable=False)
+    # Materialized snapshot of the wallet ledger; the live balance adds the
+    # wallet's unmaterialized wallet_ledger_entries (wallet_service.get_available_balance).
     balance_available: Mapped[Decimal] = mapped_column(
         Numeric(18, 2), nullable=False, server_default=text("0")
     )
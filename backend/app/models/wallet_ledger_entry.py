@@ -0,0 +1,51 @@
+import uuid
+from datetime import datetime
+from decimal import Decimal
+
+from sqlalchemy import DateTime, ForeignKey, Index, Numeric, String, text
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.base import Base, TimestampMixin, UUIDPrimaryKey
+
+
+class WalletLedgerEntry(UUIDPrimaryKey, TimestampMixin, Base):
+    """One append-only balance movement; the source of truth for wallet balances.
+
+    ``wallets.balance_available`` is a snapshot that the materializer advances
+    by folding in entries and stamping ``materialized_at``; the live balance is
+    the snapshot plus the wallet's unmaterialized entries.
+    """
+
+    __tablename__ = "wallet_ledger_entries"
+
+    wallet_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), ForeignKey("wallets.id"), nullable=False
+    )
+    amount: Mapped[Decimal] = mapped_column(Numeric(18, 2), nullable=False)  # credits > 0, debits < 0
+    entry_type: Mapped[str] = mapped_column(String(30), nullable=False)
+    reference_id: Mapped[uuid.UUID | None] = mapped_column(
+        UUID(as_uuid=True), nullable=True
+    )  # scans.id or transactions.id that caused the movement
+    materialized_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+
+    __table_args__ = (
+        # Wallet history, newest first
+        Index("ix_wallet_ledger_entries_wallet_created", "wallet_id", "created_at"),
+        # Live-balance delta and the materializer's work queue
+        Index(
+            "ix_wallet_ledger_entries_unmaterialized",
+            "wallet_id",
+            postgresql_where=text("materialized_at IS NULL"),
+            sqlite_where=text("materialized_at IS NULL"),
+        ),
+        # A scan or transaction moves a given balance at most once
+        Index(
+            "uq_wallet_ledger_entries_reference",
+            "entry_type",
+            "reference_id",
+            unique=True,
+            postgresql_where=text("reference_id IS NOT NULL"),
+            sqlite_where=text("reference_id IS NOT NULL"),
+        ),
+    )
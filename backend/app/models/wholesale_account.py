@@ -2,7 +2,7 @@ import uuid
 from datetime import datetime
 from decimal import Decimal
 
-from sqlalchemy import DateTime, Numeric, String, Text
+from sqlalchemy import DateTime, Index, Numeric, String, Text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -11,6 +11,10 @@ from app.models.base import Base, TimestampMixin, UUIDPrimaryKey
 
 class WholesaleAccount(UUIDPrimaryKey, TimestampMixin, Base):
     __tablename__ = "wholesale_accounts"
+    __table_args__ = (
+        # Keyset order for the admin wholesale account list
+        Index("ix_wholesale_accounts_created_at_id", "created_at", "id"),
+    )
 
     user_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), nullable=False, unique=True, index=True)
     business_name: Mapped[str] = mapped_column(String(255), nullable=False)
@@ -1,7 +1,7 @@
 import uuid
 from decimal import Decimal
 
-from sqlalchemy import ForeignKey, Integer, Numeric, String, Text
+from sqlalchemy import ForeignKey, Index, Integer, Numeric, String, Text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -10,6 +10,11 @@ from app.models.base import Base, TimestampMixin, UUIDPrimaryKey
 
 class WholesaleOrder(UUIDPrimaryKey, TimestampMixin, Base):
     __tablename__ = "wholesale_orders"
+    __table_args__ = (
+        # Keyset order for the admin and per-account wholesale order lists
+        Index("ix_wholesale_orders_created_at_id", "created_at", "id"),
+        Index("ix_wholesale_orders_account_created_at_id", "account_id", "created_at", "id"),
+    )
 
     account_id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True), ForeignKey("wholesale_accounts.id"), nullable=False, index=True
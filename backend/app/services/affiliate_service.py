@@ -2,24 +2,45 @@
 
 import logging
 import re
+import time
 import uuid
 from datetime import datetime, timedelta, timezone
 from decimal import Decimal
 
-from sqlalchemy import and_, func, select, update
+from sqlalchemy import (
+    DateTime,
+    Numeric,
+    and_,
+    column,
+    func,
+    insert,
+    literal,
+    select,
+    type_coerce,
+    update,
+    values,
+)
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
 
 from app.models.affiliate import Affiliate
 from app.models.affiliate_chip import AffiliateChip
 from app.models.affiliate_payout import AffiliatePayout
+from app.models.affiliate_pool_share import AffiliatePoolShare
+from app.models.affiliate_stats import AffiliateStats
+from app.models.comp_pool import CompPool
 from app.models.order import Order
 from app.models.order_item import OrderItem
-from app.models.scan import Scan
+from app.models.referral_stats import ReferralStats
 from app.models.sunset_status import SunsetStatus
 from app.models.tier import Tier
+from app.models.transaction import Transaction
 from app.models.user import User
-from app.models.wallet import Wallet
+from app.services.bootstrap_service import invalidate_bootstrap
+from app.services.pagination import TotalMode, paginate
 from app.services.tier import TIER_ORDER
+from app.services.wallet_service import credit_wallets
 
 logger = logging.getLogger(__name__)
 
@@ -32,6 +53,17 @@ PERMANENT_TIER_THRESHOLDS = [
 
 AFFILIATE_MATCH_RATE = Decimal("0.21")
 
+# Orders whose tins count towards the referrer's permanent tier
+REFERRED_TIN_ORDER_STATUSES = ("completed", "shipped", "delivered", "pending")
+
+# Vaulted chips needed per monthly bonus chip
+VAULT_BONUS_RATIO = 5
+# Affiliates per bonus INSERT / chips per expiry UPDATE in the vault jobs
+VAULT_JOB_CHUNK_SIZE = 5000
+
+# Affiliates credited per chunk (one commit each) in the weekly pool payout
+AFFILIATE_PAYOUT_CHUNK_SIZE = 1000
+
 
 # ── Core affiliate CRUD ──────────────────────────────────────────────
 
@@ -67,6 +99,8 @@ async def get_or_create_affiliate(db: AsyncSession, user_id: uuid.UUID) -> Affil
         referral_code=code,
     )
     db.add(affiliate)
+    await db.flush()
+    db.add(AffiliateStats(affiliate_id=affiliate.id))
     await db.commit()
     await db.refresh(affiliate)
 
@@ -141,6 +175,7 @@ async def attribute_referral(db: AsyncSession, new_user_id: uuid.UUID, referral_
 
     user.referred_by = affiliate.user_id
     affiliate.referred_count += 1
+    db.add(ReferralStats(user_id=user.id))
     await db.commit()
 
     logger.info("Referral attributed: user %s -> affiliate %s (code: %s)",
@@ -219,6 +254,7 @@ async def process_reward_match(
 
     # Update affiliate lifetime earnings
     affiliate.lifetime_earnings += match_amount
+    await record_referral_earnings(db, recipient_user_id, match_amount)
 
     await db.commit()
     await db.refresh(payout)
@@ -229,52 +265,81 @@ async def process_reward_match(
 
 
 async def get_downline(
-    db: AsyncSession, affiliate_id: uuid.UUID, page: int = 1, per_page: int = 20
+    db: AsyncSession,
+    affiliate_id: uuid.UUID,
+    page: int = 1,
+    per_page: int = 20,
+    cursor: str | None = None,
 ) -> dict:
-    """Paginated list of referred members."""
+    """Referred members, newest first, with their scan and earnings counters.
+
+    One query joins the referred users to their referral_stats counters and
+    tier. Pass ``cursor`` (the previous page's ``next_cursor``) for keyset
+    paging; ``page`` alone still works through OFFSET for older clients.
+
+    Raises:
+        InvalidCursor: if *cursor* is malformed.
+    """
     aff_result = await db.execute(select(Affiliate).where(Affiliate.id == affiliate_id))
     affiliate = aff_result.scalar_one_or_none()
     if not affiliate:
-        return {"items": [], "total": 0, "page": page, "per_page": per_page}
+        return {"items": [], "total": 0, "page": page, "per_page": per_page, "next_cursor": None}
 
-    base = select(User).where(User.referred_by == affiliate.user_id)
+    query = (
+        select(
+            User.id,
+            User.first_name,
+            User.created_at,
+            Tier.name.label("tier"),
+            func.coalesce(ReferralStats.scan_count, 0).label("total_scans"),
+            func.coalesce(ReferralStats.earnings_generated, Decimal("0")).label("earnings_generated"),
+        )
+        .outerjoin(ReferralStats, ReferralStats.user_id == User.id)
+        .outerjoin(Tier, Tier.id == User.tier_id)
+        .where(User.referred_by == affiliate.user_id)
+    )
+    # referred_count is maintained by attribute_referral, so no COUNT(*) per page.
+    result = await paginate(
+        db, query, (User.created_at.desc(), User.id.desc()),
+        page=page, per_page=per_page, cursor=cursor, total="none",
+    )
+    result["total"] = affiliate.referred_count
+    result["items"] = [
+        {
+            "user_id": row.id,
+            "username": row.first_name or "User",
+            "tier": row.tier,
+            "total_scans": row.total_scans,
+            "earnings_generated": row.earnings_generated,
+            "joined_at": row.created_at,
+        }
+        for row in result["items"]
+    ]
+    return result
 
-    # Count
-    count_result = await db.execute(select(func.count()).select_from(base.subquery()))
-    total = count_result.scalar_one()
 
-    # Paginated
-    result = await db.execute(
-        base.order_by(User.created_at.desc())
-        .offset((page - 1) * per_page)
-        .limit(per_page)
+async def record_referral_scan(db: AsyncSession, user_id: uuid.UUID) -> None:
+    """Bump a referred member's downline scan counter (no-op for unreferred members).
+
+    Does not commit; runs inside the caller's scan transaction.
+    """
+    await db.execute(
+        update(ReferralStats)
+        .where(ReferralStats.user_id == user_id)
+        .values(scan_count=ReferralStats.scan_count + 1)
     )
-    users = result.scalars().all()
 
-    items = []
-    for u in users:
-        # Count scans
-        scan_count_result = await db.execute(
-            select(func.count()).select_from(Scan).where(Scan.user_id == u.id)
-        )
-        scan_count = scan_count_result.scalar_one()
-
-        # Get tier name
-        tier_name = None
-        if u.tier_id:
-            tier_result = await db.execute(select(Tier.name).where(Tier.id == u.tier_id))
-            tier_name = tier_result.scalar_one_or_none()
-
-        items.append({
-            "user_id": u.id,
-            "username": u.first_name or "User",
-            "tier": tier_name,
-            "total_scans": scan_count,
-            "earnings_generated": Decimal("0"),  # TODO: sum affiliate matches from this user
-            "joined_at": u.created_at,
-        })
 
-    return {"items": items, "total": total, "page": page, "per_page": per_page}
+async def record_referral_earnings(db: AsyncSession, user_id: uuid.UUID, amount: Decimal) -> None:
+    """Add an affiliate match generated by a referred member to their downline counter.
+
+    Does not commit; runs inside the caller's reward-match transaction.
+    """
+    await db.execute(
+        update(ReferralStats)
+        .where(ReferralStats.user_id == user_id)
+        .values(earnings_generated=ReferralStats.earnings_generated + amount)
+    )
 
 
 # ── Chips ────────────────────────────────────────────────────────────
@@ -347,64 +412,172 @@ async def unvault_chips(db: AsyncSession, affiliate_id: uuid.UUID, chip_ids: lis
     return result.rowcount
 
 
-async def process_vault_bonuses(db: AsyncSession) -> int:
-    """Batch job: for every 5 vaulted chips, generate 1 bonus chip per month.
-    Returns count of bonus chips created.
+def _vault_bonus_insert(month: str, after_id: uuid.UUID | None, upto_id: uuid.UUID):
+    """INSERT ... SELECT minting this month's bonus chips for affiliates in (after_id, upto_id].
+
+    Each affiliate gets ``vaulted // VAULT_BONUS_RATIO`` chips, fanned out by a
+    recursive number series and pointing at the affiliate's oldest scan chip
+    as their source. Affiliates that already hold a chip for ``month`` are
+    skipped.
     """
-    # Get all affiliates with vaulted chips
-    result = await db.execute(
+    vaulted = (
         select(
             AffiliateChip.affiliate_id,
-            func.count(AffiliateChip.id).label("vaulted_count"),
+            (func.count(AffiliateChip.id) / VAULT_BONUS_RATIO).label("bonuses_due"),
+        )
+        .where(
+            AffiliateChip.is_vaulted == True,  # noqa: E712
+            AffiliateChip.is_expired == False,  # noqa: E712
+            AffiliateChip.affiliate_id <= upto_id,
         )
-        .where(AffiliateChip.is_vaulted == True, AffiliateChip.is_expired == False)  # noqa: E712
         .group_by(AffiliateChip.affiliate_id)
+        .having(func.count(AffiliateChip.id) >= VAULT_BONUS_RATIO)
+    )
+    if after_id is not None:
+        vaulted = vaulted.where(AffiliateChip.affiliate_id > after_id)
+    vaulted = vaulted.cte("vaulted")
+
+    series = select(literal(1).label("n")).cte("series", recursive=True)
+    series = series.union_all(
+        select(series.c.n + 1).where(
+            series.c.n < select(func.max(vaulted.c.bonuses_due)).scalar_subquery()
+        )
     )
-    rows = result.all()
-
-    bonus_count = 0
-    for aff_id, vaulted in rows:
-        bonuses_due = vaulted // 5
-        if bonuses_due <= 0:
-            continue
 
-        # Get any scan from this affiliate's referrals as a source reference
-        chip_result = await db.execute(
-            select(AffiliateChip).where(AffiliateChip.affiliate_id == aff_id).limit(1)
+    sample = aliased(AffiliateChip)
+    sample_id = (
+        select(AffiliateChip.id)
+        .where(
+            AffiliateChip.affiliate_id == vaulted.c.affiliate_id,
+            AffiliateChip.bonus_month.is_(None),
+        )
+        .order_by(AffiliateChip.created_at, AffiliateChip.id)
+        .limit(1)
+        .scalar_subquery()
+    )
+    already_minted = (
+        select(AffiliateChip.id)
+        .where(
+            AffiliateChip.affiliate_id == vaulted.c.affiliate_id,
+            AffiliateChip.bonus_month == month,
         )
-        sample_chip = chip_result.scalar_one_or_none()
-        if not sample_chip:
-            continue
-
-        for _ in range(bonuses_due):
-            bonus = AffiliateChip(
-                affiliate_id=aff_id,
-                source_user_id=sample_chip.source_user_id,
-                source_scan_id=sample_chip.source_scan_id,
+        .exists()
+    )
+    bonuses = (
+        select(
+            vaulted.c.affiliate_id,
+            sample.source_user_id,
+            sample.source_scan_id,
+            literal(month, AffiliateChip.bonus_month.type),
+        )
+        .select_from(
+            vaulted.join(sample, sample.id == sample_id).join(
+                series, series.c.n <= vaulted.c.bonuses_due
             )
-            db.add(bonus)
-            bonus_count += 1
+        )
+        .where(~already_minted)
+    )
+    return (
+        insert(AffiliateChip)
+        .from_select(
+            ["affiliate_id", "source_user_id", "source_scan_id", "bonus_month"],
+            bonuses,
+            include_defaults=False,
+        )
+        .returning(AffiliateChip.affiliate_id)
+    )
 
-    await db.commit()
-    logger.info("Vault bonuses processed: %d bonus chips created", bonus_count)
-    return bonus_count
 
+async def process_vault_bonuses(
+    db: AsyncSession,
+    now: datetime | None = None,
+    chunk_size: int = VAULT_JOB_CHUNK_SIZE,
+) -> dict:
+    """Monthly batch job: for every 5 vaulted chips, mint 1 bonus chip.
 
-async def expire_vaulted_chips(db: AsyncSession) -> int:
-    """Batch job: expire chips past 365 days vault expiry. Returns count expired."""
-    now = datetime.now(timezone.utc)
-    result = await db.execute(
-        update(AffiliateChip)
-        .where(
-            AffiliateChip.is_vaulted == True,  # noqa: E712
-            AffiliateChip.is_expired == False,  # noqa: E712
-            AffiliateChip.vault_expiry <= now,
+    Walks affiliates with at least 5 live vaulted chips in id order,
+    ``chunk_size`` at a time; each chunk is one set-based INSERT ... SELECT
+    and one commit, so no chip objects are built in memory. Bonus chips are
+    tagged with their month, which makes a re-run (or a resume after a
+    failure) mint nothing twice.
+
+    Returns a run report: month, chunks, affiliates, bonus_chips, duration_seconds.
+    """
+    now = now or datetime.now(timezone.utc)
+    month = now.strftime("%Y-%m")
+    started = time.monotonic()
+
+    report = {"month": month, "chunks": 0, "affiliates": 0, "bonus_chips": 0}
+    after_id = None
+    while True:
+        ids_query = (
+            select(AffiliateChip.affiliate_id)
+            .where(AffiliateChip.is_vaulted == True, AffiliateChip.is_expired == False)  # noqa: E712
+            .group_by(AffiliateChip.affiliate_id)
+            .having(func.count(AffiliateChip.id) >= VAULT_BONUS_RATIO)
+            .order_by(AffiliateChip.affiliate_id)
+            .limit(chunk_size)
         )
-        .values(is_expired=True)
-    )
-    await db.commit()
-    logger.info("Expired vaulted chips: %d", result.rowcount)
-    return result.rowcount
+        if after_id is not None:
+            ids_query = ids_query.where(AffiliateChip.affiliate_id > after_id)
+        chunk_ids = (await db.execute(ids_query)).scalars().all()
+        if not chunk_ids:
+            break
+
+        minted = (await db.execute(_vault_bonus_insert(month, after_id, chunk_ids[-1]))).scalars().all()
+        await db.commit()
+        after_id = chunk_ids[-1]
+        report["chunks"] += 1
+        report["affiliates"] += len(set(minted))
+        report["bonus_chips"] += len(minted)
+
+    report["duration_seconds"] = round(time.monotonic() - started, 3)
+    logger.info("Vault bonuses processed: %s", report)
+    return report
+
+
+async def expire_vaulted_chips(
+    db: AsyncSession,
+    now: datetime | None = None,
+    chunk_size: int = VAULT_JOB_CHUNK_SIZE,
+) -> dict:
+    """Batch job: expire chips past their 365-day vault expiry.
+
+    Expires at most ``chunk_size`` chips per UPDATE and commits between
+    chunks, keeping row locks and transaction size bounded.
+
+    Returns a run report: expired, chunks, duration_seconds.
+    """
+    now = now or datetime.now(timezone.utc)
+    started = time.monotonic()
+
+    report = {"expired": 0, "chunks": 0}
+    while True:
+        due = (
+            select(AffiliateChip.id)
+            .where(
+                AffiliateChip.is_vaulted == True,  # noqa: E712
+                AffiliateChip.is_expired == False,  # noqa: E712
+                AffiliateChip.vault_expiry <= now,
+            )
+            .limit(chunk_size)
+        )
+        result = await db.execute(
+            update(AffiliateChip)
+            .where(AffiliateChip.id.in_(due.scalar_subquery()))
+            .values(is_expired=True)
+            .execution_options(synchronize_session=False)
+        )
+        await db.commit()
+        if result.rowcount:
+            report["chunks"] += 1
+            report["expired"] += result.rowcount
+        if result.rowcount < chunk_size:
+            break
+
+    report["duration_seconds"] = round(time.monotonic() - started, 3)
+    logger.info("Expired vaulted chips: %s", report)
+    return report
 
 
 # ── Weekly pool distribution ─────────────────────────────────────────
@@ -443,37 +616,219 @@ async def calculate_weekly_pool_distribution(
     return distributions
 
 
-async def process_weekly_payout(db: AsyncSession, pool_amount: Decimal) -> list[AffiliatePayout]:
-    """Batch job: calculate shares, create pending payout records."""
-    distributions = await calculate_weekly_pool_distribution(db, pool_amount)
-
-    now = datetime.now(timezone.utc)
+def _iso_week(now: datetime) -> tuple[str, datetime, datetime]:
+    """Return (week key like "2026-W11", Monday 00:00 UTC, following Monday)."""
+    iso_year, iso_week, _ = now.isocalendar()
     week_start = (now - timedelta(days=now.weekday())).replace(
         hour=0, minute=0, second=0, microsecond=0
     )
-    week_end = week_start + timedelta(days=7)
-
-    payouts = []
-    for dist in distributions:
-        if dist["share_amount"] <= 0:
-            continue
-        payout = AffiliatePayout(
-            affiliate_id=dist["affiliate_id"],
-            amount=dist["share_amount"],
-            payout_type="pool_share",
-            period_start=week_start,
-            period_end=week_end,
-            status="pending",
-        )
-        db.add(payout)
-        payouts.append(payout)
+    return f"{iso_year}-W{iso_week:02d}", week_start, week_start + timedelta(days=7)
+
 
+async def _snapshot_pool_shares(db: AsyncSession, week_start: datetime, week_end: datetime) -> None:
+    """Freeze each affiliate's live chip count for the week, unless already frozen.
+
+    Counts unexpired chips minted before the week ends. A resumed run finds
+    the existing snapshot and pays from the same counts.
+    """
+    frozen = await db.scalar(
+        select(AffiliatePoolShare.id).where(AffiliatePoolShare.period_start == week_start).limit(1)
+    )
+    if frozen is not None:
+        return
+    await db.execute(
+        pg_insert(AffiliatePoolShare)
+        .from_select(
+            ["period_start", "affiliate_id", "chips"],
+            select(
+                literal(week_start, DateTime(timezone=True)),
+                AffiliateChip.affiliate_id,
+                func.count(AffiliateChip.id),
+            )
+            .where(AffiliateChip.is_expired == False, AffiliateChip.created_at < week_end)  # noqa: E712
+            .group_by(AffiliateChip.affiliate_id),
+            include_defaults=False,
+        )
+        .on_conflict_do_nothing(index_elements=["period_start", "affiliate_id"])
+    )
     await db.commit()
-    for p in payouts:
-        await db.refresh(p)
 
-    logger.info("Weekly payout batch created: %d payouts", len(payouts))
-    return payouts
+
+def _pool_share_query(
+    pool_amount: Decimal,
+    week_start: datetime,
+    after_affiliate_id: uuid.UUID | None,
+    limit: int,
+):
+    """Next ``limit`` unpaid affiliates for the week with their share computed in SQL.
+
+    Shares come from the week's frozen chip counts and are taken against
+    their total, so every chunk and a run resumed after a partial commit
+    divide the pool the same way.
+    """
+    week_shares = (
+        select(AffiliatePoolShare.affiliate_id, AffiliatePoolShare.chips)
+        .where(AffiliatePoolShare.period_start == week_start)
+        .cte("week_shares")
+    )
+    total_chips = select(func.sum(week_shares.c.chips)).scalar_subquery()
+    share = type_coerce(
+        func.round(week_shares.c.chips * literal(pool_amount, Numeric(18, 2)) / total_chips, 2),
+        Numeric(12, 2),
+    )
+    already_paid = (
+        select(AffiliatePayout.id)
+        .where(
+            AffiliatePayout.affiliate_id == week_shares.c.affiliate_id,
+            AffiliatePayout.payout_type == "pool_share",
+            AffiliatePayout.period_start == week_start,
+        )
+        .exists()
+    )
+    query = (
+        select(
+            week_shares.c.affiliate_id,
+            Affiliate.user_id,
+            week_shares.c.chips,
+            share.label("amount"),
+        )
+        .join(Affiliate, Affiliate.id == week_shares.c.affiliate_id)
+        .where(~already_paid)
+        .order_by(week_shares.c.affiliate_id)
+        .limit(limit)
+    )
+    if after_affiliate_id is not None:
+        query = query.where(week_shares.c.affiliate_id > after_affiliate_id)
+    return query
+
+
+async def _credit_pool_shares(
+    db: AsyncSession, shares: list, week_start: datetime, week_end: datetime
+) -> None:
+    """Apply one chunk of pool shares: wallet ledger credits, payout and transaction rows.
+
+    The ledger materializer folds the credits into wallet balances and
+    lifetime earnings.
+    """
+    await credit_wallets(db, [(row.user_id, row.amount) for row in shares], "affiliate_payout")
+
+    await db.execute(
+        insert(AffiliatePayout).values([
+            {
+                "affiliate_id": row.affiliate_id,
+                "amount": row.amount,
+                "payout_type": "pool_share",
+                "period_start": week_start,
+                "period_end": week_end,
+                "status": "paid",
+            }
+            for row in shares
+        ])
+    )
+    await db.execute(
+        insert(Transaction).values([
+            {
+                "user_id": row.user_id,
+                "type": "affiliate_payout",
+                "amount": row.amount,
+                "status": "completed",
+            }
+            for row in shares
+        ])
+    )
+
+
+async def process_weekly_payout(
+    db: AsyncSession,
+    pool_amount: Decimal,
+    now: datetime | None = None,
+    chunk_size: int = AFFILIATE_PAYOUT_CHUNK_SIZE,
+) -> dict:
+    """Batch job: pay each affiliate's chip share of the weekly pool.
+
+    Chip counts are frozen once per ISO week before the first chunk. Works
+    in chunks of ``chunk_size`` affiliates. Each chunk appends its wallet
+    ledger credits with one ``INSERT ... SELECT``, inserts its payout and
+    transaction rows with multi-row INSERTs and commits. Affiliates that
+    already have a pool_share payout for the week are skipped, so re-running
+    a week (or resuming a failed run) never pays anyone twice.
+    """
+    now = now or datetime.now(timezone.utc)
+    week_key, week_start, week_end = _iso_week(now)
+    await _snapshot_pool_shares(db, week_start, week_end)
+
+    report = {
+        "week": week_key,
+        "pool_amount": str(pool_amount),
+        "chunks": 0,
+        "affiliates_paid": 0,
+        "amount_paid": Decimal("0"),
+    }
+    after_affiliate_id = None
+    while True:
+        rows = (
+            await db.execute(_pool_share_query(pool_amount, week_start, after_affiliate_id, chunk_size))
+        ).all()
+        if not rows:
+            break
+        after_affiliate_id = rows[-1].affiliate_id
+
+        shares = [row for row in rows if row.amount > 0]
+        if shares:
+            await _credit_pool_shares(db, shares, week_start, week_end)
+            await db.commit()
+            await invalidate_bootstrap(*{row.user_id for row in shares})
+            report["chunks"] += 1
+            report["affiliates_paid"] += len(shares)
+            report["amount_paid"] += sum(row.amount for row in shares)
+
+    report["amount_paid"] = str(report["amount_paid"])
+    logger.info("Weekly payout %s: %d affiliates, total %s",
+                week_key, report["affiliates_paid"], report["amount_paid"])
+    return report
+
+
+async def run_weekly_pool_payout(
+    db: AsyncSession,
+    now: datetime | None = None,
+    chunk_size: int = AFFILIATE_PAYOUT_CHUNK_SIZE,
+) -> dict:
+    """Pay out this week's affiliate comp pool and record what was distributed.
+
+    The pool is the ``comp_pools`` row of type "affiliate" covering ``now``.
+    ``distributed_amount`` is recomputed from the week's pool_share payouts,
+    so it stays correct across re-runs.
+    """
+    now = now or datetime.now(timezone.utc)
+    week_key, week_start, _ = _iso_week(now)
+
+    result = await db.execute(
+        select(CompPool)
+        .where(
+            CompPool.type == "affiliate",
+            CompPool.period_start <= now,
+            CompPool.period_end > now,
+        )
+        .order_by(CompPool.period_start.desc())
+        .limit(1)
+        .with_for_update()
+    )
+    pool = result.scalar_one_or_none()
+    if pool is None:
+        logger.warning("No affiliate comp pool covers %s — skipping weekly payout", week_key)
+        return {"week": week_key, "status": "no_pool", "affiliates_paid": 0, "amount_paid": "0"}
+
+    report = await process_weekly_payout(db, pool.total_amount, now=now, chunk_size=chunk_size)
+
+    distributed = await db.execute(
+        select(func.coalesce(func.sum(AffiliatePayout.amount), Decimal("0"))).where(
+            AffiliatePayout.payout_type == "pool_share",
+            AffiliatePayout.period_start == week_start,
+        )
+    )
+    pool.distributed_amount = distributed.scalar_one()
+    await db.commit()
+    return {**report, "status": "completed", "distributed_amount": str(pool.distributed_amount)}
 
 
 async def approve_payout_batch(db: AsyncSession, batch_date: datetime | None = None) -> int:
@@ -501,46 +856,147 @@ async def execute_payouts(db: AsyncSession) -> int:
 
 
 async def get_payout_history(
-    db: AsyncSession, affiliate_id: uuid.UUID, page: int = 1, per_page: int = 20
+    db: AsyncSession,
+    affiliate_id: uuid.UUID,
+    page: int = 1,
+    per_page: int = 20,
+    cursor: str | None = None,
+    total: TotalMode = "exact",
 ) -> dict:
-    """Paginated payout history."""
+    """Paginated payout history, newest first (keyset with ``cursor``)."""
     base = select(AffiliatePayout).where(AffiliatePayout.affiliate_id == affiliate_id)
+    return await paginate(
+        db, base, (AffiliatePayout.created_at.desc(), AffiliatePayout.id.desc()),
+        page=page, per_page=per_page, cursor=cursor, total=total,
+    )
+
+
+# ── Permanent tier ───────────────────────────────────────────────────
+
+
+def _referred_tins_query():
+    """Lifetime tins in live orders by each affiliate's referrals, one row per affiliate."""
+    return (
+        select(
+            Affiliate.id.label("affiliate_id"),
+            func.coalesce(func.sum(OrderItem.quantity), 0).label("referred_tins"),
+        )
+        .outerjoin(User, User.referred_by == Affiliate.user_id)
+        .outerjoin(
+            Order,
+            and_(Order.user_id == User.id, Order.status.in_(REFERRED_TIN_ORDER_STATUSES)),
+        )
+        .outerjoin(OrderItem, OrderItem.order_id == Order.id)
+        .group_by(Affiliate.id)
+    )
 
-    count_result = await db.execute(select(func.count()).select_from(base.subquery()))
-    total = count_result.scalar_one()
 
+async def get_referred_tins_count(db: AsyncSession, affiliate_id: uuid.UUID) -> int:
+    """Count total tins purchased by all referrals (lifetime, for permanent tier).
+
+    Reads the affiliate_stats counter; an affiliate without a counter row yet
+    is counted from order history once and the row is upserted in the
+    caller's transaction (concurrent readers do not collide, and nothing is
+    committed on their behalf).
+    """
     result = await db.execute(
-        base.order_by(AffiliatePayout.created_at.desc())
-        .offset((page - 1) * per_page)
-        .limit(per_page)
+        select(AffiliateStats.referred_tins).where(AffiliateStats.affiliate_id == affiliate_id)
     )
-    items = result.scalars().all()
+    tins = result.scalar_one_or_none()
+    if tins is not None:
+        return tins
 
-    return {"items": items, "total": total, "page": page, "per_page": per_page}
+    result = await db.execute(_referred_tins_query().where(Affiliate.id == affiliate_id))
+    row = result.one_or_none()
+    if row is None:
+        return 0
+    await db.execute(
+        pg_insert(AffiliateStats)
+        .values(id=uuid.uuid4(), affiliate_id=affiliate_id, referred_tins=row.referred_tins)
+        .on_conflict_do_nothing(index_elements=["affiliate_id"])
+    )
+    return row.referred_tins
 
 
-# ── Permanent tier ───────────────────────────────────────────────────
+async def record_referred_tins(db: AsyncSession, buyer_id: uuid.UUID, tins: int) -> None:
+    """Add (or, with a negative ``tins``, remove) a referred member's tins from their affiliate's counter.
+
+    No-op for members without a referrer. Does not commit; runs inside the
+    caller's order transaction.
+    """
+    affiliate_id = (
+        select(Affiliate.id)
+        .join(User, User.referred_by == Affiliate.user_id)
+        .where(User.id == buyer_id)
+        .scalar_subquery()
+    )
+    await db.execute(
+        update(AffiliateStats)
+        .where(AffiliateStats.affiliate_id == affiliate_id)
+        .values(referred_tins=AffiliateStats.referred_tins + tins)
+        .execution_options(synchronize_session=False)
+    )
 
 
-async def get_referred_tins_count(db: AsyncSession, affiliate_id: uuid.UUID) -> int:
-    """Count total tins purchased by all referrals (lifetime, for permanent tier)."""
-    aff_result = await db.execute(select(Affiliate).where(Affiliate.id == affiliate_id))
-    affiliate = aff_result.scalar_one_or_none()
-    if not affiliate:
-        return 0
+async def reconcile_affiliate_stats(db: AsyncSession) -> dict:
+    """Recompute every affiliate's referred-tin counter from order history.
 
-    # Sum all order_items quantities for orders placed by referred users
-    result = await db.execute(
-        select(func.coalesce(func.sum(OrderItem.quantity), 0))
-        .join(Order, OrderItem.order_id == Order.id)
-        .where(
-            Order.user_id.in_(
-                select(User.id).where(User.referred_by == affiliate.user_id)
-            ),
-            Order.status.in_(["completed", "shipped", "delivered", "pending"]),
+    Used as the backfill for affiliates without a counter row and as the
+    nightly drift check. Only missing or mismatched rows are written.
+
+    The counter rows are locked before order history is recounted. An order
+    that already bumped a counter has committed by the time its lock is
+    granted, so the recount includes it; an order that has yet to bump one
+    waits for this commit and adds to the corrected value.
+
+    Returns {"affiliates_checked", "created", "repaired", "mismatches"}.
+    """
+    stored = {
+        row.affiliate_id: row.referred_tins
+        for row in (
+            await db.execute(
+                select(AffiliateStats.affiliate_id, AffiliateStats.referred_tins).with_for_update()
+            )
+        ).all()
+    }
+    actual = {row.affiliate_id: row.referred_tins for row in (await db.execute(_referred_tins_query())).all()}
+
+    missing = [aff_id for aff_id in actual if aff_id not in stored]
+    drifted = [
+        (aff_id, tins) for aff_id, tins in actual.items()
+        if aff_id in stored and stored[aff_id] != tins
+    ]
+
+    if missing:
+        await db.execute(
+            pg_insert(AffiliateStats)
+            .values([
+                {"affiliate_id": aff_id, "referred_tins": actual[aff_id]} for aff_id in missing
+            ])
+            .on_conflict_do_nothing(index_elements=["affiliate_id"])
         )
-    )
-    return result.scalar_one()
+    if drifted:
+        corrected = values(
+            column("affiliate_id", AffiliateStats.affiliate_id.type),
+            column("referred_tins", AffiliateStats.referred_tins.type),
+            name="corrected",
+        ).data(drifted)
+        await db.execute(
+            update(AffiliateStats)
+            .where(AffiliateStats.affiliate_id == corrected.c.affiliate_id)
+            .values(referred_tins=corrected.c.referred_tins)
+            .execution_options(synchronize_session=False)
+        )
+    await db.commit()
+
+    if drifted:
+        logger.warning("Affiliate stats drift repaired for %d affiliates", len(drifted))
+    return {
+        "affiliates_checked": len(actual),
+        "created": len(missing),
+        "repaired": len(drifted),
+        "mismatches": sorted(str(aff_id) for aff_id, _ in drifted),
+    }
 
 
 def check_permanent_tier(referred_tins: int) -> str | None:
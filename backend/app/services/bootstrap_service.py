@@ -0,0 +1,175 @@
+"""App-launch bootstrap payload: profile, wallet, unread count and active votes.
+
+The payload is assembled from two statements on one session:
+
+- one SELECT over users ⟕ tiers ⟕ wallets that carries the live wallet
+  balance as a correlated subquery
+- one SELECT of active votes' target tiers, counted against the member's
+  effective tier (which needs the tier service's own queries)
+
+The unread count comes from the Redis counter, as in get_unread_count; the
+notifications table is only counted when Redis is unavailable.
+
+The assembled payload is cached in Redis per user together with a strong
+ETag. Writes that change it drop the entry: profile edits, wallet credits
+and withdrawals, notification delivery and reads, and tier changes. Opening or
+closing a vote bumps a global generation instead, because it affects
+every member. Each drop also bumps the user's generation, and a rebuild
+that overlapped one is served but not cached, so a payload read before a
+write commits never outlives it. The TTL is only a safety net, e.g. for
+quarter rollovers, which change tiers without a write.
+"""
+
+import hashlib
+import json
+import logging
+import uuid
+from decimal import Decimal
+
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.notification import Notification
+from app.models.tier import Tier
+from app.models.user import User
+from app.models.wallet import Wallet
+from app.services.redis_service import (
+    cache_bootstrap,
+    get_cached_bootstrap,
+    get_unread_count as redis_get_unread_count,
+    invalidate_bootstrap as _invalidate_bootstrap,
+    invalidate_bootstrap_votes as _invalidate_bootstrap_votes,
+)
+
+logger = logging.getLogger(__name__)
+
+
+async def build_bootstrap_payload(db: AsyncSession, user_id: uuid.UUID) -> tuple[dict, bool]:
+    """Assemble the bootstrap payload from the database.
+
+    Returns:
+        (payload, complete) — ``complete`` is False when a section failed and
+        fell back to its empty value; such payloads are not cached.
+    """
+    from app.services.governance_service import _get_user_effective_tier, count_active_votes
+    from app.services.wallet_service import _live_balance
+
+    complete = True
+    profile = wallet = None
+    unread_count = active_vote_count = 0
+
+    try:
+        row = (
+            await db.execute(
+                select(
+                    User,
+                    Tier,
+                    Wallet.address,
+                    Wallet.balance_pending,
+                    _live_balance().label("balance_available"),
+                )
+                .outerjoin(Tier, Tier.id == User.tier_id)
+                .outerjoin(Wallet, Wallet.user_id == User.id)
+                .where(User.id == user_id)
+            )
+        ).one()
+        user, tier = row.User, row.Tier
+        profile = {
+            "id": str(user.id),
+            "email": user.email,
+            "first_name": user.first_name,
+            "last_name": user.last_name,
+            "username": user.username,
+            "avatar_url": user.avatar_url,
+            "tier": {"name": tier.name, "color": tier.color, "benefits": tier.benefits_json} if tier else None,
+        }
+        has_wallet = row.balance_available is not None
+        wallet = {
+            "address": row.address,
+            "balance_available": (
+                Decimal(row.balance_available).quantize(Decimal("0.01")) if has_wallet else Decimal("0")
+            ),
+            "balance_pending": row.balance_pending if has_wallet else Decimal("0"),
+            "comp_balance": user.comp_balance,
+        }
+    except Exception:
+        logger.exception("Bootstrap: failed to fetch profile and wallet")
+        complete = False
+
+    try:
+        unread_count = await redis_get_unread_count(str(user_id))
+    except Exception:
+        logger.debug("Redis unread count unavailable for user %s, using DB count", user_id)
+        try:
+            unread_count = await db.scalar(
+                select(func.count())
+                .select_from(Notification)
+                .where(Notification.user_id == user_id, Notification.is_read == False)  # noqa: E712
+            )
+        except Exception:
+            logger.exception("Bootstrap: failed to count unread notifications")
+            complete = False
+
+    try:
+        active_vote_count = await count_active_votes(db, await _get_user_effective_tier(db, user_id))
+    except Exception:
+        logger.exception("Bootstrap: failed to fetch active votes")
+        complete = False
+
+    payload = {
+        "user": profile,
+        "wallet": wallet,
+        "unread_notification_count": unread_count,
+        "active_vote_count": active_vote_count,
+    }
+    return jsonable_encoder(payload), complete
+
+
+def payload_etag(payload: dict) -> str:
+    """Strong ETag over the payload's canonical JSON."""
+    body = json.dumps(payload, sort_keys=True, separators=(",", ":"))
+    return '"' + hashlib.sha256(body.encode()).hexdigest()[:32] + '"'
+
+
+async def get_bootstrap(db: AsyncSession, user_id: uuid.UUID) -> tuple[dict, str]:
+    """Return (payload, ETag) from the cache, rebuilding it on a miss.
+
+    The rebuilt payload is cached only if neither the votes generation nor
+    the user's invalidation generation moved while it was being built.
+    """
+    generation = user_generation = None
+    try:
+        entry, generation, user_generation = await get_cached_bootstrap(str(user_id))
+        if entry is not None and entry["generation"] == generation:
+            return entry["payload"], entry["etag"]
+    except Exception:
+        logger.debug("Bootstrap cache unavailable for user %s, building from DB", user_id)
+
+    payload, complete = await build_bootstrap_payload(db, user_id)
+    etag = payload_etag(payload)
+    if complete and generation is not None:
+        try:
+            if not await cache_bootstrap(
+                str(user_id), {"generation": generation, "etag": etag, "payload": payload}, user_generation
+            ):
+                logger.debug("Bootstrap for user %s changed during rebuild, not cached", user_id)
+        except Exception:
+            logger.debug("Bootstrap payload not cached for user %s", user_id)
+    return payload, etag
+
+
+async def invalidate_bootstrap(*user_ids: uuid.UUID) -> None:
+    """Drop cached bootstrap payloads after a write that changes them. Never raises."""
+    try:
+        await _invalidate_bootstrap([str(user_id) for user_id in user_ids])
+    except Exception:
+        logger.debug("Bootstrap cache not invalidated for %d users", len(user_ids))
+
+
+async def invalidate_bootstrap_votes() -> None:
+    """Mark every cached bootstrap payload stale after a vote opens or closes. Never raises."""
+    try:
+        await _invalidate_bootstrap_votes()
+    except Exception:
+        logger.debug("Bootstrap votes generation not bumped")
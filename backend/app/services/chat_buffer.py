@@ -18,10 +18,10 @@ chat:spam:{user_id}                   — LIST   — Recent message content for
 
 from __future__ import annotations
 
-import json
 import logging
 import uuid
 
+from app.core.serialization import dumps, loads
 from app.services.redis_client import get_redis
 
 logger = logging.getLogger(__name__)
@@ -71,7 +71,7 @@ async def buffer_message(
     else:
         key = f"channel:{channel_id}:messages"
 
-    value = json.dumps(message_json, default=str)
+    value = dumps(message_json)
 
     async with redis.pipeline(transaction=True) as pipe:
         pipe.zadd(key, {value: sequence})
@@ -109,8 +109,8 @@ async def get_messages_after(
     messages = []
     for item in raw:
         try:
-            messages.append(json.loads(item))
-        except (json.JSONDecodeError, TypeError):
+            messages.append(loads(item))
+        except (ValueError, TypeError):
             logger.warning("Corrupt message in buffer key %s, skipping", key)
     return messages
 
@@ -15,6 +15,7 @@ from app.models.chat_mute import ChatMute
 from app.models.chat_report import ChatReport
 from app.models.message import Message
 from app.models.message_reaction import MessageReaction
+from app.models.social_message_translation import SocialMessageTranslation
 from app.models.tier import Tier
 from app.models.user import User
 from app.services.chat_buffer import (
@@ -23,6 +24,7 @@ from app.services.chat_buffer import (
     next_sequence,
     set_idempotency,
 )
+from app.services.message_partitions import month_bounds, retention_cutoff
 from app.services.redis_client import get_redis
 from app.services.tier import TIER_ORDER, get_user_tier_info
 
@@ -202,7 +204,13 @@ async def get_channel_messages(
 
     query = (
         select(Message)
-        .where(Message.channel_id == channel_id, Message.is_deleted == False)  # noqa: E712
+        .where(
+            Message.channel_id == channel_id,
+            Message.is_deleted == False,  # noqa: E712
+            # Bound the partition key so months past retention are pruned even
+            # before the nightly job drops them.
+            Message.created_at >= retention_cutoff(),
+        )
         .options(selectinload(Message.user), selectinload(Message.reactions).selectinload(MessageReaction.user))
         .order_by(Message.created_at.desc())
         .limit(limit)
@@ -414,7 +422,8 @@ async def add_reaction(db: AsyncSession, message_id: uuid.UUID, user_id: uuid.UU
     """Add an emoji reaction. Returns the reaction or error string."""
     # Check if message exists
     msg_result = await db.execute(select(Message).where(Message.id == message_id, Message.is_deleted == False))  # noqa: E712
-    if msg_result.scalar_one_or_none() is None:
+    msg = msg_result.scalar_one_or_none()
+    if msg is None:
         return "Message not found"
 
     # Check for duplicate
@@ -428,7 +437,9 @@ async def add_reaction(db: AsyncSession, message_id: uuid.UUID, user_id: uuid.UU
     if existing.scalar_one_or_none() is not None:
         return "Reaction already exists"
 
-    reaction = MessageReaction(message_id=message_id, user_id=user_id, emoji=emoji)
+    reaction = MessageReaction(
+        message_id=message_id, user_id=user_id, emoji=emoji, message_created_at=msg.created_at
+    )
     db.add(reaction)
     await db.commit()
     await db.refresh(reaction)
@@ -494,8 +505,16 @@ async def hard_delete_message(
 
     Returns the deleted Message object (for extracting channel_id and
     sequence) or None if the message was not found.
+
+    Nothing references messages through a cascading foreign key since the
+    table was partitioned, so reactions, translations and reports are
+    deleted here in the same transaction. The lookup is bounded by the
+    retention window and the deletes by the message's created_at, so they
+    prune to the partitions that can hold it.
     """
-    result = await db.execute(select(Message).where(Message.id == message_id))
+    result = await db.execute(
+        select(Message).where(Message.id == message_id, Message.created_at >= retention_cutoff())
+    )
     msg = result.scalar_one_or_none()
     if msg is None:
         return None
@@ -509,7 +528,17 @@ async def hard_delete_message(
         sequence=msg.sequence,
     )
 
-    await db.execute(delete(Message).where(Message.id == message_id))
+    await db.execute(
+        delete(MessageReaction).where(
+            MessageReaction.message_id == message_id, MessageReaction.message_created_at == msg.created_at
+        )
+    )
+    await db.execute(delete(SocialMessageTranslation).where(SocialMessageTranslation.message_id == message_id))
+    await db.execute(delete(ChatReport).where(ChatReport.message_id == message_id))
+    start, end = month_bounds(msg.created_at.date())
+    await db.execute(
+        delete(Message).where(Message.id == message_id, Message.created_at >= start, Message.created_at < end)
+    )
     await db.commit()
     return deleted_msg
 
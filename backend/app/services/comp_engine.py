@@ -29,24 +29,29 @@ Affiliate comps:
 """
 
 import logging
+import time
 import uuid
 from datetime import datetime, timedelta, timezone
 from decimal import Decimal
 
-from sqlalchemy import func, select
+from sqlalchemy import and_, case, func, insert, literal, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.models.affiliate import Affiliate
+from app.models.guaranteed_comp_run import GuaranteedCompRun
 from app.models.scan import Scan
 from app.models.transaction import Transaction
 from app.models.user import User
-from app.models.wallet import Wallet
+from app.services.affiliate_service import record_referral_earnings
 from app.services.blockchain import (
     AFFILIATE_POOL,
     COMPANY_RETAINED,
     CONSUMER_POOL,
     WHOLESALE_POOL,
 )
+from app.services.bootstrap_service import invalidate_bootstrap
+from app.services.comp_rollup_service import count_comp_recipients, sum_comp_amounts
+from app.services.notification_service import create_notification
+from app.services.wallet_service import credit_wallet
 
 logger = logging.getLogger(__name__)
 
@@ -73,6 +78,8 @@ GUARANTEED_COMP_AMOUNT = Decimal("5.00")
 GUARANTEED_COMP_TOTAL = Decimal("50.00")
 GUARANTEED_COMP_COUNT = 10
 FIRST_YEAR_DAYS = 365
+# Users per set-based INSERT ... SELECT in the monthly guaranteed comp job
+GUARANTEED_COMP_CHUNK_SIZE = 5000
 
 
 # ── Pool allocation math ──────────────────────────────────────────────
@@ -145,6 +152,58 @@ async def check_crypto_comp_milestone(db: AsyncSession, user_id: uuid.UUID) -> d
     return eligible
 
 
+async def find_crypto_comp_milestone(
+    db: AsyncSession, user_id: uuid.UUID, tier_name: str | None = None
+) -> dict | None:
+    """Return the milestone to award the user now, or None.
+
+    Same rule as check_crypto_comp_milestone, except a pending_choice comp of
+    the milestone's amount means it was already awarded. Pass tier_name when
+    the caller already has it; tiers below the first milestone cost no query.
+    """
+    if tier_name is None:
+        tier_name = await _get_user_tier_name(db, user_id)
+    if not _tier_at_least(tier_name, CRYPTO_MILESTONES[0]["min_tier"]):
+        return None
+
+    total_comps = await _get_total_comps_received(db, user_id)
+    milestone = next(
+        (m for m in CRYPTO_MILESTONES if _tier_at_least(tier_name, m["min_tier"]) and total_comps < m["amount"]),
+        None,
+    )
+    if milestone is None:
+        return None
+
+    already_awarded = await db.scalar(
+        select(func.count())
+        .select_from(Transaction)
+        .where(
+            Transaction.user_id == user_id,
+            Transaction.type == "comp_award",
+            Transaction.status == "pending_choice",
+            Transaction.amount == Decimal(milestone["amount"]),
+        )
+    )
+    return None if already_awarded else milestone
+
+
+async def award_milestone_comp(db: AsyncSession, user_id: uuid.UUID, amount: Decimal) -> uuid.UUID:
+    """Award a milestone comp and its comp_award notification in one commit.
+
+    Returns the pending_choice transaction id.
+    """
+    comp_id = uuid.uuid4()
+    db.add(Transaction(id=comp_id, user_id=user_id, type="comp_award", amount=amount, status="pending_choice"))
+    await create_notification(
+        db,
+        user_id,
+        "comp_award",
+        f"You earned a ${amount:,.0f} comp!",
+        "Choose how you'd like to receive it.",
+    )
+    return comp_id
+
+
 async def award_crypto_comp(
     db: AsyncSession,
     user_id: uuid.UUID,
@@ -192,28 +251,22 @@ async def process_affiliate_reward_match(
     if match_amount <= 0:
         return None
 
-    # Update affiliate's wallet
-    wallet_result = await db.execute(select(Wallet).where(Wallet.user_id == referred_by))
-    wallet = wallet_result.scalar_one_or_none()
-    if wallet:
-        wallet.balance_available += match_amount
-
-    # Update affiliate lifetime earnings
-    aff_result = await db.execute(select(Affiliate).where(Affiliate.user_id == referred_by))
-    affiliate = aff_result.scalar_one_or_none()
-    if affiliate:
-        affiliate.lifetime_earnings += match_amount
-
-    # Record the reward match transaction
+    # Credit the affiliate through the wallet ledger: a plain INSERT, so a
+    # popular affiliate's wallet row is never locked by its referrals' comps.
+    # The materializer also advances the affiliate's lifetime_earnings.
     txn = Transaction(
+        id=uuid.uuid4(),
         user_id=referred_by,
         type="affiliate_match",
         amount=match_amount,
         status="completed",
     )
     db.add(txn)
+    await credit_wallet(db, referred_by, match_amount, "affiliate_match", reference_id=txn.id)
+    await record_referral_earnings(db, comp_recipient_user_id, match_amount)
     await db.commit()
     await db.refresh(txn)
+    await invalidate_bootstrap(referred_by)
 
     logger.info(
         "Affiliate match: %s gets %s (21%% of %s comp to %s)",
@@ -271,32 +324,164 @@ async def check_guaranteed_comp(db: AsyncSession, user_id: uuid.UUID) -> bool:
     return month_comps < GUARANTEED_COMP_AMOUNT
 
 
-async def process_guaranteed_comps(db: AsyncSession) -> list[Transaction]:
-    """Batch job: find all members in first year who haven't received $5 this month.
+def _guaranteed_comp_insert(
+    after_id: uuid.UUID | None,
+    upto_id: uuid.UUID,
+    first_year_cutoff: datetime,
+    month_start: datetime,
+    now: datetime,
+):
+    """INSERT ... SELECT awarding guaranteed comps to eligible users in (after_id, upto_id].
 
-    Awards them a guaranteed $5 comp. Returns list of awarded transactions.
+    Applies the same rules as ``check_guaranteed_comp`` to a whole id range:
+    a CTE aggregates each chunk user's comp history in one pass, and users
+    already awarded a guaranteed comp this month are skipped so a resumed run
+    never double-awards.
     """
-    now = datetime.now(timezone.utc)
-    first_year_cutoff = now - timedelta(days=FIRST_YEAR_DAYS)
+    chunk_users = select(User.id.label("user_id")).where(
+        User.is_active == True,  # noqa: E712
+        User.created_at >= first_year_cutoff,
+        User.id <= upto_id,
+    )
+    if after_id is not None:
+        chunk_users = chunk_users.where(User.id > after_id)
+    chunk_users = chunk_users.cte("chunk_users")
+
+    settled = Transaction.status != "pending_choice"
+    this_month = Transaction.created_at >= month_start
+    is_guaranteed = Transaction.type == "guaranteed_comp"
+    history = (
+        select(
+            Transaction.user_id,
+            func.sum(case((and_(is_guaranteed, settled), 1), else_=0)).label("guaranteed_count"),
+            func.sum(case((and_(this_month, settled), Transaction.amount), else_=0)).label("month_total"),
+            func.max(case((and_(is_guaranteed, this_month), 1), else_=0)).label("awarded_this_month"),
+        )
+        .join(chunk_users, chunk_users.c.user_id == Transaction.user_id)
+        .where(Transaction.type.in_(["comp_award", "guaranteed_comp"]))
+        .group_by(Transaction.user_id)
+        .cte("comp_history")
+    )
+
+    eligible = (
+        select(
+            chunk_users.c.user_id,
+            literal("guaranteed_comp"),
+            literal(GUARANTEED_COMP_AMOUNT, Transaction.amount.type),
+            literal("pending_choice"),
+            literal(now, Transaction.created_at.type),
+        )
+        .select_from(chunk_users.outerjoin(history, history.c.user_id == chunk_users.c.user_id))
+        .where(
+            func.coalesce(history.c.guaranteed_count, 0) < GUARANTEED_COMP_COUNT,
+            func.coalesce(history.c.month_total, 0) < GUARANTEED_COMP_AMOUNT,
+            func.coalesce(history.c.awarded_this_month, 0) == 0,
+        )
+    )
+    return (
+        insert(Transaction)
+        .from_select(["user_id", "type", "amount", "status", "created_at"], eligible, include_defaults=False)
+        .returning(Transaction.id)
+    )
+
+
+def _guaranteed_comp_report(run: GuaranteedCompRun, **extra) -> dict:
+    return {
+        "month": run.month,
+        "status": run.status,
+        "chunks": run.chunks,
+        "users_scanned": run.users_scanned,
+        "comps_awarded": run.comps_awarded,
+        "amount_awarded": str(run.amount_awarded),
+        **extra,
+    }
+
+
+async def process_guaranteed_comps(
+    db: AsyncSession,
+    now: datetime | None = None,
+    chunk_size: int = GUARANTEED_COMP_CHUNK_SIZE,
+) -> dict:
+    """Monthly batch job: award the $5 guaranteed comp to every eligible first-year member.
+
+    Walks first-year members in user id order, ``chunk_size`` at a time. Each
+    chunk is one set-based ``INSERT ... SELECT`` (see ``_guaranteed_comp_insert``)
+    committed together with the run checkpoint, so an interrupted run resumes
+    after the last committed chunk. A month that already completed is skipped.
+
+    Returns the run report: month, status, chunks, users_scanned,
+    comps_awarded, amount_awarded, plus ``resumed``/``skipped`` and
+    ``duration_seconds``.
+    """
+    now = now or datetime.now(timezone.utc)
+    month = now.strftime("%Y-%m")
     month_start = now.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+    first_year_cutoff = now - timedelta(days=FIRST_YEAR_DAYS)
+    started = time.monotonic()
 
-    # Find users in their first year
     result = await db.execute(
-        select(User.id).where(
-            User.created_at >= first_year_cutoff,
-            User.is_active == True,
-        )
+        select(GuaranteedCompRun).where(GuaranteedCompRun.month == month).with_for_update()
     )
-    user_ids = list(result.scalars().all())
+    run = result.scalar_one_or_none()
+    if run is not None and run.status == "completed":
+        logger.info("Guaranteed comps for %s already completed — skipping", month)
+        return _guaranteed_comp_report(run, resumed=False, skipped=True, duration_seconds=0.0)
+
+    resumed = run is not None
+    if run is None:
+        run = GuaranteedCompRun(month=month, status="running")
+        db.add(run)
+    else:
+        run.status = "running"
+        run.last_error = None
+    await db.commit()
 
-    awarded = []
-    for uid in user_ids:
-        if await check_guaranteed_comp(db, uid):
-            txn = await award_crypto_comp(db, uid, GUARANTEED_COMP_AMOUNT, comp_type="guaranteed_comp")
-            awarded.append(txn)
+    try:
+        while True:
+            ids_query = (
+                select(User.id)
+                .where(User.is_active == True, User.created_at >= first_year_cutoff)  # noqa: E712
+                .order_by(User.id)
+                .limit(chunk_size)
+            )
+            if run.last_user_id is not None:
+                ids_query = ids_query.where(User.id > run.last_user_id)
+            chunk_ids = (await db.execute(ids_query)).scalars().all()
+            if not chunk_ids:
+                break
+
+            inserted = await db.execute(
+                _guaranteed_comp_insert(
+                    run.last_user_id, chunk_ids[-1], first_year_cutoff, month_start, now
+                )
+            )
+            awarded = len(inserted.all())
+            run.last_user_id = chunk_ids[-1]
+            run.chunks += 1
+            run.users_scanned += len(chunk_ids)
+            run.comps_awarded += awarded
+            run.amount_awarded += GUARANTEED_COMP_AMOUNT * awarded
+            await db.commit()
+    except Exception as exc:
+        await db.rollback()
+        run.status = "failed"
+        run.last_error = str(exc)
+        await db.commit()
+        logger.error("Guaranteed comps for %s failed, will resume from checkpoint: %s", month, exc)
+        raise
+
+    run.status = "completed"
+    run.finished_at = datetime.now(timezone.utc)
+    await db.commit()
 
-    logger.info("Guaranteed comps processed: %d awards", len(awarded))
-    return awarded
+    report = _guaranteed_comp_report(
+        run,
+        resumed=resumed,
+        skipped=False,
+        duration_seconds=round(time.monotonic() - started, 3),
+    )
+    logger.info("Guaranteed comps processed: %s", report)
+    return report
 
 
 # ── Affiliate pool distribution (weekly) ──────────────────────────────
@@ -351,54 +536,6 @@ async def calculate_affiliate_pool_distribution(
     return distributions
 
 
-async def process_weekly_affiliate_payout(
-    db: AsyncSession,
-    weekly_pool_amount: Decimal,
-) -> list[Transaction]:
-    """Batch job for Sunday payouts: distribute affiliate pool based on chip shares.
-
-    Returns list of payout transactions.
-    """
-    distributions = await calculate_affiliate_pool_distribution(db, weekly_pool_amount)
-
-    payouts = []
-    for dist in distributions:
-        aff_id = dist["affiliate_user_id"]
-        amount = dist["share_amount"]
-
-        if amount <= 0:
-            continue
-
-        # Update wallet
-        wallet_result = await db.execute(select(Wallet).where(Wallet.user_id == aff_id))
-        wallet = wallet_result.scalar_one_or_none()
-        if wallet:
-            wallet.balance_available += amount
-
-        # Update affiliate earnings
-        aff_result = await db.execute(select(Affiliate).where(Affiliate.user_id == aff_id))
-        affiliate = aff_result.scalar_one_or_none()
-        if affiliate:
-            affiliate.lifetime_earnings += amount
-
-        txn = Transaction(
-            user_id=aff_id,
-            type="affiliate_payout",
-            amount=amount,
-            status="completed",
-        )
-        db.add(txn)
-        payouts.append(txn)
-
-    await db.commit()
-    for txn in payouts:
-        await db.refresh(txn)
-
-    logger.info("Weekly affiliate payout: %d affiliates, total %s",
-                len(payouts), sum(d["share_amount"] for d in distributions))
-    return payouts
-
-
 # ── Transparency dashboard queries ───────────────────────────────────
 
 
@@ -466,26 +603,12 @@ async def get_recent_comp_recipients(
 
 
 async def get_treasury_stats(db: AsyncSession) -> dict:
-    """Return aggregate treasury statistics for the transparency dashboard."""
-    # Total comps distributed
-    total_result = await db.execute(
-        select(func.coalesce(func.sum(Transaction.amount), Decimal("0")))
-        .where(
-            Transaction.type.in_(["comp_award", "guaranteed_comp", "affiliate_match", "affiliate_payout"]),
-            Transaction.status == "completed",
-        )
-    )
-    total_distributed = total_result.scalar_one()
+    """Return aggregate treasury statistics for the transparency dashboard.
 
-    # Total unique members who received comps
-    members_result = await db.execute(
-        select(func.count(func.distinct(Transaction.user_id)))
-        .where(
-            Transaction.type.in_(["comp_award", "guaranteed_comp"]),
-            Transaction.status == "completed",
-        )
-    )
-    total_members = members_result.scalar_one()
+    Totals are read from the comp rollups plus the open tail of the ledger.
+    """
+    total_distributed = await sum_comp_amounts(db)
+    total_members = await count_comp_recipients(db)
 
     return {
         "total_distributed": total_distributed,
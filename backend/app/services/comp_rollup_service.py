@@ -0,0 +1,431 @@
+"""Incremental rollups of completed comp transactions.
+
+The transparency dashboard used to aggregate the whole ``transactions`` ledger
+on every request. ``roll_up_closed_hours`` (run every few minutes by the
+``roll_up_comp_transactions`` Celery task) folds each closed hour into
+``comp_rollups`` — one row per (hour, type, amount bucket) — and records each
+new recipient's first comp in ``comp_recipients``. Hourly rows older than
+``COMPACT_AFTER_DAYS`` are compacted to one row per day, so readers scan
+O(days) rows instead of O(transactions).
+
+Readers add the rollups (everything before the ``closed_through`` watermark)
+to a live aggregate over the still-open tail of the ledger, so results stay
+exact. Until the first rollup run the readers aggregate the ledger directly.
+
+``reconcile_comp_rollups`` recomputes recent days from the ledger and rewrites
+any day whose rollups disagree (e.g. a transaction completed after its hour
+was closed).
+"""
+
+from __future__ import annotations
+
+import logging
+import uuid
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+
+from sqlalchemy import case, delete, exists, func, insert, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.comp_recipient import CompRecipient
+from app.models.comp_rollup import CompRollup
+from app.models.rollup_watermark import RollupWatermark
+from app.models.transaction import Transaction
+
+logger = logging.getLogger(__name__)
+
+# Transaction types counted as comp payouts (total distributed, payouts_24h)
+COMP_PAYOUT_TYPES = ("comp_award", "guaranteed_comp", "affiliate_match", "affiliate_payout")
+# Transaction types that make a member a comp recipient
+COMP_RECIPIENT_TYPES = ("comp_award", "guaranteed_comp")
+# Transaction types counted in the dashboard's prize tiers
+PRIZE_TIER_TYPES = ("comp_award", "guaranteed_comp", "affiliate_payout")
+# Prize tier labels: upper bound of each amount bucket; "200000" is open-ended
+PRIZE_TIER_BUCKETS = ("100", "1000", "10000", "200000")
+
+# Hourly rows older than this are compacted to one row per day
+COMPACT_AFTER_DAYS = 2
+# Upper bound on hours folded per call so a backfill commits in slices
+MAX_HOURS_PER_RUN = 24 * 7
+# Days re-checked against the ledger by the nightly reconcile
+RECONCILE_DAYS = 7
+
+WATERMARK_CLOSED = "comp_rollups.closed_through"
+WATERMARK_COMPACTED = "comp_rollups.compacted_through"
+
+_HOUR = timedelta(hours=1)
+_DAY = timedelta(days=1)
+
+
+def _amount_bucket(amount):
+    """SQL expression mapping a comp amount to its prize tier label."""
+    return case(
+        (amount <= 0, "0"),
+        (amount <= 100, "100"),
+        (amount <= 1000, "1000"),
+        (amount <= 10000, "10000"),
+        else_="200000",
+    ).label("amount_bucket")
+
+
+def _as_utc(value: datetime) -> datetime:
+    return value if value.tzinfo is not None else value.replace(tzinfo=timezone.utc)
+
+
+def _floor_hour(value: datetime) -> datetime:
+    return value.replace(minute=0, second=0, microsecond=0)
+
+
+def _ceil_hour(value: datetime) -> datetime:
+    floor = _floor_hour(value)
+    return floor if floor == value else floor + _HOUR
+
+
+def _floor_day(value: datetime) -> datetime:
+    return value.replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+def _completed(types, start: datetime | None = None, end: datetime | None = None) -> list:
+    conditions = [Transaction.type.in_(types), Transaction.status == "completed"]
+    if start is not None:
+        conditions.append(Transaction.created_at >= start)
+    if end is not None:
+        conditions.append(Transaction.created_at < end)
+    return conditions
+
+
+# ---------------------------------------------------------------------------
+# Watermarks
+# ---------------------------------------------------------------------------
+
+
+async def _get_watermark(db: AsyncSession, name: str, for_update: bool = False) -> datetime | None:
+    query = select(RollupWatermark.position).where(RollupWatermark.name == name)
+    if for_update:
+        # Serialises concurrent rollup runs on the watermark row.
+        query = query.with_for_update()
+    result = await db.execute(query)
+    position = result.scalar_one_or_none()
+    return _as_utc(position) if position is not None else None
+
+
+async def _set_watermark(db: AsyncSession, name: str, position: datetime) -> None:
+    result = await db.execute(select(RollupWatermark).where(RollupWatermark.name == name))
+    watermark = result.scalar_one_or_none()
+    if watermark is None:
+        db.add(RollupWatermark(name=name, position=position))
+    else:
+        watermark.position = position
+        watermark.updated_at = datetime.now(timezone.utc)
+
+
+# ---------------------------------------------------------------------------
+# Writers
+# ---------------------------------------------------------------------------
+
+
+async def _ledger_aggregates(
+    db: AsyncSession, start: datetime, end: datetime
+) -> dict[tuple[str, str], tuple[int, Decimal]]:
+    """(type, amount_bucket) -> (count, total) for completed comps in [start, end)."""
+    bucket = _amount_bucket(Transaction.amount)
+    result = await db.execute(
+        select(
+            Transaction.type,
+            bucket,
+            func.count(),
+            func.coalesce(func.sum(Transaction.amount), Decimal("0")),
+        )
+        .where(*_completed(COMP_PAYOUT_TYPES, start, end))
+        .group_by(Transaction.type, "amount_bucket")
+    )
+    return {(t, b): (count, Decimal(total)) for t, b, count, total in result.all()}
+
+
+async def _rollup_aggregates(
+    db: AsyncSession, start: datetime, end: datetime
+) -> dict[tuple[str, str], tuple[int, Decimal]]:
+    """Same shape as ``_ledger_aggregates``, read from the rollup rows in [start, end)."""
+    result = await db.execute(
+        select(
+            CompRollup.type,
+            CompRollup.amount_bucket,
+            func.sum(CompRollup.tx_count),
+            func.sum(CompRollup.amount_total),
+        )
+        .where(CompRollup.bucket_start >= start, CompRollup.bucket_start < end)
+        .group_by(CompRollup.type, CompRollup.amount_bucket)
+    )
+    return {(t, b): (int(count), Decimal(total)) for t, b, count, total in result.all()}
+
+
+async def _write_rollup_rows(
+    db: AsyncSession,
+    bucket_start: datetime,
+    aggregates: dict[tuple[str, str], tuple[int, Decimal]],
+) -> None:
+    if not aggregates:
+        return
+    await db.execute(
+        insert(CompRollup),
+        [
+            {
+                "id": uuid.uuid4(),
+                "bucket_start": bucket_start,
+                "type": comp_type,
+                "amount_bucket": bucket,
+                "tx_count": count,
+                "amount_total": total,
+            }
+            for (comp_type, bucket), (count, total) in aggregates.items()
+        ],
+    )
+
+
+async def _rebuild_from_ledger(db: AsyncSession, start: datetime, end: datetime, hourly: bool) -> None:
+    """Replace every rollup row in [start, end) with fresh aggregates of the ledger."""
+    await db.execute(
+        delete(CompRollup).where(CompRollup.bucket_start >= start, CompRollup.bucket_start < end)
+    )
+    if not hourly:
+        await _write_rollup_rows(db, start, await _ledger_aggregates(db, start, end))
+        return
+    hour = start
+    while hour < end:
+        await _write_rollup_rows(db, hour, await _ledger_aggregates(db, hour, hour + _HOUR))
+        hour += _HOUR
+
+
+async def _record_new_recipients(db: AsyncSession, start: datetime, end: datetime) -> int:
+    """Add members whose first comp falls in [start, end) to ``comp_recipients``."""
+    result = await db.execute(
+        select(Transaction.user_id, func.min(Transaction.created_at))
+        .where(
+            *_completed(COMP_RECIPIENT_TYPES, start, end),
+            ~exists().where(CompRecipient.user_id == Transaction.user_id),
+        )
+        .group_by(Transaction.user_id)
+    )
+    rows = [
+        {"id": uuid.uuid4(), "user_id": user_id, "first_comped_at": first_comped_at}
+        for user_id, first_comped_at in result.all()
+    ]
+    if rows:
+        await db.execute(insert(CompRecipient), rows)
+    return len(rows)
+
+
+async def _next_ledger_hour(
+    db: AsyncSession, start: datetime | None, end: datetime
+) -> datetime | None:
+    """Start of the first hour in [start, end) holding a completed comp, skipping empty stretches."""
+    result = await db.execute(
+        select(func.min(Transaction.created_at)).where(*_completed(COMP_PAYOUT_TYPES, start, end))
+    )
+    first = result.scalar_one_or_none()
+    return _floor_hour(_as_utc(first)) if first is not None else None
+
+
+async def roll_up_closed_hours(db: AsyncSession, now: datetime | None = None) -> dict:
+    """Fold closed hours of the ledger into ``comp_rollups`` and compact old days.
+
+    Processes at most ``MAX_HOURS_PER_RUN`` non-empty hours and commits; call
+    again while ``caught_up`` is False (the first run backfills history).
+
+    Returns:
+        {"hours_closed", "recipients_added", "days_compacted", "closed_through", "caught_up"}
+    """
+    now = now or datetime.now(timezone.utc)
+    target = _floor_hour(now)
+
+    closed = await _get_watermark(db, WATERMARK_CLOSED, for_update=True)
+    if closed is None:
+        closed = await _next_ledger_hour(db, None, target) or target
+
+    hours_closed = 0
+    recipients_added = 0
+    cursor = closed
+    while cursor < target and hours_closed < MAX_HOURS_PER_RUN:
+        hour = await _next_ledger_hour(db, cursor, target)
+        if hour is None:
+            cursor = target
+            break
+        await _rebuild_from_ledger(db, hour, hour + _HOUR, hourly=True)
+        recipients_added += await _record_new_recipients(db, hour, hour + _HOUR)
+        hours_closed += 1
+        cursor = hour + _HOUR
+
+    await _set_watermark(db, WATERMARK_CLOSED, cursor)
+    days_compacted = await _compact_old_days(db, now, cursor)
+    await db.commit()
+
+    logger.info(
+        "Comp rollups: %d hours closed, %d recipients added, %d days compacted, closed through %s",
+        hours_closed, recipients_added, days_compacted, cursor.isoformat(),
+    )
+    return {
+        "hours_closed": hours_closed,
+        "recipients_added": recipients_added,
+        "days_compacted": days_compacted,
+        "closed_through": cursor.isoformat(),
+        "caught_up": cursor >= target,
+    }
+
+
+async def _compact_old_days(db: AsyncSession, now: datetime, closed: datetime) -> int:
+    """Merge the hourly rows of each fully closed day older than COMPACT_AFTER_DAYS."""
+    cutoff = min(_floor_day(now) - timedelta(days=COMPACT_AFTER_DAYS), _floor_day(closed))
+    compacted = await _get_watermark(db, WATERMARK_COMPACTED)
+    if compacted is None:
+        result = await db.execute(select(func.min(CompRollup.bucket_start)))
+        first = result.scalar_one_or_none()
+        if first is None:
+            return 0
+        compacted = _floor_day(_as_utc(first))
+
+    days = 0
+    day = compacted
+    while day < cutoff:
+        aggregates = await _rollup_aggregates(db, day, day + _DAY)
+        if aggregates:
+            await db.execute(
+                delete(CompRollup).where(
+                    CompRollup.bucket_start >= day, CompRollup.bucket_start < day + _DAY
+                )
+            )
+            await _write_rollup_rows(db, day, aggregates)
+            days += 1
+        day += _DAY
+
+    if cutoff > compacted:
+        await _set_watermark(db, WATERMARK_COMPACTED, cutoff)
+    return days
+
+
+async def reconcile_comp_rollups(db: AsyncSession, days: int = RECONCILE_DAYS) -> dict:
+    """Check the last *days* closed days against the ledger and rebuild any that disagree.
+
+    Returns:
+        {"days_checked", "days_repaired", "recipients_added", "mismatches": [day iso, ...]}
+    """
+    closed = await _get_watermark(db, WATERMARK_CLOSED, for_update=True)
+    report = {"days_checked": 0, "days_repaired": 0, "recipients_added": 0, "mismatches": []}
+    if closed is None:
+        return report
+
+    compacted = await _get_watermark(db, WATERMARK_COMPACTED)
+    start = _floor_day(closed) - timedelta(days=days)
+    day = start
+    while day < closed:
+        day_end = min(day + _DAY, closed)
+        report["days_checked"] += 1
+        if await _ledger_aggregates(db, day, day_end) != await _rollup_aggregates(db, day, day_end):
+            hourly = compacted is None or day >= compacted
+            await _rebuild_from_ledger(db, day, day_end, hourly=hourly)
+            report["days_repaired"] += 1
+            report["mismatches"].append(day.date().isoformat())
+        day += _DAY
+
+    report["recipients_added"] = await _record_new_recipients(db, start, closed)
+    await db.commit()
+
+    if report["days_repaired"]:
+        logger.warning("Comp rollups repaired for days %s", report["mismatches"])
+    return report
+
+
+# ---------------------------------------------------------------------------
+# Readers
+# ---------------------------------------------------------------------------
+
+
+async def _read_window(db: AsyncSession, since: datetime | None) -> tuple[list, list]:
+    """Split [since, now) into rollup-row conditions and ledger-tail conditions.
+
+    Returns ``(rollup_conditions, ledger_conditions)``; ``rollup_conditions``
+    is None when the window must be read from the ledger alone.
+    """
+    closed = await _get_watermark(db, WATERMARK_CLOSED)
+    if closed is None:
+        return None, [Transaction.created_at >= since] if since else []
+
+    if since is None:
+        return [CompRollup.bucket_start < closed], [Transaction.created_at >= closed]
+
+    # Compacted days only hold daily rows, which cannot be split at *since*.
+    compacted = await _get_watermark(db, WATERMARK_COMPACTED)
+    if compacted is not None and since < compacted:
+        return None, [Transaction.created_at >= since]
+
+    # Partial first hour and the open tail come from the ledger.
+    first_full_hour = _ceil_hour(since)
+    return (
+        [CompRollup.bucket_start >= first_full_hour, CompRollup.bucket_start < closed],
+        [
+            Transaction.created_at >= since,
+            or_(Transaction.created_at < first_full_hour, Transaction.created_at >= closed),
+        ],
+    )
+
+
+async def sum_comp_amounts(
+    db: AsyncSession,
+    types: tuple[str, ...] = COMP_PAYOUT_TYPES,
+    since: datetime | None = None,
+) -> Decimal:
+    """Total amount of completed comps of *types*, all time or since *since*."""
+    rollup_window, ledger_window = await _read_window(db, since)
+    total = Decimal("0")
+    if rollup_window is not None:
+        result = await db.execute(
+            select(func.coalesce(func.sum(CompRollup.amount_total), Decimal("0"))).where(
+                CompRollup.type.in_(types), *rollup_window
+            )
+        )
+        total += Decimal(result.scalar_one())
+    result = await db.execute(
+        select(func.coalesce(func.sum(Transaction.amount), Decimal("0"))).where(
+            *_completed(types), *ledger_window
+        )
+    )
+    return total + Decimal(result.scalar_one())
+
+
+async def count_comps_by_bucket(
+    db: AsyncSession, types: tuple[str, ...] = PRIZE_TIER_TYPES
+) -> dict[str, int]:
+    """Number of completed comps of *types* per prize tier bucket, all time."""
+    counts = dict.fromkeys(PRIZE_TIER_BUCKETS, 0)
+    rollup_window, ledger_window = await _read_window(db, None)
+    if rollup_window is not None:
+        result = await db.execute(
+            select(CompRollup.amount_bucket, func.sum(CompRollup.tx_count))
+            .where(CompRollup.type.in_(types), *rollup_window)
+            .group_by(CompRollup.amount_bucket)
+        )
+        for bucket, count in result.all():
+            if bucket in counts:
+                counts[bucket] += int(count)
+    result = await db.execute(
+        select(_amount_bucket(Transaction.amount), func.count())
+        .where(*_completed(types), *ledger_window)
+        .group_by("amount_bucket")
+    )
+    for bucket, count in result.all():
+        if bucket in counts:
+            counts[bucket] += count
+    return counts
+
+
+async def count_comp_recipients(db: AsyncSession) -> int:
+    """Number of distinct members who have received a comp_award or guaranteed_comp."""
+    _, ledger_window = await _read_window(db, None)
+    recorded = await db.execute(select(func.count()).select_from(CompRecipient))
+    unrecorded = await db.execute(
+        select(func.count(func.distinct(Transaction.user_id))).where(
+            *_completed(COMP_RECIPIENT_TYPES),
+            *ledger_window,
+            ~exists().where(CompRecipient.user_id == Transaction.user_id),
+        )
+    )
+    return recorded.scalar_one() + unrecorded.scalar_one()
@@ -9,6 +9,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.vote import Vote
 from app.models.vote_ballot import VoteBallot
+from app.services.bootstrap_service import invalidate_bootstrap_votes
 
 logger = logging.getLogger(__name__)
 
@@ -47,59 +48,47 @@ async def create_vote(
     db.add(vote)
     await db.commit()
     await db.refresh(vote)
+    await invalidate_bootstrap_votes()
     return vote
 
 
 async def get_active_votes(db: AsyncSession, user_id: uuid.UUID) -> list[dict]:
     """Return active votes the user is eligible for based on their effective tier."""
     user_tier = await _get_user_effective_tier(db, user_id)
-
-    result = await db.execute(
-        select(Vote).where(Vote.status == "active").order_by(Vote.start_date.desc())
-    )
-    votes = result.scalars().all()
-
-    eligible = []
-    for v in votes:
-        tiers = v.target_tiers if isinstance(v.target_tiers, list) else []
-        if user_tier not in tiers:
-            continue
-
-        # Check if user has voted
-        ballot_result = await db.execute(
-            select(VoteBallot).where(VoteBallot.vote_id == v.id, VoteBallot.user_id == user_id)
-        )
-        ballot = ballot_result.scalar_one_or_none()
-
-        results = await _get_vote_results(db, v)
-
-        eligible.append(_vote_to_dict(v, results, ballot))
-
-    return eligible
+    return await get_votes_for_tier(db, user_tier, user_id)
 
 
 async def get_votes_for_tier(db: AsyncSession, tier_name: str, user_id: uuid.UUID) -> list[dict]:
-    """Return active votes where tier_name is in target_tiers (for governance rooms)."""
+    """Return active votes where tier_name is in target_tiers (for governance rooms).
+
+    Ballots and tallies for all matching votes are loaded with one query
+    each, not per vote.
+    """
     result = await db.execute(
         select(Vote).where(Vote.status == "active").order_by(Vote.start_date.desc())
     )
-    votes = result.scalars().all()
+    votes = [v for v in result.scalars().all() if tier_name in _target_tiers(v)]
+    if not votes:
+        return []
+
+    vote_ids = [v.id for v in votes]
+    ballot_result = await db.execute(
+        select(VoteBallot).where(VoteBallot.vote_id.in_(vote_ids), VoteBallot.user_id == user_id)
+    )
+    ballots = {b.vote_id: b for b in ballot_result.scalars().all()}
+    results = await _get_results_for_votes(db, votes)
 
-    matching = []
-    for v in votes:
-        tiers = v.target_tiers if isinstance(v.target_tiers, list) else []
-        if tier_name not in tiers:
-            continue
+    return [_vote_to_dict(v, results[v.id], ballots.get(v.id)) for v in votes]
 
-        ballot_result = await db.execute(
-            select(VoteBallot).where(VoteBallot.vote_id == v.id, VoteBallot.user_id == user_id)
-        )
-        ballot = ballot_result.scalar_one_or_none()
 
-        results = await _get_vote_results(db, v)
-        matching.append(_vote_to_dict(v, results, ballot))
+async def count_active_votes(db: AsyncSession, tier_name: str) -> int:
+    """Count active votes open to *tier_name* — one query, no ballots or tallies."""
+    result = await db.execute(select(Vote.target_tiers).where(Vote.status == "active"))
+    return sum(1 for tiers in result.scalars().all() if isinstance(tiers, list) and tier_name in tiers)
+
 
-    return matching
+def _target_tiers(vote: Vote) -> list[str]:
+    return vote.target_tiers if isinstance(vote.target_tiers, list) else []
 
 
 async def get_vote_detail(db: AsyncSession, vote_id: uuid.UUID, user_id: uuid.UUID) -> dict | None:
@@ -125,11 +114,25 @@ async def _get_vote_results(db: AsyncSession, vote: Vote) -> list[dict]:
         .where(VoteBallot.vote_id == vote.id)
         .group_by(VoteBallot.option_id)
     )
-    rows = result.all()
+    return _tally(vote, {r.option_id: r.cnt for r in result.all()})
+
+
+async def _get_results_for_votes(db: AsyncSession, votes: list[Vote]) -> dict[uuid.UUID, list[dict]]:
+    """Per-option counts and percentages for each of *votes*, from one grouped query."""
+    result = await db.execute(
+        select(VoteBallot.vote_id, VoteBallot.option_id, func.count(VoteBallot.id).label("cnt"))
+        .where(VoteBallot.vote_id.in_([v.id for v in votes]))
+        .group_by(VoteBallot.vote_id, VoteBallot.option_id)
+    )
+    counts: dict[uuid.UUID, dict[str, int]] = {}
+    for r in result.all():
+        counts.setdefault(r.vote_id, {})[r.option_id] = r.cnt
+
+    return {v.id: _tally(v, counts.get(v.id, {})) for v in votes}
 
-    total = sum(r.cnt for r in rows)
-    count_map = {r.option_id: r.cnt for r in rows}
 
+def _tally(vote: Vote, count_map: dict[str, int]) -> list[dict]:
+    total = sum(count_map.values())
     options = vote.options_json if isinstance(vote.options_json, list) else []
     results = []
     for opt in options:
@@ -240,6 +243,7 @@ async def close_vote(db: AsyncSession, vote_id: uuid.UUID, admin_user_id: uuid.U
     await db.commit()
 
     if result.rowcount > 0:
+        await invalidate_bootstrap_votes()
         # Post results to announcements (fire-and-forget)
         try:
             await _post_vote_results_to_announcements(db, vote_id, admin_user_id)
@@ -268,6 +272,8 @@ async def auto_close_expired_votes(db: AsyncSession) -> int:
     )
     closed_ids = result.scalars().all()
     await db.commit()
+    if closed_ids:
+        await invalidate_bootstrap_votes()
     return len(closed_ids)
 
 
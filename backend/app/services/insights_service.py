@@ -7,11 +7,13 @@ raising — callers (API endpoints) receive whatever data is available.
 
 from __future__ import annotations
 
+import base64
+import json
 import logging
+import uuid
 from datetime import datetime, timedelta, timezone
-from decimal import Decimal
 
-from sqlalchemy import func, select
+from sqlalchemy import and_, cast, func, literal, null, or_, select, union_all
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.affiliate import Affiliate
@@ -20,6 +22,11 @@ from app.models.tier_history import TierHistory
 from app.models.transaction import Transaction
 from app.models.user import User
 from app.models.wholesale_account import WholesaleAccount
+from app.services.comp_rollup_service import (
+    COMP_PAYOUT_TYPES,
+    count_comps_by_bucket,
+    sum_comp_amounts,
+)
 
 # Module-level service imports — required for test patching
 # These are imported here so tests can patch them at the module level.
@@ -47,9 +54,9 @@ except ImportError:
     get_last_sync_status = None  # type: ignore[assignment]
 
 try:
-    from app.services.timescale_service import get_treasury_sparkline
+    from app.services.timescale_service import get_treasury_sparklines
 except ImportError:
-    get_treasury_sparkline = None  # type: ignore[assignment]
+    get_treasury_sparklines = None  # type: ignore[assignment]
 
 try:
     from app.services.blockchain import get_node_health
@@ -104,18 +111,10 @@ async def get_overview(db: AsyncSession) -> dict:
         logger.warning("get_overview: could not fetch active_members: %s", exc)
         result["active_members"] = 0
 
-    # --- payouts_24h: sum of comp amounts in the last 24 hours ---
+    # --- payouts_24h: sum of comp amounts in the last 24 hours (rollups + open tail) ---
     try:
         cutoff = datetime.now(timezone.utc) - timedelta(hours=24)
-        payout_result = await db.execute(
-            select(func.coalesce(func.sum(Transaction.amount), Decimal("0")))
-            .where(
-                Transaction.type.in_(["comp_award", "guaranteed_comp", "affiliate_match", "affiliate_payout"]),
-                Transaction.status == "completed",
-                Transaction.created_at >= cutoff,
-            )
-        )
-        result["payouts_24h"] = float(payout_result.scalar_one())
+        result["payouts_24h"] = float(await sum_comp_amounts(db, since=cutoff))
     except Exception as exc:
         logger.warning("get_overview: could not fetch payouts_24h: %s", exc)
         result["payouts_24h"] = 0.0
@@ -195,16 +194,9 @@ async def get_treasury_insights(db: AsyncSession) -> dict:
         logger.warning("get_treasury_insights: could not fetch bank_balances: %s", exc)
         result["bank_balances"] = []
 
-    # --- sparklines: 90-day daily history per pool ---
+    # --- sparklines: 90-day daily history for every pool (one query, cached) ---
     try:
-        sparklines = {}
-        for pool in ("consumer", "affiliate", "wholesale"):
-            try:
-                sparklines[pool] = await get_treasury_sparkline(db, pool_type=pool, days=90)
-            except Exception as pool_exc:
-                logger.warning("get_treasury_insights: sparkline failed for %s: %s", pool, pool_exc)
-                sparklines[pool] = []
-        result["sparklines"] = sparklines
+        result["sparklines"] = await get_treasury_sparklines(db, days=90)
     except Exception as exc:
         logger.warning("get_treasury_insights: could not fetch sparklines: %s", exc)
         result["sparklines"] = {"consumer": [], "affiliate": [], "wholesale": []}
@@ -273,30 +265,10 @@ async def get_comp_stats(db: AsyncSession) -> dict:
     """
     result: dict = {}
 
-    # --- prize_tiers: count of comp transactions grouped by threshold buckets ---
+    # --- prize_tiers: comp counts per threshold bucket, read from the comp rollups ---
+    # Buckets follow the CRYPTO_MILESTONES: $100, $1,000, $10,000 + affiliate payout $200,000 threshold
     try:
-        # Query comp payouts, count how many fall into each threshold bucket
-        # Using the CRYPTO_MILESTONES: $100, $1,000, $10,000 + affiliate payout $200,000 threshold
-        THRESHOLDS = {
-            "100": (Decimal("0"), Decimal("100")),
-            "1000": (Decimal("100"), Decimal("1000")),
-            "10000": (Decimal("1000"), Decimal("10000")),
-            "200000": (Decimal("10000"), Decimal("999999999")),
-        }
-        prize_tiers: dict[str, int] = {}
-        for label, (low, high) in THRESHOLDS.items():
-            count_result = await db.execute(
-                select(func.count())
-                .select_from(Transaction)
-                .where(
-                    Transaction.type.in_(["comp_award", "guaranteed_comp", "affiliate_payout"]),
-                    Transaction.status == "completed",
-                    Transaction.amount > low,
-                    Transaction.amount <= high,
-                )
-            )
-            prize_tiers[label] = count_result.scalar_one()
-        result["prize_tiers"] = prize_tiers
+        result["prize_tiers"] = await count_comps_by_bucket(db)
     except Exception as exc:
         logger.warning("get_comp_stats: could not fetch prize_tiers: %s", exc)
         result["prize_tiers"] = {"100": 0, "1000": 0, "10000": 0, "200000": 0}
@@ -349,99 +321,144 @@ async def get_partner_stats(db: AsyncSession) -> dict:
     return result
 
 
+class InvalidFeedCursor(ValueError):
+    """Raised when an activity feed cursor token cannot be decoded."""
+
+
+def encode_feed_cursor(ts: datetime, event_id: uuid.UUID | str) -> str:
+    """Encode the (timestamp, id) position of the last item on a feed page."""
+    raw = json.dumps([ts.isoformat(), str(event_id)])
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_feed_cursor(cursor: str) -> tuple[datetime, uuid.UUID]:
+    """Decode a token produced by ``encode_feed_cursor``.
+
+    Raises:
+        InvalidFeedCursor: if the token is malformed.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        ts_raw, event_id = json.loads(base64.urlsafe_b64decode(padded))
+        return datetime.fromisoformat(ts_raw), uuid.UUID(event_id)
+    except Exception as exc:
+        raise InvalidFeedCursor("Invalid feed cursor") from exc
+
+
+def _feed_branch(kind, first_name, amount, tier, ts, event_id, where, after, limit):
+    """One source of the merged feed, already keyset-filtered, ordered and limited.
+
+    Each branch reads at most *limit* rows from its (ts, id) index, so the
+    outer merge never sees more than ``3 * limit`` rows whatever the window.
+    """
+    query = select(
+        kind.label("type"),
+        first_name.label("first_name"),
+        amount.label("amount"),
+        tier.label("tier"),
+        ts.label("ts"),
+        event_id.label("event_id"),
+    ).where(*where)
+    if after is not None:
+        after_ts, after_id = after
+        query = query.where(or_(ts < after_ts, and_(ts == after_ts, event_id < after_id)))
+    return select(query.order_by(ts.desc(), event_id.desc()).limit(limit).subquery())
+
+
 async def get_activity_feed(
     db: AsyncSession,
     hours: int = 24,
-    page: int = 1,
+    cursor: str | None = None,
     per_page: int = 20,
 ) -> dict:
-    """Return a paginated activity feed of recent platform events.
+    """Return one keyset-paginated page of recent platform events.
 
-    Combines:
+    Merges, newest first:
     - Comp payouts (type: comp_award, guaranteed_comp, affiliate_match, affiliate_payout)
     - Tier upgrades (from tier_history)
     - New members (users created within the window)
 
+    The page is produced by a single ``UNION ALL ... ORDER BY ts DESC LIMIT``
+    query, so memory per request is bounded by ``per_page`` no matter how
+    large the ``hours`` window is.
+
     Args:
         hours:    How many hours of history to include.
-        page:     1-based page number.
+        cursor:   ``next_cursor`` from the previous page, or None for the first page.
         per_page: Items per page.
 
     Returns:
-        {"items": [...], "total": int, "page": int, "per_page": int}
-        Each item: {"type", "user_masked", "amount", "timestamp"}
+        {"items": [...], "next_cursor": str | None, "per_page": int, "hours": int}
+        Each item: {"type", "user_masked", "amount", "timestamp"} (+ "tier" for upgrades)
+
+    Raises:
+        InvalidFeedCursor: if *cursor* is malformed.
     """
+    after = decode_feed_cursor(cursor) if cursor else None
     cutoff = datetime.now(timezone.utc) - timedelta(hours=hours)
-    events: list[dict] = []
-
-    # --- Comp payouts ---
-    try:
-        comp_result = await db.execute(
-            select(Transaction.type, Transaction.amount, Transaction.created_at, User.first_name)
-            .join(User, Transaction.user_id == User.id)
-            .where(
-                Transaction.type.in_(["comp_award", "guaranteed_comp", "affiliate_match", "affiliate_payout"]),
-                Transaction.status == "completed",
-                Transaction.created_at >= cutoff,
-            )
-            .order_by(Transaction.created_at.desc())
-        )
-        for row in comp_result.all():
-            events.append({
-                "type": row.type,
-                "user_masked": _mask_username(row.first_name),
-                "amount": float(row.amount) if row.amount is not None else None,
-                "timestamp": row.created_at.isoformat() if row.created_at else None,
-            })
-    except Exception as exc:
-        logger.warning("get_activity_feed: could not fetch comp payouts: %s", exc)
-
-    # --- Tier upgrades ---
-    try:
-        tier_result = await db.execute(
-            select(TierHistory.tier_name, TierHistory.achieved_at, User.first_name)
-            .join(User, TierHistory.user_id == User.id)
-            .where(TierHistory.achieved_at >= cutoff)
-            .order_by(TierHistory.achieved_at.desc())
-        )
-        for row in tier_result.all():
-            events.append({
-                "type": "tier_upgrade",
-                "user_masked": _mask_username(row.first_name),
-                "amount": None,
-                "timestamp": row.achieved_at.isoformat() if row.achieved_at else None,
-                "tier": row.tier_name,
-            })
-    except Exception as exc:
-        logger.warning("get_activity_feed: could not fetch tier upgrades: %s", exc)
+    limit = per_page + 1
+    no_amount = cast(null(), Transaction.amount.type)
+    no_tier = cast(null(), TierHistory.tier_name.type)
+
+    comps = _feed_branch(
+        Transaction.type, User.first_name, Transaction.amount, no_tier,
+        Transaction.created_at, Transaction.id,
+        where=(
+            Transaction.user_id == User.id,
+            Transaction.type.in_(COMP_PAYOUT_TYPES),
+            Transaction.status == "completed",
+            Transaction.created_at >= cutoff,
+        ),
+        after=after, limit=limit,
+    )
+    upgrades = _feed_branch(
+        literal("tier_upgrade"), User.first_name, no_amount, TierHistory.tier_name,
+        TierHistory.achieved_at, TierHistory.id,
+        where=(TierHistory.user_id == User.id, TierHistory.achieved_at >= cutoff),
+        after=after, limit=limit,
+    )
+    members = _feed_branch(
+        literal("new_member"), User.first_name, no_amount, no_tier,
+        User.created_at, User.id,
+        where=(User.created_at >= cutoff, User.is_active == True),  # noqa: E712
+        after=after, limit=limit,
+    )
+    merged = union_all(comps, upgrades, members).subquery()
 
-    # --- New members ---
     try:
-        new_members_result = await db.execute(
-            select(User.first_name, User.created_at)
-            .where(User.created_at >= cutoff, User.is_active == True)  # noqa: E712
-            .order_by(User.created_at.desc())
+        result = await db.execute(
+            select(merged)
+            .order_by(merged.c.ts.desc(), merged.c.event_id.desc())
+            .limit(limit)
         )
-        for row in new_members_result.all():
-            events.append({
-                "type": "new_member",
-                "user_masked": _mask_username(row.first_name),
-                "amount": None,
-                "timestamp": row.created_at.isoformat() if row.created_at else None,
-            })
+        rows = result.all()
     except Exception as exc:
-        logger.warning("get_activity_feed: could not fetch new members: %s", exc)
-
-    # Sort all events descending by timestamp, handling None gracefully
-    events.sort(key=lambda e: e.get("timestamp") or "", reverse=True)
+        logger.warning("get_activity_feed: could not fetch events: %s", exc)
+        rows = []
+
+    has_more = len(rows) > per_page
+    rows = rows[:per_page]
+
+    items: list[dict] = []
+    for row in rows:
+        item = {
+            "type": row.type,
+            "user_masked": _mask_username(row.first_name),
+            "amount": float(row.amount) if row.amount is not None else None,
+            "timestamp": row.ts.isoformat() if row.ts else None,
+        }
+        if row.type == "tier_upgrade":
+            item["tier"] = row.tier
+        items.append(item)
 
-    total = len(events)
-    offset = (page - 1) * per_page
-    page_items = events[offset: offset + per_page]
+    next_cursor = None
+    if has_more:
+        last = rows[-1]
+        next_cursor = encode_feed_cursor(last.ts, last.event_id)
 
     return {
-        "items": page_items,
-        "total": total,
-        "page": page,
+        "items": items,
+        "next_cursor": next_cursor,
         "per_page": per_page,
+        "hours": hours,
     }
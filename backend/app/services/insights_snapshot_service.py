@@ -0,0 +1,146 @@
+"""Precomputed insights dashboard snapshots with stale-while-revalidate serving.
+
+Each public dashboard payload (overview, treasury, systems, comps, partners)
+is computed by the ``refresh_insights_snapshots`` Celery task and stored in
+Redis as a versioned JSON envelope. API requests read the snapshot directly:
+
+  - fresh  (age < SNAPSHOT_STALE_AFTER)  → served as-is
+  - stale                                → served as-is, and one background
+                                           refresh is started (single-flight
+                                           across pods via a Redis lock)
+  - missing / wrong schema               → computed inline, stored, served
+  - Redis unavailable                    → computed inline (previous behavior)
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.services import insights_service
+from app.services.redis_service import (
+    acquire_insights_refresh_lock,
+    get_insights_snapshot,
+    release_insights_refresh_lock,
+    store_insights_snapshot,
+)
+
+logger = logging.getLogger(__name__)
+
+# Bump when any snapshot payload changes shape so old envelopes are ignored.
+SNAPSHOT_SCHEMA_VERSION = 1
+# Age (seconds) after which a snapshot is served stale and refreshed in the background.
+SNAPSHOT_STALE_AFTER = 60
+
+# Snapshot name -> insights_service aggregator that builds it
+SNAPSHOT_BUILDERS: dict[str, str] = {
+    "overview": "get_overview",
+    "treasury": "get_treasury_insights",
+    "systems": "get_systems_health",
+    "comps": "get_comp_stats",
+    "partners": "get_partner_stats",
+}
+
+# Background refreshes started by this process (held so they are not garbage collected)
+_refresh_tasks: dict[str, asyncio.Task] = {}
+
+
+async def _compute(name: str, db: AsyncSession) -> dict:
+    builder = getattr(insights_service, SNAPSHOT_BUILDERS[name])
+    return await builder(db)
+
+
+async def refresh_snapshot(name: str, db: AsyncSession | None = None) -> dict | None:
+    """Recompute snapshot *name* and store it, unless another worker is already doing so.
+
+    Uses its own session when *db* is not given. Returns the stored
+    envelope, or ``None`` if the refresh was skipped or failed.
+    """
+    try:
+        token = await acquire_insights_refresh_lock(name)
+        if token is None:
+            logger.debug("Insights snapshot %s already refreshing elsewhere — skipping", name)
+            return None
+    except Exception as exc:
+        logger.warning("Insights snapshot %s: lock unavailable: %s", name, exc)
+        return None
+
+    try:
+        computed_at = time.time()
+        if db is None:
+            from app.db.session import async_session_factory
+
+            async with async_session_factory() as session:
+                data = await _compute(name, session)
+        else:
+            data = await _compute(name, db)
+        version = await store_insights_snapshot(name, SNAPSHOT_SCHEMA_VERSION, computed_at, data)
+        return {
+            "version": version,
+            "schema": SNAPSHOT_SCHEMA_VERSION,
+            "computed_at": computed_at,
+            "data": data,
+        }
+    except Exception as exc:
+        logger.warning("Insights snapshot %s refresh failed: %s", name, exc)
+        if db is not None:
+            # The caller computes inline next; a failed query leaves the session aborted.
+            await db.rollback()
+        return None
+    finally:
+        try:
+            await release_insights_refresh_lock(name, token)
+        except Exception:
+            pass
+
+
+async def refresh_all_snapshots() -> dict[str, int | None]:
+    """Refresh every snapshot; returns the new version per name (None if skipped)."""
+    versions: dict[str, int | None] = {}
+    for name in SNAPSHOT_BUILDERS:
+        envelope = await refresh_snapshot(name)
+        versions[name] = envelope["version"] if envelope else None
+    return versions
+
+
+def _schedule_refresh(name: str) -> None:
+    """Start a background refresh for *name* unless one is already running here."""
+    task = _refresh_tasks.get(name)
+    if task is not None and not task.done():
+        return
+    task = asyncio.create_task(refresh_snapshot(name))
+    _refresh_tasks[name] = task
+    task.add_done_callback(lambda _: _refresh_tasks.pop(name, None))
+
+
+async def get_snapshot(name: str, db: AsyncSession) -> tuple[dict, int | None]:
+    """Return ``(payload, age_seconds)`` for dashboard snapshot *name*.
+
+    ``age_seconds`` is None when the payload was computed for this request
+    rather than read from a stored snapshot. Never blocks on a refresh when
+    any snapshot is available; see the module docstring for the serving
+    rules.
+    """
+    if name not in SNAPSHOT_BUILDERS:
+        raise ValueError(f"Unknown insights snapshot: {name!r}")
+
+    try:
+        envelope = await get_insights_snapshot(name)
+    except Exception as exc:
+        logger.debug("Insights snapshot %s unavailable (%s) — computing inline", name, exc)
+        return await _compute(name, db), None
+
+    if envelope is not None and envelope.get("schema") == SNAPSHOT_SCHEMA_VERSION:
+        age = max(0, int(time.time() - envelope["computed_at"]))
+        if age >= SNAPSHOT_STALE_AFTER:
+            _schedule_refresh(name)
+        return envelope["data"], age
+
+    # Cold start: compute with the request's session and publish for everyone else.
+    envelope = await refresh_snapshot(name, db)
+    if envelope is not None:
+        return envelope["data"], None
+    return await _compute(name, db), None
@@ -0,0 +1,206 @@
+"""Monthly range partitions for chat messages and their reactions.
+
+``messages`` is partitioned on created_at and ``message_reactions`` on
+message_created_at (a copy of its message's created_at), one partition per
+calendar month named ``<table>_YYYY_MM``. Both tables also have a DEFAULT
+partition that should stay empty; rows only land there when the
+partition-creation job has fallen behind. PostgreSQL will not create a
+month whose range already has rows in DEFAULT, so those rows are moved
+into the new partition as it is created.
+
+Retention is metadata-only for the partitioned tables. A month is dropped
+once its last day falls outside RETENTION_DAYS. The reactions partition is
+detached and dropped first, then the messages partition. Messages therefore
+live between RETENTION_DAYS and RETENTION_DAYS plus one month, instead of
+being deleted row by row. Translations and reports of the dropped messages
+have no foreign key to cascade from, so they are deleted just before it.
+
+Partition DDL only applies on PostgreSQL; on other databases (SQLite in
+tests) the functions are no-ops.
+"""
+
+import logging
+import re
+from datetime import date, datetime, time, timedelta, timezone
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+logger = logging.getLogger(__name__)
+
+RETENTION_DAYS = 90
+MONTHS_AHEAD = 3   # future months kept ready by the nightly job
+
+# Parent table → partition key column. Reactions come first so retention
+# drops them before the messages they belong to.
+PARTITIONED_TABLES = {
+    "message_reactions": "message_created_at",
+    "messages": "created_at",
+}
+
+# Tables that reference messages(id) without a foreign key; their rows for
+# a dropped month are deleted with it.
+MESSAGE_REFERENCES = ("social_message_translations", "chat_reports")
+
+_PARTITION_RE = re.compile(r"^(?P<table>[a-z_]+)_(?P<year>\d{4})_(?P<month>\d{2})$")
+
+
+def month_start(day: date) -> date:
+    return day.replace(day=1)
+
+
+def add_months(day: date, months: int) -> date:
+    index = day.year * 12 + day.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(table: str, month: date) -> str:
+    return f"{table}_{month:%Y_%m}"
+
+
+def retention_cutoff(now: datetime | None = None) -> datetime:
+    """Oldest created_at still inside the retention window."""
+    return (now or datetime.now(timezone.utc)) - timedelta(days=RETENTION_DAYS)
+
+
+def month_bounds(month: date) -> tuple[datetime, datetime]:
+    """UTC [start, end) of the month containing *month* — one partition's range."""
+    start = month_start(month)
+    return (
+        datetime.combine(start, time.min, timezone.utc),
+        datetime.combine(add_months(start, 1), time.min, timezone.utc),
+    )
+
+
+def utc_bound(month: date) -> str:
+    """Midnight UTC on *month* as a timestamptz literal.
+
+    A bare date would be read in the session's TimeZone, shifting the
+    boundary on any connection not set to UTC.
+    """
+    return f"{month.isoformat()} 00:00:00+00"
+
+
+def partition_ddl(table: str, month: date) -> str:
+    """``CREATE TABLE IF NOT EXISTS`` for one month of *table*."""
+    return (
+        f"CREATE TABLE IF NOT EXISTS {partition_name(table, month)} PARTITION OF {table} "
+        f"FOR VALUES FROM ('{utc_bound(month)}') TO ('{utc_bound(add_months(month, 1))}')"
+    )
+
+
+def _is_postgres(db: AsyncSession) -> bool:
+    return db.get_bind().dialect.name == "postgresql"
+
+
+async def list_partitions(db: AsyncSession, table: str) -> dict[date, str]:
+    """Existing monthly partitions of *table*, keyed by month start."""
+    result = await db.execute(
+        text(
+            "SELECT c.relname FROM pg_inherits i "
+            "JOIN pg_class c ON c.oid = i.inhrelid "
+            "JOIN pg_class p ON p.oid = i.inhparent "
+            "WHERE p.relname = :table"
+        ),
+        {"table": table},
+    )
+    partitions = {}
+    for name in result.scalars():
+        match = _PARTITION_RE.match(name)
+        if match and match["table"] == table:
+            partitions[date(int(match["year"]), int(match["month"]), 1)] = name
+    return partitions
+
+
+async def _create_partition(db: AsyncSession, table: str, month: date) -> None:
+    """Create one month of *table*, moving any rows for it out of DEFAULT first.
+
+    DEFAULT is detached while its rows for the month are moved, then
+    re-attached, all inside the caller's transaction.
+    """
+    column = PARTITIONED_TABLES[table]
+    default = f"{table}_default"
+    in_month = f"{column} >= :start AND {column} < :end"
+    bounds = dict(zip(("start", "end"), month_bounds(month)))
+    stragglers = (await db.execute(text(f"SELECT count(*) FROM {default} WHERE {in_month}"), bounds)).scalar_one()
+    if not stragglers:
+        await db.execute(text(partition_ddl(table, month)))
+        return
+
+    await db.execute(text(f"ALTER TABLE {table} DETACH PARTITION {default}"))
+    await db.execute(text(partition_ddl(table, month)))
+    await db.execute(
+        text(
+            f"WITH moved AS (DELETE FROM {default} WHERE {in_month} RETURNING *) "
+            f"INSERT INTO {table} SELECT * FROM moved"
+        ),
+        bounds,
+    )
+    await db.execute(text(f"ALTER TABLE {table} ATTACH PARTITION {default} DEFAULT"))
+    logger.warning("Moved %d rows from %s into %s", stragglers, default, partition_name(table, month))
+
+
+async def ensure_message_partitions(
+    db: AsyncSession, months_ahead: int = MONTHS_AHEAD, now: datetime | None = None
+) -> list[str]:
+    """Create this month's and the next *months_ahead* months' partitions.
+
+    Idempotent. Rows already sitting in DEFAULT for a new month are moved
+    into it. Returns the names of partitions that did not exist before.
+    """
+    if not _is_postgres(db):
+        return []
+
+    first = month_start((now or datetime.now(timezone.utc)).date())
+    created = []
+    for table in PARTITIONED_TABLES:
+        existing = await list_partitions(db, table)
+        for offset in range(months_ahead + 1):
+            month = add_months(first, offset)
+            if month not in existing:
+                await _create_partition(db, table, month)
+                created.append(partition_name(table, month))
+    await db.commit()
+    if created:
+        logger.info("Created message partitions: %s", ", ".join(created))
+    return created
+
+
+async def drop_expired_message_partitions(
+    db: AsyncSession, retention_days: int = RETENTION_DAYS, now: datetime | None = None
+) -> list[str]:
+    """Detach and drop every monthly partition that ends before the retention cutoff.
+
+    Translations and reports of a dropped month's messages are deleted in
+    the same transaction. Returns the dropped partition names, reactions
+    before messages.
+    """
+    if not _is_postgres(db):
+        return []
+
+    cutoff = (now or datetime.now(timezone.utc)) - timedelta(days=retention_days)
+    dropped = []
+    for table in PARTITIONED_TABLES:
+        for month, name in sorted((await list_partitions(db, table)).items()):
+            if add_months(month, 1) > cutoff.date():
+                continue
+            if table == "messages":
+                for referencing in MESSAGE_REFERENCES:
+                    await db.execute(text(f"DELETE FROM {referencing} WHERE message_id IN (SELECT id FROM {name})"))
+            await db.execute(text(f"ALTER TABLE {table} DETACH PARTITION {name}"))
+            await db.execute(text(f"DROP TABLE {name}"))
+            dropped.append(name)
+    await db.commit()
+    if dropped:
+        logger.info("Dropped expired message partitions: %s", ", ".join(dropped))
+    return dropped
+
+
+async def count_default_partition_rows(db: AsyncSession) -> dict[str, int]:
+    """Rows that fell into each table's DEFAULT partition (should all be 0)."""
+    if not _is_postgres(db):
+        return {}
+    counts = {}
+    for table in PARTITIONED_TABLES:
+        counts[table] = (await db.execute(text(f"SELECT count(*) FROM {table}_default"))).scalar_one()
+    return counts
@@ -1,13 +1,25 @@
-"""Notification service — writes to DB and triggers push notifications."""
+"""Notification service — writes notifications and their push jobs to the outbox.
+
+Creating a notification never performs push delivery inline. The notification
+row and a pending ``notification_outbox`` row are committed in the same
+transaction; ``dispatch_outbox`` (run by the ``dispatch_notification_outbox``
+Celery task) drains pending jobs in batches, delivers the pushes and bumps the
+Redis unread counters.
+"""
 
 import logging
 import uuid
+from collections import Counter
+from datetime import datetime, timedelta, timezone
 
-from sqlalchemy import func, select
+from sqlalchemy import delete, func, insert, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.notification import Notification
-from app.services.push_service import send_push_notification
+from app.models.notification_outbox import NotificationOutbox
+from app.services.bootstrap_service import invalidate_bootstrap
+from app.services.push_service import send_push_batch
+from app.services.redis_service import decrement_unread, increment_unread_many
 from app.services.redis_service import get_unread_count as redis_get_unread_count
 
 logger = logging.getLogger(__name__)
@@ -23,6 +35,22 @@ NOTIFICATION_TYPES = {
     "weekly_summary",
 }
 
+# Rows per multi-row INSERT when creating notifications in bulk
+BULK_INSERT_CHUNK_SIZE = 1000
+# Outbox jobs claimed per dispatcher batch
+OUTBOX_BATCH_SIZE = 500
+# Attempts before an outbox job is parked as "failed"
+OUTBOX_MAX_ATTEMPTS = 5
+# Delay before the first retry of a failed job; doubles with each attempt
+OUTBOX_RETRY_BASE_SECONDS = 30
+# Days a sent job is kept before purge_outbox deletes it
+OUTBOX_RETENTION_DAYS = 7
+
+
+def _push_data(notification_id: uuid.UUID, type: str) -> dict:
+    """Custom push payload so clients can deep-link to the notification."""
+    return {"notification_id": str(notification_id), "type": type}
+
 
 async def create_notification(
     db: AsyncSession,
@@ -31,24 +59,180 @@ async def create_notification(
     title: str,
     body: str | None = None,
 ) -> Notification:
-    """Write notification to DB and trigger push notification."""
+    """Write a notification and its pending push job in one transaction.
+
+    Push delivery happens later in ``dispatch_outbox``. The unread counter
+    is bumped once the rows commit, whether or not the push ever succeeds.
+    """
     notification = Notification(
+        id=uuid.uuid4(),
         user_id=user_id,
         type=type,
         title=title,
         body=body,
     )
     db.add(notification)
+    db.add(
+        NotificationOutbox(
+            notification_id=notification.id,
+            user_id=user_id,
+            title=title,
+            body=body,
+            data=_push_data(notification.id, type),
+        )
+    )
     await db.commit()
     await db.refresh(notification)
+    await _count_unread([user_id])
+    return notification
+
+
+async def bulk_create_notifications(db: AsyncSession, notifications: list[dict]) -> int:
+    """Create many notifications, each with its own content, in one transaction.
+
+    Each item is a dict with ``user_id``, ``type``, ``title`` and optional
+    ``body``. Notification and outbox rows are written with chunked
+    multi-row INSERTs — no ORM objects are built or refreshed — so thousands
+    of notifications cost a handful of round trips.
+
+    Returns the number of notifications created.
+    """
+    if not notifications:
+        return 0
+
+    for start in range(0, len(notifications), BULK_INSERT_CHUNK_SIZE):
+        chunk = notifications[start : start + BULK_INSERT_CHUNK_SIZE]
+        notification_rows = []
+        outbox_rows = []
+        for item in chunk:
+            notification_id = uuid.uuid4()
+            notification_rows.append(
+                {
+                    "id": notification_id,
+                    "user_id": item["user_id"],
+                    "type": item["type"],
+                    "title": item["title"],
+                    "body": item.get("body"),
+                }
+            )
+            outbox_rows.append(
+                {
+                    "id": uuid.uuid4(),
+                    "notification_id": notification_id,
+                    "user_id": item["user_id"],
+                    "title": item["title"],
+                    "body": item.get("body"),
+                    "data": _push_data(notification_id, item["type"]),
+                }
+            )
+        await db.execute(insert(Notification), notification_rows)
+        await db.execute(insert(NotificationOutbox), outbox_rows)
+
+    await db.commit()
+    await _count_unread([item["user_id"] for item in notifications])
+    return len(notifications)
+
 
-    # Trigger push notification (fire-and-forget, don't block on failure)
+async def _count_unread(user_ids: list[uuid.UUID]) -> None:
+    """Add committed notifications to their users' unread counters.
+
+    Counting at commit rather than at push delivery keeps a read that beats
+    the dispatcher, or a push that is parked as failed, from skewing the
+    badge. One pipelined round trip for all users.
+    """
     try:
-        await send_push_notification(db, user_id, title, body or "")
+        await increment_unread_many(Counter(str(user_id) for user_id in user_ids))
     except Exception:
-        pass  # Push failures should not break notification creation
+        logger.warning("Redis unread counters not updated for %d notifications", len(user_ids))
+    await invalidate_bootstrap(*set(user_ids))
 
-    return notification
+
+async def batch_create_notifications(
+    db: AsyncSession,
+    user_ids: list[uuid.UUID],
+    type: str,
+    title: str,
+    body: str | None = None,
+) -> int:
+    """Create the same notification for many users at once (for broadcasts).
+
+    Returns the number of notifications created.
+    """
+    return await bulk_create_notifications(
+        db,
+        [{"user_id": uid, "type": type, "title": title, "body": body} for uid in user_ids],
+    )
+
+
+async def dispatch_outbox(db: AsyncSession, batch_size: int = OUTBOX_BATCH_SIZE) -> dict:
+    """Claim one batch of pending outbox jobs and deliver the pushes.
+
+    Jobs are claimed with ``FOR UPDATE SKIP LOCKED`` so several dispatchers
+    can drain the outbox concurrently. Device tokens for the whole batch are
+    loaded in a single query. Only jobs whose ``next_attempt_at`` has passed
+    are claimed. When a batch fails, its jobs are retried after an
+    exponential backoff (``OUTBOX_RETRY_BASE_SECONDS`` doubled per attempt),
+    so they move behind newer jobs. After ``OUTBOX_MAX_ATTEMPTS`` they are
+    parked as ``failed``.
+
+    Returns ``{"claimed": int, "sent": int, "failed": int, "devices": int}``.
+    """
+    now = datetime.now(timezone.utc)
+    result = await db.execute(
+        select(NotificationOutbox)
+        .where(NotificationOutbox.status == "pending", NotificationOutbox.next_attempt_at <= now)
+        .order_by(NotificationOutbox.next_attempt_at)
+        .limit(batch_size)
+        .with_for_update(skip_locked=True)
+    )
+    jobs = list(result.scalars().all())
+    if not jobs:
+        return {"claimed": 0, "sent": 0, "failed": 0, "devices": 0}
+
+    devices = 0
+    try:
+        devices = await send_push_batch(
+            db, [(job.user_id, job.title, job.body or "", job.data) for job in jobs]
+        )
+    except Exception as exc:
+        logger.error("Outbox dispatch failed for %d jobs: %s", len(jobs), exc)
+        for job in jobs:
+            job.attempts += 1
+            job.last_error = str(exc)
+            if job.attempts >= OUTBOX_MAX_ATTEMPTS:
+                job.status = "failed"
+            else:
+                job.next_attempt_at = now + timedelta(
+                    seconds=OUTBOX_RETRY_BASE_SECONDS * 2 ** (job.attempts - 1)
+                )
+        await db.commit()
+        failed = sum(1 for job in jobs if job.status == "failed")
+        return {"claimed": len(jobs), "sent": 0, "failed": failed, "devices": 0}
+
+    now = datetime.now(timezone.utc)
+    for job in jobs:
+        job.status = "sent"
+        job.attempts += 1
+        job.dispatched_at = now
+    await db.commit()
+
+    return {"claimed": len(jobs), "sent": len(jobs), "failed": 0, "devices": devices}
+
+
+async def purge_outbox(db: AsyncSession, retention_days: int = OUTBOX_RETENTION_DAYS) -> int:
+    """Delete sent outbox jobs dispatched more than ``retention_days`` ago.
+
+    Failed jobs are kept for inspection. Returns the number of rows deleted.
+    """
+    cutoff = datetime.now(timezone.utc) - timedelta(days=retention_days)
+    result = await db.execute(
+        delete(NotificationOutbox).where(
+            NotificationOutbox.status == "sent",
+            NotificationOutbox.dispatched_at < cutoff,
+        )
+    )
+    await db.commit()
+    return result.rowcount
 
 
 async def mark_as_read(db: AsyncSession, notification_id: uuid.UUID, user_id: uuid.UUID) -> bool:
@@ -63,8 +247,16 @@ async def mark_as_read(db: AsyncSession, notification_id: uuid.UUID, user_id: uu
     if notification is None:
         return False
 
+    was_unread = not notification.is_read
     notification.is_read = True
     await db.commit()
+
+    if was_unread:
+        try:
+            await decrement_unread(str(user_id))
+        except Exception:
+            logger.debug("Redis unread count unavailable for user %s, skipping decrement", user_id)
+        await invalidate_bootstrap(user_id)
     return True
 
 
@@ -93,31 +285,3 @@ async def _get_unread_count_from_db(db: AsyncSession, user_id: uuid.UUID) -> int
         )
     )
     return result.scalar_one()
-
-
-async def batch_create_notifications(
-    db: AsyncSession,
-    user_ids: list[uuid.UUID],
-    type: str,
-    title: str,
-    body: str | None = None,
-) -> list[Notification]:
-    """Create notifications for multiple users at once (for broadcasts)."""
-    notifications = []
-    for uid in user_ids:
-        n = Notification(user_id=uid, type=type, title=title, body=body)
-        db.add(n)
-        notifications.append(n)
-
-    await db.commit()
-    for n in notifications:
-        await db.refresh(n)
-
-    # Trigger push notifications for each user
-    for uid in user_ids:
-        try:
-            await send_push_notification(db, uid, title, body or "")
-        except Exception:
-            pass
-
-    return notifications
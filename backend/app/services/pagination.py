@@ -0,0 +1,260 @@
+"""Keyset pagination and row totals for list endpoints.
+
+``paginate`` turns a SQLAlchemy select and a stable sort key — one or more
+columns ending in a unique one, usually ``(created_at, id)`` — into a page
+of rows plus opaque ``next_cursor``/``prev_cursor`` tokens. A cursor page
+seeks straight to the encoded key through the matching index, so page
+1000 costs the same as page 1. Requests without a cursor still page by
+OFFSET, so page-number clients keep working.
+
+Totals are computed only when asked for, in one of three modes:
+
+- ``exact``    — ``COUNT(*)`` over the filtered query
+- ``estimate`` — the PostgreSQL planner's row estimate for the query, or a
+                 counter the caller maintains; cheap, but approximate
+- ``none``     — no total at all; cursor clients only need the cursors
+
+Endpoints adopt it through the ``page_params`` dependency, which defaults
+to an exact total for page-number requests and none for cursor requests.
+"""
+
+import base64
+import json
+import uuid
+from collections.abc import Callable, Sequence
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from decimal import Decimal
+from typing import Any, Literal
+
+from fastapi import Query
+from sqlalchemy import Select, and_, func, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql import operators
+from sqlalchemy.sql.elements import ColumnElement, UnaryExpression
+
+TotalMode = Literal["exact", "estimate", "none"]
+
+
+class InvalidCursor(ValueError):
+    """Raised when a page cursor cannot be decoded for the listing's sort key."""
+
+
+# ── Totals ───────────────────────────────────────────────────────────
+
+
+async def exact_count(db: AsyncSession, query: Select) -> int:
+    """``COUNT(*)`` over *query* with its ordering and limits stripped."""
+    base = query.order_by(None).limit(None).offset(None)
+    return (await db.execute(select(func.count()).select_from(base.subquery()))).scalar_one()
+
+
+async def estimate_count(db: AsyncSession, query: Select) -> int:
+    """The planner's estimated row count for *query*.
+
+    Runs ``EXPLAIN (FORMAT JSON)``, which reads table statistics but no
+    rows. Databases without a JSON plan (SQLite in tests) fall back to
+    ``exact_count``.
+    """
+    bind = db.get_bind()
+    if bind.dialect.name != "postgresql":
+        return await exact_count(db, query)
+
+    base = query.order_by(None).limit(None).offset(None)
+    sql = base.compile(dialect=bind.dialect, compile_kwargs={"literal_binds": True})
+    connection = await db.connection()
+    raw = (await connection.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {sql}")).scalar_one()
+    plan = json.loads(raw) if isinstance(raw, str) else raw
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+async def count_rows(db: AsyncSession, query: Select, mode: TotalMode) -> int | None:
+    """The listing total for *mode*; ``None`` when the caller asked for none."""
+    if mode == "none":
+        return None
+    if mode == "estimate":
+        return await estimate_count(db, query)
+    return await exact_count(db, query)
+
+
+# ── Cursors ──────────────────────────────────────────────────────────
+
+
+SortKey = list[tuple[ColumnElement, bool]]  # (column, descending)
+
+
+def _sort_key(order_by: Sequence[ColumnElement]) -> SortKey:
+    """Split ``(Model.created_at.desc(), Model.id.desc())`` into columns and directions."""
+    key = []
+    for expr in order_by:
+        if isinstance(expr, UnaryExpression) and expr.modifier in (operators.desc_op, operators.asc_op):
+            key.append((expr.element, expr.modifier is operators.desc_op))
+        else:
+            key.append((expr, False))
+    return key
+
+
+def _to_json(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, (uuid.UUID, Decimal)):
+        return str(value)
+    return value
+
+
+def _from_json(column: ColumnElement, value: Any) -> Any:
+    try:
+        python_type = column.type.python_type
+    except NotImplementedError:
+        return value
+    if value is None or isinstance(value, python_type):
+        return value
+    if python_type is datetime:
+        return datetime.fromisoformat(value)
+    return python_type(value)
+
+
+def encode_cursor(values: Sequence[Any], backward: bool = False) -> str:
+    """Encode a row's sort-key values and the direction to page from them."""
+    raw = json.dumps(["p" if backward else "n", [_to_json(v) for v in values]])
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, key: SortKey) -> tuple[bool, list[Any]]:
+    """Decode a token from ``encode_cursor`` into (backward, typed key values).
+
+    Raises:
+        InvalidCursor: if the token is malformed or does not fit *key*.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        direction, raw_values = json.loads(base64.urlsafe_b64decode(padded))
+        if direction not in ("n", "p") or len(raw_values) != len(key):
+            raise ValueError(cursor)
+        values = [_from_json(column, value) for (column, _), value in zip(key, raw_values)]
+    except Exception as exc:
+        raise InvalidCursor("Invalid page cursor") from exc
+    return direction == "p", values
+
+
+def _beyond(key: SortKey, values: list[Any], backward: bool) -> ColumnElement:
+    """Rows strictly after *values* in the key's order (before them when *backward*)."""
+    clauses = []
+    for i, (column, descending) in enumerate(key):
+        toward_smaller = descending != backward
+        step = column < values[i] if toward_smaller else column > values[i]
+        ties = [col == value for (col, _), value in zip(key[:i], values[:i])]
+        clauses.append(and_(*ties, step))
+    return or_(*clauses)
+
+
+def _row_values(row: Any, key: SortKey) -> list[Any]:
+    return [getattr(row, column.key) for column, _ in key]
+
+
+# ── Pages ────────────────────────────────────────────────────────────
+
+
+async def paginate(
+    db: AsyncSession,
+    query: Select,
+    order_by: Sequence[ColumnElement],
+    *,
+    page: int = 1,
+    per_page: int = 20,
+    cursor: str | None = None,
+    total: TotalMode = "exact",
+    offset: int | None = None,
+) -> dict:
+    """Run one page of *query* ordered by *order_by*.
+
+    *order_by* must end in a unique column so every row has a distinct
+    position. Single-entity selects yield ORM objects, anything else yields
+    rows; either way each sort-key column must be readable by its key.
+    *offset* overrides ``(page - 1) * per_page`` for limit/offset clients.
+
+    Returns:
+        {"items", "total", "total_estimated", "page", "per_page",
+         "next_cursor", "prev_cursor"}
+
+    Raises:
+        InvalidCursor: if *cursor* is malformed.
+    """
+    key = _sort_key(order_by)
+    row_total = await count_rows(db, query, total)
+    backward = False
+    paged = query
+    if cursor:
+        backward, values = decode_cursor(cursor, key)
+        paged = paged.where(_beyond(key, values, backward))
+    else:
+        offset = (page - 1) * per_page if offset is None else offset
+        if offset:
+            paged = paged.offset(offset)
+
+    ordering = [column.desc() if descending != backward else column.asc() for column, descending in key]
+    result = await db.execute(paged.order_by(*ordering).limit(per_page + 1))
+    descriptions = query.column_descriptions
+    is_entity = len(descriptions) == 1 and descriptions[0]["expr"] is descriptions[0]["entity"]
+    rows = list(result.scalars().all() if is_entity else result.all())
+
+    has_more = len(rows) > per_page
+    rows = rows[:per_page]
+    next_cursor = prev_cursor = None
+    if backward:
+        rows.reverse()
+        if rows:
+            next_cursor = encode_cursor(_row_values(rows[-1], key))
+            if has_more:
+                prev_cursor = encode_cursor(_row_values(rows[0], key), backward=True)
+    elif rows:
+        if has_more:
+            next_cursor = encode_cursor(_row_values(rows[-1], key))
+        if cursor or offset:
+            prev_cursor = encode_cursor(_row_values(rows[0], key), backward=True)
+
+    return {
+        "items": rows,
+        "total": row_total,
+        "total_estimated": total == "estimate",
+        "page": page,
+        "per_page": per_page,
+        "next_cursor": next_cursor,
+        "prev_cursor": prev_cursor,
+    }
+
+
+# ── FastAPI dependency ───────────────────────────────────────────────
+
+
+@dataclass(frozen=True)
+class PageParams:
+    page: int = 1
+    per_page: int = 20
+    cursor: str | None = None
+    total: TotalMode = "exact"
+
+    def as_kwargs(self) -> dict:
+        """Keyword arguments for ``paginate`` and the list services built on it."""
+        return asdict(self)
+
+
+def page_params(
+    default_per_page: int = 20, max_per_page: int = 100, per_page_alias: str = "per_page"
+) -> Callable[..., PageParams]:
+    """Build the query-parameter dependency for a paginated endpoint.
+
+    ``per_page_alias`` keeps an endpoint's existing page-size parameter name
+    (e.g. ``page_size`` or ``limit``). Totals are lazy: exact for page-number
+    requests, none for cursor requests unless ``total`` says otherwise.
+    """
+
+    def dependency(
+        page: int = Query(1, ge=1),
+        per_page: int = Query(default_per_page, ge=1, le=max_per_page, alias=per_page_alias),
+        cursor: str | None = Query(default=None, description="next_cursor or prev_cursor from a previous page"),
+        total: TotalMode | None = Query(default=None, description="exact, estimate or none"),
+    ) -> PageParams:
+        return PageParams(page, per_page, cursor, total or ("none" if cursor else "exact"))
+
+    return dependency
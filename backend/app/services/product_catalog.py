@@ -0,0 +1,171 @@
+"""In-process product catalog with versioned invalidation.
+
+The catalog is a handful of rarely-changing SKUs, so each process keeps the
+whole products table in memory as an immutable, indexed snapshot (by id,
+and per flavor for each sort order). Listing and detail reads are then
+dictionary lookups and tuple slices.
+
+Freshness is driven by a Redis counter (``PRODUCT_CATALOG_VERSION``) that
+every product write bumps:
+
+  - checked within CATALOG_CHECK_SECONDS → snapshot served, no I/O at all
+  - counter unchanged                    → snapshot kept, check time reset
+  - counter moved                        → snapshot reloaded from the DB
+  - Redis unavailable                    → snapshot reloaded on each check,
+                                           so staleness stays bounded
+  - older than CATALOG_MAX_AGE_SECONDS   → reloaded, as a safety net for
+                                           products edited outside the API
+"""
+
+from __future__ import annotations
+
+import logging
+import time
+import uuid
+from dataclasses import dataclass
+from decimal import Decimal
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.product import Product
+from app.services.redis_service import (
+    bump_catalog_version as _bump_catalog_version,
+    get_catalog_version,
+)
+
+logger = logging.getLogger(__name__)
+
+# Seconds between Redis version checks; bounds cross-process staleness.
+CATALOG_CHECK_SECONDS = 5.0
+# Seconds after which a snapshot is reloaded even if the version did not move.
+CATALOG_MAX_AGE_SECONDS = 300.0
+
+SORT_KEYS = {
+    "price_asc": lambda p: (p.price, p.name, p.id),
+    "price_desc": lambda p: (-p.price, p.name, p.id),
+    "name": lambda p: (p.name, p.id),
+}
+DEFAULT_SORT = "name"
+
+
+@dataclass(frozen=True, slots=True)
+class CatalogProduct:
+    """Read-only copy of a product row, safe to share across requests."""
+
+    id: uuid.UUID
+    name: str
+    description: str | None
+    price: Decimal
+    flavor: str | None
+    nicotine_strength: str | None
+    image_url: str | None
+    stock: int
+    is_active: bool
+
+    @classmethod
+    def from_model(cls, product: Product) -> CatalogProduct:
+        return cls(
+            id=product.id,
+            name=product.name,
+            description=product.description,
+            price=product.price,
+            flavor=product.flavor,
+            nicotine_strength=product.nicotine_strength,
+            image_url=product.image_url,
+            stock=product.stock,
+            is_active=product.is_active,
+        )
+
+
+class ProductCatalog:
+    """Immutable snapshot of the products table, indexed for the shop's reads.
+
+    ``get`` sees every product (detail pages and past orders may reference
+    inactive ones); ``list`` only returns active products.
+    """
+
+    def __init__(self, products: list[CatalogProduct], version: int | None) -> None:
+        self.version = version
+        self.loaded_at = time.monotonic()
+        self._by_id = {p.id: p for p in products}
+        active = [p for p in products if p.is_active]
+        self._sorted: dict[tuple[str | None, str], tuple[CatalogProduct, ...]] = {}
+        for sort_by, key in SORT_KEYS.items():
+            ordered = sorted(active, key=key)
+            self._sorted[(None, sort_by)] = tuple(ordered)
+            by_flavor: dict[str, list[CatalogProduct]] = {}
+            for product in ordered:
+                if product.flavor is not None:
+                    by_flavor.setdefault(product.flavor, []).append(product)
+            for flavor, products_for_flavor in by_flavor.items():
+                self._sorted[(flavor, sort_by)] = tuple(products_for_flavor)
+
+    def __len__(self) -> int:
+        return len(self._by_id)
+
+    def get(self, product_id: uuid.UUID) -> CatalogProduct | None:
+        return self._by_id.get(product_id)
+
+    def list(
+        self, flavor: str | None = None, sort_by: str = DEFAULT_SORT
+    ) -> tuple[CatalogProduct, ...]:
+        """Active products, optionally for one flavor, in ``sort_by`` order."""
+        if sort_by not in SORT_KEYS:
+            sort_by = DEFAULT_SORT
+        return self._sorted.get((flavor or None, sort_by), ())
+
+
+_catalog: ProductCatalog | None = None
+_checked_at = 0.0
+
+
+async def _load(db: AsyncSession, version: int | None) -> ProductCatalog:
+    result = await db.execute(select(Product))
+    catalog = ProductCatalog([CatalogProduct.from_model(p) for p in result.scalars().all()], version)
+    logger.debug("Loaded product catalog v%s (%d products)", version, len(catalog))
+    return catalog
+
+
+async def get_catalog(db: AsyncSession) -> ProductCatalog:
+    """Return this process's catalog snapshot, reloading it when it may be stale."""
+    global _catalog, _checked_at
+
+    now = time.monotonic()
+    catalog = _catalog
+    if catalog is not None and now - _checked_at < CATALOG_CHECK_SECONDS:
+        return catalog
+
+    try:
+        version = await get_catalog_version()
+    except Exception:
+        logger.debug("Catalog version unavailable, reloading products from DB")
+        version = None
+
+    if (
+        catalog is None
+        or version is None
+        or version != catalog.version
+        or now - catalog.loaded_at >= CATALOG_MAX_AGE_SECONDS
+    ):
+        catalog = _catalog = await _load(db, version)
+    _checked_at = now
+    return catalog
+
+
+def drop_local_catalog() -> None:
+    """Forget this process's snapshot; the next read reloads it."""
+    global _catalog, _checked_at
+    _catalog = None
+    _checked_at = 0.0
+
+
+async def bump_catalog_version() -> None:
+    """Invalidate every process's catalog after a product write. Never raises."""
+    drop_local_catalog()
+    try:
+        await _bump_catalog_version()
+    except Exception:
+        logger.debug(
+            "Catalog version not bumped; other processes reload within %ss", CATALOG_MAX_AGE_SECONDS
+        )
@@ -4,6 +4,7 @@ APNs uses HTTP/2 with JWT authentication (ES256, .p8 key).
 FCM uses the legacy HTTP v1 server-key API.
 """
 
+import asyncio
 import json
 import logging
 import os
@@ -26,6 +27,9 @@ logger = logging.getLogger(__name__)
 APNS_PRODUCTION_URL = "https://api.push.apple.com/3/device/{token}"
 APNS_SANDBOX_URL = "https://api.sandbox.push.apple.com/3/device/{token}"
 
+# Maximum in-flight APNs/FCM requests when delivering a batch
+PUSH_BATCH_CONCURRENCY = 50
+
 
 # ---------------------------------------------------------------------------
 # Internal helpers
@@ -267,6 +271,47 @@ async def send_push_notification(
     return count
 
 
+async def send_push_batch(
+    db: AsyncSession, messages: list[tuple[uuid.UUID, str, str, dict | None]]
+) -> int:
+    """Deliver many user-addressed pushes with a single device-token lookup.
+
+    *messages* is a list of ``(user_id, title, body, data)`` tuples. Device
+    tokens for every recipient are loaded in one query and deliveries run
+    concurrently, bounded by ``PUSH_BATCH_CONCURRENCY``.
+
+    Returns the number of devices for which delivery was attempted.
+    Never raises for individual delivery failures — they are caught and logged.
+    """
+    if not messages:
+        return 0
+
+    user_ids = {user_id for user_id, _, _, _ in messages}
+    result = await db.execute(select(DeviceToken).where(DeviceToken.user_id.in_(user_ids)))
+    tokens_by_user: dict[uuid.UUID, list[DeviceToken]] = {}
+    for dt in result.scalars().all():
+        tokens_by_user.setdefault(dt.user_id, []).append(dt)
+
+    semaphore = asyncio.Semaphore(PUSH_BATCH_CONCURRENCY)
+
+    async def _deliver(dt: DeviceToken, title: str, body: str, data: dict | None) -> None:
+        async with semaphore:
+            try:
+                await _dispatch(dt, title, body, data)
+            except Exception as exc:
+                logger.error(
+                    "PUSH Unhandled exception for user=%s token=%s: %s", dt.user_id, dt.token, exc
+                )
+
+    deliveries = [
+        _deliver(dt, title, body, data)
+        for user_id, title, body, data in messages
+        for dt in tokens_by_user.get(user_id, [])
+    ]
+    await asyncio.gather(*deliveries)
+    return len(deliveries)
+
+
 async def send_push_to_segment(
     db: AsyncSession, tier_name: str, title: str, body: str, data: dict | None = None
 ) -> int:
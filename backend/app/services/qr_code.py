@@ -13,8 +13,13 @@ from app.models.product import Product
 from app.models.qr_code import QRCode
 from app.models.scan import Scan
 from app.models.user import User
-from app.models.wallet import Wallet
+from app.services.affiliate_service import record_referral_scan
+from app.services.bootstrap_service import invalidate_bootstrap
+from app.services.comp_engine import award_milestone_comp, find_crypto_comp_milestone
+from app.services.qr_mint_service import MINT_CHUNK_SIZE, mint_chunk, product_code_for
+from app.services.scan_events import ScanEvent, publish_scan_event
 from app.services.tier import get_all_tiers, get_quarterly_scan_count, get_user_tier_info
+from app.services.wallet_service import credit_wallet, get_available_balance
 
 logger = logging.getLogger(__name__)
 
@@ -96,7 +101,9 @@ async def submit_scan(db: AsyncSession, user: User, raw_qr: str) -> dict:
     usdc_earned = BASE_RATE * tier_multiplier
 
     # Record the scan
+    scan_id = uuid.uuid4()
     scan = Scan(
+        id=scan_id,
         user_id=user.id,
         qr_code_id=qr.id,
         usdc_earned=usdc_earned,
@@ -108,60 +115,56 @@ async def submit_scan(db: AsyncSession, user: User, raw_qr: str) -> dict:
     # Mark QR as used
     qr.is_used = True
     qr.scanned_by = user.id
-    qr.scanned_at = datetime.now(timezone.utc)
+    scanned_at = datetime.now(timezone.utc)
+    qr.scanned_at = scanned_at
 
-    # Credit wallet
-    wallet_result = await db.execute(
-        select(Wallet).where(Wallet.user_id == user.id)
-    )
-    wallet = wallet_result.scalar_one_or_none()
-    wallet_balance = Decimal("0")
-    if wallet:
-        wallet.balance_available += usdc_earned
-        wallet_balance = wallet.balance_available
+    # Credit wallet — an append-only ledger entry, no wallet row lock
+    await credit_wallet(db, user.id, usdc_earned, "scan_earning", reference_id=scan_id)
+
+    await record_referral_scan(db, user.id)
 
     await db.commit()
+    await invalidate_bootstrap(user.id)
+
+    wallet_balance = await get_available_balance(db, user.id)
 
     # Get updated tier info (post-scan quarterly count)
     tier_info = await get_user_tier_info(db, user.id)
     quarterly_scans = tier_info.get("quarterly_scans", 0)
 
     # Determine quarter label
-    now = datetime.now(timezone.utc)
-    quarter = f"Q{(now.month - 1) // 3 + 1} {now.year}"
+    quarter = f"Q{(scanned_at.month - 1) // 3 + 1} {scanned_at.year}"
 
-    # Check comp milestone (fire-and-forget — never break scan on comp failure)
+    # Milestone comps shape the response, so they are awarded here; the comps
+    # consumer only retries when this fails (never break scan on comp failure).
     comp_earned = None
     milestone_hit = False
     try:
-        from app.services.comp_engine import award_crypto_comp, check_crypto_comp_milestone
-        milestone = await check_crypto_comp_milestone(db, user.id)
+        milestone = await find_crypto_comp_milestone(db, user.id, tier_info.get("tier_name") or "Standard")
         if milestone:
+            comp_id = await award_milestone_comp(db, user.id, milestone["amount"])
             milestone_hit = True
-            txn = await award_crypto_comp(db, user.id, milestone["amount"])
             comp_earned = {
-                "id": txn.id,
+                "id": comp_id,
                 "amount": float(milestone["amount"]),
                 "type": "crypto_comp",
                 "status": "pending_choice",
                 "requires_payout_choice": True,
             }
     except Exception as exc:
+        await db.rollback()
         logger.warning("Comp milestone check failed for user %s: %s", user.id, exc)
 
-    # Increment Redis counters (global counter + velocity; leaderboard removed from scope)
+    # Referral chips, counters and tier history run in scan event consumers;
+    # the response only reads the counter.
+    await publish_scan_event(db, ScanEvent(scan_id=scan_id, user_id=user.id, scanned_at=scanned_at))
+
     global_scan_count = 0
     try:
-        from app.services.redis_service import (
-            get_global_scan_count,
-            increment_global_scan_counter,
-            track_scan_velocity,
-        )
-        await increment_global_scan_counter()
-        await track_scan_velocity()
+        from app.services.redis_service import get_global_scan_count
         global_scan_count = await get_global_scan_count()
     except Exception as exc:
-        logger.warning("Redis scan counter update failed: %s", exc)
+        logger.warning("Redis scan counter read failed: %s", exc)
 
     return {
         "success": True,
@@ -187,29 +190,23 @@ async def submit_scan(db: AsyncSession, user: User, raw_qr: str) -> dict:
 async def generate_qr_codes(
     db: AsyncSession, product_id: uuid.UUID, quantity: int
 ) -> list[str]:
-    """Generate bulk QR codes for a product. Returns list of full code strings."""
+    """Generate bulk QR codes for a product. Returns list of full code strings.
+
+    For admin-sized batches returned inline; print runs go through
+    ``qr_mint_service`` jobs. Codes are bulk-loaded in one transaction and
+    collisions are re-minted until ``quantity`` codes exist.
+    """
     # Verify product exists
     result = await db.execute(select(Product).where(Product.id == product_id))
     product = result.scalar_one_or_none()
     if product is None:
         raise HTTPException(status.HTTP_404_NOT_FOUND, "Product not found")
 
-    # Derive a short product code from the product name
-    product_code = re.sub(r"[^A-Za-z0-9]", "", product.name).upper()[:10]
-    if not product_code:
-        product_code = "PROD"
-
-    codes = []
-    for _ in range(quantity):
-        short_uuid = uuid.uuid4().hex[:12].upper()
-        full_code = f"BLAKJAKS-{product_code}-{short_uuid}"
-        qr = QRCode(
-            product_code=product_code,
-            unique_id=full_code,
-            product_id=product_id,
-        )
-        db.add(qr)
-        codes.append(full_code)
+    product_code = product_code_for(product.name)
+    codes: list[str] = []
+    while len(codes) < quantity:
+        count = min(MINT_CHUNK_SIZE, quantity - len(codes))
+        codes.extend(await mint_chunk(db, product_id, product_code, count))
 
     await db.commit()
     return codes
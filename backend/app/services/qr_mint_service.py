@@ -0,0 +1,281 @@
+"""Bulk QR code minting for print runs.
+
+Both the synchronous admin batch (``qr_code.generate_qr_codes``) and the
+asynchronous mint jobs use one loader. Codes are generated in chunks and
+bulk-loaded without ORM objects. On PostgreSQL each chunk is COPYed into a
+session-local staging table and moved into qr_codes with one
+``INSERT ... ON CONFLICT (unique_id) DO NOTHING``; other databases (tests,
+local SQLite) get the same INSERT as multi-row VALUES. Rows dropped by the
+conflict clause are unique_id collisions — they are counted and minted
+again in the next chunk, so a job always ends with exactly ``quantity``
+codes.
+
+Memory use is bounded by the chunk size for minting and by
+EXPORT_BATCH_SIZE for the streamed export, whatever the job's quantity.
+"""
+
+import csv
+import io
+import json
+import logging
+import re
+import secrets
+import time
+import uuid
+from collections.abc import AsyncIterator
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import and_, or_, select, text, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.product import Product
+from app.models.qr_code import QRCode
+from app.models.qr_mint_job import QRMintJob
+
+logger = logging.getLogger(__name__)
+
+MINT_CHUNK_SIZE = 10_000       # codes generated, loaded and committed per chunk
+EXPORT_BATCH_SIZE = 5_000      # codes read per keyset page of the export
+VALUES_INSERT_BATCH = 1_000    # rows per INSERT when COPY is unavailable
+MAX_EMPTY_CHUNKS = 3           # consecutive all-collision chunks before giving up
+MAX_MINT_ATTEMPTS = 5          # claims per job before a failure is left for an admin
+MINT_STALE_AFTER = timedelta(minutes=15)  # running job without a chunk commit is presumed dead
+
+EXPORT_FORMATS = {"csv": "text/csv", "ndjson": "application/x-ndjson"}
+
+_COLUMNS = ("id", "product_code", "unique_id", "product_id", "mint_job_id")
+
+
+def product_code_for(name: str) -> str:
+    """Derive the short product code embedded in QR strings from a product name."""
+    return re.sub(r"[^A-Za-z0-9]", "", name).upper()[:10] or "PROD"
+
+
+def _random_codes(product_code: str, count: int) -> list[str]:
+    """Return ``count`` distinct BLAKJAKS-{product_code}-{12 hex} strings."""
+    codes: set[str] = set()
+    while len(codes) < count:
+        codes.add(f"BLAKJAKS-{product_code}-{secrets.token_hex(6).upper()}")
+    return list(codes)
+
+
+async def _copy_codes(db: AsyncSession, rows: list[tuple]) -> list[str]:
+    """COPY rows into the staging table and move the non-colliding ones into qr_codes."""
+    await db.execute(text(
+        "CREATE TEMP TABLE IF NOT EXISTS qr_mint_staging ("
+        " id uuid, product_code varchar(100), unique_id varchar(255),"
+        " product_id uuid, mint_job_id uuid"
+        ") ON COMMIT DELETE ROWS"
+    ))
+    connection = await db.connection()
+    raw = await connection.get_raw_connection()
+    await raw.driver_connection.copy_records_to_table(
+        "qr_mint_staging", records=rows, columns=list(_COLUMNS)
+    )
+    result = await db.execute(text(
+        "INSERT INTO qr_codes (id, product_code, unique_id, product_id, mint_job_id) "
+        "SELECT id, product_code, unique_id, product_id, mint_job_id FROM qr_mint_staging "
+        "ON CONFLICT (unique_id) DO NOTHING RETURNING unique_id"
+    ))
+    inserted = list(result.scalars())
+    await db.execute(text("TRUNCATE qr_mint_staging"))
+    return inserted
+
+
+async def _insert_codes(db: AsyncSession, rows: list[tuple]) -> list[str]:
+    """Multi-row INSERT ... ON CONFLICT DO NOTHING, for databases without COPY."""
+    inserted: list[str] = []
+    for start in range(0, len(rows), VALUES_INSERT_BATCH):
+        batch = [dict(zip(_COLUMNS, row)) for row in rows[start:start + VALUES_INSERT_BATCH]]
+        result = await db.execute(
+            pg_insert(QRCode)
+            .values(batch)
+            .on_conflict_do_nothing(index_elements=["unique_id"])
+            .returning(QRCode.unique_id)
+        )
+        inserted.extend(result.scalars())
+    return inserted
+
+
+async def mint_chunk(
+    db: AsyncSession,
+    product_id: uuid.UUID,
+    product_code: str,
+    count: int,
+    mint_job_id: uuid.UUID | None = None,
+) -> list[str]:
+    """Generate and bulk-load ``count`` codes; returns the ones actually inserted.
+
+    ``count - len(result)`` codes collided with existing unique_ids. Does not
+    commit.
+    """
+    rows = [
+        (uuid.uuid4(), product_code, code, product_id, mint_job_id)
+        for code in _random_codes(product_code, count)
+    ]
+    if db.get_bind().dialect.name == "postgresql":
+        return await _copy_codes(db, rows)
+    return await _insert_codes(db, rows)
+
+
+async def create_mint_job(
+    db: AsyncSession, product_id: uuid.UUID, quantity: int, requested_by: uuid.UUID | None = None
+) -> QRMintJob:
+    """Queue a print run of ``quantity`` codes. Raises ValueError for an unknown product."""
+    product = await db.scalar(select(Product).where(Product.id == product_id))
+    if product is None:
+        raise ValueError("Product not found")
+
+    job = QRMintJob(
+        product_id=product_id,
+        product_code=product_code_for(product.name),
+        quantity=quantity,
+        requested_by=requested_by,
+    )
+    db.add(job)
+    await db.commit()
+    await db.refresh(job)
+    return job
+
+
+async def get_mint_job(db: AsyncSession, job_id: uuid.UUID) -> QRMintJob | None:
+    return await db.scalar(select(QRMintJob).where(QRMintJob.id == job_id))
+
+
+def _claimable(now: datetime):
+    """Jobs a worker may take: queued, failed with attempts left, or running but stale."""
+    return or_(
+        QRMintJob.status == "queued",
+        and_(QRMintJob.status == "failed", QRMintJob.attempts < MAX_MINT_ATTEMPTS),
+        and_(
+            QRMintJob.status == "running",
+            QRMintJob.attempts < MAX_MINT_ATTEMPTS,
+            QRMintJob.updated_at < now - MINT_STALE_AFTER,
+        ),
+    )
+
+
+async def resumable_mint_jobs(db: AsyncSession) -> list[uuid.UUID]:
+    """Return failed jobs with attempts left and running jobs whose worker died."""
+    now = datetime.now(timezone.utc)
+    return list((await db.execute(
+        select(QRMintJob.id)
+        .where(QRMintJob.status.in_(("failed", "running")), _claimable(now))
+        .order_by(QRMintJob.created_at)
+    )).scalars().all())
+
+
+def _mint_job_report(job: QRMintJob, chunks: int, started: float, skipped: bool = False) -> dict:
+    return {
+        "job_id": str(job.id),
+        "status": job.status,
+        "quantity": job.quantity,
+        "minted": job.minted,
+        "collisions": job.collisions,
+        "chunks": chunks,
+        "skipped": skipped,
+        "duration_seconds": round(time.monotonic() - started, 3),
+    }
+
+
+async def run_mint_job(
+    db: AsyncSession, job_id: uuid.UUID, chunk_size: int = MINT_CHUNK_SIZE
+) -> dict:
+    """Mint a job's codes chunk by chunk, committing codes and progress together.
+
+    The job is claimed by moving it to running in one UPDATE, so a duplicate
+    task delivery never mints the same job twice. Queued jobs are claimable,
+    as are failed jobs under MAX_MINT_ATTEMPTS and running jobs with no
+    chunk committed for MINT_STALE_AFTER (their worker died); anything else
+    is skipped. A reclaimed job resumes from its committed ``minted`` count.
+    The resume_mint_jobs beat task re-queues failed and stale jobs.
+    """
+    started = time.monotonic()
+    job = await get_mint_job(db, job_id)
+    if job is None:
+        raise ValueError(f"Mint job {job_id} not found")
+
+    claimed = (await db.execute(
+        update(QRMintJob)
+        .where(QRMintJob.id == job_id, _claimable(datetime.now(timezone.utc)))
+        .values(status="running", last_error=None, attempts=QRMintJob.attempts + 1)
+        .returning(QRMintJob.id)
+        .execution_options(synchronize_session=False)
+    )).scalar_one_or_none()
+    await db.commit()
+    await db.refresh(job)
+    if claimed is None:
+        logger.info("QR mint job %s not claimed (status %s), skipping", job_id, job.status)
+        return _mint_job_report(job, 0, started, skipped=True)
+
+    chunks = empty_chunks = 0
+    try:
+        while job.minted < job.quantity:
+            count = min(chunk_size, job.quantity - job.minted)
+            inserted = len(await mint_chunk(db, job.product_id, job.product_code, count, job.id))
+            job.minted += inserted
+            job.collisions += count - inserted
+            await db.commit()
+            chunks += 1
+
+            empty_chunks = empty_chunks + 1 if inserted == 0 else 0
+            if empty_chunks >= MAX_EMPTY_CHUNKS:
+                raise RuntimeError(f"{count} of {count} codes collided {MAX_EMPTY_CHUNKS} times in a row")
+    except Exception as exc:
+        await db.rollback()
+        job = await get_mint_job(db, job_id)
+        job.status = "failed"
+        job.last_error = str(exc)[:500]
+        await db.commit()
+        logger.error("QR mint job %s failed after %d codes: %s", job_id, job.minted, exc)
+        raise
+
+    job.status = "completed"
+    job.finished_at = datetime.now(timezone.utc)
+    await db.commit()
+
+    report = _mint_job_report(job, chunks, started)
+    logger.info(
+        "QR mint job %s completed — %d codes, %d collisions, %d chunks in %.1fs",
+        job_id, job.minted, job.collisions, chunks, report["duration_seconds"],
+    )
+    return report
+
+
+async def stream_mint_job_codes(
+    db: AsyncSession, job_id: uuid.UUID, fmt: str = "csv"
+) -> AsyncIterator[str]:
+    """Yield a job's codes as CSV or NDJSON text, one keyset page at a time."""
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Unsupported export format: {fmt!r}")
+    if fmt == "csv":
+        yield "unique_id,product_code\r\n"
+
+    after_id = None
+    while True:
+        query = (
+            select(QRCode.id, QRCode.unique_id, QRCode.product_code)
+            .where(QRCode.mint_job_id == job_id)
+            .order_by(QRCode.id)
+            .limit(EXPORT_BATCH_SIZE)
+        )
+        if after_id is not None:
+            query = query.where(QRCode.id > after_id)
+        rows = (await db.execute(query)).all()
+        if not rows:
+            return
+
+        if fmt == "csv":
+            buffer = io.StringIO()
+            csv.writer(buffer).writerows((row.unique_id, row.product_code) for row in rows)
+            yield buffer.getvalue()
+        else:
+            yield "".join(
+                json.dumps({"unique_id": row.unique_id, "product_code": row.product_code}) + "\n"
+                for row in rows
+            )
+
+        if len(rows) < EXPORT_BATCH_SIZE:
+            return
+        after_id = rows[-1].id
@@ -8,6 +8,7 @@ from sqlalchemy import func, select
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.models.message import Message
 from app.models.message_reaction import MessageReaction
 
 logger = logging.getLogger(__name__)
@@ -25,7 +26,14 @@ async def add_reaction(
     Returns {message_id, emoji, count, reacted_by_me: True} on success.
     Raises HTTPException 409 if the same user already reacted with the same emoji.
     """
-    reaction = MessageReaction(message_id=message_id, user_id=user_id, emoji=emoji)
+    reaction = MessageReaction(
+        message_id=message_id,
+        user_id=user_id,
+        emoji=emoji,
+        # Partition key, copied from the message in the INSERT itself; an unknown
+        # message leaves it NULL and fails like the old foreign key did.
+        message_created_at=select(Message.created_at).where(Message.id == message_id).scalar_subquery(),
+    )
     db.add(reaction)
     try:
         await db.commit()
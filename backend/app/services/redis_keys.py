@@ -17,6 +17,14 @@ TTL_GIF_TRENDING = 600           # 10 minutes — Giphy trending GIFs
 TTL_LEADERBOARD_MONTHLY = 0      # no TTL — expires via monthly reset
 TTL_LEADERBOARD_ALL_TIME = 0     # no TTL — permanent
 TTL_GLOBAL_SCAN_COUNTER = 0      # no TTL — permanent counter
+TTL_INSIGHTS_SNAPSHOT = 3600     # 1 hour — hard expiry for dashboard snapshots
+TTL_INSIGHTS_REFRESH_LOCK = 30   # 30 seconds — single-flight snapshot refresh lock
+TTL_TREASURY_SPARKLINES = 7200   # 2 hours — safety net; invalidated by each snapshot write
+TTL_SCAN_COUNTED = 86400         # 1 day — dedupe marker for redelivered scan events
+TTL_BOOTSTRAP = 300              # 5 minutes — safety net; invalidated by profile/wallet/notification/vote writes
+TTL_BOOTSTRAP_GENERATION = 86400  # 1 day — outlives any rebuild that read it; refreshed by every invalidation
+TTL_CART = 2592000               # 30 days — refreshed by every cart mutation; flushed to Postgres when idle
+TTL_TRANSLATION_FANOUT_CLAIM = 60  # 1 minute — one pod translates each (message, language) for live fan-out
 
 # ---------------------------------------------------------------------------
 # Global counters
@@ -111,3 +119,171 @@ def gif_search_cache(query: str, limit: int, offset: int) -> str:
 
 GIF_TRENDING_CACHE = "blakjaks:giphy:trending"
 """Cache key for Giphy trending GIFs (shared across all users)."""
+
+
+# ---------------------------------------------------------------------------
+# Translation cache keys
+# ---------------------------------------------------------------------------
+
+
+def translation_cache(message_id: str, language: str) -> str:
+    """Return the Redis key for a cached message translation.
+
+    Args:
+        message_id: The social message UUID.
+        language:   ISO 639-1 target language code.
+
+    Returns:
+        Key string like "blakjaks:translation:{message_id}:{language}".
+    """
+    return f"blakjaks:translation:{message_id}:{language}"
+
+
+def translation_fanout_claim(message_id: str, language: str) -> str:
+    """Return the SET NX key that elects one pod to translate a live message.
+
+    Args:
+        message_id: The social message UUID.
+        language:   ISO 639-1 target language code.
+
+    Returns:
+        Key string like "blakjaks:translation:fanout:{message_id}:{language}".
+    """
+    return f"blakjaks:translation:fanout:{message_id}:{language}"
+
+
+# ---------------------------------------------------------------------------
+# Insights snapshot keys
+# ---------------------------------------------------------------------------
+
+
+def insights_snapshot(name: str) -> str:
+    """Return the Redis key for a precomputed insights dashboard payload.
+
+    Args:
+        name: Snapshot name, e.g. "overview" or "treasury".
+
+    Returns:
+        Key string like "blakjaks:insights:snapshot:{name}".
+    """
+    return f"blakjaks:insights:snapshot:{name}"
+
+
+def insights_snapshot_version(name: str) -> str:
+    """Return the Redis key for a snapshot's monotonically increasing version."""
+    return f"blakjaks:insights:snapshot:{name}:version"
+
+
+def insights_snapshot_lock(name: str) -> str:
+    """Return the Redis key guarding a single in-flight snapshot refresh."""
+    return f"blakjaks:insights:snapshot:{name}:lock"
+
+
+# ---------------------------------------------------------------------------
+# Treasury sparkline cache
+# ---------------------------------------------------------------------------
+
+TREASURY_SPARKLINES_GENERATION = "blakjaks:treasury:sparklines:generation"
+"""Counter bumped by every treasury snapshot write; part of each sparkline cache key."""
+
+
+def treasury_sparklines(generation: int, days: int) -> str:
+    """Return the Redis key for cached multi-pool sparklines.
+
+    Args:
+        generation: Current value of TREASURY_SPARKLINES_GENERATION.
+        days: Days of history in the cached series.
+
+    Returns:
+        Key string like "blakjaks:treasury:sparklines:{generation}:{days}".
+    """
+    return f"blakjaks:treasury:sparklines:{generation}:{days}"
+
+
+# ---------------------------------------------------------------------------
+# Scan event stream
+# ---------------------------------------------------------------------------
+
+SCAN_EVENTS_STREAM = "blakjaks:scans:events"
+"""Stream of committed scans; each side-effect consumer group reads it independently."""
+
+SCAN_EVENTS_DEAD_LETTER = "blakjaks:scans:events:dead"
+"""Stream of scan events that exhausted their deliveries, tagged with group and error."""
+
+
+def scan_counted(scan_id: str) -> str:
+    """Return the Redis key marking a scan as already added to the counters.
+
+    Args:
+        scan_id: The scan's UUID string.
+
+    Returns:
+        Key string like "blakjaks:scans:counted:{scan_id}".
+    """
+    return f"blakjaks:scans:counted:{scan_id}"
+
+
+# ---------------------------------------------------------------------------
+# Bootstrap payload cache
+# ---------------------------------------------------------------------------
+
+BOOTSTRAP_VOTES_GENERATION = "blakjaks:bootstrap:votes:generation"
+"""Counter bumped whenever a vote opens or closes; cached payloads from older generations are stale."""
+
+
+def bootstrap_payload(user_id: str) -> str:
+    """Return the Redis key for a user's cached app-launch bootstrap payload.
+
+    Args:
+        user_id: The user's UUID string.
+
+    Returns:
+        Key string like "blakjaks:bootstrap:{user_id}".
+    """
+    return f"blakjaks:bootstrap:{user_id}"
+
+
+def bootstrap_generation(user_id: str) -> str:
+    """Return the Redis key for a user's bootstrap invalidation counter.
+
+    Bumped by every invalidation, so a rebuild that started before a write
+    can tell its payload is stale and skip caching it.
+
+    Args:
+        user_id: The user's UUID string.
+
+    Returns:
+        Key string like "blakjaks:bootstrap:{user_id}:generation".
+    """
+    return f"blakjaks:bootstrap:{user_id}:generation"
+
+
+# ---------------------------------------------------------------------------
+# Product catalog
+# ---------------------------------------------------------------------------
+
+PRODUCT_CATALOG_VERSION = "blakjaks:shop:catalog:version"
+"""Counter bumped by every product write; processes reload their in-memory catalog when it moves."""
+
+
+# ---------------------------------------------------------------------------
+# Shopping carts
+# ---------------------------------------------------------------------------
+
+CART_DIRTY = "blakjaks:cart:dirty"
+"""Sorted set of user IDs with cart changes not yet written to cart_items; score = last change (epoch)."""
+
+CART_HYDRATED_FIELD = "_hydrated"
+"""Sentinel field present in every loaded cart hash, so an empty cart is not re-read from Postgres."""
+
+
+def cart(user_id: str) -> str:
+    """Return the Redis key for a user's cart hash (product_id -> quantity).
+
+    Args:
+        user_id: The user's UUID string.
+
+    Returns:
+        Key string like "blakjaks:cart:{user_id}".
+    """
+    return f"blakjaks:cart:{user_id}"
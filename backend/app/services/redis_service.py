@@ -9,22 +9,52 @@ from __future__ import annotations
 
 import json
 import logging
+import secrets
+import time
+from collections.abc import Awaitable, Callable
 from datetime import datetime, timezone
 
+from redis.exceptions import ResponseError, WatchError
+
 from app.services.redis_client import get_redis
 from app.services.redis_keys import (
+    BOOTSTRAP_VOTES_GENERATION,
+    CART_DIRTY,
+    CART_HYDRATED_FIELD,
     GIF_TRENDING_CACHE,
     GLOBAL_SCAN_COUNTER,
     LEADERBOARD_ALL_TIME,
+    PRODUCT_CATALOG_VERSION,
+    SCAN_EVENTS_DEAD_LETTER,
+    SCAN_EVENTS_STREAM,
     SCAN_VELOCITY_HOUR,
     SCAN_VELOCITY_MINUTE,
+    TREASURY_SPARKLINES_GENERATION,
+    TTL_BOOTSTRAP,
+    TTL_BOOTSTRAP_GENERATION,
+    TTL_CART,
     TTL_EMOTE_SET,
     TTL_GIF_SEARCH,
+    TTL_INSIGHTS_REFRESH_LOCK,
+    TTL_INSIGHTS_SNAPSHOT,
+    TTL_SCAN_COUNTED,
     TTL_SCAN_VELOCITY_HOUR,
     TTL_SCAN_VELOCITY_MINUTE,
+    TTL_TRANSLATION_FANOUT_CLAIM,
+    TTL_TREASURY_SPARKLINES,
+    bootstrap_generation,
+    bootstrap_payload,
+    cart,
     emote_set_cache,
     gif_search_cache,
+    insights_snapshot,
+    insights_snapshot_lock,
+    insights_snapshot_version,
     leaderboard_monthly,
+    scan_counted,
+    translation_cache,
+    translation_fanout_claim,
+    treasury_sparklines,
     unread_notifications,
 )
 
@@ -151,6 +181,17 @@ async def get_user_rank(user_id: str, type: str) -> dict | None:
     }
 
 
+async def get_user_scan_total(user_id: str) -> int:
+    """Return *user_id*'s all-time scan count as maintained by the leaderboard.
+
+    Updated asynchronously by the scan event consumers, so it can trail the
+    scans table by a few seconds. Returns 0 if the user has no score.
+    """
+    redis = await get_redis()
+    score = await redis.zscore(LEADERBOARD_ALL_TIME, user_id)
+    return int(score) if score is not None else 0
+
+
 # ---------------------------------------------------------------------------
 # Scan velocity (sliding-window counters)
 # ---------------------------------------------------------------------------
@@ -186,6 +227,148 @@ async def get_scan_velocity() -> dict:
     }
 
 
+async def count_scan_once(scan_id: str, user_id: str) -> bool:
+    """Bump the global counter, velocity windows and leaderboards for one scan, once.
+
+    Scan events are delivered at least once. The dedupe marker is written
+    in the same MULTI as the increments: a failed attempt leaves neither
+    behind, so the redelivery counts the scan; a scan that was counted
+    (or is being counted concurrently, caught by WATCH) is skipped.
+
+    Returns:
+        True if this call counted the scan.
+    """
+    redis = await get_redis()
+    marker = scan_counted(scan_id)
+    async with redis.pipeline(transaction=True) as pipe:
+        try:
+            await pipe.watch(marker)
+            if await pipe.exists(marker):
+                return False
+            pipe.multi()
+            pipe.set(marker, "1", ex=TTL_SCAN_COUNTED)
+            pipe.incr(GLOBAL_SCAN_COUNTER)
+            pipe.incr(SCAN_VELOCITY_MINUTE)
+            pipe.expire(SCAN_VELOCITY_MINUTE, TTL_SCAN_VELOCITY_MINUTE)
+            pipe.incr(SCAN_VELOCITY_HOUR)
+            pipe.expire(SCAN_VELOCITY_HOUR, TTL_SCAN_VELOCITY_HOUR)
+            pipe.zincrby(leaderboard_monthly(_current_year_month()), 1, user_id)
+            pipe.zincrby(LEADERBOARD_ALL_TIME, 1, user_id)
+            await pipe.execute()
+        except WatchError:
+            return False
+    return True
+
+
+# ---------------------------------------------------------------------------
+# Scan event stream (consumer groups)
+# ---------------------------------------------------------------------------
+
+
+async def append_scan_event(fields: dict[str, str], maxlen: int) -> str:
+    """XADD a scan event, trimming the stream to roughly *maxlen* entries.
+
+    Returns:
+        The stream entry ID assigned by Redis.
+    """
+    redis = await get_redis()
+    return await redis.xadd(SCAN_EVENTS_STREAM, fields, maxlen=maxlen, approximate=True)
+
+
+async def ensure_scan_event_group(group: str) -> None:
+    """Create consumer group *group* (and the stream) if it does not exist yet.
+
+    New groups start from the beginning of the stream so no retained event
+    is skipped when a consumer is added.
+    """
+    redis = await get_redis()
+    try:
+        await redis.xgroup_create(SCAN_EVENTS_STREAM, group, id="0", mkstream=True)
+    except ResponseError as exc:
+        if "BUSYGROUP" not in str(exc):
+            raise
+
+
+async def read_scan_events(group: str, consumer: str, count: int) -> list[tuple[str, dict]]:
+    """Return up to *count* never-delivered entries for *group*, as (id, fields)."""
+    redis = await get_redis()
+    response = await redis.xreadgroup(group, consumer, {SCAN_EVENTS_STREAM: ">"}, count=count)
+    return [(entry_id, fields) for _, entries in response or [] for entry_id, fields in entries]
+
+
+async def claim_stale_scan_events(
+    group: str, consumer: str, min_idle_ms: int, count: int
+) -> list[tuple[str, dict, int]]:
+    """XAUTOCLAIM entries idle for *min_idle_ms* and return (id, fields, deliveries).
+
+    The delivery count already includes this claim. Entries trimmed from the
+    stream while pending come back without fields and are dropped here.
+    """
+    redis = await get_redis()
+    response = await redis.xautoclaim(
+        SCAN_EVENTS_STREAM, group, consumer, min_idle_time=min_idle_ms, start_id="0-0", count=count
+    )
+    claimed = [(entry_id, fields) for entry_id, fields in response[1] if fields]
+    if not claimed:
+        return []
+    pending = await redis.xpending_range(
+        SCAN_EVENTS_STREAM, group, min=claimed[0][0], max=claimed[-1][0], count=len(claimed) * 2,
+        consumername=consumer,
+    )
+    deliveries = {p["message_id"]: int(p.get("times_delivered", 1)) for p in pending}
+    return [(entry_id, fields, deliveries.get(entry_id, 1)) for entry_id, fields in claimed]
+
+
+async def ack_scan_events(group: str, entry_ids: list[str]) -> int:
+    """XACK *entry_ids* for *group*; returns the number acknowledged."""
+    if not entry_ids:
+        return 0
+    redis = await get_redis()
+    return await redis.xack(SCAN_EVENTS_STREAM, group, *entry_ids)
+
+
+async def dead_letter_scan_event(fields: dict[str, str], maxlen: int) -> str:
+    """Copy a poisoned scan event onto the dead-letter stream."""
+    redis = await get_redis()
+    return await redis.xadd(SCAN_EVENTS_DEAD_LETTER, fields, maxlen=maxlen, approximate=True)
+
+
+async def prune_scan_event_consumers(group: str, min_idle_ms: int) -> int:
+    """XGROUP DELCONSUMER every consumer of *group* idle for *min_idle_ms* with nothing pending.
+
+    Consumers that still own pending entries are kept so XAUTOCLAIM can move
+    those entries to a live consumer first. Returns the number deleted.
+    """
+    redis = await get_redis()
+    try:
+        consumers = await redis.xinfo_consumers(SCAN_EVENTS_STREAM, group)
+    except ResponseError:  # stream or group not created yet
+        return 0
+    deleted = 0
+    for info in consumers:
+        if int(info.get("pending") or 0) == 0 and int(info.get("idle") or 0) >= min_idle_ms:
+            await redis.xgroup_delconsumer(SCAN_EVENTS_STREAM, group, info["name"])
+            deleted += 1
+    return deleted
+
+
+async def get_scan_event_group_info(group: str) -> dict:
+    """Return ``{"pending": int, "lag": int}`` for *group*.
+
+    ``pending`` comes from XPENDING (delivered, not yet acked); ``lag`` is
+    Redis' count of entries not yet delivered to the group (Redis 7+, 0 on
+    older servers).
+    """
+    redis = await get_redis()
+    try:
+        summary = await redis.xpending(SCAN_EVENTS_STREAM, group)
+        groups = await redis.xinfo_groups(SCAN_EVENTS_STREAM)
+    except ResponseError:  # stream or group not created yet
+        return {"pending": 0, "lag": 0}
+    lag = next((info.get("lag") for info in groups if info.get("name") == group), 0)
+    return {"pending": int(summary.get("pending") or 0), "lag": int(lag or 0)}
+
+
 # ---------------------------------------------------------------------------
 # Unread notification counters
 # ---------------------------------------------------------------------------
@@ -211,6 +394,38 @@ async def increment_unread(user_id: str) -> int:
     return await redis.incr(unread_notifications(user_id))
 
 
+async def increment_unread_many(counts: dict[str, int]) -> None:
+    """Increment several users' unread counters in one pipelined round trip.
+
+    Args:
+        counts: Mapping of user_id to the number of new unread notifications.
+    """
+    if not counts:
+        return
+    redis = await get_redis()
+    async with redis.pipeline(transaction=False) as pipe:
+        for user_id, delta in counts.items():
+            pipe.incrby(unread_notifications(user_id), delta)
+        await pipe.execute()
+
+
+async def decrement_unread(user_id: str) -> int:
+    """Decrement the unread notification count for *user_id*, never below ``0``.
+
+    Returns:
+        The new unread count after decrementing.
+    """
+    redis = await get_redis()
+    key = unread_notifications(user_id)
+    value = await redis.decr(key)
+    if value < 0:
+        # A read can race ahead of the outbox dispatcher that increments the
+        # counter; clamp rather than let the badge go negative.
+        await redis.set(key, 0)
+        return 0
+    return value
+
+
 async def clear_unread(user_id: str) -> None:
     """Reset the unread notification count to ``0`` for *user_id*."""
     redis = await get_redis()
@@ -308,3 +523,371 @@ async def get_cached_gif_trending() -> list | None:
     if raw is None:
         return None
     return json.loads(raw)
+
+
+# ---------------------------------------------------------------------------
+# Message translation cache
+# ---------------------------------------------------------------------------
+
+
+async def get_cached_translations(
+    message_ids: list[str], language: str
+) -> dict[str, str]:
+    """Return cached translations for *message_ids* in one MGET.
+
+    Args:
+        message_ids: Message UUIDs (string form).
+        language:    ISO 639-1 target language code.
+
+    Returns:
+        Mapping of message_id to translated text; misses are omitted.
+    """
+    if not message_ids:
+        return {}
+    redis = await get_redis()
+    values = await redis.mget([translation_cache(mid, language) for mid in message_ids])
+    return {mid: value for mid, value in zip(message_ids, values) if value is not None}
+
+
+async def cache_translations(translations: dict[str, str], language: str, ttl: int) -> None:
+    """Cache translated texts for several messages in one pipelined round trip.
+
+    Args:
+        translations: Mapping of message_id to translated text.
+        language:     ISO 639-1 target language code.
+        ttl:          Expiry in seconds.
+    """
+    if not translations:
+        return
+    redis = await get_redis()
+    async with redis.pipeline(transaction=False) as pipe:
+        for message_id, text in translations.items():
+            pipe.set(translation_cache(message_id, language), text, ex=ttl)
+        await pipe.execute()
+
+
+async def claim_translation_fanout(message_id: str, language: str) -> bool:
+    """Elect this pod to translate *message_id* into *language* for live fan-out.
+
+    Returns:
+        True for exactly one caller per (message, language) within
+        TTL_TRANSLATION_FANOUT_CLAIM.
+    """
+    redis = await get_redis()
+    return bool(
+        await redis.set(
+            translation_fanout_claim(message_id, language), 1, nx=True, ex=TTL_TRANSLATION_FANOUT_CLAIM
+        )
+    )
+
+
+# ---------------------------------------------------------------------------
+# Insights dashboard snapshots
+# ---------------------------------------------------------------------------
+
+
+async def get_insights_snapshot(name: str) -> dict | None:
+    """Return the stored snapshot envelope for *name*, or ``None`` on a miss.
+
+    Returns:
+        ``{"version": int, "schema": int, "computed_at": float, "data": dict}``
+    """
+    redis = await get_redis()
+    raw = await redis.get(insights_snapshot(name))
+    if raw is None:
+        return None
+    return json.loads(raw)
+
+
+async def store_insights_snapshot(name: str, schema: int, computed_at: float, data: dict) -> int:
+    """Serialize and store a freshly computed snapshot, bumping its version.
+
+    Args:
+        name:        Snapshot name.
+        schema:      Payload schema version; readers treat mismatches as misses.
+        computed_at: Unix timestamp at which *data* was computed.
+        data:        JSON-serializable dashboard payload.
+
+    Returns:
+        The new snapshot version.
+    """
+    redis = await get_redis()
+    version = await redis.incr(insights_snapshot_version(name))
+    envelope = {"version": version, "schema": schema, "computed_at": computed_at, "data": data}
+    await redis.set(
+        insights_snapshot(name), json.dumps(envelope, default=str), ex=TTL_INSIGHTS_SNAPSHOT
+    )
+    return version
+
+
+async def acquire_insights_refresh_lock(name: str) -> str | None:
+    """Try to take the single-flight refresh lock for *name*.
+
+    Returns:
+        The owner token to pass to ``release_insights_refresh_lock`` if this
+        caller now owns the refresh, ``None`` if another worker already does.
+    """
+    redis = await get_redis()
+    token = secrets.token_hex(16)
+    acquired = await redis.set(insights_snapshot_lock(name), token, nx=True, ex=TTL_INSIGHTS_REFRESH_LOCK)
+    return token if acquired else None
+
+
+async def release_insights_refresh_lock(name: str, token: str) -> bool:
+    """Release the refresh lock for *name* if *token* still owns it.
+
+    A refresh that outlived the lock TTL must not delete the lock a later
+    worker took, so the owner check and DEL run as one WATCH/MULTI
+    transaction.
+
+    Returns:
+        True if the lock was deleted.
+    """
+    redis = await get_redis()
+    key = insights_snapshot_lock(name)
+    async with redis.pipeline(transaction=True) as pipe:
+        try:
+            await pipe.watch(key)
+            if await pipe.get(key) != token:
+                return False
+            pipe.multi()
+            pipe.delete(key)
+            await pipe.execute()
+        except WatchError:
+            return False
+    return True
+
+
+# ---------------------------------------------------------------------------
+# Treasury sparkline cache
+# ---------------------------------------------------------------------------
+
+
+async def get_sparklines_generation() -> int:
+    """Return the current sparkline cache generation (0 before the first snapshot write)."""
+    redis = await get_redis()
+    return int(await redis.get(TREASURY_SPARKLINES_GENERATION) or 0)
+
+
+async def get_cached_sparklines(generation: int, days: int) -> dict | None:
+    """Return cached sparklines for *generation* and *days*, or ``None`` on a miss."""
+    redis = await get_redis()
+    raw = await redis.get(treasury_sparklines(generation, days))
+    if raw is None:
+        return None
+    return json.loads(raw)
+
+
+async def cache_sparklines(generation: int, days: int, data: dict) -> None:
+    """Store sparklines computed while *generation* was current."""
+    redis = await get_redis()
+    await redis.set(
+        treasury_sparklines(generation, days), json.dumps(data), ex=TTL_TREASURY_SPARKLINES
+    )
+
+
+async def invalidate_sparklines() -> int:
+    """Bump the generation so every cached sparkline series becomes unreachable.
+
+    Returns:
+        The new generation.
+    """
+    redis = await get_redis()
+    return await redis.incr(TREASURY_SPARKLINES_GENERATION)
+
+
+# ---------------------------------------------------------------------------
+# Bootstrap payload cache
+# ---------------------------------------------------------------------------
+
+
+async def get_cached_bootstrap(user_id: str) -> tuple[dict | None, int, int]:
+    """Return (cached entry or ``None``, votes generation, user generation) in one round trip."""
+    redis = await get_redis()
+    raw, votes, user = await redis.mget(
+        bootstrap_payload(user_id), BOOTSTRAP_VOTES_GENERATION, bootstrap_generation(user_id)
+    )
+    return (json.loads(raw) if raw is not None else None), int(votes or 0), int(user or 0)
+
+
+async def cache_bootstrap(user_id: str, entry: dict, user_generation: int) -> bool:
+    """Store a user's bootstrap entry (payload, ETag and votes generation).
+
+    Skipped when either generation moved since the payload was built: a
+    write committed during the rebuild, so the payload may predate it.
+
+    Returns:
+        True if the entry was stored.
+    """
+    redis = await get_redis()
+    generation_key = bootstrap_generation(user_id)
+    async with redis.pipeline(transaction=True) as pipe:
+        try:
+            await pipe.watch(BOOTSTRAP_VOTES_GENERATION, generation_key)
+            votes, user = await pipe.mget(BOOTSTRAP_VOTES_GENERATION, generation_key)
+            if (int(votes or 0), int(user or 0)) != (entry["generation"], user_generation):
+                return False
+            pipe.multi()
+            pipe.set(bootstrap_payload(user_id), json.dumps(entry), ex=TTL_BOOTSTRAP)
+            await pipe.execute()
+        except WatchError:
+            return False
+    return True
+
+
+async def invalidate_bootstrap(user_ids: list[str]) -> None:
+    """Drop the cached bootstrap payloads of *user_ids* and bump their generations."""
+    if not user_ids:
+        return
+    redis = await get_redis()
+    async with redis.pipeline(transaction=False) as pipe:
+        pipe.delete(*(bootstrap_payload(user_id) for user_id in user_ids))
+        for user_id in user_ids:
+            pipe.incr(bootstrap_generation(user_id))
+            pipe.expire(bootstrap_generation(user_id), TTL_BOOTSTRAP_GENERATION)
+        await pipe.execute()
+
+
+async def invalidate_bootstrap_votes() -> int:
+    """Bump the votes generation so every cached bootstrap payload is rebuilt.
+
+    Returns:
+        The new generation.
+    """
+    redis = await get_redis()
+    return await redis.incr(BOOTSTRAP_VOTES_GENERATION)
+
+
+# ---------------------------------------------------------------------------
+# Product catalog version
+# ---------------------------------------------------------------------------
+
+
+async def get_catalog_version() -> int:
+    """Return the current product catalog version (0 before the first product write)."""
+    redis = await get_redis()
+    return int(await redis.get(PRODUCT_CATALOG_VERSION) or 0)
+
+
+async def bump_catalog_version() -> int:
+    """Bump the catalog version so every process reloads its product catalog.
+
+    Returns:
+        The new version.
+    """
+    redis = await get_redis()
+    return await redis.incr(PRODUCT_CATALOG_VERSION)
+
+
+# ---------------------------------------------------------------------------
+# Shopping carts
+# ---------------------------------------------------------------------------
+
+
+def _cart_lines(raw: dict[str, str]) -> dict[str, int]:
+    return {field: int(qty) for field, qty in raw.items() if field != CART_HYDRATED_FIELD}
+
+
+async def get_cart_lines(user_id: str) -> dict[str, int] | None:
+    """Return a cart's product_id -> quantity lines, or ``None`` if the cart is not loaded."""
+    redis = await get_redis()
+    raw = await redis.hgetall(cart(user_id))
+    return _cart_lines(raw) if raw else None
+
+
+async def load_cart(user_id: str, lines: dict[str, int]) -> dict[str, int]:
+    """Seed a user's cart with *lines* read from Postgres, unless it was loaded meanwhile.
+
+    Returns:
+        The cart's lines as stored in Redis.
+    """
+    redis = await get_redis()
+    key = cart(user_id)
+    async with redis.pipeline(transaction=True) as pipe:
+        try:
+            await pipe.watch(key)
+            raw = await pipe.hgetall(key)
+            if raw:
+                return _cart_lines(raw)
+            pipe.multi()
+            pipe.hset(key, mapping={CART_HYDRATED_FIELD: 1, **lines})
+            pipe.expire(key, TTL_CART)
+            await pipe.execute()
+        except WatchError:
+            return _cart_lines(await redis.hgetall(key))
+    return dict(lines)
+
+
+async def increment_cart_line(user_id: str, product_id: str, quantity: int) -> int:
+    """Add *quantity* to a cart line and mark the cart dirty.
+
+    Returns:
+        The line's new quantity.
+    """
+    redis = await get_redis()
+    key = cart(user_id)
+    async with redis.pipeline(transaction=True) as pipe:
+        pipe.hincrby(key, product_id, quantity)
+        pipe.expire(key, TTL_CART)
+        pipe.zadd(CART_DIRTY, {user_id: time.time()})
+        new_quantity, _, _ = await pipe.execute()
+    return new_quantity
+
+
+async def set_cart_line(user_id: str, product_id: str, quantity: int) -> None:
+    """Set a cart line's quantity (0 removes it) and mark the cart dirty."""
+    redis = await get_redis()
+    key = cart(user_id)
+    async with redis.pipeline(transaction=True) as pipe:
+        if quantity > 0:
+            pipe.hset(key, product_id, quantity)
+        else:
+            pipe.hdel(key, product_id)
+        pipe.expire(key, TTL_CART)
+        pipe.zadd(CART_DIRTY, {user_id: time.time()})
+        await pipe.execute()
+
+
+async def reset_cart(user_id: str) -> None:
+    """Empty a cart whose contents were just persisted (checkout); it is no longer dirty."""
+    redis = await get_redis()
+    key = cart(user_id)
+    async with redis.pipeline(transaction=True) as pipe:
+        pipe.delete(key)
+        pipe.hset(key, CART_HYDRATED_FIELD, 1)
+        pipe.expire(key, TTL_CART)
+        pipe.zrem(CART_DIRTY, user_id)
+        await pipe.execute()
+
+
+async def get_idle_carts(idle_before: float, limit: int) -> list[str]:
+    """Return up to *limit* dirty carts (user IDs) last changed before *idle_before* (epoch)."""
+    redis = await get_redis()
+    return await redis.zrangebyscore(CART_DIRTY, "-inf", idle_before, start=0, num=limit)
+
+
+async def flush_cart(
+    user_id: str, persist: Callable[[dict[str, int] | None], Awaitable[None]]
+) -> bool:
+    """Run ``persist(lines)`` for a dirty cart, then clear its dirty mark.
+
+    The cart key is WATCHed across *persist*: if the cart changes meanwhile
+    the mark stays and a later flush writes the newer contents. ``lines``
+    is ``None`` if the cart expired from Redis.
+
+    Returns:
+        True if the mark was cleared.
+    """
+    redis = await get_redis()
+    key = cart(user_id)
+    async with redis.pipeline(transaction=True) as pipe:
+        try:
+            await pipe.watch(key)
+            raw = await pipe.hgetall(key)
+            await persist(_cart_lines(raw) if raw else None)
+            pipe.multi()
+            pipe.zrem(CART_DIRTY, user_id)
+            await pipe.execute()
+        except WatchError:
+            return False
+    return True
@@ -0,0 +1,453 @@
+"""Scan event stream — fan-out of scan side effects to consumer groups.
+
+submit_scan commits the scan, awards any milestone comp the response
+reports, and publishes one ScanEvent; everything else happens afterwards in
+consumers, one consumer group per side effect:
+
+  - comps:        retries a milestone comp the scan request failed to award
+  - affiliate:    referral chip for the referrer's affiliate
+  - leaderboard:  global scan counter, scan velocity, leaderboards
+  - tier_history: tier recomputation, tier_history row + tier_change notification
+
+Each group reads the stream independently, so a slow or failing side
+effect never delays the scan request or the other groups. Delivery is
+at-least-once: a message is acked only after its handler succeeds, failed
+messages stay pending and are reclaimed after CLAIM_IDLE_MS, and after
+MAX_DELIVERIES attempts they move to the dead-letter stream. Handlers are
+therefore idempotent.
+
+Two backends implement ScanEventStream: Redis Streams (production) and an
+in-process stream for tests and single-process development, selected by
+settings.SCAN_EVENTS_BACKEND.
+"""
+
+from __future__ import annotations
+
+import abc
+import logging
+import os
+import socket
+import time
+import uuid
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from datetime import datetime
+from decimal import Decimal
+
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.models.affiliate_chip import AffiliateChip
+from app.models.tier import Tier
+from app.models.tier_history import TierHistory
+from app.models.user import User
+
+logger = logging.getLogger(__name__)
+
+SCAN_EVENT_GROUPS = ("comps", "affiliate", "leaderboard", "tier_history")
+
+STREAM_MAXLEN = 1_000_000       # approximate trim; ~11 days at 1k scans/s
+DEAD_LETTER_MAXLEN = 100_000
+READ_COUNT = 200                # messages per consumer batch
+CLAIM_IDLE_MS = 60_000          # a pending message is retried after 1 minute
+MAX_DELIVERIES = 5              # then it is dead-lettered
+CONSUMER_IDLE_MS = 3_600_000    # consumers idle this long with nothing pending are deleted
+
+
+@dataclass(frozen=True)
+class ScanEvent:
+    """A committed scan. Consumers re-read anything else they need."""
+
+    scan_id: uuid.UUID
+    user_id: uuid.UUID
+    scanned_at: datetime
+
+    def to_fields(self) -> dict[str, str]:
+        return {
+            "scan_id": str(self.scan_id),
+            "user_id": str(self.user_id),
+            "scanned_at": self.scanned_at.isoformat(),
+        }
+
+    @classmethod
+    def from_fields(cls, fields: dict[str, str]) -> ScanEvent:
+        return cls(
+            scan_id=uuid.UUID(fields["scan_id"]),
+            user_id=uuid.UUID(fields["user_id"]),
+            scanned_at=datetime.fromisoformat(fields["scanned_at"]),
+        )
+
+
+@dataclass(frozen=True)
+class StreamMessage:
+    id: str
+    event: ScanEvent
+    deliveries: int = 1
+
+
+# ── Stream backends ──────────────────────────────────────────────────
+
+
+class ScanEventStream(abc.ABC):
+    """Append-only event log with independent, acknowledged consumer groups."""
+
+    @abc.abstractmethod
+    async def publish(self, event: ScanEvent) -> str:
+        """Append *event*; returns its message ID."""
+
+    @abc.abstractmethod
+    async def ensure_group(self, group: str) -> None:
+        """Create *group* if needed, positioned at the start of the stream."""
+
+    @abc.abstractmethod
+    async def read(self, group: str, consumer: str, count: int) -> list[StreamMessage]:
+        """Deliver up to *count* messages the group has not seen yet."""
+
+    @abc.abstractmethod
+    async def claim_stale(
+        self, group: str, consumer: str, min_idle_ms: int, count: int
+    ) -> list[StreamMessage]:
+        """Take over messages left unacknowledged for at least *min_idle_ms*."""
+
+    @abc.abstractmethod
+    async def ack(self, group: str, message_ids: list[str]) -> None:
+        """Mark messages as processed by *group*."""
+
+    @abc.abstractmethod
+    async def dead_letter(self, group: str, message: StreamMessage, error: str) -> None:
+        """Park a message that exhausted its deliveries."""
+
+    @abc.abstractmethod
+    async def lag(self, group: str) -> dict:
+        """Return ``{"pending": int, "lag": int}`` for *group*."""
+
+    @abc.abstractmethod
+    async def prune_consumers(self, group: str, min_idle_ms: int) -> int:
+        """Forget consumers idle for *min_idle_ms* that own no pending messages."""
+
+
+class RedisScanEventStream(ScanEventStream):
+    """Redis Streams backend: XADD / XREADGROUP / XACK / XAUTOCLAIM."""
+
+    async def publish(self, event: ScanEvent) -> str:
+        from app.services.redis_service import append_scan_event
+
+        return await append_scan_event(event.to_fields(), STREAM_MAXLEN)
+
+    async def ensure_group(self, group: str) -> None:
+        from app.services.redis_service import ensure_scan_event_group
+
+        await ensure_scan_event_group(group)
+
+    async def read(self, group: str, consumer: str, count: int) -> list[StreamMessage]:
+        from app.services.redis_service import read_scan_events
+
+        entries = await read_scan_events(group, consumer, count)
+        return [StreamMessage(entry_id, ScanEvent.from_fields(fields)) for entry_id, fields in entries]
+
+    async def claim_stale(
+        self, group: str, consumer: str, min_idle_ms: int, count: int
+    ) -> list[StreamMessage]:
+        from app.services.redis_service import claim_stale_scan_events
+
+        entries = await claim_stale_scan_events(group, consumer, min_idle_ms, count)
+        return [
+            StreamMessage(entry_id, ScanEvent.from_fields(fields), deliveries)
+            for entry_id, fields, deliveries in entries
+        ]
+
+    async def ack(self, group: str, message_ids: list[str]) -> None:
+        from app.services.redis_service import ack_scan_events
+
+        await ack_scan_events(group, message_ids)
+
+    async def dead_letter(self, group: str, message: StreamMessage, error: str) -> None:
+        from app.services.redis_service import dead_letter_scan_event
+
+        fields = {
+            **message.event.to_fields(),
+            "group": group,
+            "message_id": message.id,
+            "deliveries": str(message.deliveries),
+            "error": error[:500],
+        }
+        await dead_letter_scan_event(fields, DEAD_LETTER_MAXLEN)
+
+    async def lag(self, group: str) -> dict:
+        from app.services.redis_service import get_scan_event_group_info
+
+        return await get_scan_event_group_info(group)
+
+    async def prune_consumers(self, group: str, min_idle_ms: int) -> int:
+        from app.services.redis_service import prune_scan_event_consumers
+
+        return await prune_scan_event_consumers(group, min_idle_ms)
+
+
+class InMemoryScanEventStream(ScanEventStream):
+    """Process-local stream with the same group semantics as Redis Streams.
+
+    Only suitable when the API and the consumers share one process (tests,
+    local development); nothing survives a restart.
+    """
+
+    def __init__(self) -> None:
+        self.entries: list[tuple[str, ScanEvent]] = []
+        self.dead_letters: list[dict] = []
+        self._cursors: dict[str, int] = {}
+        # group -> message id -> [consumer, delivered_at (monotonic s), deliveries]
+        self._pending: dict[str, dict[str, list]] = {}
+
+    async def publish(self, event: ScanEvent) -> str:
+        message_id = f"{len(self.entries) + 1}-0"
+        self.entries.append((message_id, event))
+        return message_id
+
+    async def ensure_group(self, group: str) -> None:
+        self._cursors.setdefault(group, 0)
+        self._pending.setdefault(group, {})
+
+    async def read(self, group: str, consumer: str, count: int) -> list[StreamMessage]:
+        start = self._cursors[group]
+        batch = self.entries[start:start + count]
+        self._cursors[group] = start + len(batch)
+        now = time.monotonic()
+        for message_id, _ in batch:
+            self._pending[group][message_id] = [consumer, now, 1]
+        return [StreamMessage(message_id, event) for message_id, event in batch]
+
+    async def claim_stale(
+        self, group: str, consumer: str, min_idle_ms: int, count: int
+    ) -> list[StreamMessage]:
+        now = time.monotonic()
+        events = dict(self.entries)
+        claimed = []
+        for message_id, state in self._pending[group].items():
+            if len(claimed) >= count:
+                break
+            if (now - state[1]) * 1000 >= min_idle_ms:
+                state[:] = [consumer, now, state[2] + 1]
+                claimed.append(StreamMessage(message_id, events[message_id], state[2]))
+        return claimed
+
+    async def ack(self, group: str, message_ids: list[str]) -> None:
+        for message_id in message_ids:
+            self._pending[group].pop(message_id, None)
+
+    async def dead_letter(self, group: str, message: StreamMessage, error: str) -> None:
+        self.dead_letters.append({"group": group, "message": message, "error": error})
+
+    async def lag(self, group: str) -> dict:
+        return {
+            "pending": len(self._pending.get(group, {})),
+            "lag": len(self.entries) - self._cursors.get(group, 0),
+        }
+
+    async def prune_consumers(self, group: str, min_idle_ms: int) -> int:
+        # Consumers exist here only as the owner recorded on pending messages.
+        return 0
+
+
+_memory_stream: InMemoryScanEventStream | None = None
+
+
+def get_scan_event_stream() -> ScanEventStream:
+    """Return the configured backend (settings.SCAN_EVENTS_BACKEND)."""
+    global _memory_stream
+    if settings.SCAN_EVENTS_BACKEND == "memory":
+        if _memory_stream is None:
+            _memory_stream = InMemoryScanEventStream()
+        return _memory_stream
+    return RedisScanEventStream()
+
+
+# ── Handlers (one per consumer group, all idempotent) ────────────────
+
+
+async def award_comp_milestone(db: AsyncSession, event: ScanEvent) -> None:
+    """Award the member's next crypto comp milestone, if the scan didn't already.
+
+    submit_scan awards milestones inline; this is the retry path when that
+    failed. A pending_choice comp of the same amount means the milestone was
+    already awarded, so redelivery awards nothing.
+    """
+    from app.services.comp_engine import award_milestone_comp, find_crypto_comp_milestone
+
+    milestone = await find_crypto_comp_milestone(db, event.user_id)
+    if milestone:
+        await award_milestone_comp(db, event.user_id, Decimal(milestone["amount"]))
+
+
+async def create_affiliate_chip(db: AsyncSession, event: ScanEvent) -> None:
+    """Award the referrer's affiliate one chip for this scan (at most once)."""
+    from app.services.affiliate_service import process_referral_scan
+
+    existing = await db.scalar(
+        select(AffiliateChip.id).where(AffiliateChip.source_scan_id == event.scan_id).limit(1)
+    )
+    if existing is None:
+        await process_referral_scan(db, event.scan_id, event.user_id)
+
+
+async def update_scan_counters(db: AsyncSession, event: ScanEvent) -> None:
+    """Bump the global counter, velocity windows and leaderboards once per scan."""
+    from app.services.redis_service import count_scan_once
+
+    await count_scan_once(str(event.scan_id), str(event.user_id))
+
+
+async def record_tier_change(db: AsyncSession, event: ScanEvent) -> None:
+    """Persist the member's effective tier and log changes to tier_history.
+
+    A change writes a tier_history row for the current quarter; upgrades also
+    notify the member. A member without a stored tier who is still on the
+    base tier just gets the tier stored. Once users.tier_id matches, replays
+    are no-ops.
+    """
+    from app.services.bootstrap_service import invalidate_bootstrap
+    from app.services.notification_service import create_notification
+    from app.services.tier import TIER_ORDER, get_current_quarter_range, get_user_tier_info
+
+    info = await get_user_tier_info(db, event.user_id)
+    tier_name = info.get("tier_name")
+    if tier_name is None:
+        return
+
+    stored = (
+        await db.execute(
+            select(Tier.name).select_from(User).outerjoin(Tier, User.tier_id == Tier.id)
+            .where(User.id == event.user_id)
+        )
+    ).one_or_none()
+    if stored is None or stored.name == tier_name:
+        return
+
+    tier_id = await db.scalar(select(Tier.id).where(Tier.name == tier_name))
+    await db.execute(
+        update(User).where(User.id == event.user_id).values(tier_id=tier_id)
+        .execution_options(synchronize_session=False)
+    )
+    previous = stored.name or TIER_ORDER[0]
+    if previous == tier_name:
+        await db.commit()
+        await invalidate_bootstrap(event.user_id)
+        return
+
+    q_start, q_end = get_current_quarter_range()
+    db.add(
+        TierHistory(
+            user_id=event.user_id,
+            quarter=f"{q_start.year}-Q{(q_start.month - 1) // 3 + 1}",
+            tier_name=tier_name,
+            scan_count=info.get("quarterly_scans", 0),
+            achieved_at=event.scanned_at,
+            expires_at=q_end,
+        )
+    )
+    is_upgrade = (
+        tier_name in TIER_ORDER and previous in TIER_ORDER
+        and TIER_ORDER.index(tier_name) > TIER_ORDER.index(previous)
+    )
+    if is_upgrade:
+        await create_notification(
+            db, event.user_id, "tier_change", f"Welcome to {tier_name}!",
+            f"You reached {tier_name} with {info.get('quarterly_scans', 0)} scans this quarter.",
+        )
+    else:
+        await db.commit()
+    await invalidate_bootstrap(event.user_id)
+
+
+ScanEventHandler = Callable[[AsyncSession, ScanEvent], Awaitable[None]]
+
+HANDLERS: dict[str, ScanEventHandler] = {
+    "comps": award_comp_milestone,
+    "affiliate": create_affiliate_chip,
+    "leaderboard": update_scan_counters,
+    "tier_history": record_tier_change,
+}
+
+
+# ── Producer / consumer ──────────────────────────────────────────────
+
+
+async def publish_scan_event(db: AsyncSession, event: ScanEvent) -> None:
+    """Publish *event* after its scan committed; never fails the scan.
+
+    If the stream is unreachable the handlers run inline on *db* instead, so
+    side effects are delayed into the request rather than lost.
+    """
+    try:
+        await get_scan_event_stream().publish(event)
+        return
+    except Exception as exc:
+        logger.warning("Scan event publish failed for scan %s, running inline: %s", event.scan_id, exc)
+
+    for group, handler in HANDLERS.items():
+        try:
+            await handler(db, event)
+        except Exception as exc:
+            await db.rollback()
+            logger.warning("Inline scan handler %s failed for scan %s: %s", group, event.scan_id, exc)
+
+
+def default_consumer_name() -> str:
+    """Stable per worker process, so repeated runs reuse one Redis consumer."""
+    return f"{socket.gethostname()}-{os.getpid()}"
+
+
+async def consume_scan_events(
+    group: str,
+    consumer: str | None = None,
+    session_factory: Callable[[], AsyncSession] | None = None,
+    count: int = READ_COUNT,
+    min_idle_ms: int = CLAIM_IDLE_MS,
+) -> dict:
+    """Process one batch for *group*: stale retries first, then new messages.
+
+    Every message gets its own session so one failure cannot roll back the
+    others. Returns a report with counts and the group's remaining lag.
+    """
+    if session_factory is None:
+        from app.db.session import async_session_factory as session_factory
+
+    handler = HANDLERS[group]
+    consumer = consumer or default_consumer_name()
+    stream = get_scan_event_stream()
+    await stream.ensure_group(group)
+
+    retried = await stream.claim_stale(group, consumer, min_idle_ms, count)
+    messages = retried + await stream.read(group, consumer, count)
+
+    report = {"group": group, "processed": 0, "failed": 0, "retried": len(retried), "dead_lettered": 0}
+    acked: list[str] = []
+    for message in messages:
+        try:
+            async with session_factory() as db:
+                await handler(db, message.event)
+        except Exception as exc:
+            if message.deliveries >= MAX_DELIVERIES:
+                logger.error(
+                    "Scan event %s dead-lettered by %s after %d deliveries: %s",
+                    message.id, group, message.deliveries, exc,
+                )
+                await stream.dead_letter(group, message, repr(exc))
+                acked.append(message.id)
+                report["dead_lettered"] += 1
+            else:
+                logger.warning("Scan event %s failed in %s (delivery %d): %s", message.id, group, message.deliveries, exc)
+                report["failed"] += 1
+            continue
+        acked.append(message.id)
+        report["processed"] += 1
+
+    await stream.ack(group, acked)
+    report.update(await stream.lag(group))
+    return report
+
+
+async def get_scan_event_lag() -> dict[str, dict]:
+    """Return pending/lag counts for every consumer group."""
+    stream = get_scan_event_stream()
+    return {group: await stream.lag(group) for group in SCAN_EVENT_GROUPS}
@@ -0,0 +1,118 @@
+"""Quarterly range partitions for the scans table.
+
+``scans`` is partitioned on created_at, one partition per calendar quarter
+named ``scans_YYYY_qN``, with bounds from tier.quarter_range. A quarterly
+tier count is bounded by the same range, so it reads only the active
+partition and that partition's (user_id, created_at, id) index. A DEFAULT
+partition catches rows only if the nightly job has fallen behind; they are
+moved into their quarter when its partition is created.
+
+Scans are never dropped; they back scan history and lifetime stats. A
+closed quarter is just a regular table, so it can be detached
+(``ALTER TABLE scans DETACH PARTITION scans_2025_q1 CONCURRENTLY``) for
+archiving or moved to cheaper storage without touching the active one.
+
+Partition DDL only applies on PostgreSQL; on other databases (SQLite in
+tests) the functions are no-ops.
+"""
+
+import logging
+from datetime import date, datetime, timezone
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.services.tier import quarter_range
+
+logger = logging.getLogger(__name__)
+
+QUARTERS_AHEAD = 1   # future quarters kept ready by the nightly job
+
+
+def quarter_start(day: date) -> date:
+    return quarter_range(day)[0].date()
+
+
+def next_quarter(day: date) -> date:
+    return quarter_range(day)[1].date()
+
+
+def partition_name(day: date) -> str:
+    """``scans_YYYY_qN`` for the quarter containing *day*."""
+    return f"scans_{day.year}_q{(day.month - 1) // 3 + 1}"
+
+
+def partition_ddl(day: date) -> str:
+    """``CREATE TABLE IF NOT EXISTS`` for the quarter containing *day*."""
+    # quarter_range is UTC; an explicit offset keeps the session TimeZone
+    # from shifting the bounds.
+    start, end = quarter_range(day)
+    return (
+        f"CREATE TABLE IF NOT EXISTS {partition_name(day)} PARTITION OF scans "
+        f"FOR VALUES FROM ('{start:%Y-%m-%d %H:%M:%S}+00') TO ('{end:%Y-%m-%d %H:%M:%S}+00')"
+    )
+
+
+async def _create_partition(db: AsyncSession, quarter: date) -> None:
+    """Create one quarter, moving any rows for it out of scans_default first.
+
+    Same sequence as message_partitions: DEFAULT is detached while its rows
+    for the quarter are moved, then re-attached, inside the caller's
+    transaction.
+    """
+    start, end = quarter_range(quarter)
+    in_quarter = "created_at >= :start AND created_at < :end"
+    bounds = {"start": start, "end": end}
+    stragglers = (
+        await db.execute(text(f"SELECT count(*) FROM scans_default WHERE {in_quarter}"), bounds)
+    ).scalar_one()
+    if not stragglers:
+        await db.execute(text(partition_ddl(quarter)))
+        return
+
+    await db.execute(text("ALTER TABLE scans DETACH PARTITION scans_default"))
+    await db.execute(text(partition_ddl(quarter)))
+    await db.execute(
+        text(
+            f"WITH moved AS (DELETE FROM scans_default WHERE {in_quarter} RETURNING *) "
+            "INSERT INTO scans SELECT * FROM moved"
+        ),
+        bounds,
+    )
+    await db.execute(text("ALTER TABLE scans ATTACH PARTITION scans_default DEFAULT"))
+    logger.warning("Moved %d rows from scans_default into %s", stragglers, partition_name(quarter))
+
+
+async def ensure_scan_partitions(
+    db: AsyncSession, quarters_ahead: int = QUARTERS_AHEAD, now: datetime | None = None
+) -> list[str]:
+    """Create the current quarter's and the next *quarters_ahead* quarters' partitions.
+
+    Idempotent. Rows already sitting in scans_default for a new quarter are
+    moved into it. Returns the names of partitions that did not exist before.
+    """
+    if db.get_bind().dialect.name != "postgresql":
+        return []
+
+    result = await db.execute(
+        text(
+            "SELECT c.relname FROM pg_inherits i "
+            "JOIN pg_class c ON c.oid = i.inhrelid "
+            "JOIN pg_class p ON p.oid = i.inhparent "
+            "WHERE p.relname = 'scans'"
+        )
+    )
+    existing = set(result.scalars())
+
+    quarter = quarter_start((now or datetime.now(timezone.utc)).date())
+    created = []
+    for _ in range(quarters_ahead + 1):
+        name = partition_name(quarter)
+        if name not in existing:
+            await _create_partition(db, quarter)
+            created.append(name)
+        quarter = next_quarter(quarter)
+    await db.commit()
+    if created:
+        logger.info("Created scan partitions: %s", ", ".join(created))
+    return created
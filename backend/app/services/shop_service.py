@@ -1,10 +1,12 @@
 """E-commerce shop service — products, cart, orders."""
 
+import logging
+import time
 import uuid
 from decimal import Decimal
 
 from fastapi import HTTPException, status
-from sqlalchemy import delete, func, select
+from sqlalchemy import delete, select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload, subqueryload
 
@@ -12,7 +14,20 @@ from app.models.cart_item import CartItem
 from app.models.order import Order
 from app.models.order_item import OrderItem
 from app.models.product import Product
+from app.models.user import User
+from app.services.affiliate_service import REFERRED_TIN_ORDER_STATUSES, record_referred_tins
 from app.services.age_verification import verify_age
+from app.services.pagination import TotalMode, paginate
+from app.services.product_catalog import CatalogProduct, bump_catalog_version, get_catalog
+from app.services.redis_service import (
+    flush_cart as redis_flush_cart,
+    get_cart_lines as redis_get_cart_lines,
+    get_idle_carts,
+    increment_cart_line as redis_increment_cart_line,
+    load_cart as redis_load_cart,
+    reset_cart as redis_reset_cart,
+    set_cart_line as redis_set_cart_line,
+)
 from app.services.tax_service import estimate_tax
 
 # Business constants
@@ -20,13 +35,13 @@ PRICE_PER_TIN = Decimal("5.00")
 MIN_ORDER_AMOUNT = Decimal("25.00")  # 5 tins minimum
 SHIPPING_FLAT_RATE = Decimal("2.99")
 FREE_SHIPPING_THRESHOLD = Decimal("50.00")
+ORDER_STATUSES = {"pending", "completed", "shipped", "delivered", "cancelled", "refunded"}
 
-# Sort options
-SORT_MAP = {
-    "price_asc": Product.price.asc(),
-    "price_desc": Product.price.desc(),
-    "name": Product.name.asc(),
-}
+# Seconds a Redis cart must sit unchanged before it is written to cart_items
+CART_IDLE_FLUSH_SECONDS = 900
+CART_FLUSH_BATCH_SIZE = 500
+
+logger = logging.getLogger(__name__)
 
 
 # ── Products ──────────────────────────────────────────────────────────
@@ -39,101 +54,164 @@ async def get_products(
     page: int = 1,
     per_page: int = 20,
 ) -> dict:
-    """Paginated product catalog with optional flavor filter and sort."""
-    query = select(Product).where(Product.is_active == True)  # noqa: E712
-
-    if flavor:
-        query = query.where(Product.flavor == flavor)
+    """Paginated product catalog with optional flavor filter and sort.
 
-    # Count total
-    count_query = select(func.count()).select_from(query.subquery())
-    total = (await db.execute(count_query)).scalar_one()
+    Served from the in-process catalog (see product_catalog); no query runs
+    unless the snapshot needs reloading.
+    """
+    products = (await get_catalog(db)).list(flavor, sort_by)
+    offset = (page - 1) * per_page
+    return {"items": list(products[offset:offset + per_page]), "total": len(products)}
 
-    # Sort
-    order_clause = SORT_MAP.get(sort_by, Product.name.asc())
-    query = query.order_by(order_clause)
 
-    # Paginate
-    offset = (page - 1) * per_page
-    query = query.offset(offset).limit(per_page)
+async def get_product(db: AsyncSession, product_id: uuid.UUID) -> CatalogProduct:
+    """Single active product's detail, from the in-process catalog."""
+    product = (await get_catalog(db)).get(product_id)
+    if product is None or not product.is_active:
+        raise HTTPException(status.HTTP_404_NOT_FOUND, "Product not found")
+    return product
 
-    result = await db.execute(query)
-    products = list(result.scalars().all())
 
-    return {"items": products, "total": total}
+async def create_product(db: AsyncSession, **fields) -> Product:
+    """Insert a product and invalidate every process's catalog."""
+    product = Product(**fields)
+    db.add(product)
+    await db.commit()
+    await db.refresh(product)
+    await bump_catalog_version()
+    return product
 
 
-async def get_product(db: AsyncSession, product_id: uuid.UUID) -> Product:
-    """Single product detail."""
-    result = await db.execute(select(Product).where(Product.id == product_id))
-    product = result.scalar_one_or_none()
+async def update_product(db: AsyncSession, product_id: uuid.UUID, **fields) -> Product:
+    """Apply ``fields`` to a product and invalidate every process's catalog."""
+    product = await db.get(Product, product_id)
     if product is None:
         raise HTTPException(status.HTTP_404_NOT_FOUND, "Product not found")
+    for name, value in fields.items():
+        setattr(product, name, value)
+    await db.commit()
+    await db.refresh(product)
+    await bump_catalog_version()
     return product
 
 
 # ── Cart ──────────────────────────────────────────────────────────────
-
-
-async def get_cart(db: AsyncSession, user_id: uuid.UUID) -> dict:
-    """Return user's current cart."""
+#
+# Carts live in a Redis hash per user (product_id -> quantity), loaded from
+# cart_items on first use. Mutations only touch Redis and mark the cart
+# dirty; flush_idle_carts writes carts that stopped changing back to
+# cart_items, and checkout turns the cart into order items. Prices come
+# from the in-process catalog. If Redis is unreachable the cart falls back
+# to reading and writing cart_items directly. A line's ``id`` is its
+# product ID on both paths.
+#
+# Checkout and the idle flush both write cart_items, so both lock the
+# member's users row first. Checkout resets the Redis cart before it
+# commits, and the flush re-reads the Redis cart under the lock. That way a
+# flush never commits lines a checkout has already turned into an order.
+
+
+async def _lock_cart(db: AsyncSession, user_id: uuid.UUID) -> None:
+    await db.execute(select(User.id).where(User.id == user_id).with_for_update())
+
+
+async def _db_cart_lines(db: AsyncSession, user_id: uuid.UUID) -> dict[str, int]:
     result = await db.execute(
-        select(CartItem)
+        select(CartItem.product_id, CartItem.quantity)
         .where(CartItem.user_id == user_id)
-        .options(selectinload(CartItem.product))
         .order_by(CartItem.created_at)
     )
-    cart_items = list(result.scalars().all())
+    return {str(product_id): quantity for product_id, quantity in result.all()}
 
+
+async def _redis_cart_lines(db: AsyncSession, user_id: uuid.UUID) -> dict[str, int] | None:
+    """The user's Redis cart, loading it from cart_items if needed; ``None`` if Redis is down."""
+    try:
+        lines = await redis_get_cart_lines(str(user_id))
+        if lines is None:
+            lines = await redis_load_cart(str(user_id), await _db_cart_lines(db, user_id))
+        return lines
+    except Exception:
+        logger.warning("Cart unavailable in Redis for user %s, using cart_items", user_id)
+        return None
+
+
+async def _price_cart(db: AsyncSession, lines: dict[str, int]) -> dict:
+    catalog = await get_catalog(db)
     items = []
     subtotal = Decimal("0")
     item_count = 0
-    for ci in cart_items:
-        line_total = ci.product.price * ci.quantity
+    for product_id, quantity in lines.items():
+        product = catalog.get(uuid.UUID(product_id))
+        if product is None or quantity <= 0:
+            continue
+        line_total = product.price * quantity
         subtotal += line_total
-        item_count += ci.quantity
+        item_count += quantity
         items.append({
-            "id": ci.id,
-            "product_id": ci.product_id,
-            "product_name": ci.product.name,
-            "product_image": ci.product.image_url,
-            "quantity": ci.quantity,
-            "unit_price": ci.product.price,
+            "id": product.id,
+            "product_id": product.id,
+            "product_name": product.name,
+            "product_image": product.image_url,
+            "quantity": quantity,
+            "unit_price": product.price,
             "line_total": line_total,
         })
 
     return {"items": items, "subtotal": subtotal, "item_count": item_count}
 
 
-async def add_to_cart(
-    db: AsyncSession, user_id: uuid.UUID, product_id: uuid.UUID, quantity: int
-) -> dict:
-    """Add item to cart or increment quantity if already present."""
-    # Verify product exists and is active
-    product = await db.execute(
-        select(Product).where(Product.id == product_id, Product.is_active == True)  # noqa: E712
-    )
-    product = product.scalar_one_or_none()
-    if product is None:
-        raise HTTPException(status.HTTP_404_NOT_FOUND, "Product not found")
+async def get_cart(db: AsyncSession, user_id: uuid.UUID) -> dict:
+    """Return user's current cart."""
+    lines = await _redis_cart_lines(db, user_id)
+    if lines is None:
+        lines = await _db_cart_lines(db, user_id)
+    return await _price_cart(db, lines)
+
 
-    # Check if already in cart
+async def _db_set_cart_line(
+    db: AsyncSession,
+    user_id: uuid.UUID,
+    product_id: uuid.UUID,
+    quantity: int,
+    *,
+    increment: bool = False,
+) -> None:
+    """Fallback write straight to cart_items. ``quantity`` 0 removes the line."""
     result = await db.execute(
-        select(CartItem).where(
-            CartItem.user_id == user_id, CartItem.product_id == product_id
-        )
+        select(CartItem).where(CartItem.user_id == user_id, CartItem.product_id == product_id)
     )
-    existing = result.scalar_one_or_none()
+    item = result.scalar_one_or_none()
 
-    if existing:
-        existing.quantity += quantity
+    if item is None:
+        if not increment:
+            raise HTTPException(status.HTTP_404_NOT_FOUND, "Cart item not found")
+        db.add(CartItem(user_id=user_id, product_id=product_id, quantity=quantity))
+    elif increment:
+        item.quantity += quantity
+    elif quantity == 0:
+        await db.delete(item)
     else:
-        cart_item = CartItem(
-            user_id=user_id, product_id=product_id, quantity=quantity
-        )
-        db.add(cart_item)
+        item.quantity = quantity
 
     await db.commit()
+
+
+async def add_to_cart(
+    db: AsyncSession, user_id: uuid.UUID, product_id: uuid.UUID, quantity: int
+) -> dict:
+    """Add item to cart or increment quantity if already present."""
+    product = (await get_catalog(db)).get(product_id)
+    if product is None or not product.is_active:
+        raise HTTPException(status.HTTP_404_NOT_FOUND, "Product not found")
+
+    if await _redis_cart_lines(db, user_id) is not None:
+        try:
+            await redis_increment_cart_line(str(user_id), str(product_id), quantity)
+            return await get_cart(db, user_id)
+        except Exception:
+            logger.warning("Cart add for user %s not applied in Redis, using cart_items", user_id)
+    await _db_set_cart_line(db, user_id, product_id, quantity, increment=True)
     return await get_cart(db, user_id)
 
 
@@ -141,19 +219,18 @@ async def update_cart_item(
     db: AsyncSession, user_id: uuid.UUID, item_id: uuid.UUID, quantity: int
 ) -> dict:
     """Update cart item quantity. Remove if quantity is 0."""
-    result = await db.execute(
-        select(CartItem).where(CartItem.id == item_id, CartItem.user_id == user_id)
-    )
-    item = result.scalar_one_or_none()
-    if item is None:
-        raise HTTPException(status.HTTP_404_NOT_FOUND, "Cart item not found")
-
-    if quantity == 0:
-        await db.delete(item)
-    else:
-        item.quantity = quantity
+    lines = await _redis_cart_lines(db, user_id)
+    if lines is None:
+        await _db_set_cart_line(db, user_id, item_id, quantity)
+        return await get_cart(db, user_id)
 
-    await db.commit()
+    if str(item_id) not in lines:
+        raise HTTPException(status.HTTP_404_NOT_FOUND, "Cart item not found")
+    try:
+        await redis_set_cart_line(str(user_id), str(item_id), quantity)
+    except Exception:
+        logger.warning("Cart update for user %s not applied in Redis, using cart_items", user_id)
+        await _db_set_cart_line(db, user_id, item_id, quantity)
     return await get_cart(db, user_id)
 
 
@@ -161,24 +238,69 @@ async def remove_from_cart(
     db: AsyncSession, user_id: uuid.UUID, item_id: uuid.UUID
 ) -> dict:
     """Remove item from cart."""
-    result = await db.execute(
-        select(CartItem).where(CartItem.id == item_id, CartItem.user_id == user_id)
-    )
-    item = result.scalar_one_or_none()
-    if item is None:
-        raise HTTPException(status.HTTP_404_NOT_FOUND, "Cart item not found")
-
-    await db.delete(item)
-    await db.commit()
-    return await get_cart(db, user_id)
+    return await update_cart_item(db, user_id, item_id, 0)
 
 
 async def clear_cart(db: AsyncSession, user_id: uuid.UUID) -> None:
     """Empty user's cart."""
+    await _lock_cart(db, user_id)
     await db.execute(delete(CartItem).where(CartItem.user_id == user_id))
+    try:
+        await redis_reset_cart(str(user_id))
+    except Exception:
+        logger.warning("Cart for user %s not cleared in Redis", user_id)
     await db.commit()
 
 
+async def _replace_db_cart(db: AsyncSession, user_id: uuid.UUID, lines: dict[str, int]) -> bool:
+    """Replace the user's cart_items with *lines* read from Redis.
+
+    Writes nothing and returns False if the Redis cart no longer holds
+    *lines* once the cart lock is held, e.g. because a checkout reset it.
+    """
+    catalog = await get_catalog(db)
+    await _lock_cart(db, user_id)
+    if await redis_get_cart_lines(str(user_id)) != lines:
+        await db.rollback()
+        return False
+    await db.execute(delete(CartItem).where(CartItem.user_id == user_id))
+    db.add_all(
+        CartItem(user_id=user_id, product_id=uuid.UUID(product_id), quantity=quantity)
+        for product_id, quantity in lines.items()
+        if quantity > 0 and catalog.get(uuid.UUID(product_id)) is not None
+    )
+    await db.commit()
+    return True
+
+
+async def flush_idle_carts(
+    db: AsyncSession,
+    idle_seconds: float = CART_IDLE_FLUSH_SECONDS,
+    batch_size: int = CART_FLUSH_BATCH_SIZE,
+) -> dict:
+    """Write carts unchanged for ``idle_seconds`` from Redis to cart_items.
+
+    Each cart's rows are replaced in one transaction. A cart that changes
+    while it is being written keeps its dirty mark and is written again by
+    a later run. A cart that fails to write is logged and also keeps its
+    mark, without stopping the rest of the batch.
+    """
+    user_ids = await get_idle_carts(time.time() - idle_seconds, batch_size)
+    flushed = 0
+    for user_id in user_ids:
+        async def persist(lines: dict[str, int] | None, user_id: str = user_id) -> None:
+            if lines is not None:  # None: expired from Redis; cart_items keeps the last flush
+                await _replace_db_cart(db, uuid.UUID(user_id), lines)
+
+        try:
+            if await redis_flush_cart(user_id, persist):
+                flushed += 1
+        except Exception:
+            await db.rollback()
+            logger.exception("Cart flush failed for user %s", user_id)
+    return {"idle": len(user_ids), "flushed": flushed}
+
+
 # ── Shipping ──────────────────────────────────────────────────────────
 
 
@@ -248,9 +370,27 @@ async def create_order(
         )
         db.add(order_item)
 
-    # Clear cart
+    # Keep the referrer's permanent-tier tin counter current
+    await record_referred_tins(db, user_id, sum(item["quantity"] for item in cart["items"]))
+
+    # Clear cart: any rows from an earlier idle flush, then the Redis cart,
+    # before committing, so an idle flush waiting on the lock finds it reset
+    await _lock_cart(db, user_id)
     await db.execute(delete(CartItem).where(CartItem.user_id == user_id))
-    await db.commit()
+    try:
+        await redis_reset_cart(str(user_id))
+    except Exception:
+        logger.warning("Cart for user %s not cleared in Redis for order %s", user_id, order.id)
+    try:
+        await db.commit()
+    except Exception:
+        # No order was placed: put the lines back so the cart is not lost
+        try:
+            for item in cart["items"]:
+                await redis_set_cart_line(str(user_id), str(item["product_id"]), item["quantity"])
+        except Exception:
+            logger.warning("Cart for user %s not restored in Redis after a failed checkout", user_id)
+        raise
 
     # Reload order with items
     await db.refresh(order)
@@ -263,23 +403,23 @@ async def create_order(
 
 
 async def get_orders(
-    db: AsyncSession, user_id: uuid.UUID, page: int = 1, per_page: int = 10
+    db: AsyncSession,
+    user_id: uuid.UUID,
+    page: int = 1,
+    per_page: int = 10,
+    cursor: str | None = None,
+    total: TotalMode = "exact",
 ) -> dict:
-    """User's order history, paginated."""
-    count_query = select(func.count()).select_from(Order).where(Order.user_id == user_id)
-    total = (await db.execute(count_query)).scalar_one()
-
-    offset = (page - 1) * per_page
-    result = await db.execute(
+    """User's order history, newest first (keyset with ``cursor``)."""
+    query = (
         select(Order)
         .where(Order.user_id == user_id)
         .options(selectinload(Order.items).selectinload(OrderItem.product))
-        .order_by(Order.created_at.desc())
-        .offset(offset)
-        .limit(per_page)
     )
-    orders = list(result.scalars().all())
-    return {"items": orders, "total": total, "page": page, "per_page": per_page}
+    return await paginate(
+        db, query, (Order.created_at.desc(), Order.id.desc()),
+        page=page, per_page=per_page, cursor=cursor, total=total,
+    )
 
 
 async def get_order(db: AsyncSession, user_id: uuid.UUID, order_id: uuid.UUID) -> Order:
@@ -293,3 +433,41 @@ async def get_order(db: AsyncSession, user_id: uuid.UUID, order_id: uuid.UUID) -
     if order is None:
         raise HTTPException(status.HTTP_404_NOT_FOUND, "Order not found")
     return order
+
+
+async def update_order_status(db: AsyncSession, order_id: uuid.UUID, new_status: str) -> Order:
+    """Move an order to ``new_status`` (e.g. shipped, cancelled, refunded).
+
+    When the order enters or leaves the statuses that count towards a
+    referrer's permanent tier, its tins are added to or removed from the
+    affiliate_stats counter in the same transaction.
+    """
+    if new_status not in ORDER_STATUSES:
+        raise HTTPException(
+            status.HTTP_400_BAD_REQUEST,
+            f"Invalid status '{new_status}'. Must be one of: {', '.join(sorted(ORDER_STATUSES))}",
+        )
+
+    result = await db.execute(
+        select(Order).where(Order.id == order_id).options(selectinload(Order.items)).with_for_update()
+    )
+    order = result.scalar_one_or_none()
+    if order is None:
+        raise HTTPException(status.HTTP_404_NOT_FOUND, "Order not found")
+
+    was_counted = order.status in REFERRED_TIN_ORDER_STATUSES
+    is_counted = new_status in REFERRED_TIN_ORDER_STATUSES
+    if was_counted != is_counted:
+        tins = sum(item.quantity for item in order.items)
+        await record_referred_tins(db, order.user_id, tins if is_counted else -tins)
+
+    order.status = new_status
+    await db.commit()
+
+    result = await db.execute(
+        select(Order)
+        .where(Order.id == order_id)
+        .options(selectinload(Order.items).selectinload(OrderItem.product))
+        .execution_options(populate_existing=True)
+    )
+    return result.scalar_one()
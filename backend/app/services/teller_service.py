@@ -18,6 +18,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from app.core.config import settings
 from app.models.teller_account import TellerAccount
 from app.models.treasury_snapshot import TreasurySnapshot
+from app.services.redis_service import invalidate_sparklines
 
 logger = logging.getLogger(__name__)
 
@@ -104,6 +105,7 @@ async def sync_all_balances(db: AsyncSession) -> dict:
         return {}
 
     sync_results = {}
+    snapshots_written = 0
     now = datetime.now(timezone.utc)
 
     for account in accounts:
@@ -134,6 +136,7 @@ async def sync_all_balances(db: AsyncSession) -> dict:
                         bank_balance=balance,
                     )
                     db.add(snapshot)
+                    snapshots_written += 1
                 else:
                     account.sync_status = "error"
                     account_result["status"] = "error"
@@ -145,6 +148,12 @@ async def sync_all_balances(db: AsyncSession) -> dict:
         sync_results[account.name] = account_result
 
     await db.commit()
+    if snapshots_written:
+        # Cached treasury sparklines are keyed by generation; new snapshots retire them.
+        try:
+            await invalidate_sparklines()
+        except Exception as exc:
+            logger.warning("Could not invalidate cached sparklines: %s", exc)
     logger.info("Teller sync complete: %s", sync_results)
     return sync_results
 
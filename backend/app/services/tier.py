@@ -12,22 +12,28 @@ from app.models.tier import Tier
 TIER_ORDER = ["Standard", "VIP", "High Roller", "Whale"]
 
 
-def get_current_quarter_range() -> tuple[datetime, datetime]:
-    """Return (start, end) datetimes for the current calendar quarter (UTC)."""
-    today = date.today()
-    quarter = (today.month - 1) // 3
-    q_start_month = quarter * 3 + 1
-    q_start = datetime(today.year, q_start_month, 1, tzinfo=timezone.utc)
+def quarter_range(day: date) -> tuple[datetime, datetime]:
+    """Return (start, end) datetimes for the calendar quarter containing *day* (UTC).
+
+    These are also the bounds of the scans table's quarterly partitions.
+    """
+    q_start_month = (day.month - 1) // 3 * 3 + 1
+    q_start = datetime(day.year, q_start_month, 1, tzinfo=timezone.utc)
 
     next_q_month = q_start_month + 3
     if next_q_month > 12:
-        q_end = datetime(today.year + 1, 1, 1, tzinfo=timezone.utc)
+        q_end = datetime(day.year + 1, 1, 1, tzinfo=timezone.utc)
     else:
-        q_end = datetime(today.year, next_q_month, 1, tzinfo=timezone.utc)
+        q_end = datetime(day.year, next_q_month, 1, tzinfo=timezone.utc)
 
     return q_start, q_end
 
 
+def get_current_quarter_range() -> tuple[datetime, datetime]:
+    """Return (start, end) datetimes for the current calendar quarter (UTC)."""
+    return quarter_range(date.today())
+
+
 async def get_quarterly_scan_count(db: AsyncSession, user_id: uuid.UUID) -> int:
     """Count scans for a user in the current quarter."""
     q_start, q_end = get_current_quarter_range()
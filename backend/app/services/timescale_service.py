@@ -3,9 +3,15 @@
 Uses PostgreSQL native date_trunc() + GROUP BY for time-bucketed aggregations.
 TimescaleDB is NOT required — the same queries work on standard PostgreSQL.
 
+Where the timescaledb extension is available, migration 033 converts both
+tables to hypertables and creates real-time continuous aggregates. With
+TIMESCALE_ENABLED, reads then come from those aggregates and fall back to
+the plain queries if they are missing.
+
 Tables used:
   - treasury_snapshots (created in migration 014)
   - transparency_metrics (created in migration 013)
+  - treasury_snapshots_daily, transparency_metrics_hourly (migration 033, optional)
 """
 
 import logging
@@ -15,11 +21,52 @@ from decimal import Decimal
 import sqlalchemy as sa
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.config import settings
 from app.models.transparency_metric import TransparencyMetric
 from app.models.treasury_snapshot import TreasurySnapshot
+from app.services.redis_service import (
+    cache_sparklines,
+    get_cached_sparklines,
+    get_sparklines_generation,
+    invalidate_sparklines,
+)
 
 logger = logging.getLogger(__name__)
 
+# Continuous aggregates created by migration 033
+TREASURY_DAILY_VIEW = "treasury_snapshots_daily"
+METRICS_HOURLY_VIEW = "transparency_metrics_hourly"
+
+# Pools shown on the treasury dashboard, in display order
+TREASURY_POOLS = ("consumer", "affiliate", "wholesale")
+
+# Whether the continuous aggregates exist; checked once per process (until a probe succeeds)
+_continuous_aggregates: bool | None = None
+
+
+async def _has_continuous_aggregates(db: AsyncSession) -> bool:
+    """Return True when TimescaleDB mode is on and both aggregates exist."""
+    global _continuous_aggregates
+    if not settings.TIMESCALE_ENABLED:
+        return False
+    if _continuous_aggregates is None:
+        try:
+            # A SAVEPOINT keeps a failed probe from aborting the caller's transaction.
+            async with db.begin_nested():
+                result = await db.execute(
+                    sa.text("SELECT to_regclass(:daily) IS NOT NULL AND to_regclass(:hourly) IS NOT NULL"),
+                    {"daily": TREASURY_DAILY_VIEW, "hourly": METRICS_HOURLY_VIEW},
+                )
+                found = bool(result.scalar())
+        except Exception as exc:
+            # Not cached: a transient error should not pin the plain queries.
+            logger.warning("Could not check for continuous aggregates: %s", exc)
+            return False
+        _continuous_aggregates = found
+        if not _continuous_aggregates:
+            logger.info("TIMESCALE_ENABLED but continuous aggregates missing — using plain SQL")
+    return _continuous_aggregates
+
 
 # ---------------------------------------------------------------------------
 # Treasury snapshots
@@ -54,6 +101,10 @@ async def write_treasury_snapshot(
     db.add(snapshot)
     await db.commit()
     await db.refresh(snapshot)
+    try:
+        await invalidate_sparklines()
+    except Exception as exc:
+        logger.warning("Could not invalidate cached sparklines: %s", exc)
     logger.debug(
         "Wrote treasury snapshot: pool=%s onchain=%s bank=%s",
         pool_type, onchain_balance, bank_balance,
@@ -68,7 +119,8 @@ async def get_treasury_sparkline(
 ) -> list[dict]:
     """Return daily aggregated treasury snapshots for sparkline charts.
 
-    Uses PostgreSQL native date_trunc('day', timestamp) + AVG() for bucketing.
+    Reads the daily continuous aggregate in TimescaleDB mode, otherwise uses
+    PostgreSQL native date_trunc('day', timestamp) + AVG() for bucketing.
 
     Args:
         pool_type: Pool to query ("consumer", "affiliate", "wholesale").
@@ -78,18 +130,31 @@ async def get_treasury_sparkline(
         List of {"date": str, "onchain_balance": float, "bank_balance": float}
         sorted ascending by date.
     """
-    query = sa.text("""
-        SELECT
-            date_trunc('day', timestamp)::date AS day,
-            AVG(onchain_balance) AS avg_onchain,
-            AVG(bank_balance)    AS avg_bank
-        FROM treasury_snapshots
-        WHERE
-            pool_type = :pool_type
-            AND timestamp >= NOW() - INTERVAL '1 day' * :days
-        GROUP BY day
-        ORDER BY day ASC
-    """)
+    if await _has_continuous_aggregates(db):
+        query = sa.text(f"""
+            SELECT
+                day::date   AS day,
+                avg_onchain,
+                avg_bank
+            FROM {TREASURY_DAILY_VIEW}
+            WHERE
+                pool_type = :pool_type
+                AND day >= date_trunc('day', NOW() - INTERVAL '1 day' * :days)
+            ORDER BY day ASC
+        """)
+    else:
+        query = sa.text("""
+            SELECT
+                date_trunc('day', timestamp)::date AS day,
+                AVG(onchain_balance) AS avg_onchain,
+                AVG(bank_balance)    AS avg_bank
+            FROM treasury_snapshots
+            WHERE
+                pool_type = :pool_type
+                AND timestamp >= NOW() - INTERVAL '1 day' * :days
+            GROUP BY day
+            ORDER BY day ASC
+        """)
     result = await db.execute(query, {"pool_type": pool_type, "days": days})
     rows = result.fetchall()
     return [
@@ -102,6 +167,75 @@ async def get_treasury_sparkline(
     ]
 
 
+async def get_treasury_sparklines(db: AsyncSession, days: int = 90) -> dict[str, list[dict]]:
+    """Return daily sparklines for every treasury pool from one grouped query.
+
+    Results are cached in Redis until the next ``write_treasury_snapshot``
+    bumps the cache generation, so the hourly snapshot task is the only
+    thing that triggers a recompute.
+
+    Args:
+        days: Number of days of history to return.
+
+    Returns:
+        {pool_type: [{"date", "onchain_balance", "bank_balance"}, ...]} for
+        each pool in TREASURY_POOLS, each series sorted ascending by date.
+    """
+    generation = None
+    try:
+        generation = await get_sparklines_generation()
+        cached = await get_cached_sparklines(generation, days)
+        if cached is not None:
+            return cached
+    except Exception as exc:
+        logger.debug("Sparkline cache unavailable (%s) — querying directly", exc)
+
+    if await _has_continuous_aggregates(db):
+        query = sa.text(f"""
+            SELECT
+                pool_type,
+                day::date   AS day,
+                avg_onchain,
+                avg_bank
+            FROM {TREASURY_DAILY_VIEW}
+            WHERE
+                pool_type IN :pool_types
+                AND day >= date_trunc('day', NOW() - INTERVAL '1 day' * :days)
+            ORDER BY pool_type, day ASC
+        """)
+    else:
+        query = sa.text("""
+            SELECT
+                pool_type,
+                date_trunc('day', timestamp)::date AS day,
+                AVG(onchain_balance) AS avg_onchain,
+                AVG(bank_balance)    AS avg_bank
+            FROM treasury_snapshots
+            WHERE
+                pool_type IN :pool_types
+                AND timestamp >= NOW() - INTERVAL '1 day' * :days
+            GROUP BY pool_type, day
+            ORDER BY pool_type, day ASC
+        """)
+    query = query.bindparams(sa.bindparam("pool_types", expanding=True))
+    result = await db.execute(query, {"pool_types": list(TREASURY_POOLS), "days": days})
+
+    sparklines: dict[str, list[dict]] = {pool: [] for pool in TREASURY_POOLS}
+    for row in result.fetchall():
+        sparklines[row.pool_type].append({
+            "date": str(row.day),
+            "onchain_balance": float(row.avg_onchain or 0),
+            "bank_balance": float(row.avg_bank or 0),
+        })
+
+    if generation is not None:
+        try:
+            await cache_sparklines(generation, days, sparklines)
+        except Exception as exc:
+            logger.debug("Could not cache sparklines: %s", exc)
+    return sparklines
+
+
 # ---------------------------------------------------------------------------
 # Transparency metrics
 # ---------------------------------------------------------------------------
@@ -142,6 +276,8 @@ async def get_metric_history(
 ) -> list[dict]:
     """Return hourly bucketed metric history for the past N hours.
 
+    Reads the hourly continuous aggregate in TimescaleDB mode.
+
     Args:
         metric_key: Metric type to query.
         hours: Number of hours of history.
@@ -150,18 +286,31 @@ async def get_metric_history(
         List of {"hour": str, "avg_value": float, "max_value": float}
         sorted ascending by hour.
     """
-    query = sa.text("""
-        SELECT
-            date_trunc('hour', timestamp) AS hour,
-            AVG(metric_value)             AS avg_value,
-            MAX(metric_value)             AS max_value
-        FROM transparency_metrics
-        WHERE
-            metric_type = :metric_key
-            AND timestamp >= NOW() - INTERVAL '1 hour' * :hours
-        GROUP BY hour
-        ORDER BY hour ASC
-    """)
+    if await _has_continuous_aggregates(db):
+        query = sa.text(f"""
+            SELECT
+                hour,
+                avg_value,
+                max_value
+            FROM {METRICS_HOURLY_VIEW}
+            WHERE
+                metric_type = :metric_key
+                AND hour >= date_trunc('hour', NOW() - INTERVAL '1 hour' * :hours)
+            ORDER BY hour ASC
+        """)
+    else:
+        query = sa.text("""
+            SELECT
+                date_trunc('hour', timestamp) AS hour,
+                AVG(metric_value)             AS avg_value,
+                MAX(metric_value)             AS max_value
+            FROM transparency_metrics
+            WHERE
+                metric_type = :metric_key
+                AND timestamp >= NOW() - INTERVAL '1 hour' * :hours
+            GROUP BY hour
+            ORDER BY hour ASC
+        """)
     result = await db.execute(query, {"metric_key": metric_key, "hours": hours})
     rows = result.fetchall()
     return [
@@ -1,34 +1,117 @@
 """Google Cloud Translation service for social message internationalization.
 
-Translates chat messages on-demand and caches results in the
-social_message_translations table.  Falls back gracefully when the
-Translation API is not configured.
+Translates chat messages on-demand behind two cache tiers: Redis (hot,
+TTL-bound) and the social_message_translations table (durable). Falls back
+gracefully when the Translation API is not configured.
+
+The provider client is a process-wide singleton and its blocking calls run
+in a worker thread so they never stall the event loop. Concurrent requests
+for the same (message, language) pair share a single in-flight translation,
+and ``translate_messages`` translates a whole history page with one provider
+call.
 
 Settings used:
   TRANSLATION_ENABLED              — global kill-switch
+  TRANSLATION_PROVIDER             — "google" or "fake" (offline, deterministic)
   TRANSLATION_GOOGLE_PROJECT_ID    — GCP project ID
   TRANSLATION_GOOGLE_CREDENTIALS_PATH — optional service-account JSON path
   TRANSLATION_SUPPORTED_LANGUAGES  — list of ISO 639-1 codes we will serve
+  TRANSLATION_CACHE_TTL            — Redis cache TTL in seconds
 """
 
+import abc
+import asyncio
 import logging
 import uuid
 from datetime import datetime, timezone
 
 from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.config import settings
 from app.models.social_message_translation import SocialMessageTranslation
+from app.services.redis_service import cache_translations, get_cached_translations
 
 logger = logging.getLogger(__name__)
 
+# Google Translate v2 accepts at most 128 text segments per request
+PROVIDER_BATCH_SIZE = 128
+
+_translate_client = None
+_fake_provider: "FakeTranslationProvider | None" = None
+
+# (message_id, language) -> future resolved by the request doing the work
+_inflight: dict[tuple[str, str], asyncio.Future] = {}
+
+
+# ---------------------------------------------------------------------------
+# Providers
+# ---------------------------------------------------------------------------
+
+
+class TranslationProvider(abc.ABC):
+    """Synchronous provider interface; callers run it via ``asyncio.to_thread``."""
+
+    @abc.abstractmethod
+    def translate(
+        self, texts: list[str], target_language: str, source_language: str | None
+    ) -> list[str]:
+        """Translate *texts* in order; returns one translation per input."""
+
+    @abc.abstractmethod
+    def detect(self, text: str) -> str:
+        """Return the ISO 639-1 code of *text*'s language."""
+
+
+class GoogleTranslationProvider(TranslationProvider):
+    """Adapter over the ``google.cloud.translate_v2`` client."""
+
+    def __init__(self, client) -> None:
+        self._client = client
+
+    def translate(
+        self, texts: list[str], target_language: str, source_language: str | None
+    ) -> list[str]:
+        response = self._client.translate(
+            texts,
+            target_language=target_language,
+            source_language=source_language,
+        )
+        return [item["translatedText"] for item in response]
+
+    def detect(self, text: str) -> str:
+        return self._client.detect_language(text).get("language", "en")
+
+
+class FakeTranslationProvider(TranslationProvider):
+    """Deterministic offline provider for local development and tests.
+
+    Prefixes each text with the target language code and counts provider
+    calls so tests can assert on batching and coalescing.
+    """
+
+    def __init__(self) -> None:
+        self.calls = 0
+
+    def translate(
+        self, texts: list[str], target_language: str, source_language: str | None
+    ) -> list[str]:
+        self.calls += 1
+        return [f"[{target_language}] {text}" for text in texts]
+
+    def detect(self, text: str) -> str:
+        return "en"
+
 
 def _get_translate_client():
-    """Lazy-load Google Cloud Translate client.
+    """Return the shared Google Cloud Translate client, creating it on first use.
 
     Returns the client or None if the library / credentials are unavailable.
     """
+    global _translate_client
+    if _translate_client is not None:
+        return _translate_client
     try:
         from google.cloud import translate_v2 as translate  # type: ignore
         import os
@@ -39,12 +122,98 @@ def _get_translate_client():
                 settings.TRANSLATION_GOOGLE_CREDENTIALS_PATH,
             )
 
-        return translate.Client()
+        _translate_client = translate.Client()
+        return _translate_client
     except Exception as exc:
         logger.warning("Google Translate client unavailable: %s", exc)
         return None
 
 
+def get_translation_provider() -> TranslationProvider | None:
+    """Return the configured provider, or None if it is unavailable."""
+    global _fake_provider
+    if settings.TRANSLATION_PROVIDER == "fake":
+        if _fake_provider is None:
+            _fake_provider = FakeTranslationProvider()
+        return _fake_provider
+
+    client = _get_translate_client()
+    if client is None:
+        return None
+    return GoogleTranslationProvider(client)
+
+
+async def _provider_translate(
+    provider: TranslationProvider,
+    texts: list[str],
+    target_language: str,
+    source_language: str | None,
+) -> list[str]:
+    """Translate *texts* off the event loop, chunked to the provider limit."""
+    translated: list[str] = []
+    for start in range(0, len(texts), PROVIDER_BATCH_SIZE):
+        chunk = texts[start : start + PROVIDER_BATCH_SIZE]
+        translated.extend(
+            await asyncio.to_thread(provider.translate, chunk, target_language, source_language)
+        )
+    return translated
+
+
+# ---------------------------------------------------------------------------
+# Cache tiers
+# ---------------------------------------------------------------------------
+
+
+async def _redis_get(message_ids: list[str], language: str) -> dict[str, str]:
+    try:
+        return await get_cached_translations(message_ids, language)
+    except Exception:
+        logger.debug("Redis translation cache unavailable, falling back to DB")
+        return {}
+
+
+async def _redis_set(translations: dict[str, str], language: str) -> None:
+    try:
+        await cache_translations(translations, language, settings.TRANSLATION_CACHE_TTL)
+    except Exception:
+        logger.debug("Could not write %d translations to Redis", len(translations))
+
+
+async def _persist(db: AsyncSession, translations: dict[str, str], language: str) -> None:
+    """Store freshly translated texts in the durable DB cache.
+
+    Rows another request already stored are skipped (``uq_message_language``),
+    so a concurrent duplicate never discards the rest of the batch.
+    """
+    now = datetime.now(timezone.utc)
+    try:
+        await db.execute(
+            pg_insert(SocialMessageTranslation)
+            .values(
+                [
+                    {
+                        "id": uuid.uuid4(),
+                        "message_id": uuid.UUID(message_id),
+                        "language": language,
+                        "translated_text": text,
+                        "translated_at": now,
+                    }
+                    for message_id, text in translations.items()
+                ]
+            )
+            .on_conflict_do_nothing(index_elements=["message_id", "language"])
+        )
+        await db.commit()
+    except Exception as exc:
+        logger.warning("Could not cache %d translations: %s", len(translations), exc)
+        await db.rollback()
+
+
+# ---------------------------------------------------------------------------
+# Public API
+# ---------------------------------------------------------------------------
+
+
 async def detect_language(text: str) -> str:
     """Detect the language of a given text string.
 
@@ -53,13 +222,12 @@ async def detect_language(text: str) -> str:
     if not settings.TRANSLATION_ENABLED:
         return "en"
 
-    client = _get_translate_client()
-    if client is None:
+    provider = get_translation_provider()
+    if provider is None:
         return "en"
 
     try:
-        result = client.detect_language(text)
-        return result.get("language", "en")
+        return await asyncio.to_thread(provider.detect, text)
     except Exception as exc:
         logger.warning("Language detection failed: %s", exc)
         return "en"
@@ -70,17 +238,20 @@ async def translate_message(
     message_id: uuid.UUID,
     source_text: str,
     target_language: str,
+    source_language: str | None = "en",
 ) -> str | None:
     """Translate a social message to the requested language.
 
-    Checks the DB cache first.  On miss, calls Google Translate and stores
-    the result.
+    Checks Redis, then the DB cache. On miss, calls the provider and stores
+    the result in both tiers. Concurrent calls for the same message and
+    language share one translation.
 
     Args:
         db: Async database session.
         message_id: UUID of the social Message row.
         source_text: Original message text to translate.
         target_language: ISO 639-1 target language code (e.g. "es", "fr").
+        source_language: ISO 639-1 source code, or None to let the provider detect it.
 
     Returns:
         Translated text, or None if translation is disabled/unavailable.
@@ -92,49 +263,131 @@ async def translate_message(
         logger.debug("Unsupported language requested: %s", target_language)
         return None
 
-    # Check DB cache
+    key = (str(message_id), target_language)
+    pending = _inflight.get(key)
+    if pending is not None:
+        return await asyncio.shield(pending)
+
+    future = asyncio.get_running_loop().create_future()
+    _inflight[key] = future
+    translated = None
+    try:
+        translated = await _translate_one(
+            db, key[0], source_text, target_language, source_language
+        )
+        return translated
+    finally:
+        del _inflight[key]
+        # Waiters get None if the leading request failed or was cancelled.
+        future.set_result(translated)
+
+
+async def _translate_one(
+    db: AsyncSession,
+    message_id: str,
+    source_text: str,
+    target_language: str,
+    source_language: str | None,
+) -> str | None:
+    cached = await _redis_get([message_id], target_language)
+    if message_id in cached:
+        return cached[message_id]
+
     result = await db.execute(
         select(SocialMessageTranslation).where(
-            SocialMessageTranslation.message_id == message_id,
+            SocialMessageTranslation.message_id == uuid.UUID(message_id),
             SocialMessageTranslation.language == target_language,
         )
     )
-    cached = result.scalar_one_or_none()
-    if cached:
-        return cached.translated_text
+    row = result.scalar_one_or_none()
+    if row:
+        await _redis_set({message_id: row.translated_text}, target_language)
+        return row.translated_text
 
-    # Call Google Translate
-    client = _get_translate_client()
-    if client is None:
+    provider = get_translation_provider()
+    if provider is None:
         return None
 
     try:
-        response = client.translate(
-            source_text,
-            target_language=target_language,
-            source_language="en",
+        (translated,) = await _provider_translate(
+            provider, [source_text], target_language, source_language
         )
-        translated = response["translatedText"]
     except Exception as exc:
-        logger.error("Google Translate API error for message %s: %s", message_id, exc)
+        logger.error("Translation provider error for message %s: %s", message_id, exc)
         return None
 
-    # Persist to DB cache
-    row = SocialMessageTranslation(
-        message_id=message_id,
-        language=target_language,
-        translated_text=translated,
-        translated_at=datetime.now(timezone.utc),
-    )
-    db.add(row)
+    await _persist(db, {message_id: translated}, target_language)
+    await _redis_set({message_id: translated}, target_language)
+    return translated
+
+
+async def translate_messages(
+    db: AsyncSession,
+    messages: list[tuple[uuid.UUID, str]],
+    target_language: str,
+    source_language: str | None = "en",
+) -> dict[str, str]:
+    """Translate a batch of messages (e.g. a history page) to one language.
+
+    Resolves hits from Redis with one MGET, then from the DB with one IN
+    query, and sends every remaining text to the provider in a single call
+    (chunked only above ``PROVIDER_BATCH_SIZE``).
+
+    Args:
+        db: Async database session.
+        messages: ``(message_id, source_text)`` pairs.
+        target_language: ISO 639-1 target language code.
+        source_language: ISO 639-1 source code, or None to let the provider detect it.
+
+    Returns:
+        Mapping of message_id (str) to translated text. Messages that could
+        not be translated are omitted.
+    """
+    if not settings.TRANSLATION_ENABLED or not messages:
+        return {}
+
+    if target_language not in settings.TRANSLATION_SUPPORTED_LANGUAGES:
+        logger.debug("Unsupported language requested: %s", target_language)
+        return {}
+
+    texts = {str(message_id): text for message_id, text in messages}
+    translations = await _redis_get(list(texts), target_language)
+
+    missing = [mid for mid in texts if mid not in translations]
+    if missing:
+        result = await db.execute(
+            select(
+                SocialMessageTranslation.message_id, SocialMessageTranslation.translated_text
+            ).where(
+                SocialMessageTranslation.message_id.in_([uuid.UUID(mid) for mid in missing]),
+                SocialMessageTranslation.language == target_language,
+            )
+        )
+        from_db = {str(message_id): text for message_id, text in result.all()}
+        translations.update(from_db)
+        await _redis_set(from_db, target_language)
+
+    missing = [mid for mid in texts if mid not in translations]
+    if not missing:
+        return translations
+
+    provider = get_translation_provider()
+    if provider is None:
+        return translations
+
     try:
-        await db.commit()
-        await db.refresh(row)
+        translated = await _provider_translate(
+            provider, [texts[mid] for mid in missing], target_language, source_language
+        )
     except Exception as exc:
-        logger.warning("Could not cache translation for message %s: %s", message_id, exc)
-        await db.rollback()
-
-    return translated
+        logger.error("Translation provider error for %d messages: %s", len(missing), exc)
+        return translations
+
+    fresh = dict(zip(missing, translated))
+    await _persist(db, fresh, target_language)
+    await _redis_set(fresh, target_language)
+    translations.update(fresh)
+    return translations
 
 
 async def get_cached_translation(
@@ -1,15 +1,24 @@
 """User wallet service — manages wallet records and transactions."""
 
 import hashlib
+import logging
 import re
+import time
 import uuid
+from collections import defaultdict
+from datetime import datetime, timezone
 from decimal import Decimal
 
-from sqlalchemy import select
+from sqlalchemy import column, func, insert, literal, select, update, values
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.transaction import Transaction
 from app.models.wallet import Wallet
+from app.models.wallet_ledger_entry import WalletLedgerEntry
+from app.services.bootstrap_service import invalidate_bootstrap
+from app.services.pagination import TotalMode, paginate
+
+logger = logging.getLogger(__name__)
 
 # Minimum withdrawal amount in USDC
 MIN_WITHDRAWAL_USDC = Decimal("5.00")
@@ -17,6 +26,12 @@ MIN_WITHDRAWAL_USDC = Decimal("5.00")
 # Polygon address regex: 0x followed by 40 hex chars
 POLYGON_ADDRESS_RE = re.compile(r"^0x[0-9a-fA-F]{40}$")
 
+# Ledger entries that also count towards the owner's affiliate lifetime_earnings
+AFFILIATE_EARNING_ENTRY_TYPES = ("affiliate_match", "affiliate_payout")
+
+# Entries folded into wallet snapshots per materializer transaction
+LEDGER_MATERIALIZE_BATCH_SIZE = 5000
+
 
 def _deterministic_placeholder_address(email: str) -> str:
     """Generate a deterministic placeholder wallet address from an email.
@@ -76,12 +91,176 @@ async def get_user_wallet_balance(db: AsyncSession, user_id: uuid.UUID) -> dict:
         }
     return {
         "address": wallet.address,
-        "balance_available": wallet.balance_available,
+        "balance_available": await get_available_balance(db, user_id),
         "balance_pending": wallet.balance_pending,
         "comp_balance": comp_balance,
     }
 
 
+def _live_balance():
+    """Snapshot plus unmaterialized ledger entries, as one correlated expression.
+
+    Evaluated in a single statement, so it reads one consistent snapshot even
+    while the materializer moves entries into ``balance_available``.
+    """
+    delta = (
+        select(func.coalesce(func.sum(WalletLedgerEntry.amount), 0))
+        .where(
+            WalletLedgerEntry.wallet_id == Wallet.id,
+            WalletLedgerEntry.materialized_at.is_(None),
+        )
+        .scalar_subquery()
+    )
+    return Wallet.balance_available + delta
+
+
+async def get_available_balance(db: AsyncSession, user_id: uuid.UUID) -> Decimal:
+    """Return the live available balance for a user's wallet (0 if none)."""
+    result = await db.execute(select(_live_balance()).where(Wallet.user_id == user_id))
+    balance = result.scalar_one_or_none()
+    return Decimal(balance).quantize(Decimal("0.01")) if balance is not None else Decimal("0")
+
+
+async def credit_wallet(
+    db: AsyncSession,
+    user_id: uuid.UUID,
+    amount: Decimal,
+    entry_type: str,
+    reference_id: uuid.UUID | None = None,
+) -> None:
+    """Append a credit to a user's wallet ledger. Does not commit.
+
+    A single INSERT ... SELECT — the wallet row is neither loaded nor
+    locked, so concurrent credits to one wallet never wait on each other.
+    Users without a wallet are skipped. The caller invalidates the
+    bootstrap cache after committing.
+    """
+    await db.execute(
+        insert(WalletLedgerEntry).from_select(
+            ["wallet_id", "amount", "entry_type", "reference_id"],
+            select(
+                Wallet.id,
+                literal(amount, WalletLedgerEntry.amount.type),
+                literal(entry_type, WalletLedgerEntry.entry_type.type),
+                literal(reference_id, WalletLedgerEntry.reference_id.type),
+            ).where(Wallet.user_id == user_id),
+            include_defaults=False,
+        )
+    )
+
+
+async def credit_wallets(
+    db: AsyncSession, credits: list[tuple[uuid.UUID, Decimal]], entry_type: str
+) -> None:
+    """Append one credit per ``(user_id, amount)`` in a single INSERT. Does not commit.
+
+    The caller invalidates the bootstrap cache after committing.
+    """
+    if not credits:
+        return
+    rows = values(
+        column("user_id", Wallet.user_id.type),
+        column("amount", WalletLedgerEntry.amount.type),
+        name="credits",
+    ).data(credits)
+    await db.execute(
+        insert(WalletLedgerEntry).from_select(
+            ["wallet_id", "amount", "entry_type"],
+            select(
+                Wallet.id,
+                rows.c.amount,
+                literal(entry_type, WalletLedgerEntry.entry_type.type),
+            ).join_from(Wallet, rows, Wallet.user_id == rows.c.user_id),
+            include_defaults=False,
+        )
+    )
+
+
+async def materialize_wallet_ledger(
+    db: AsyncSession, batch_size: int = LEDGER_MATERIALIZE_BATCH_SIZE
+) -> dict:
+    """Fold unmaterialized ledger entries into wallet (and affiliate) snapshots.
+
+    Each batch claims up to ``batch_size`` entries (SKIP LOCKED, so parallel
+    runs split the work), stamps ``materialized_at`` and adds the per-wallet
+    sums with one ``UPDATE ... FROM (VALUES ...)``, all in one transaction —
+    readers see either the entry or its effect on the snapshot, never both.
+    Affiliate earning entries also advance ``affiliates.lifetime_earnings``.
+    """
+    from app.models.affiliate import Affiliate
+
+    started = time.monotonic()
+    report = {"entries": 0, "wallets": 0, "batches": 0}
+    while True:
+        batch = (
+            select(WalletLedgerEntry.id)
+            .where(WalletLedgerEntry.materialized_at.is_(None))
+            .order_by(WalletLedgerEntry.created_at)
+            .limit(batch_size)
+            .with_for_update(skip_locked=True)
+        )
+        claimed = (
+            await db.execute(
+                update(WalletLedgerEntry)
+                .where(WalletLedgerEntry.id.in_(batch))
+                .values(materialized_at=datetime.now(timezone.utc))
+                .returning(WalletLedgerEntry.wallet_id, WalletLedgerEntry.amount, WalletLedgerEntry.entry_type)
+                .execution_options(synchronize_session=False)
+            )
+        ).all()
+        if not claimed:
+            break
+
+        balances: dict[uuid.UUID, Decimal] = defaultdict(Decimal)
+        earnings: dict[uuid.UUID, Decimal] = defaultdict(Decimal)
+        for wallet_id, amount, entry_type in claimed:
+            balances[wallet_id] += amount
+            if entry_type in AFFILIATE_EARNING_ENTRY_TYPES:
+                earnings[wallet_id] += amount
+
+        deltas = values(
+            column("wallet_id", Wallet.id.type),
+            column("amount", Wallet.balance_available.type),
+            name="deltas",
+        ).data(list(balances.items()))
+        await db.execute(
+            update(Wallet)
+            .where(Wallet.id == deltas.c.wallet_id)
+            .values(balance_available=Wallet.balance_available + deltas.c.amount)
+            .execution_options(synchronize_session=False)
+        )
+        if earnings:
+            earned = values(
+                column("wallet_id", Wallet.id.type),
+                column("amount", Affiliate.lifetime_earnings.type),
+                name="earned",
+            ).data(list(earnings.items()))
+            owners = select(Wallet.user_id, earned.c.amount).join_from(
+                Wallet, earned, Wallet.id == earned.c.wallet_id
+            ).subquery("owners")
+            await db.execute(
+                update(Affiliate)
+                .where(Affiliate.user_id == owners.c.user_id)
+                .values(lifetime_earnings=Affiliate.lifetime_earnings + owners.c.amount)
+                .execution_options(synchronize_session=False)
+            )
+        await db.commit()
+
+        report["entries"] += len(claimed)
+        report["wallets"] += len(balances)
+        report["batches"] += 1
+        if len(claimed) < batch_size:
+            break
+
+    report["duration_seconds"] = round(time.monotonic() - started, 3)
+    if report["entries"]:
+        logger.info(
+            "Wallet ledger materialized — %d entries into %d wallets (%d batches)",
+            report["entries"], report["wallets"], report["batches"],
+        )
+    return report
+
+
 async def update_wallet_address(db: AsyncSession, user_id: uuid.UUID, new_address: str) -> Wallet:
     """Update a wallet's on-chain address (e.g. after MetaMask SDK setup)."""
     if not POLYGON_ADDRESS_RE.match(new_address):
@@ -94,6 +273,7 @@ async def update_wallet_address(db: AsyncSession, user_id: uuid.UUID, new_addres
     wallet.address = new_address
     await db.commit()
     await db.refresh(wallet)
+    await invalidate_bootstrap(user_id)
     return wallet
 
 
@@ -144,6 +324,7 @@ async def request_withdrawal(
     db.add(txn)
     await db.commit()
     await db.refresh(txn)
+    await invalidate_bootstrap(user_id)
     return txn
 
 
@@ -152,16 +333,19 @@ async def get_user_transactions(
     user_id: uuid.UUID,
     limit: int = 20,
     offset: int = 0,
-) -> list[Transaction]:
-    """Get paginated transaction history for a user, newest first."""
-    result = await db.execute(
-        select(Transaction)
-        .where(Transaction.user_id == user_id)
-        .order_by(Transaction.created_at.desc())
-        .limit(limit)
-        .offset(offset)
+    cursor: str | None = None,
+    total: TotalMode = "none",
+) -> dict:
+    """Paginated transaction history for a user, newest first.
+
+    Pass ``cursor`` for keyset paging; ``limit``/``offset`` alone still
+    work for older clients.
+    """
+    query = select(Transaction).where(Transaction.user_id == user_id)
+    return await paginate(
+        db, query, (Transaction.created_at.desc(), Transaction.id.desc()),
+        per_page=limit, offset=offset, cursor=cursor, total=total,
     )
-    return list(result.scalars().all())
 
 
 async def record_transaction(
@@ -241,4 +425,5 @@ async def apply_comp_payout_choice(
 
     await db.commit()
     await db.refresh(txn)
+    await invalidate_bootstrap(user_id)
     return txn
@@ -5,11 +5,12 @@ from datetime import datetime, timezone
 from decimal import Decimal
 
 from fastapi import HTTPException, status
-from sqlalchemy import func, select
+from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.wholesale_account import WholesaleAccount
 from app.models.wholesale_order import WholesaleOrder
+from app.services.pagination import TotalMode, paginate
 
 VALID_STATUSES = {"pending", "confirmed", "shipped", "delivered", "cancelled"}
 
@@ -66,26 +67,20 @@ async def get_wholesale_account_by_id(
 
 
 async def list_wholesale_accounts(
-    db: AsyncSession, page: int = 1, per_page: int = 20
+    db: AsyncSession,
+    page: int = 1,
+    per_page: int = 20,
+    cursor: str | None = None,
+    total: TotalMode = "exact",
 ) -> dict:
-    """Paginated list of all wholesale accounts.
+    """Paginated list of all wholesale accounts, newest first (keyset with ``cursor``).
 
-    Returns {"items": [...], "total": int, "page": int, "per_page": int}.
+    Returns the ``paginate`` page: {"items", "total", "page", "per_page", "next_cursor", ...}.
     """
-    count_result = await db.execute(
-        select(func.count()).select_from(WholesaleAccount)
-    )
-    total = count_result.scalar_one()
-
-    result = await db.execute(
-        select(WholesaleAccount)
-        .order_by(WholesaleAccount.created_at.desc())
-        .offset((page - 1) * per_page)
-        .limit(per_page)
+    return await paginate(
+        db, select(WholesaleAccount), (WholesaleAccount.created_at.desc(), WholesaleAccount.id.desc()),
+        page=page, per_page=per_page, cursor=cursor, total=total,
     )
-    items = list(result.scalars().all())
-
-    return {"items": items, "total": total, "page": page, "per_page": per_page}
 
 
 async def approve_wholesale_account(
@@ -164,10 +159,12 @@ async def list_orders(
     status: str | None = None,
     page: int = 1,
     per_page: int = 20,
+    cursor: str | None = None,
+    total: TotalMode = "exact",
 ) -> dict:
     """Paginated list of wholesale orders, optionally filtered by account_id and/or status.
 
-    Returns {"items": [...], "total": int, "page": int, "per_page": int}.
+    Returns the ``paginate`` page: {"items", "total", "page", "per_page", "next_cursor", ...}.
     """
     query = select(WholesaleOrder)
 
@@ -176,19 +173,10 @@ async def list_orders(
     if status is not None:
         query = query.where(WholesaleOrder.status == status)
 
-    count_result = await db.execute(
-        select(func.count()).select_from(query.subquery())
+    return await paginate(
+        db, query, (WholesaleOrder.created_at.desc(), WholesaleOrder.id.desc()),
+        page=page, per_page=per_page, cursor=cursor, total=total,
     )
-    total = count_result.scalar_one()
-
-    result = await db.execute(
-        query.order_by(WholesaleOrder.created_at.desc())
-        .offset((page - 1) * per_page)
-        .limit(per_page)
-    )
-    items = list(result.scalars().all())
-
-    return {"items": items, "total": total, "page": page, "per_page": per_page}
 
 
 async def update_order_status(
@@ -1,61 +1,86 @@
-"""Affiliate payout Celery task.
+"""Affiliate Celery tasks.
 
 run_weekly_affiliate_payout: distributes the weekly affiliate pool to qualified affiliates.
-
-Real logic wired in Phase D (affiliate service).
+process_vault_bonuses: mints the monthly bonus chip per 5 vaulted chips.
+expire_vaulted_chips: expires vaulted chips past their 365-day vault expiry.
+reconcile_affiliate_stats: nightly backfill/repair of the referred-tin counters.
 """
 
 import logging
-from datetime import datetime, timezone
 
 from app.celery_app import celery_app
 
 logger = logging.getLogger(__name__)
 
 
-@celery_app.task(name="app.tasks.affiliate.run_weekly_affiliate_payout", bind=True)
-def run_weekly_affiliate_payout(self) -> dict:
+@celery_app.task(name="app.tasks.affiliate.run_weekly_affiliate_payout")
+def run_weekly_affiliate_payout() -> dict:
     """Run the weekly affiliate pool payout.
 
-    Runs every Sunday at 3:00 AM UTC. Distributes 21% match rewards
-    to qualifying affiliates using the affiliate pool wallet.
-    Real implementation wired in Phase D.
+    Runs every Sunday at 3:00 AM UTC. Pays each affiliate their chip share
+    of the week's affiliate comp pool. Idempotent per ISO week: affiliates
+    already paid for the week are skipped, so a second invocation pays nothing.
     """
-    now = datetime.now(timezone.utc)
-    # ISO week key, e.g. "2026-W08" — unique per calendar week
-    iso_year, iso_week, _ = now.isocalendar()
-    week_key = f"{iso_year}-W{iso_week:02d}"
-
-    # Idempotency check: bail out if this ISO week's payout has already been recorded.
-    idempotency_key = f"affiliate:weekly_payout:{week_key}"
-    backend = self.backend
-    if backend is not None:
-        try:
-            already_ran = backend.client.get(idempotency_key)
-            if already_ran:
-                logger.info(
-                    "[affiliate] run_weekly_affiliate_payout already ran for %s — skipping.",
-                    week_key,
-                )
-                return {
-                    "status": "skipped",
-                    "task": "run_weekly_affiliate_payout",
-                    "week": week_key,
-                    "message": "Already executed for this ISO week.",
-                }
-            # Mark as ran; expire after 10 days so old keys are cleaned up automatically.
-            backend.client.setex(idempotency_key, 60 * 60 * 24 * 10, "1")
-        except Exception as exc:
-            # If Redis is unavailable, log and proceed rather than blocking the task.
-            logger.warning(
-                "[affiliate] Could not check/set idempotency key %s: %s — proceeding anyway.",
-                idempotency_key,
-                exc,
-            )
-
-    logger.info("[affiliate] run_weekly_affiliate_payout — task stub executed.")
-    return {
-        "status": "stub",
-        "task": "run_weekly_affiliate_payout",
-        "message": "Real implementation wired in Phase D affiliate service.",
-    }
+    import asyncio
+
+    return asyncio.run(_run_weekly_affiliate_payout_async())
+
+
+async def _run_weekly_affiliate_payout_async() -> dict:
+    from app.db.session import async_session_factory
+    from app.services.affiliate_service import run_weekly_pool_payout
+
+    async with async_session_factory() as db:
+        return await run_weekly_pool_payout(db)
+
+
+@celery_app.task(name="app.tasks.affiliate.process_vault_bonuses")
+def process_vault_bonuses() -> dict:
+    """Mint this month's vault bonus chips.
+
+    Runs on the 1st of each month at 3:00 AM UTC. Bonus chips carry their
+    month, so a repeated run mints nothing twice.
+    """
+    import asyncio
+
+    return asyncio.run(_process_vault_bonuses_async())
+
+
+async def _process_vault_bonuses_async() -> dict:
+    from app.db.session import async_session_factory
+    from app.services import affiliate_service
+
+    async with async_session_factory() as db:
+        return await affiliate_service.process_vault_bonuses(db)
+
+
+@celery_app.task(name="app.tasks.affiliate.expire_vaulted_chips")
+def expire_vaulted_chips() -> dict:
+    """Expire vaulted chips whose vault expiry has passed. Runs daily at 0:30 AM UTC."""
+    import asyncio
+
+    return asyncio.run(_expire_vaulted_chips_async())
+
+
+async def _expire_vaulted_chips_async() -> dict:
+    from app.db.session import async_session_factory
+    from app.services import affiliate_service
+
+    async with async_session_factory() as db:
+        return await affiliate_service.expire_vaulted_chips(db)
+
+
+@celery_app.task(name="app.tasks.affiliate.reconcile_affiliate_stats")
+def reconcile_affiliate_stats() -> dict:
+    """Recompute affiliate_stats counters from order history and repair drift."""
+    import asyncio
+
+    return asyncio.run(_reconcile_affiliate_stats_async())
+
+
+async def _reconcile_affiliate_stats_async() -> dict:
+    from app.db.session import async_session_factory
+    from app.services import affiliate_service
+
+    async with async_session_factory() as db:
+        return await affiliate_service.reconcile_affiliate_stats(db)
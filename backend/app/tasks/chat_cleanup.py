@@ -1,7 +1,8 @@
 """Nightly chat cleanup tasks.
 
 Tasks:
-  - purge_old_messages: batch DELETE messages older than 90 days (1000 rows/iteration)
+  - purge_old_messages: drop monthly message/reaction partitions past the 90-day retention window
+  - create_message_partitions: create the current and next 3 months' partitions ahead of time
   - cleanup_orphaned_streams: scan + delete orphaned stream Redis keys
 """
 
@@ -11,61 +12,43 @@ from app.celery_app import celery_app
 
 logger = logging.getLogger(__name__)
 
-# Messages older than this many days are hard-deleted
-RETENTION_DAYS = 90
-# Rows deleted per batch to avoid long-running transactions
-BATCH_SIZE = 1000
-
 
 @celery_app.task(name="app.tasks.chat_cleanup.purge_old_messages")
 def purge_old_messages():
-    """Hard-delete messages older than 90 days in batches of 1000."""
+    """Detach and drop message partitions whose whole month is past retention."""
     import asyncio
 
     asyncio.run(_purge_old_messages_async())
 
 
 async def _purge_old_messages_async():
-    from datetime import datetime, timedelta, timezone
+    from app.db.session import async_session_factory
+    from app.services.message_partitions import drop_expired_message_partitions
+
+    async with async_session_factory() as db:
+        dropped = await drop_expired_message_partitions(db)
 
-    from sqlalchemy import delete, select, func
+    logger.info("Chat purge complete — %d partitions dropped", len(dropped))
 
-    from app.models.message import Message
-    from app.db.session import async_session_factory
 
-    cutoff = datetime.now(timezone.utc) - timedelta(days=RETENTION_DAYS)
-    total_deleted = 0
+@celery_app.task(name="app.tasks.chat_cleanup.create_message_partitions")
+def create_message_partitions():
+    """Make sure upcoming months have message partitions before rows arrive."""
+    import asyncio
+
+    asyncio.run(_create_message_partitions_async())
+
+
+async def _create_message_partitions_async():
+    from app.db.session import async_session_factory
+    from app.services.message_partitions import count_default_partition_rows, ensure_message_partitions
 
     async with async_session_factory() as db:
-        while True:
-            # Find batch of old message IDs
-            stmt = (
-                select(Message.id)
-                .where(Message.created_at < cutoff)
-                .limit(BATCH_SIZE)
-            )
-            result = await db.execute(stmt)
-            ids = [row[0] for row in result.all()]
-
-            if not ids:
-                break
-
-            # Delete reactions first (cascade should handle this, but be explicit)
-            from app.models.message_reaction import MessageReaction
-
-            await db.execute(
-                delete(MessageReaction).where(MessageReaction.message_id.in_(ids))
-            )
-            await db.execute(delete(Message).where(Message.id.in_(ids)))
-            await db.commit()
-
-            total_deleted += len(ids)
-            logger.info("Purged %d old messages (batch), total so far: %d", len(ids), total_deleted)
-
-            if len(ids) < BATCH_SIZE:
-                break
-
-    logger.info("Chat purge complete — %d messages deleted (cutoff: %s)", total_deleted, cutoff.isoformat())
+        await ensure_message_partitions(db)
+        strays = {table: n for table, n in (await count_default_partition_rows(db)).items() if n}
+
+    if strays:
+        logger.warning("Rows in default message partitions (partitions were late): %s", strays)
 
 
 @celery_app.task(name="app.tasks.chat_cleanup.cleanup_orphaned_streams")
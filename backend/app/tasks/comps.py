@@ -1,62 +1,75 @@
-"""Guaranteed comps Celery task.
+"""Comp Celery tasks.
 
-run_monthly_guaranteed_comps: processes the $50 monthly guaranteed comp
-for all qualifying members who haven't yet hit a milestone this month.
-
-Real logic wired in Phase D (comp engine).
+run_monthly_guaranteed_comps: awards the $5 monthly guaranteed comp to
+first-year members who haven't received $5 in comps this month.
+roll_up_comp_transactions: folds closed hours of comp transactions into the
+comp rollup tables read by the transparency dashboard.
+reconcile_comp_rollups: nightly check of recent rollups against the ledger.
 """
 
 import logging
-from datetime import datetime, timezone
 
 from app.celery_app import celery_app
 
 logger = logging.getLogger(__name__)
 
 
-@celery_app.task(name="app.tasks.comps.run_monthly_guaranteed_comps", bind=True)
-def run_monthly_guaranteed_comps(self) -> dict:
-    """Run monthly guaranteed comp batch for all qualifying members.
+@celery_app.task(name="app.tasks.comps.run_monthly_guaranteed_comps")
+def run_monthly_guaranteed_comps() -> dict:
+    """Run the monthly guaranteed comp batch for all qualifying members.
 
-    Runs on the 1st of each month at 2:00 AM UTC. Awards $50 guaranteed
-    comp to all active members who have not hit a milestone comp this month.
-    Real implementation wired in Phase D comp engine.
+    Runs on the 1st of each month at 2:00 AM UTC. The month's
+    guaranteed_comp_runs row makes this idempotent: a completed month is
+    skipped and an interrupted one resumes from its last committed chunk.
     """
-    now = datetime.now(timezone.utc)
-    month_key = now.strftime("%Y-%m")
-
-    # Idempotency check: bail out if this month's run has already been recorded.
-    # The task stores a sentinel key in the Celery/Redis backend so a second
-    # invocation in the same calendar month is a no-op.
-    idempotency_key = f"comps:monthly_guaranteed:{month_key}"
-    backend = self.backend
-    if backend is not None:
-        try:
-            already_ran = backend.client.get(idempotency_key)
-            if already_ran:
-                logger.info(
-                    "[comps] run_monthly_guaranteed_comps already ran for %s — skipping.",
-                    month_key,
-                )
-                return {
-                    "status": "skipped",
-                    "task": "run_monthly_guaranteed_comps",
-                    "month": month_key,
-                    "message": "Already executed for this month.",
-                }
-            # Mark as ran; expire after 35 days so old keys are cleaned up automatically.
-            backend.client.setex(idempotency_key, 60 * 60 * 24 * 35, "1")
-        except Exception as exc:
-            # If Redis is unavailable, log and proceed rather than blocking the task.
-            logger.warning(
-                "[comps] Could not check/set idempotency key %s: %s — proceeding anyway.",
-                idempotency_key,
-                exc,
-            )
-
-    logger.info("[comps] run_monthly_guaranteed_comps — task stub executed.")
-    return {
-        "status": "stub",
-        "task": "run_monthly_guaranteed_comps",
-        "message": "Real implementation wired in Phase D comp engine.",
-    }
+    import asyncio
+
+    return asyncio.run(_run_monthly_guaranteed_comps_async())
+
+
+async def _run_monthly_guaranteed_comps_async() -> dict:
+    from app.db.session import async_session_factory
+    from app.services.comp_engine import process_guaranteed_comps
+
+    async with async_session_factory() as db:
+        return await process_guaranteed_comps(db)
+
+
+@celery_app.task(name="app.tasks.comps.roll_up_comp_transactions")
+def roll_up_comp_transactions() -> dict:
+    """Fold every closed hour of comp transactions into comp_rollups."""
+    import asyncio
+
+    return asyncio.run(_roll_up_comp_transactions_async())
+
+
+async def _roll_up_comp_transactions_async() -> dict:
+    from app.db.session import async_session_factory
+    from app.services.comp_rollup_service import roll_up_closed_hours
+
+    # A first run backfills history in MAX_HOURS_PER_RUN slices, one commit each.
+    totals = {"hours_closed": 0, "recipients_added": 0, "days_compacted": 0}
+    while True:
+        async with async_session_factory() as db:
+            report = await roll_up_closed_hours(db)
+        for key in totals:
+            totals[key] += report[key]
+        if report["caught_up"]:
+            break
+    return {**totals, "closed_through": report["closed_through"]}
+
+
+@celery_app.task(name="app.tasks.comps.reconcile_comp_rollups")
+def reconcile_comp_rollups() -> dict:
+    """Re-check the last RECONCILE_DAYS days of comp rollups against the ledger."""
+    import asyncio
+
+    return asyncio.run(_reconcile_comp_rollups_async())
+
+
+async def _reconcile_comp_rollups_async() -> dict:
+    from app.db.session import async_session_factory
+    from app.services import comp_rollup_service
+
+    async with async_session_factory() as db:
+        return await comp_rollup_service.reconcile_comp_rollups(db)
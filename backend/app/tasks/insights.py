@@ -0,0 +1,34 @@
+"""Insights dashboard snapshot refresh task.
+
+refresh_insights_snapshots: recomputes every public insights payload and
+stores it in Redis so API requests are served from the snapshot.
+"""
+
+import logging
+
+from app.celery_app import celery_app
+
+logger = logging.getLogger(__name__)
+
+
+@celery_app.task(name="app.tasks.insights.refresh_insights_snapshots")
+def refresh_insights_snapshots() -> dict:
+    """Recompute the overview, treasury, systems, comps and partners snapshots."""
+    import asyncio
+
+    return asyncio.run(_refresh_insights_snapshots_async())
+
+
+async def _refresh_insights_snapshots_async() -> dict:
+    from app.services.insights_snapshot_service import refresh_all_snapshots
+    from app.services.redis_client import close_redis
+
+    try:
+        versions = await refresh_all_snapshots()
+    finally:
+        # The Redis client is bound to this asyncio.run() loop; drop it so the
+        # next task invocation does not reuse a connection from a closed loop.
+        await close_redis()
+
+    logger.info("Insights snapshots refreshed — %s", versions)
+    return versions
@@ -0,0 +1,79 @@
+"""Notification outbox tasks.
+
+dispatch_notification_outbox: drains due push jobs written by
+notification_service in batches until the outbox is empty.
+purge_notification_outbox: deletes sent jobs past the retention window.
+"""
+
+import logging
+
+from app.celery_app import celery_app
+
+logger = logging.getLogger(__name__)
+
+# Upper bound on batches per run so one invocation cannot starve the worker;
+# anything left over is picked up by the next beat tick.
+MAX_BATCHES_PER_RUN = 20
+
+
+@celery_app.task(name="app.tasks.notifications.dispatch_notification_outbox")
+def dispatch_notification_outbox() -> dict:
+    """Deliver pending notification pushes and update unread counters."""
+    import asyncio
+
+    return asyncio.run(_dispatch_notification_outbox_async())
+
+
+async def _dispatch_notification_outbox_async() -> dict:
+    from app.db.session import async_session_factory
+    from app.services.notification_service import OUTBOX_BATCH_SIZE, dispatch_outbox
+    from app.services.redis_client import close_redis
+
+    totals = {"batches": 0, "claimed": 0, "sent": 0, "failed": 0, "devices": 0}
+
+    try:
+        async with async_session_factory() as db:
+            for _ in range(MAX_BATCHES_PER_RUN):
+                stats = await dispatch_outbox(db)
+                if not stats["claimed"]:
+                    break
+                totals["batches"] += 1
+                for key in ("claimed", "sent", "failed", "devices"):
+                    totals[key] += stats[key]
+                # A failed batch means the push provider is likely down; its
+                # jobs are backed off, so leave the rest for the next tick.
+                if stats["sent"] < stats["claimed"] or stats["claimed"] < OUTBOX_BATCH_SIZE:
+                    break
+    finally:
+        # The Redis client is bound to this asyncio.run() loop; drop it so the
+        # next task invocation does not reuse a connection from a closed loop.
+        await close_redis()
+
+    if totals["claimed"]:
+        logger.info(
+            "Notification outbox drained — %d jobs sent, %d failed, %d devices (%d batches)",
+            totals["sent"],
+            totals["failed"],
+            totals["devices"],
+            totals["batches"],
+        )
+    return totals
+
+
+@celery_app.task(name="app.tasks.notifications.purge_notification_outbox")
+def purge_notification_outbox() -> int:
+    """Delete sent outbox jobs older than OUTBOX_RETENTION_DAYS."""
+    import asyncio
+
+    return asyncio.run(_purge_notification_outbox_async())
+
+
+async def _purge_notification_outbox_async() -> int:
+    from app.db.session import async_session_factory
+    from app.services.notification_service import purge_outbox
+
+    async with async_session_factory() as db:
+        deleted = await purge_outbox(db)
+
+    logger.info("Notification outbox purge complete — %d sent jobs deleted", deleted)
+    return deleted
@@ -0,0 +1,54 @@
+"""QR code Celery tasks.
+
+mint_qr_codes: runs one queued print-run mint job (see qr_mint_service).
+resume_mint_jobs: re-queues failed jobs and running jobs whose worker died.
+"""
+
+import logging
+
+from app.celery_app import celery_app
+
+logger = logging.getLogger(__name__)
+
+
+@celery_app.task(name="app.tasks.qr_codes.mint_qr_codes")
+def mint_qr_codes(job_id: str) -> dict:
+    """Mint every code of a queued job, committing progress per chunk.
+
+    Safe to retry: a completed or live running job is skipped, and a failed
+    or stale one resumes from its last committed chunk.
+    """
+    import asyncio
+
+    return asyncio.run(_mint_qr_codes_async(job_id))
+
+
+async def _mint_qr_codes_async(job_id: str) -> dict:
+    import uuid
+
+    from app.db.session import async_session_factory
+    from app.services.qr_mint_service import run_mint_job
+
+    async with async_session_factory() as db:
+        return await run_mint_job(db, uuid.UUID(job_id))
+
+
+@celery_app.task(name="app.tasks.qr_codes.resume_mint_jobs")
+def resume_mint_jobs() -> list[str]:
+    """Re-queue mint jobs that failed or were orphaned by a crashed worker."""
+    import asyncio
+
+    return asyncio.run(_resume_mint_jobs_async())
+
+
+async def _resume_mint_jobs_async() -> list[str]:
+    from app.db.session import async_session_factory
+    from app.services.qr_mint_service import resumable_mint_jobs
+
+    async with async_session_factory() as db:
+        job_ids = [str(job_id) for job_id in await resumable_mint_jobs(db)]
+    for job_id in job_ids:
+        mint_qr_codes.delay(job_id)
+    if job_ids:
+        logger.warning("Re-queued %d QR mint jobs: %s", len(job_ids), ", ".join(job_ids))
+    return job_ids
@@ -0,0 +1,121 @@
+"""Scan event consumer tasks.
+
+dispatch_scan_event_consumers: fans out one consume task per consumer group
+and logs the groups' backlog.
+consume_scan_events: drains one consumer group's new and stale messages in
+batches (comps, affiliate chips, counters, tier history).
+create_scan_partitions: keeps the current and next quarter's scans
+partitions in place (see scan_partitions).
+"""
+
+import logging
+
+from app.celery_app import celery_app
+
+logger = logging.getLogger(__name__)
+
+# Upper bound on batches per run so one group cannot starve the worker;
+# anything left over is picked up by the next beat tick.
+MAX_BATCHES_PER_RUN = 25
+
+# Backlog above which the dispatcher logs a warning.
+LAG_WARNING_THRESHOLD = 10_000
+
+
+@celery_app.task(name="app.tasks.scan_events.dispatch_scan_event_consumers")
+def dispatch_scan_event_consumers() -> dict:
+    """Queue a consume run per consumer group and report each group's lag."""
+    import asyncio
+
+    from app.services.scan_events import SCAN_EVENT_GROUPS
+
+    for group in SCAN_EVENT_GROUPS:
+        consume_scan_events.delay(group)
+    return asyncio.run(_scan_event_lag_async())
+
+
+async def _scan_event_lag_async() -> dict:
+    from app.services.redis_client import close_redis
+    from app.services.scan_events import get_scan_event_lag
+
+    try:
+        lag = await get_scan_event_lag()
+    finally:
+        await close_redis()
+
+    for group, stats in lag.items():
+        if stats["lag"] + stats["pending"] > LAG_WARNING_THRESHOLD:
+            logger.warning(
+                "Scan event group %s is behind — %d undelivered, %d pending",
+                group, stats["lag"], stats["pending"],
+            )
+    return lag
+
+
+@celery_app.task(name="app.tasks.scan_events.consume_scan_events")
+def consume_scan_events(group: str) -> dict:
+    """Process *group*'s scan events until it is caught up or the batch cap is hit."""
+    import asyncio
+
+    return asyncio.run(_consume_scan_events_async(group))
+
+
+async def _consume_scan_events_async(group: str) -> dict:
+    from app.services.redis_client import close_redis
+    from app.services.scan_events import (
+        CONSUMER_IDLE_MS,
+        READ_COUNT,
+        consume_scan_events as consume,
+        default_consumer_name,
+        get_scan_event_stream,
+    )
+
+    consumer = default_consumer_name()
+    totals = {
+        "group": group, "batches": 0, "processed": 0, "failed": 0,
+        "retried": 0, "dead_lettered": 0, "pending": 0, "lag": 0, "consumers_pruned": 0,
+    }
+    try:
+        for _ in range(MAX_BATCHES_PER_RUN):
+            report = await consume(group, consumer)
+            handled = report["processed"] + report["failed"] + report["dead_lettered"]
+            if not handled:
+                break
+            totals["batches"] += 1
+            for key in ("processed", "failed", "retried", "dead_lettered"):
+                totals[key] += report[key]
+            totals["pending"], totals["lag"] = report["pending"], report["lag"]
+            if handled < READ_COUNT or report["failed"]:
+                break
+        # Consumers left behind by restarted worker processes.
+        try:
+            totals["consumers_pruned"] = await get_scan_event_stream().prune_consumers(group, CONSUMER_IDLE_MS)
+        except Exception as exc:
+            logger.warning("Pruning idle %s consumers failed: %s", group, exc)
+    finally:
+        # The Redis client is bound to this asyncio.run() loop; drop it so the
+        # next task invocation does not reuse a connection from a closed loop.
+        await close_redis()
+
+    if totals["batches"]:
+        logger.info(
+            "Scan events %s — %d processed, %d failed, %d retried, %d dead-lettered",
+            group, totals["processed"], totals["failed"], totals["retried"], totals["dead_lettered"],
+        )
+    return totals
+
+
+@celery_app.task(name="app.tasks.scan_events.create_scan_partitions")
+def create_scan_partitions() -> list[str]:
+    """Create upcoming quarterly scans partitions before the quarter starts."""
+    import asyncio
+
+    return asyncio.run(_create_scan_partitions_async())
+
+
+async def _create_scan_partitions_async() -> list[str]:
+    from app.db.session import async_session_factory
+    from app.services.scan_partitions import ensure_scan_partitions
+
+    async with async_session_factory() as db:
+        return await ensure_scan_partitions(db)
@@ -0,0 +1,30 @@
+"""Shop Celery tasks.
+
+flush_idle_carts: writes Redis carts that stopped changing back to
+cart_items, so cart churn never reaches Postgres row by row.
+"""
+
+import logging
+
+from app.celery_app import celery_app
+
+logger = logging.getLogger(__name__)
+
+
+@celery_app.task(name="app.tasks.shop.flush_idle_carts")
+def flush_idle_carts() -> dict:
+    """Persist carts idle for CART_IDLE_FLUSH_SECONDS to cart_items."""
+    import asyncio
+
+    return asyncio.run(_flush_idle_carts_async())
+
+
+async def _flush_idle_carts_async() -> dict:
+    from app.db.session import async_session_factory
+    from app.services.shop_service import flush_idle_carts as flush
+
+    async with async_session_factory() as db:
+        result = await flush(db)
+    if result["flushed"]:
+        logger.info("Flushed %d idle carts to cart_items", result["flushed"])
+    return result
@@ -0,0 +1,32 @@
+"""Wallet ledger Celery tasks.
+
+materialize_wallet_ledger: folds new wallet ledger entries into the
+wallets.balance_available snapshots (and affiliate lifetime earnings).
+"""
+
+import logging
+
+from app.celery_app import celery_app
+
+logger = logging.getLogger(__name__)
+
+
+@celery_app.task(name="app.tasks.wallet.materialize_wallet_ledger")
+def materialize_wallet_ledger() -> dict:
+    """Advance wallet balance snapshots past every committed ledger entry.
+
+    Balances read through wallet_service.get_available_balance are exact
+    regardless; keeping the snapshot close behind only keeps the
+    unmaterialized delta each read sums small.
+    """
+    import asyncio
+
+    return asyncio.run(_materialize_wallet_ledger_async())
+
+
+async def _materialize_wallet_ledger_async() -> dict:
+    from app.db.session import async_session_factory
+    from app.services.wallet_service import materialize_wallet_ledger as materialize
+
+    async with async_session_factory() as db:
+        return await materialize(db)
@@ -5,17 +5,21 @@ from datetime import datetime, timezone
 # Disable rate limiting before app is imported so the Limiter instance is created
 # with rate limiting off. This prevents 429 errors across the test suite.
 os.environ.setdefault("RATELIMIT_ENABLED", "False")
+# Keep scan events in-process; tests drive the consumers directly.
+os.environ.setdefault("SCAN_EVENTS_BACKEND", "memory")
 
 import pytest
 from httpx import ASGITransport, AsyncClient
-from sqlalchemy import event
+from sqlalchemy import event, literal, select, union_all
 from sqlalchemy.dialects.postgresql import JSONB, UUID
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.expression import Values
 
 from app.api.deps import get_db
 from app.main import app
 from app.models.base import Base
+from app.services.product_catalog import drop_local_catalog
 
 # --- SQLite compat: compile PostgreSQL types as SQLite equivalents ---
 
@@ -30,6 +34,19 @@ def _compile_jsonb_sqlite(type_, compiler, **kw):
     return "JSON"
 
 
+@compiles(Values, "sqlite")
+def _compile_values_sqlite(element, compiler, **kw):
+    """SQLite has no ``(VALUES ...) AS name (col, ...)``; render a UNION ALL subquery."""
+    rows = [row for chunk in element._data for row in chunk]
+    selects = [
+        select(*[literal(value, col.type).label(col.name) for value, col in zip(row, element.columns)])
+        for row in rows
+    ]
+    kw.pop("asfrom", None)
+    stmt = selects[0] if len(selects) == 1 else union_all(*selects)
+    return compiler.process(stmt.subquery(element.name), asfrom=True, **kw)
+
+
 # --- Test engine ---
 
 TEST_DATABASE_URL = "sqlite+aiosqlite://"
@@ -57,6 +74,8 @@ app.dependency_overrides[get_db] = _override_get_db
 async def setup_database():
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
+    # The product catalog is cached per process; each test starts from an empty table.
+    drop_local_catalog()
     yield
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.drop_all)
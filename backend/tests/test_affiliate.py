@@ -2,34 +2,48 @@
 
 import uuid
 from decimal import Decimal
+from unittest.mock import patch
 
 import pytest
 from httpx import AsyncClient
-from sqlalchemy import select
+from sqlalchemy import select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.security import create_access_token, hash_password
 from app.models.affiliate import Affiliate
 from app.models.affiliate_chip import AffiliateChip
+from app.models.affiliate_payout import AffiliatePayout
 from app.models.scan import Scan
 from app.models.qr_code import QRCode
+from app.models.transaction import Transaction
 from app.models.user import User
+from app.models.wallet import Wallet
+from app.services import affiliate_service
 from app.services.affiliate_service import (
     attribute_referral,
     calculate_reward_match,
     calculate_weekly_pool_distribution,
     check_permanent_tier,
     check_sunset_status,
+    expire_vaulted_chips,
     get_affiliate_chips,
     get_downline,
     get_or_create_affiliate,
+    get_referred_tins_count,
     process_referral_scan,
     process_reward_match,
+    process_vault_bonuses,
+    process_weekly_payout,
+    reconcile_affiliate_stats,
+    record_referral_scan,
+    record_referred_tins,
+    run_weekly_pool_payout,
     set_custom_referral_code,
+    update_permanent_tier,
     vault_chips,
     unvault_chips,
 )
-from app.services.wallet_service import create_user_wallet
+from app.services.wallet_service import create_user_wallet, materialize_wallet_ledger
 from tests.conftest import seed_tiers
 
 pytestmark = pytest.mark.asyncio
@@ -253,6 +267,52 @@ async def test_get_downline(db: AsyncSession):
     assert len(result["items"]) == 3
 
 
+async def test_downline_counters_and_keyset_pages(db: AsyncSession):
+    from app.services.comp_engine import process_affiliate_reward_match
+
+    await seed_tiers(db)
+    referrer = await _create_user(db, "keysetref@test.com")
+    affiliate = await get_or_create_affiliate(db, referrer.id)
+
+    from datetime import datetime, timedelta, timezone
+
+    members = []
+    joined = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    for i in range(5):
+        u = await _create_user(db, f"keyset{i}@test.com", tier_name="VIP")
+        u.created_at = joined + timedelta(days=i)
+        await attribute_referral(db, u.id, affiliate.referral_code)
+        members.append(u)
+
+    for _ in range(2):
+        await record_referral_scan(db, members[0].id)
+    await record_referral_scan(db, referrer.id)  # not referred — no counter row
+    await db.commit()
+    await process_affiliate_reward_match(db, members[0].id, Decimal("100"))
+    await process_reward_match(db, Decimal("10"), members[0].id)
+
+    seen = []
+    cursor = None
+    while True:
+        page = await get_downline(db, affiliate.id, per_page=2, cursor=cursor)
+        assert page["total"] == 5
+        seen.extend(page["items"])
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+
+    assert [item["user_id"] for item in seen] == [m.id for m in reversed(members)]
+    stats = {item["user_id"]: item for item in seen}
+    assert stats[members[0].id]["total_scans"] == 2
+    assert stats[members[0].id]["earnings_generated"] == Decimal("23.10")
+    assert stats[members[0].id]["tier"] == "VIP"
+    assert stats[members[1].id]["total_scans"] == 0
+
+    # Page-number clients still get the same slices.
+    second = await get_downline(db, affiliate.id, page=2, per_page=2)
+    assert [item["user_id"] for item in second["items"]] == [members[2].id, members[1].id]
+
+
 # ── Chips vault/unvault ──────────────────────────────────────────────
 
 
@@ -301,6 +361,72 @@ async def test_unvault_chips(db: AsyncSession):
     assert summary["active_chips"] == 1
 
 
+async def _seed_vaulted_chips(db: AsyncSession, counts: list[int]) -> list[Affiliate]:
+    """Affiliates holding the given numbers of vaulted chips (all from one scan)."""
+    from datetime import datetime, timedelta, timezone
+
+    await seed_tiers(db)
+    vault_date = datetime.now(timezone.utc)
+    affiliates = []
+    for i, count in enumerate(counts):
+        owner = await _create_user(db, f"vaultbonus{i}@test.com")
+        affiliate = await get_or_create_affiliate(db, owner.id)
+        referred = await _create_user(db, f"vaultbonusref{i}@test.com")
+        scan = await _create_scan(db, referred.id)
+        db.add_all([
+            AffiliateChip(
+                affiliate_id=affiliate.id,
+                source_user_id=referred.id,
+                source_scan_id=scan.id,
+                is_vaulted=True,
+                vault_date=vault_date,
+                vault_expiry=vault_date + timedelta(days=365),
+            )
+            for _ in range(count)
+        ])
+        affiliates.append(affiliate)
+    await db.commit()
+    return affiliates
+
+
+async def test_vault_bonuses_minted_once_per_month(db: AsyncSession):
+    rich, exact, short = await _seed_vaulted_chips(db, [11, 5, 4])
+
+    report = await process_vault_bonuses(db, chunk_size=1)
+
+    assert report["bonus_chips"] == 3
+    assert report["affiliates"] == 2
+    assert report["chunks"] == 2  # the 4-chip affiliate never qualifies
+    bonus = (
+        await db.execute(select(AffiliateChip).where(AffiliateChip.bonus_month.isnot(None)))
+    ).scalars().all()
+    assert sorted(c.affiliate_id == rich.id for c in bonus) == [False, True, True]
+    assert all(not c.is_vaulted and c.source_scan_id is not None for c in bonus)
+
+    again = await process_vault_bonuses(db)
+    assert again["bonus_chips"] == 0
+
+
+async def test_expire_vaulted_chips_in_chunks(db: AsyncSession):
+    from datetime import datetime, timedelta, timezone
+
+    (affiliate,) = await _seed_vaulted_chips(db, [5])
+    chips = (await db.execute(select(AffiliateChip.id))).scalars().all()
+    past = datetime.now(timezone.utc) - timedelta(days=1)
+    await db.execute(
+        update(AffiliateChip).where(AffiliateChip.id.in_(chips[:3])).values(vault_expiry=past)
+    )
+    await db.commit()
+
+    report = await expire_vaulted_chips(db, chunk_size=2)
+
+    assert report["expired"] == 3
+    assert report["chunks"] == 2
+    summary = await get_affiliate_chips(db, affiliate.id)
+    assert summary["vaulted_chips"] == 2
+    assert summary["expired_chips"] == 3
+
+
 # ── Weekly pool distribution ─────────────────────────────────────────
 
 
@@ -336,6 +462,107 @@ async def test_weekly_pool_distribution(db: AsyncSession):
     assert dist_map[aff2.id]["share_amount"] == Decimal("25.00")
 
 
+async def _seed_pool_affiliates(db: AsyncSession) -> tuple[Affiliate, Affiliate]:
+    """Two affiliates holding 3 and 1 active chips."""
+    await seed_tiers(db)
+    affiliates = []
+    for i, chips in enumerate((3, 1)):
+        owner = await _create_user(db, f"payaff{i}@test.com")
+        affiliate = await get_or_create_affiliate(db, owner.id)
+        referred = await _create_user(db, f"payref{i}@test.com")
+        await attribute_referral(db, referred.id, affiliate.referral_code)
+        for _ in range(chips):
+            scan = await _create_scan(db, referred.id)
+            await process_referral_scan(db, scan.id, referred.id)
+        affiliates.append(affiliate)
+    return affiliates[0], affiliates[1]
+
+
+async def test_weekly_payout_credits_wallets_once_per_week(db: AsyncSession):
+    aff1, aff2 = await _seed_pool_affiliates(db)
+
+    report = await process_weekly_payout(db, Decimal("100"), chunk_size=1)
+
+    assert report["affiliates_paid"] == 2
+    assert report["amount_paid"] == "100.00"
+    assert report["chunks"] == 2
+
+    await materialize_wallet_ledger(db)
+    wallets = {
+        w.user_id: w.balance_available
+        for w in (await db.execute(select(Wallet).execution_options(populate_existing=True))).scalars()
+    }
+    assert wallets[aff1.user_id] == Decimal("75.00")
+    assert wallets[aff2.user_id] == Decimal("25.00")
+
+    await db.refresh(aff1)
+    assert aff1.lifetime_earnings == Decimal("75.00")
+    payouts = (await db.execute(select(AffiliatePayout))).scalars().all()
+    assert {(p.affiliate_id, p.amount, p.status) for p in payouts} == {
+        (aff1.id, Decimal("75.00"), "paid"),
+        (aff2.id, Decimal("25.00"), "paid"),
+    }
+    txns = (
+        await db.execute(select(Transaction).where(Transaction.type == "affiliate_payout"))
+    ).scalars().all()
+    assert sorted(t.amount for t in txns) == [Decimal("25.00"), Decimal("75.00")]
+
+    again = await process_weekly_payout(db, Decimal("100"))
+    assert again["affiliates_paid"] == 0
+    assert len((await db.execute(select(AffiliatePayout))).scalars().all()) == 2
+
+
+async def test_weekly_payout_shares_are_frozen_for_the_whole_run(db: AsyncSession):
+    aff1, aff2 = await _seed_pool_affiliates(db)
+    credit = affiliate_service._credit_pool_shares
+    chunks = 0
+
+    async def credit_then_change_chips(db, shares, week_start, week_end):
+        nonlocal chunks
+        await credit(db, shares, week_start, week_end)
+        chunks += 1
+        if chunks == 1:  # chips minted and expired between chunks
+            db.add(AffiliateChip(affiliate_id=aff2.id, source_user_id=aff2.user_id, source_scan_id=uuid.uuid4()))
+            await db.execute(
+                update(AffiliateChip).where(AffiliateChip.affiliate_id == aff1.id).values(is_expired=True)
+            )
+
+    with patch.object(affiliate_service, "_credit_pool_shares", credit_then_change_chips):
+        report = await process_weekly_payout(db, Decimal("100"), chunk_size=1)
+
+    assert report["amount_paid"] == "100.00"
+    payouts = (await db.execute(select(AffiliatePayout))).scalars().all()
+    assert {(p.affiliate_id, p.amount) for p in payouts} == {
+        (aff1.id, Decimal("75.00")),
+        (aff2.id, Decimal("25.00")),
+    }
+
+
+async def test_run_weekly_pool_payout_uses_current_pool(db: AsyncSession):
+    from datetime import datetime, timedelta, timezone
+
+    from app.models.comp_pool import CompPool
+
+    now = datetime.now(timezone.utc)
+    assert (await run_weekly_pool_payout(db, now=now))["status"] == "no_pool"
+
+    await _seed_pool_affiliates(db)
+    pool = CompPool(
+        type="affiliate",
+        total_amount=Decimal("40.00"),
+        period_start=now - timedelta(days=1),
+        period_end=now + timedelta(days=6),
+    )
+    db.add(pool)
+    await db.commit()
+
+    report = await run_weekly_pool_payout(db, now=now)
+
+    assert report["status"] == "completed"
+    assert report["amount_paid"] == "40.00"
+    assert report["distributed_amount"] == "40.00"
+
+
 # ── Permanent tier ───────────────────────────────────────────────────
 
 
@@ -349,6 +576,78 @@ def test_permanent_tier_thresholds():
     assert check_permanent_tier(21000) == "Whale"
 
 
+async def _place_order(db: AsyncSession, user: User, tins: int):
+    """Insert an order the way checkout does, bumping the referrer's tin counter."""
+    from app.models.order import Order
+    from app.models.order_item import OrderItem
+    from app.models.product import Product
+
+    product = Product(name=f"Tin {uuid.uuid4().hex[:6]}", price=Decimal("5.00"), stock=100)
+    db.add(product)
+    await db.flush()
+    order = Order(user_id=user.id, subtotal=Decimal("5.00") * tins, total=Decimal("5.00") * tins)
+    db.add(order)
+    await db.flush()
+    db.add(OrderItem(order_id=order.id, product_id=product.id, quantity=tins, unit_price=Decimal("5.00")))
+    await record_referred_tins(db, user.id, tins)
+    await db.commit()
+    return order
+
+
+async def test_referred_tins_counter_follows_orders(db: AsyncSession):
+    from app.services.shop_service import update_order_status
+
+    await seed_tiers(db)
+    referrer = await _create_user(db, "tinsref@test.com")
+    affiliate = await get_or_create_affiliate(db, referrer.id)
+    buyer = await _create_user(db, "tinsbuyer@test.com")
+    await attribute_referral(db, buyer.id, affiliate.referral_code)
+    stranger = await _create_user(db, "tinsstranger@test.com")
+
+    await _place_order(db, buyer, 150)
+    second = await _place_order(db, buyer, 70)
+    await _place_order(db, stranger, 500)
+    assert await get_referred_tins_count(db, affiliate.id) == 220
+    assert await update_permanent_tier(db, affiliate.id) == "VIP"
+
+    await update_order_status(db, second.id, "shipped")
+    assert await get_referred_tins_count(db, affiliate.id) == 220
+    await update_order_status(db, second.id, "cancelled")
+    assert await get_referred_tins_count(db, affiliate.id) == 150
+    assert await update_permanent_tier(db, affiliate.id) is None
+
+    report = await reconcile_affiliate_stats(db)
+    assert report["repaired"] == 0
+
+
+async def test_reconcile_affiliate_stats_backfills_and_repairs(db: AsyncSession):
+    from app.models.affiliate_stats import AffiliateStats
+
+    await seed_tiers(db)
+    referrer = await _create_user(db, "reconref@test.com")
+    legacy = Affiliate(user_id=referrer.id, referral_code="LEGACY1")  # predates the counters
+    db.add(legacy)
+    await db.commit()
+    buyer = await _create_user(db, "reconbuyer@test.com")
+    await attribute_referral(db, buyer.id, "LEGACY1")
+    await _place_order(db, buyer, 40)  # no counter row yet, so nothing is recorded
+
+    other_owner = await _create_user(db, "reconother@test.com")
+    other = await get_or_create_affiliate(db, other_owner.id)
+    await db.execute(
+        update(AffiliateStats).where(AffiliateStats.affiliate_id == other.id).values(referred_tins=99)
+    )
+    await db.commit()
+
+    report = await reconcile_affiliate_stats(db)
+
+    assert report["created"] == 1
+    assert report["repaired"] == 1
+    assert report["mismatches"] == [str(other.id)]
+    assert await get_referred_tins_count(db, legacy.id) == 40
+    assert await get_referred_tins_count(db, other.id) == 0
+
+
 # ── Sunset ───────────────────────────────────────────────────────────
 
 
@@ -385,6 +684,10 @@ async def test_affiliate_downline_api(client: AsyncClient, db: AsyncSession):
     data = resp.json()
     assert "items" in data
     assert data["total"] == 0
+    assert data["next_cursor"] is None
+
+    resp = await client.get("/api/affiliate/me/downline?cursor=bogus", headers=headers)
+    assert resp.status_code == 400
 
 
 async def test_affiliate_chips_api(client: AsyncClient, db: AsyncSession):
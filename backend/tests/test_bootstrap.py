@@ -0,0 +1,147 @@
+"""Tests for the cached, ETag-validated bootstrap endpoint."""
+
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from fakeredis.aioredis import FakeRedis
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession
+
+import app.services.redis_service as redis_service
+from app.models.notification import Notification
+from app.services.governance_service import create_vote
+from app.services.wallet_service import credit_wallet
+from tests.conftest import seed_tiers
+from tests.test_governance import FLAVOR_OPTIONS, _auth_headers_for, _create_user, _future
+from tests.test_scans import create_product, create_qr
+
+pytestmark = pytest.mark.asyncio
+
+
+@pytest.fixture
+def fake_redis():
+    fake = FakeRedis(decode_responses=True)
+    with patch.object(redis_service, "get_redis", AsyncMock(return_value=fake)):
+        yield fake
+
+
+async def test_bootstrap_payload_and_conditional_get(client: AsyncClient, db: AsyncSession, fake_redis):
+    await seed_tiers(db)
+    user = await _create_user(db, "boot@test.com")
+    headers = _auth_headers_for(user)
+
+    resp = await client.get("/api/bootstrap", headers=headers)
+    assert resp.status_code == 200
+    body = resp.json()
+    assert body["user"]["email"] == "boot@test.com"
+    assert body["user"]["tier"] is None
+    assert body["wallet"]["balance_available"] == 0
+    assert (body["unread_notification_count"], body["active_vote_count"]) == (0, 0)
+    etag = resp.headers["etag"]
+    assert resp.headers["cache-control"] == "private, no-cache"
+    assert await fake_redis.exists(f"blakjaks:bootstrap:{user.id}")
+
+    with patch("app.services.bootstrap_service.build_bootstrap_payload") as build:
+        resp = await client.get("/api/bootstrap", headers={**headers, "If-None-Match": etag})
+    assert resp.status_code == 304
+    assert resp.content == b""
+    assert resp.headers["etag"] == etag
+    build.assert_not_called()  # served from the cache
+
+    resp = await client.put("/api/users/me", json={"first_name": "Renamed"}, headers=headers)
+    assert resp.status_code == 200
+    resp = await client.get("/api/bootstrap", headers={**headers, "If-None-Match": etag})
+    assert resp.status_code == 200
+    assert resp.json()["user"]["first_name"] == "Renamed"
+    assert resp.headers["etag"] != etag
+
+
+async def test_rebuild_racing_a_write_is_not_cached(client: AsyncClient, db: AsyncSession, fake_redis):
+    from app.services import bootstrap_service
+
+    await seed_tiers(db)
+    user = await _create_user(db, "race@test.com")
+    build = bootstrap_service.build_bootstrap_payload
+
+    async def build_then_write(*args, **kwargs):
+        result = await build(*args, **kwargs)
+        await bootstrap_service.invalidate_bootstrap(user.id)  # a write commits mid-rebuild
+        return result
+
+    with patch("app.services.bootstrap_service.build_bootstrap_payload", build_then_write):
+        resp = await client.get("/api/bootstrap", headers=_auth_headers_for(user))
+    assert resp.status_code == 200
+    assert not await fake_redis.exists(f"blakjaks:bootstrap:{user.id}")
+
+    await client.get("/api/bootstrap", headers=_auth_headers_for(user))
+    assert await fake_redis.exists(f"blakjaks:bootstrap:{user.id}")
+
+
+async def test_new_vote_invalidates_every_cached_payload(client: AsyncClient, db: AsyncSession, fake_redis):
+    await seed_tiers(db)
+    admin = await _create_user(db, "admin@test.com", "Whale", is_admin=True)
+    member = await _create_user(db, "member@test.com", "VIP")
+    headers = _auth_headers_for(member)
+
+    first = await client.get("/api/bootstrap", headers=headers)
+    assert first.json()["active_vote_count"] == 0
+
+    await create_vote(db, admin.id, "New Flavor", "Pick one", ["VIP", "Whale"], FLAVOR_OPTIONS, _future())
+    await create_vote(db, admin.id, "Whales only", "Pick one", ["Whale"], FLAVOR_OPTIONS, _future())
+
+    resp = await client.get("/api/bootstrap", headers={**headers, "If-None-Match": first.headers["etag"]})
+    assert resp.status_code == 200
+    assert resp.json()["active_vote_count"] == 1
+
+
+async def test_bootstrap_without_redis_still_validates_etag(client: AsyncClient, db: AsyncSession):
+    await seed_tiers(db)
+    user = await _create_user(db, "noredis@test.com")
+    headers = _auth_headers_for(user)
+
+    with patch.object(redis_service, "get_redis", AsyncMock(side_effect=ConnectionError("down"))):
+        first = await client.get("/api/bootstrap", headers=headers)
+        again = await client.get("/api/bootstrap", headers={**headers, "If-None-Match": first.headers["etag"]})
+
+    assert first.status_code == 200
+    assert first.json()["wallet"]["address"].startswith("0x")
+    assert again.status_code == 304
+
+
+async def test_unread_count_falls_back_to_db_without_redis(client: AsyncClient, db: AsyncSession):
+    await seed_tiers(db)
+    user = await _create_user(db, "unread@test.com")
+    db.add(Notification(user_id=user.id, type="system", title="Hello", body="World"))
+    await db.commit()
+
+    with patch.object(redis_service, "get_redis", AsyncMock(side_effect=ConnectionError("down"))):
+        resp = await client.get("/api/bootstrap", headers=_auth_headers_for(user))
+
+    assert resp.json()["unread_notification_count"] == 1
+
+
+async def test_scan_credit_invalidates_bootstrap_after_commit(client: AsyncClient, db: AsyncSession, fake_redis):
+    await seed_tiers(db)
+    user = await _create_user(db, "scanner@test.com")
+    headers = _auth_headers_for(user)
+    await create_qr(db, await create_product(db), "BOOT00000001")
+    first = await client.get("/api/bootstrap", headers=headers)
+    key = f"blakjaks:bootstrap:{user.id}"
+
+    cached_after_credit = []
+
+    async def credit_then_check(*args, **kwargs):
+        await credit_wallet(*args, **kwargs)
+        cached_after_credit.append(await fake_redis.exists(key))
+
+    with patch("app.services.qr_code.credit_wallet", credit_then_check):
+        resp = await client.post(
+            "/api/scans/submit", headers=headers, json={"qr_code": "BLAKJAKS-TESTPACK-BOOT00000001"}
+        )
+    assert resp.status_code == 200
+    assert cached_after_credit == [1]  # still cached until the scan commits
+    assert not await fake_redis.exists(key)
+
+    resp = await client.get("/api/bootstrap", headers={**headers, "If-None-Match": first.headers["etag"]})
+    assert resp.status_code == 200
+    assert resp.json()["wallet"]["balance_available"] > 0
@@ -0,0 +1,180 @@
+"""Tests for the Redis-held cart: lazy loading, idle flush and checkout."""
+
+import uuid
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from fakeredis.aioredis import FakeRedis
+from httpx import AsyncClient
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+import app.services.redis_service as redis_service
+import app.services.shop_service as shop_service
+from app.models.cart_item import CartItem
+from app.services.redis_keys import CART_DIRTY, cart
+from tests.test_shop import SHIPPING_ADDRESS, _seed_products
+
+pytestmark = pytest.mark.asyncio
+
+
+@pytest.fixture
+def fake_redis():
+    fake = FakeRedis(decode_responses=True)
+    with patch.object(redis_service, "get_redis", AsyncMock(return_value=fake)):
+        yield fake
+
+
+async def _cart_rows(db: AsyncSession, user_id: str) -> dict[str, int]:
+    result = await db.execute(
+        select(CartItem.product_id, CartItem.quantity).where(CartItem.user_id == uuid.UUID(user_id))
+    )
+    return {str(product_id): quantity for product_id, quantity in result.all()}
+
+
+async def test_cart_mutations_stay_in_redis(
+    client: AsyncClient, auth_headers, registered_user, db: AsyncSession, fake_redis
+):
+    products = await _seed_products(db)
+    user_id = registered_user["user"]["id"]
+    first, second = str(products[0].id), str(products[1].id)
+
+    await client.post("/api/cart/add", headers=auth_headers, json={"product_id": first, "quantity": 2})
+    await client.post("/api/cart/add", headers=auth_headers, json={"product_id": first, "quantity": 3})
+    await client.post("/api/cart/add", headers=auth_headers, json={"product_id": second, "quantity": 1})
+    resp = await client.put(f"/api/cart/{second}", headers=auth_headers, json={"quantity": 4})
+    assert resp.status_code == 200
+    resp = await client.delete(f"/api/cart/{first}", headers=auth_headers)
+    assert resp.status_code == 200
+
+    data = resp.json()
+    assert [(item["id"], item["quantity"]) for item in data["items"]] == [(second, 4)]
+    assert data["subtotal"] == str(products[1].price * 4)
+    assert await fake_redis.hget(cart(user_id), second) == "4"
+    assert await fake_redis.zscore(CART_DIRTY, user_id) is not None
+    assert (await db.execute(select(func.count()).select_from(CartItem))).scalar_one() == 0
+
+    resp = await client.put(f"/api/cart/{first}", headers=auth_headers, json={"quantity": 1})
+    assert resp.status_code == 404
+
+
+async def test_cart_loads_from_rows_and_flushes_back_when_idle(
+    client: AsyncClient, auth_headers, registered_user, db: AsyncSession, fake_redis
+):
+    products = await _seed_products(db)
+    user_id = registered_user["user"]["id"]
+    first, second = str(products[0].id), str(products[1].id)
+    db.add(CartItem(user_id=uuid.UUID(user_id), product_id=products[0].id, quantity=2))
+    await db.commit()
+
+    # The first read loads the saved rows; mutations then build on them.
+    resp = await client.post("/api/cart/add", headers=auth_headers, json={"product_id": second, "quantity": 1})
+    assert {item["id"]: item["quantity"] for item in resp.json()["items"]} == {first: 2, second: 1}
+
+    # Not idle yet: nothing is written.
+    assert await shop_service.flush_idle_carts(db) == {"idle": 0, "flushed": 0}
+    assert await _cart_rows(db, user_id) == {first: 2}
+
+    assert await shop_service.flush_idle_carts(db, idle_seconds=0) == {"idle": 1, "flushed": 1}
+    assert await _cart_rows(db, user_id) == {first: 2, second: 1}
+    assert await fake_redis.zscore(CART_DIRTY, user_id) is None
+
+    # After Redis loses the cart, it is rebuilt from the flushed rows.
+    await fake_redis.delete(cart(user_id))
+    resp = await client.get("/api/cart", headers=auth_headers)
+    assert resp.json()["item_count"] == 3
+
+
+async def test_flush_keeps_dirty_mark_when_cart_changes_mid_write(
+    client: AsyncClient, auth_headers, registered_user, db: AsyncSession, fake_redis
+):
+    products = await _seed_products(db)
+    user_id = registered_user["user"]["id"]
+    product_id = str(products[0].id)
+    await client.post("/api/cart/add", headers=auth_headers, json={"product_id": product_id, "quantity": 1})
+
+    replace = shop_service._replace_db_cart
+
+    async def replace_then_add(db, user_id, lines):
+        await replace(db, user_id, lines)
+        await redis_service.increment_cart_line(str(user_id), product_id, 1)
+
+    with patch.object(shop_service, "_replace_db_cart", replace_then_add):
+        assert await shop_service.flush_idle_carts(db, idle_seconds=0) == {"idle": 1, "flushed": 0}
+    assert await fake_redis.zscore(CART_DIRTY, user_id) is not None
+
+    assert await shop_service.flush_idle_carts(db, idle_seconds=0) == {"idle": 1, "flushed": 1}
+    assert await _cart_rows(db, user_id) == {product_id: 2}
+
+
+async def test_flush_does_not_resurrect_lines_checked_out_mid_flush(
+    client: AsyncClient, auth_headers, registered_user, db: AsyncSession, fake_redis
+):
+    products = await _seed_products(db)
+    user_id = registered_user["user"]["id"]
+    product_id = str(products[0].id)
+    await client.post("/api/cart/add", headers=auth_headers, json={"product_id": product_id, "quantity": 5})
+
+    flush_cart = shop_service.redis_flush_cart
+
+    async def checkout_mid_flush(user_id, persist):
+        async def checkout_then_persist(lines):
+            resp = await client.post(
+                "/api/orders/create", headers=auth_headers,
+                json={"shipping_address": SHIPPING_ADDRESS, "age_verification_id": "AGE-VERIFIED-123"},
+            )
+            assert resp.status_code == 200
+            await persist(lines)
+
+        return await flush_cart(user_id, checkout_then_persist)
+
+    with patch.object(shop_service, "redis_flush_cart", checkout_mid_flush):
+        assert await shop_service.flush_idle_carts(db, idle_seconds=0) == {"idle": 1, "flushed": 0}
+
+    assert await _cart_rows(db, user_id) == {}
+    await fake_redis.delete(cart(user_id))
+    assert (await client.get("/api/cart", headers=auth_headers)).json()["items"] == []
+
+
+async def test_failed_cart_flush_does_not_stop_the_batch(
+    client: AsyncClient, auth_headers, registered_user, db: AsyncSession, fake_redis
+):
+    products = await _seed_products(db)
+    user_id = registered_user["user"]["id"]
+    product_id, other_id = str(products[0].id), str(uuid.uuid4())
+    await redis_service.increment_cart_line(other_id, str(products[1].id), 1)
+    await client.post("/api/cart/add", headers=auth_headers, json={"product_id": product_id, "quantity": 1})
+
+    replace = shop_service._replace_db_cart
+
+    async def fail_for_other(db, user_id, lines):
+        if str(user_id) == other_id:
+            raise RuntimeError("bad cart")
+        return await replace(db, user_id, lines)
+
+    with patch.object(shop_service, "_replace_db_cart", fail_for_other):
+        assert await shop_service.flush_idle_carts(db, idle_seconds=0) == {"idle": 2, "flushed": 1}
+    assert await _cart_rows(db, user_id) == {product_id: 1}
+    assert await fake_redis.zscore(CART_DIRTY, other_id) is not None
+
+
+async def test_checkout_empties_redis_cart_and_rows(
+    client: AsyncClient, auth_headers, registered_user, db: AsyncSession, fake_redis
+):
+    products = await _seed_products(db)
+    user_id = registered_user["user"]["id"]
+    product_id = str(products[0].id)
+    await client.post("/api/cart/add", headers=auth_headers, json={"product_id": product_id, "quantity": 5})
+    await shop_service.flush_idle_carts(db, idle_seconds=0)
+    await client.post("/api/cart/add", headers=auth_headers, json={"product_id": product_id, "quantity": 1})
+
+    resp = await client.post(
+        "/api/orders/create", headers=auth_headers,
+        json={"shipping_address": SHIPPING_ADDRESS, "age_verification_id": "AGE-VERIFIED-123"},
+    )
+    assert resp.status_code == 200
+    assert resp.json()["items"][0]["quantity"] == 6
+
+    assert await _cart_rows(db, user_id) == {}
+    assert await fake_redis.zscore(CART_DIRTY, user_id) is None
+    assert (await client.get("/api/cart", headers=auth_headers)).json()["items"] == []
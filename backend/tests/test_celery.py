@@ -10,10 +10,10 @@ def test_celery_app_imports():
     assert celery_app.main == "blakjaks"
 
 
-def test_celery_beat_schedule_has_seven_entries():
+def test_celery_beat_schedule_has_twenty_one_entries():
     from app.celery_app import celery_app
     schedule = celery_app.conf.beat_schedule
-    assert len(schedule) == 7
+    assert len(schedule) == 21
 
 
 def test_celery_beat_schedule_task_names():
@@ -25,7 +25,21 @@ def test_celery_beat_schedule_task_names():
     assert "app.tasks.affiliate.run_weekly_affiliate_payout" in task_names
     assert "app.tasks.comps.run_monthly_guaranteed_comps" in task_names
     assert "app.tasks.chat_cleanup.purge_old_messages" in task_names
+    assert "app.tasks.chat_cleanup.create_message_partitions" in task_names
     assert "app.tasks.chat_cleanup.cleanup_orphaned_streams" in task_names
+    assert "app.tasks.notifications.dispatch_notification_outbox" in task_names
+    assert "app.tasks.insights.refresh_insights_snapshots" in task_names
+    assert "app.tasks.comps.roll_up_comp_transactions" in task_names
+    assert "app.tasks.comps.reconcile_comp_rollups" in task_names
+    assert "app.tasks.affiliate.process_vault_bonuses" in task_names
+    assert "app.tasks.affiliate.expire_vaulted_chips" in task_names
+    assert "app.tasks.affiliate.reconcile_affiliate_stats" in task_names
+    assert "app.tasks.scan_events.dispatch_scan_event_consumers" in task_names
+    assert "app.tasks.scan_events.create_scan_partitions" in task_names
+    assert "app.tasks.wallet.materialize_wallet_ledger" in task_names
+    assert "app.tasks.shop.flush_idle_carts" in task_names
+    assert "app.tasks.notifications.purge_notification_outbox" in task_names
+    assert "app.tasks.qr_codes.resume_mint_jobs" in task_names
 
 
 def test_treasury_tasks_import():
@@ -40,29 +54,49 @@ def test_teller_task_imports():
 
 
 def test_affiliate_task_imports():
-    from app.tasks.affiliate import run_weekly_affiliate_payout
+    from app.tasks.affiliate import (
+        expire_vaulted_chips,
+        process_vault_bonuses,
+        reconcile_affiliate_stats,
+        run_weekly_affiliate_payout,
+    )
     assert callable(run_weekly_affiliate_payout)
+    assert callable(process_vault_bonuses)
+    assert callable(expire_vaulted_chips)
+    assert callable(reconcile_affiliate_stats)
+
+
+def test_notifications_task_imports():
+    from app.tasks.notifications import dispatch_notification_outbox
+    assert callable(dispatch_notification_outbox)
+
+
+def test_insights_task_imports():
+    from app.tasks.insights import refresh_insights_snapshots
+    assert callable(refresh_insights_snapshots)
 
 
 def test_comps_task_imports():
-    from app.tasks.comps import run_monthly_guaranteed_comps
+    from app.tasks.comps import (
+        reconcile_comp_rollups,
+        roll_up_comp_transactions,
+        run_monthly_guaranteed_comps,
+    )
     assert callable(run_monthly_guaranteed_comps)
+    assert callable(roll_up_comp_transactions)
+    assert callable(reconcile_comp_rollups)
 
 
 def test_task_stubs_return_status_dict():
     """All stub tasks return a dict with status='stub'."""
     from app.tasks.treasury import take_treasury_snapshot, reconcile_leaderboard
     from app.tasks.teller import sync_teller_balances
-    from app.tasks.affiliate import run_weekly_affiliate_payout
-    from app.tasks.comps import run_monthly_guaranteed_comps
 
     # Call the underlying function directly (bypasses Celery broker)
     for task_fn in [
         take_treasury_snapshot,
         reconcile_leaderboard,
         sync_teller_balances,
-        run_weekly_affiliate_payout,
-        run_monthly_guaranteed_comps,
     ]:
         result = task_fn.run()
         assert result["status"] == "stub"
@@ -0,0 +1,157 @@
+"""Tests for comp_rollup_service — rollups must always agree with the raw ledger."""
+
+import uuid
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import func, select, update
+
+from app.models.comp_recipient import CompRecipient
+from app.models.comp_rollup import CompRollup
+from app.models.transaction import Transaction
+from app.models.user import User
+from app.services import comp_rollup_service as svc
+
+pytestmark = pytest.mark.asyncio
+
+NOW = datetime(2026, 3, 10, 12, 30, tzinfo=timezone.utc)
+
+
+async def _user(db, name: str) -> User:
+    user = User(
+        email=f"{name}@example.com",
+        password_hash="x",
+        username=name,
+        username_lower=name.lower(),
+    )
+    db.add(user)
+    await db.flush()
+    return user
+
+
+def _tx(user, amount, at, type="comp_award", status="completed") -> Transaction:
+    return Transaction(
+        id=uuid.uuid4(), user_id=user.id, type=type, amount=Decimal(amount), status=status, created_at=at
+    )
+
+
+async def _seed(db):
+    alice = await _user(db, "alice")
+    bob = await _user(db, "bob")
+    db.add_all([
+        _tx(alice, "50", NOW - timedelta(days=5, hours=3)),
+        _tx(alice, "500", NOW - timedelta(days=5, hours=1)),
+        _tx(bob, "5000", NOW - timedelta(hours=30), type="guaranteed_comp"),
+        _tx(bob, "20000", NOW - timedelta(hours=23, minutes=45), type="affiliate_payout"),
+        _tx(alice, "75", NOW - timedelta(hours=2)),
+        _tx(bob, "10", NOW - timedelta(hours=1), type="affiliate_match"),
+        _tx(alice, "999", NOW - timedelta(hours=3), type="withdrawal"),
+        _tx(bob, "300", NOW - timedelta(hours=4), status="pending"),
+    ])
+    await db.commit()
+    return alice, bob
+
+
+async def _readers(db):
+    return (
+        await svc.sum_comp_amounts(db),
+        await svc.sum_comp_amounts(db, since=NOW - timedelta(hours=24)),
+        await svc.count_comps_by_bucket(db),
+        await svc.count_comp_recipients(db),
+    )
+
+
+EXPECTED_TOTAL = Decimal("25635.00")
+# 20000 (23h45m ago) + 75 + 10; the 30h-old guaranteed comp is outside the window
+EXPECTED_24H = Decimal("20085.00")
+EXPECTED_BUCKETS = {"100": 2, "1000": 1, "10000": 1, "200000": 1}
+
+
+async def test_readers_fall_back_to_ledger_before_first_rollup(db):
+    await _seed(db)
+    total, last_24h, buckets, recipients = await _readers(db)
+    assert total == EXPECTED_TOTAL
+    assert last_24h == EXPECTED_24H
+    assert buckets == EXPECTED_BUCKETS
+    assert recipients == 2
+    assert await db.scalar(select(func.count()).select_from(CompRollup)) == 0
+
+
+async def test_roll_up_matches_ledger_and_compacts_old_days(db):
+    await _seed(db)
+
+    report = await svc.roll_up_closed_hours(db, now=NOW)
+
+    assert report["caught_up"] is True
+    assert report["hours_closed"] == 6
+    assert report["recipients_added"] == 2
+    assert report["days_compacted"] == 1
+    assert report["closed_through"] == "2026-03-10T12:00:00+00:00"
+
+    total, last_24h, buckets, recipients = await _readers(db)
+    assert total == EXPECTED_TOTAL
+    assert last_24h == EXPECTED_24H
+    assert buckets == EXPECTED_BUCKETS
+    assert recipients == 2
+
+    # The two hours five days ago were merged into one row at midnight.
+    old_rows = (
+        await db.execute(
+            select(CompRollup.bucket_start, CompRollup.tx_count).where(
+                CompRollup.bucket_start < NOW - timedelta(days=4)
+            )
+        )
+    ).all()
+    assert len(old_rows) == 2  # one row per amount bucket (50 -> "100", 500 -> "1000")
+    assert {row.bucket_start.hour for row in old_rows} == {0}
+
+
+async def test_open_tail_is_read_from_ledger(db):
+    alice, _ = await _seed(db)
+    await svc.roll_up_closed_hours(db, now=NOW)
+
+    carol = await _user(db, "carol")
+    db.add_all([_tx(alice, "25", NOW - timedelta(minutes=10)), _tx(carol, "2000", NOW - timedelta(minutes=5))])
+    await db.commit()
+
+    total, _, buckets, recipients = await _readers(db)
+    assert total == EXPECTED_TOTAL + Decimal("2025")
+    assert buckets["100"] == EXPECTED_BUCKETS["100"] + 1
+    assert buckets["10000"] == EXPECTED_BUCKETS["10000"] + 1
+    assert recipients == 3
+
+    # A second run closes nothing new (the current hour is still open).
+    report = await svc.roll_up_closed_hours(db, now=NOW)
+    assert report["hours_closed"] == 0
+
+
+async def test_reconcile_repairs_late_completed_transactions(db):
+    await _seed(db)
+    await svc.roll_up_closed_hours(db, now=NOW)
+
+    # Bob's pending payout completes after its hour was closed.
+    await db.execute(
+        update(Transaction).where(Transaction.status == "pending").values(status="completed")
+    )
+    await db.commit()
+    assert await svc.sum_comp_amounts(db) == EXPECTED_TOTAL  # stale until reconciled
+
+    report = await svc.reconcile_comp_rollups(db, days=7)
+
+    assert report["days_repaired"] == 1
+    assert report["mismatches"] == ["2026-03-10"]
+    assert await svc.sum_comp_amounts(db) == EXPECTED_TOTAL + Decimal("300")
+    assert (await svc.count_comps_by_bucket(db))["1000"] == EXPECTED_BUCKETS["1000"] + 1
+
+    again = await svc.reconcile_comp_rollups(db, days=7)
+    assert again["days_repaired"] == 0
+
+
+async def test_recipients_are_recorded_once(db):
+    await _seed(db)
+    await svc.roll_up_closed_hours(db, now=NOW)
+    await svc.reconcile_comp_rollups(db, days=30)
+
+    assert await db.scalar(select(func.count()).select_from(CompRecipient)) == 2
+    assert await svc.count_comp_recipients(db) == 2
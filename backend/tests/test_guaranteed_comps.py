@@ -0,0 +1,153 @@
+"""Tests for the set-based monthly guaranteed comp job (comp_engine.process_guaranteed_comps)."""
+
+import uuid
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from unittest.mock import patch
+
+import pytest
+from sqlalchemy import func, select
+
+from app.models.guaranteed_comp_run import GuaranteedCompRun
+from app.models.transaction import Transaction
+from app.models.user import User
+from app.services import comp_engine
+from app.services.comp_engine import process_guaranteed_comps
+
+pytestmark = pytest.mark.asyncio
+
+NOW = datetime(2026, 3, 31, 2, 0, tzinfo=timezone.utc)
+
+
+async def _user(db, name: str, joined_days_ago: int = 30, is_active: bool = True) -> User:
+    user = User(
+        email=f"{name}@example.com",
+        password_hash="x",
+        username=name,
+        username_lower=name.lower(),
+        is_active=is_active,
+        created_at=NOW - timedelta(days=joined_days_ago),
+    )
+    db.add(user)
+    await db.flush()
+    return user
+
+
+def _tx(user, amount, at, type="comp_award", status="completed") -> Transaction:
+    return Transaction(
+        id=uuid.uuid4(), user_id=user.id, type=type, amount=Decimal(amount), status=status, created_at=at
+    )
+
+
+async def _guaranteed_user_ids(db) -> set[uuid.UUID]:
+    rows = await db.execute(
+        select(Transaction.user_id).where(
+            Transaction.type == "guaranteed_comp",
+            Transaction.status == "pending_choice",
+            Transaction.created_at >= NOW.replace(day=1, hour=0),
+        )
+    )
+    return set(rows.scalars().all())
+
+
+async def _seed(db) -> dict[str, User]:
+    users = {
+        "fresh": await _user(db, "fresh"),
+        "small_comp": await _user(db, "small_comp"),
+        "organic": await _user(db, "organic"),
+        "pending_only": await _user(db, "pending_only"),
+        "maxed": await _user(db, "maxed", joined_days_ago=300),
+        "veteran": await _user(db, "veteran", joined_days_ago=400),
+        "inactive": await _user(db, "inactive", is_active=False),
+    }
+    db.add_all([
+        _tx(users["small_comp"], "2.00", NOW - timedelta(days=3)),
+        _tx(users["organic"], "5.00", NOW - timedelta(days=3)),
+        # Pending-choice comps don't count towards this month's total.
+        _tx(users["pending_only"], "100.00", NOW - timedelta(days=3), status="pending_choice"),
+        # Last month's comp doesn't count either.
+        _tx(users["fresh"], "100.00", NOW - timedelta(days=40)),
+    ])
+    db.add_all([
+        _tx(users["maxed"], "5.00", NOW - timedelta(days=31 * (i + 1)), type="guaranteed_comp")
+        for i in range(comp_engine.GUARANTEED_COMP_COUNT)
+    ])
+    await db.commit()
+    return users
+
+
+async def test_awards_only_eligible_members(db):
+    users = await _seed(db)
+
+    report = await process_guaranteed_comps(db, now=NOW)
+
+    expected = {users["fresh"].id, users["small_comp"].id, users["pending_only"].id}
+    assert await _guaranteed_user_ids(db) == expected
+    assert report["month"] == "2026-03"
+    assert report["status"] == "completed"
+    assert report["users_scanned"] == 5  # active first-year members
+    assert report["comps_awarded"] == 3
+    assert report["amount_awarded"] == "15.00"
+    assert report["chunks"] == 1
+    assert report["resumed"] is False
+    assert report["skipped"] is False
+
+
+async def test_chunked_run_awards_everyone_once(db):
+    users = [await _user(db, f"member{i}") for i in range(7)]
+    await db.commit()
+
+    report = await process_guaranteed_comps(db, now=NOW, chunk_size=3)
+
+    assert report["chunks"] == 3
+    assert report["users_scanned"] == 7
+    assert report["comps_awarded"] == 7
+    assert await _guaranteed_user_ids(db) == {u.id for u in users}
+
+
+async def test_completed_month_is_skipped(db):
+    await _seed(db)
+    await process_guaranteed_comps(db, now=NOW)
+
+    again = await process_guaranteed_comps(db, now=NOW)
+
+    assert again["skipped"] is True
+    assert again["comps_awarded"] == 3
+    total = await db.scalar(
+        select(func.count()).select_from(Transaction).where(Transaction.type == "guaranteed_comp")
+    )
+    assert total == comp_engine.GUARANTEED_COMP_COUNT + 3
+
+
+async def test_failed_run_resumes_from_checkpoint(db):
+    user_ids = {(await _user(db, f"member{i}")).id for i in range(6)}
+    await db.commit()
+
+    original = comp_engine._guaranteed_comp_insert
+    calls = 0
+
+    def flaky_insert(*args, **kwargs):
+        nonlocal calls
+        calls += 1
+        if calls == 2:
+            raise RuntimeError("connection reset")
+        return original(*args, **kwargs)
+
+    with patch.object(comp_engine, "_guaranteed_comp_insert", flaky_insert):
+        with pytest.raises(RuntimeError):
+            await process_guaranteed_comps(db, now=NOW, chunk_size=2)
+
+    run = await db.scalar(select(GuaranteedCompRun).where(GuaranteedCompRun.month == "2026-03"))
+    assert run.status == "failed"
+    assert run.last_error == "connection reset"
+    assert run.chunks == 1
+    assert len(await _guaranteed_user_ids(db)) == 2
+
+    report = await process_guaranteed_comps(db, now=NOW, chunk_size=2)
+
+    assert report["resumed"] is True
+    assert report["status"] == "completed"
+    assert report["chunks"] == 3
+    assert report["users_scanned"] == 6
+    assert report["comps_awarded"] == 6
+    assert await _guaranteed_user_ids(db) == user_ids
@@ -7,6 +7,8 @@ timescale_service, blockchain) are patched at the insights_service module level.
 
 from __future__ import annotations
 
+import uuid
+from datetime import datetime, timezone
 from decimal import Decimal
 from unittest.mock import AsyncMock, MagicMock, patch
 
@@ -95,7 +97,7 @@ async def test_get_treasury_insights_returns_dict():
     with (
         patch("app.services.insights_service.get_pool_balances", new=AsyncMock(return_value={"consumer": {"address": None, "balance": Decimal("0")}, "affiliate": {"address": None, "balance": Decimal("0")}, "wholesale": {"address": None, "balance": Decimal("0")}})),
         patch("app.services.insights_service.get_last_sync_status", new=AsyncMock(return_value=[])),
-        patch("app.services.insights_service.get_treasury_sparkline", new=AsyncMock(return_value=[])),
+        patch("app.services.insights_service.get_treasury_sparklines", new=AsyncMock(return_value={"consumer": [], "affiliate": [], "wholesale": []})),
         patch("app.services.insights_service.get_node_health", return_value={"connected": False}),
     ):
         result = await svc.get_treasury_insights(db)
@@ -110,7 +112,7 @@ async def test_get_treasury_insights_includes_sparklines():
     with (
         patch("app.services.insights_service.get_pool_balances", new=AsyncMock(return_value={"consumer": {"address": "0x1", "balance": Decimal("100")}, "affiliate": {"address": "0x2", "balance": Decimal("5")}, "wholesale": {"address": "0x3", "balance": Decimal("5")}})),
         patch("app.services.insights_service.get_last_sync_status", new=AsyncMock(return_value=[])),
-        patch("app.services.insights_service.get_treasury_sparkline", new=AsyncMock(return_value=sample_sparkline)),
+        patch("app.services.insights_service.get_treasury_sparklines", new=AsyncMock(return_value={"consumer": sample_sparkline, "affiliate": [], "wholesale": []})),
         patch("app.services.insights_service.get_node_health", return_value={"connected": True, "block_number": 12345}),
     ):
         result = await svc.get_treasury_insights(db)
@@ -127,12 +129,12 @@ async def test_get_treasury_insights_does_not_raise_when_services_fail():
     with (
         patch("app.services.insights_service.get_pool_balances", new=AsyncMock(side_effect=Exception("chain down"))),
         patch("app.services.insights_service.get_last_sync_status", new=AsyncMock(side_effect=Exception("teller down"))),
-        patch("app.services.insights_service.get_treasury_sparkline", new=AsyncMock(side_effect=Exception("db error"))),
+        patch("app.services.insights_service.get_treasury_sparklines", new=AsyncMock(side_effect=Exception("db error"))),
         patch("app.services.insights_service.get_node_health", side_effect=Exception("node down")),
     ):
         result = await svc.get_treasury_insights(db)
     assert isinstance(result, dict)
-    assert "sparklines" in result
+    assert result["sparklines"] == {"consumer": [], "affiliate": [], "wholesale": []}
 
 
 # ---------------------------------------------------------------------------
@@ -219,23 +221,23 @@ async def test_get_partner_stats_returns_dict():
 
 @pytest.mark.asyncio
 async def test_get_activity_feed_returns_paginated_structure():
-    """get_activity_feed must return a dict with 'items' and 'total' keys."""
+    """get_activity_feed must return a dict with 'items' and 'next_cursor' keys."""
     db = _make_db()
-    result = await svc.get_activity_feed(db, hours=24, page=1, per_page=20)
+    result = await svc.get_activity_feed(db, hours=24, per_page=20)
     assert isinstance(result, dict)
     assert "items" in result
-    assert "total" in result
-    assert "page" in result
+    assert "next_cursor" in result
     assert "per_page" in result
+    assert "hours" in result
 
 
 @pytest.mark.asyncio
-async def test_get_activity_feed_pagination_is_correct():
-    """get_activity_feed page and per_page values are reflected in the output."""
+async def test_get_activity_feed_runs_single_query():
+    """The merged feed is produced by one UNION ALL query, not one per source."""
     db = _make_db()
-    result = await svc.get_activity_feed(db, hours=48, page=2, per_page=5)
-    assert result["page"] == 2
-    assert result["per_page"] == 5
+    await svc.get_activity_feed(db, hours=720, per_page=5)
+    assert db.execute.await_count == 1
+    assert "UNION ALL" in str(db.execute.await_args.args[0])
 
 
 @pytest.mark.asyncio
@@ -243,9 +245,89 @@ async def test_get_activity_feed_does_not_raise_when_db_empty():
     """get_activity_feed must not raise when the DB returns no rows."""
     db = _make_db()
     # All execute() calls return empty results (set up in _make_db)
-    result = await svc.get_activity_feed(db, hours=24, page=1, per_page=20)
-    assert result["total"] == 0
+    result = await svc.get_activity_feed(db, hours=24, per_page=20)
+    assert result["items"] == []
+    assert result["next_cursor"] is None
+
+
+@pytest.mark.asyncio
+async def test_get_activity_feed_returns_empty_page_when_query_fails():
+    db = _make_db()
+    db.execute = AsyncMock(side_effect=RuntimeError("db down"))
+    result = await svc.get_activity_feed(db, hours=24, per_page=20)
     assert result["items"] == []
+    assert result["next_cursor"] is None
+
+
+@pytest.mark.asyncio
+async def test_get_activity_feed_rejects_malformed_cursor():
+    db = _make_db()
+    with pytest.raises(svc.InvalidFeedCursor):
+        await svc.get_activity_feed(db, hours=24, cursor="not-a-cursor", per_page=20)
+    db.execute.assert_not_awaited()
+
+
+def test_feed_cursor_round_trip():
+    ts = datetime(2026, 3, 1, 12, 30, tzinfo=timezone.utc)
+    event_id = uuid.uuid4()
+    assert svc.decode_feed_cursor(svc.encode_feed_cursor(ts, event_id)) == (ts, event_id)
+
+
+@pytest.mark.asyncio
+async def test_get_activity_feed_walks_pages_without_gaps_or_duplicates(db):
+    """Following next_cursor visits every event in the window exactly once, newest first."""
+    from datetime import timedelta
+
+    from app.models.tier_history import TierHistory
+    from app.models.transaction import Transaction
+    from app.models.user import User
+
+    now = datetime.now(timezone.utc)
+    user = User(
+        email="feed@example.com", password_hash="x", username="FeedUser",
+        username_lower="feeduser", first_name="Alice", created_at=now - timedelta(minutes=1),
+    )
+    db.add(user)
+    await db.flush()
+    for i in range(7):
+        db.add(Transaction(
+            user_id=user.id, type="comp_award", amount=Decimal("10"), status="completed",
+            created_at=now - timedelta(minutes=10 + i),
+        ))
+    # Same timestamp as a comp — the id tiebreak must keep both.
+    db.add(TierHistory(
+        user_id=user.id, quarter="2026-Q1", tier_name="VIP", achieved_at=now - timedelta(minutes=10),
+    ))
+    # Outside the window and not a feed type — never returned.
+    db.add(Transaction(
+        user_id=user.id, type="comp_award", amount=Decimal("5"), status="completed",
+        created_at=now - timedelta(hours=30),
+    ))
+    db.add(Transaction(
+        user_id=user.id, type="withdrawal", amount=Decimal("5"), status="completed",
+        created_at=now - timedelta(minutes=5),
+    ))
+    await db.commit()
+
+    seen: list[dict] = []
+    cursor = None
+    pages = 0
+    while True:
+        page = await svc.get_activity_feed(db, hours=24, cursor=cursor, per_page=3)
+        assert len(page["items"]) <= 3
+        seen.extend(page["items"])
+        pages += 1
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+
+    assert pages == 3
+    assert len(seen) == 9
+    assert [item["type"] for item in seen].count("comp_award") == 7
+    assert [item["type"] for item in seen].count("tier_upgrade") == 1
+    assert seen[0]["type"] == "new_member"
+    timestamps = [item["timestamp"] for item in seen]
+    assert timestamps == sorted(timestamps, reverse=True)
 
 
 # ---------------------------------------------------------------------------
@@ -0,0 +1,177 @@
+"""Tests for insights_snapshot_service.py.
+
+Redis is a FakeRedis instance patched into redis_service; the insights
+aggregators are patched with AsyncMocks so no database is touched.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import time
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from fakeredis.aioredis import FakeRedis
+
+import app.services.insights_snapshot_service as svc
+import app.services.redis_service as redis_svc
+from app.services.redis_keys import insights_snapshot, insights_snapshot_lock
+
+
+@pytest.fixture
+async def fake_redis() -> FakeRedis:
+    return FakeRedis(decode_responses=True)
+
+
+@pytest.fixture(autouse=True)
+def patch_get_redis(fake_redis: FakeRedis):
+    with patch.object(redis_svc, "get_redis", AsyncMock(return_value=fake_redis)):
+        yield
+
+
+@pytest.fixture
+def overview_builder():
+    builder = AsyncMock(return_value={"global_scan_count": 42})
+    with patch("app.services.insights_service.get_overview", builder):
+        yield builder
+
+
+async def _store_envelope(fake_redis: FakeRedis, name: str, data: dict, age: float, schema: int | None = None):
+    envelope = {
+        "version": 1,
+        "schema": svc.SNAPSHOT_SCHEMA_VERSION if schema is None else schema,
+        "computed_at": time.time() - age,
+        "data": data,
+    }
+    await fake_redis.set(insights_snapshot(name), json.dumps(envelope))
+
+
+@pytest.mark.asyncio
+async def test_cold_snapshot_is_computed_once_then_served_from_redis(overview_builder):
+    data, age = await svc.get_snapshot("overview", AsyncMock())
+    assert data == {"global_scan_count": 42}
+    assert age is None
+
+    data, _ = await svc.get_snapshot("overview", AsyncMock())
+    assert data == {"global_scan_count": 42}
+    overview_builder.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_fresh_snapshot_is_served_without_refresh(fake_redis, overview_builder):
+    await _store_envelope(fake_redis, "overview", {"global_scan_count": 7}, age=5)
+
+    data, age = await svc.get_snapshot("overview", AsyncMock())
+
+    assert data == {"global_scan_count": 7}
+    assert 5 <= age < svc.SNAPSHOT_STALE_AFTER
+    overview_builder.assert_not_awaited()
+    assert "overview" not in svc._refresh_tasks
+
+
+@pytest.mark.asyncio
+async def test_stale_snapshot_is_served_and_refreshed_in_background(fake_redis, overview_builder):
+    await _store_envelope(fake_redis, "overview", {"global_scan_count": 7}, age=svc.SNAPSHOT_STALE_AFTER + 10)
+
+    data, age = await svc.get_snapshot("overview", AsyncMock())
+    assert data == {"global_scan_count": 7}
+    assert age >= svc.SNAPSHOT_STALE_AFTER
+
+    # A second stale read while the refresh is running does not start another one
+    await svc.get_snapshot("overview", AsyncMock())
+    await asyncio.gather(*list(svc._refresh_tasks.values()))
+
+    overview_builder.assert_awaited_once()
+    envelope = await redis_svc.get_insights_snapshot("overview")
+    assert envelope["data"] == {"global_scan_count": 42}
+    assert envelope["version"] == 1
+
+
+@pytest.mark.asyncio
+async def test_refresh_is_single_flight_across_workers(fake_redis, overview_builder):
+    await fake_redis.set(insights_snapshot_lock("overview"), "1")
+
+    assert await svc.refresh_snapshot("overview", AsyncMock()) is None
+    overview_builder.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_overrunning_refresh_does_not_release_the_next_workers_lock(fake_redis):
+    lock = insights_snapshot_lock("overview")
+
+    async def _overrun(db):
+        # Our lock expires mid-refresh and another worker takes it.
+        await fake_redis.delete(lock)
+        assert await redis_svc.acquire_insights_refresh_lock("overview") is not None
+        return {"global_scan_count": 1}
+
+    with patch("app.services.insights_service.get_overview", _overrun):
+        assert await svc.refresh_snapshot("overview", AsyncMock()) is not None
+
+    assert await fake_redis.get(lock) is not None
+
+
+@pytest.mark.asyncio
+async def test_failed_cold_refresh_rolls_back_before_inline_retry():
+    db = AsyncMock()
+    builder = AsyncMock(side_effect=[RuntimeError("statement timeout"), {"global_scan_count": 3}])
+    with patch("app.services.insights_service.get_overview", builder):
+        data, _ = await svc.get_snapshot("overview", db)
+
+    assert data == {"global_scan_count": 3}
+    db.rollback.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_schema_mismatch_is_treated_as_a_miss(fake_redis, overview_builder):
+    await _store_envelope(fake_redis, "overview", {"old": True}, age=1, schema=svc.SNAPSHOT_SCHEMA_VERSION - 1)
+
+    data, _ = await svc.get_snapshot("overview", AsyncMock())
+
+    assert data == {"global_scan_count": 42}
+    overview_builder.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_redis_outage_falls_back_to_inline_compute(overview_builder):
+    with patch.object(redis_svc, "get_redis", AsyncMock(side_effect=ConnectionError("down"))):
+        data, age = await svc.get_snapshot("overview", AsyncMock())
+
+    assert data == {"global_scan_count": 42}
+    assert age is None
+
+
+@pytest.mark.asyncio
+async def test_refresh_all_snapshots_bumps_each_version():
+    builders = {name: AsyncMock(return_value={"name": name}) for name in svc.SNAPSHOT_BUILDERS}
+    with (
+        patch("app.services.insights_service.get_overview", builders["overview"]),
+        patch("app.services.insights_service.get_treasury_insights", builders["treasury"]),
+        patch("app.services.insights_service.get_systems_health", builders["systems"]),
+        patch("app.services.insights_service.get_comp_stats", builders["comps"]),
+        patch("app.services.insights_service.get_partner_stats", builders["partners"]),
+    ):
+        first = await svc.refresh_all_snapshots()
+        second = await svc.refresh_all_snapshots()
+
+    assert first == {name: 1 for name in svc.SNAPSHOT_BUILDERS}
+    assert second == {name: 2 for name in svc.SNAPSHOT_BUILDERS}
+
+
+@pytest.mark.asyncio
+async def test_unknown_snapshot_name_raises():
+    with pytest.raises(ValueError):
+        await svc.get_snapshot("nope", AsyncMock())
+
+
+@pytest.mark.asyncio
+async def test_api_reports_snapshot_hit_or_miss(client, overview_builder):
+    cold = await client.get("/api/insights/overview")
+    assert cold.headers["x-snapshot"] == "miss"
+    assert "age" not in cold.headers
+
+    warm = await client.get("/api/insights/overview")
+    assert warm.headers["x-snapshot"] == "hit"
+    assert int(warm.headers["age"]) >= 0
+    assert warm.json() == {"global_scan_count": 42}
@@ -0,0 +1,147 @@
+"""Tests for monthly message partitions and partition-based chat retention."""
+
+from datetime import date, datetime, timedelta, timezone
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.message import Message
+from app.services.chat_service import add_reaction, get_channel_messages
+from app.services.message_partitions import (
+    add_months,
+    drop_expired_message_partitions,
+    ensure_message_partitions,
+    partition_ddl,
+    partition_name,
+)
+from tests.conftest import seed_tiers
+from tests.test_social import _create_channel, _create_user_with_tier
+
+pytestmark = pytest.mark.asyncio
+
+NOW = datetime(2026, 10, 19, 12, 0, tzinfo=timezone.utc)
+
+
+def _postgres_db(partitions: dict[str, list[str]], stragglers: dict[str, int] | None = None) -> AsyncMock:
+    """A session mock on the PostgreSQL dialect whose pg_inherits lookup returns *partitions*.
+
+    *stragglers* maps a DEFAULT partition to the row count its range check returns.
+    """
+    db = AsyncMock()
+    db.get_bind = MagicMock()
+    db.get_bind.return_value.dialect.name = "postgresql"
+
+    async def execute(statement, params=None):
+        result = MagicMock()
+        result.scalars.return_value = partitions.get((params or {}).get("table"), [])
+        sql = str(statement)
+        result.scalar_one.return_value = next(
+            (count for default, count in (stragglers or {}).items() if f"FROM {default} " in sql), 0
+        )
+        return result
+
+    db.execute.side_effect = execute
+    return db
+
+
+def _ddl(db: AsyncMock) -> list[str]:
+    return [str(c.args[0]) for c in db.execute.call_args_list if not c.args[1:]]
+
+
+async def test_partition_names_and_bounds():
+    assert add_months(date(2026, 11, 1), 2) == date(2027, 1, 1)
+    assert add_months(date(2026, 1, 1), -1) == date(2025, 12, 1)
+    assert partition_name("messages", date(2026, 10, 1)) == "messages_2026_10"
+    assert partition_ddl("message_reactions", date(2026, 12, 1)) == (
+        "CREATE TABLE IF NOT EXISTS message_reactions_2026_12 PARTITION OF message_reactions "
+        "FOR VALUES FROM ('2026-12-01 00:00:00+00') TO ('2027-01-01 00:00:00+00')"
+    )
+
+
+async def test_ensure_creates_only_missing_months():
+    db = _postgres_db({"messages": ["messages_2026_10", "messages_2026_11", "messages_default"]})
+
+    created = await ensure_message_partitions(db, months_ahead=2, now=NOW)
+
+    assert created == [
+        "message_reactions_2026_10",
+        "message_reactions_2026_11",
+        "message_reactions_2026_12",
+        "messages_2026_12",
+    ]
+    assert all(sql.startswith("CREATE TABLE IF NOT EXISTS") for sql in _ddl(db))
+    db.commit.assert_awaited_once()
+
+
+async def test_ensure_moves_default_rows_into_new_month():
+    db = _postgres_db(
+        {"messages": ["messages_2026_10", "messages_default"], "message_reactions": ["message_reactions_2026_10"]},
+        stragglers={"messages_default": 3},
+    )
+
+    created = await ensure_message_partitions(db, months_ahead=1, now=NOW)
+
+    assert created == ["message_reactions_2026_11", "messages_2026_11"]
+    assert _ddl(db) == [
+        partition_ddl("message_reactions", date(2026, 11, 1)),
+        "ALTER TABLE messages DETACH PARTITION messages_default",
+        partition_ddl("messages", date(2026, 11, 1)),
+        "ALTER TABLE messages ATTACH PARTITION messages_default DEFAULT",
+    ]
+    move = db.execute.call_args_list[-2]
+    assert "DELETE FROM messages_default WHERE created_at >= :start" in str(move.args[0])
+    assert move.args[1] == {
+        "start": datetime(2026, 11, 1, tzinfo=timezone.utc),
+        "end": datetime(2026, 12, 1, tzinfo=timezone.utc),
+    }
+
+
+async def test_drop_expired_drops_whole_months_reactions_first():
+    months = ["2026_05", "2026_06", "2026_07", "2026_08"]
+    db = _postgres_db({
+        "messages": [f"messages_{m}" for m in months] + ["messages_default"],
+        "message_reactions": [f"message_reactions_{m}" for m in months],
+    })
+
+    # Cutoff is 2026-07-21: June ends before it, July does not.
+    dropped = await drop_expired_message_partitions(db, retention_days=90, now=NOW)
+
+    assert dropped == [
+        "message_reactions_2026_05",
+        "message_reactions_2026_06",
+        "messages_2026_05",
+        "messages_2026_06",
+    ]
+    assert _ddl(db)[:2] == [
+        "ALTER TABLE message_reactions DETACH PARTITION message_reactions_2026_05",
+        "DROP TABLE message_reactions_2026_05",
+    ]
+    assert [sql for sql in _ddl(db) if "messages_2026_05" in sql] == [
+        "DELETE FROM social_message_translations WHERE message_id IN (SELECT id FROM messages_2026_05)",
+        "DELETE FROM chat_reports WHERE message_id IN (SELECT id FROM messages_2026_05)",
+        "ALTER TABLE messages DETACH PARTITION messages_2026_05",
+        "DROP TABLE messages_2026_05",
+    ]
+
+
+async def test_partition_jobs_are_noops_off_postgres(db: AsyncSession):
+    assert await ensure_message_partitions(db) == []
+    assert await drop_expired_message_partitions(db) == []
+
+
+async def test_reads_skip_messages_past_retention_and_reactions_copy_month(db: AsyncSession):
+    await seed_tiers(db)
+    user = await _create_user_with_tier(db, "partitions@test.com", "VIP")
+    ch = await _create_channel(db, "partition-test")
+    now = datetime.now(timezone.utc)
+    old = Message(channel_id=ch.id, user_id=user.id, content="old", created_at=now - timedelta(days=120))
+    recent = Message(channel_id=ch.id, user_id=user.id, content="recent", created_at=now - timedelta(days=1))
+    db.add_all([old, recent])
+    await db.commit()
+
+    result = await get_channel_messages(db, ch.id, user.id)
+    assert [m["content"] for m in result] == ["recent"]
+
+    reaction = await add_reaction(db, recent.id, user.id, "🔥")
+    assert reaction.message_created_at.replace(tzinfo=None) == recent.created_at.replace(tzinfo=None)
@@ -0,0 +1,79 @@
+"""Tests for the pure ASGI header and conditional-GET middleware."""
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+from starlette.applications import Starlette
+from starlette.responses import StreamingResponse
+from starlette.routing import Route
+
+from app.core.middleware import CacheControlMiddleware, CacheRule, RuleTrie, SecurityHeadersMiddleware
+
+pytestmark = pytest.mark.asyncio
+
+
+async def test_rule_trie_exact_and_subtree_matches():
+    trie = RuleTrie({
+        "/api/shop/products": CacheRule("exact"),
+        "/api/giphy/*": CacheRule("giphy"),
+        "/api/giphy/trending": CacheRule("trending"),
+    })
+
+    assert trie.match("/api/shop/products").header == "exact"
+    assert trie.match("/api/shop/products/").header == "exact"
+    assert trie.match("/api/shop/products/123") is None
+    assert trie.match("/api/shop") is None
+    assert trie.match("/api/giphy/search").header == "giphy"
+    assert trie.match("/api/giphy/trending").header == "trending"
+    assert trie.match("/api/giphy/trending/more").header == "giphy"
+
+
+async def test_security_headers_on_every_response(client: AsyncClient):
+    resp = await client.get("/health")
+    assert resp.headers["x-frame-options"] == "DENY"
+    assert resp.headers["x-content-type-options"] == "nosniff"
+    assert "cache-control" not in resp.headers
+
+
+async def test_listed_route_gets_weak_etag_and_304(client: AsyncClient):
+    resp = await client.get("/api/shop/products")
+    assert resp.status_code == 200
+    assert resp.headers["cache-control"] == "public, max-age=300"
+    etag = resp.headers["etag"]
+    assert etag.startswith('W/"')
+
+    cached = await client.get("/api/shop/products", headers={"If-None-Match": f'"other", {etag}'})
+    assert cached.status_code == 304
+    assert cached.content == b""
+    assert cached.headers["etag"] == etag
+    assert cached.headers["x-frame-options"] == "DENY"
+
+    stale = await client.get("/api/shop/products", headers={"If-None-Match": 'W/"stale"'})
+    assert stale.status_code == 200
+    assert stale.json() == resp.json()
+
+
+async def test_streaming_responses_pass_through_unbuffered():
+    sent = []
+
+    async def chunks():
+        for part in (b"a", b"b", b"c"):
+            sent.append(part)
+            yield part
+
+    async def stream(request):
+        return StreamingResponse(chunks(), media_type="text/plain")
+
+    app = Starlette(routes=[Route("/stream", stream), Route("/cached", stream)])
+    app = SecurityHeadersMiddleware(
+        CacheControlMiddleware(app, rules={"/stream": CacheRule("no-store"), "/cached": CacheRule("public", etag=True)})
+    )
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
+        plain = await ac.get("/stream")
+        tagged = await ac.get("/cached")
+
+    assert plain.text == "abc"
+    assert plain.headers["cache-control"] == "no-store"
+    assert plain.headers["x-frame-options"] == "DENY"
+    assert "etag" not in plain.headers
+    assert tagged.text == "abc"
+    assert tagged.headers["etag"].startswith('W/"')
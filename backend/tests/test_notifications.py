@@ -1,19 +1,34 @@
 import uuid
 import logging
+from datetime import datetime, timedelta, timezone
 from unittest.mock import AsyncMock, patch
 
 import pytest
 from httpx import AsyncClient
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from fakeredis.aioredis import FakeRedis
+from sqlalchemy import func, select, update
+
+import app.services.redis_service as redis_svc
 from app.models.notification import Notification
+from app.models.notification_outbox import NotificationOutbox
 from app.services.email_service import (
     send_comp_award,
     send_order_confirmation,
     send_tier_advancement,
     send_welcome_email,
 )
-from app.services.notification_service import create_notification, get_unread_count, mark_as_read
+from app.services.notification_service import (
+    OUTBOX_MAX_ATTEMPTS,
+    OUTBOX_RETENTION_DAYS,
+    batch_create_notifications,
+    create_notification,
+    dispatch_outbox,
+    get_unread_count,
+    mark_as_read,
+    purge_outbox,
+)
 from app.services.push_service import register_device_token, unregister_device_token
 from tests.conftest import SIGNUP_PAYLOAD
 
@@ -120,6 +135,155 @@ async def test_mark_as_read_decrements(db: AsyncSession):
     assert await get_unread_count(db, user.id) == 1
 
 
+# ── Notification outbox ──────────────────────────────────────────────
+
+
+async def _outbox_jobs(db: AsyncSession) -> list[NotificationOutbox]:
+    result = await db.execute(select(NotificationOutbox).order_by(NotificationOutbox.created_at))
+    return list(result.scalars().all())
+
+
+async def test_create_notification_enqueues_push_without_delivering(db: AsyncSession):
+    user = await _create_user(db, "outbox@example.com")
+    with patch("app.services.push_service._dispatch", new_callable=AsyncMock) as mock_dispatch:
+        notif = await create_notification(db, user.id, "comp_award", "You got $100!", "Nice")
+
+    mock_dispatch.assert_not_called()
+    jobs = await _outbox_jobs(db)
+    assert len(jobs) == 1
+    assert jobs[0].notification_id == notif.id
+    assert jobs[0].user_id == user.id
+    assert jobs[0].status == "pending"
+    assert jobs[0].data == {"notification_id": str(notif.id), "type": "comp_award"}
+
+
+async def test_batch_create_notifications_writes_rows_and_outbox(db: AsyncSession):
+    users = [await _create_user(db, f"bulk{i}@example.com") for i in range(3)]
+
+    created = await batch_create_notifications(
+        db, [u.id for u in users], "system", "Maintenance tonight", "Back by 2AM"
+    )
+
+    assert created == 3
+    count = await db.execute(select(func.count()).select_from(Notification))
+    assert count.scalar_one() == 3
+    jobs = await _outbox_jobs(db)
+    assert {j.user_id for j in jobs} == {u.id for u in users}
+    assert all(j.status == "pending" for j in jobs)
+
+
+async def test_dispatch_outbox_delivers_pushes_counted_at_creation(db: AsyncSession):
+    user = await _create_user(db, "dispatch@example.com")
+    await register_device_token(db, user.id, "dispatch-token", "ios")
+
+    fake_redis = FakeRedis(decode_responses=True)
+    with (
+        patch("app.services.push_service._dispatch", new_callable=AsyncMock, return_value=True) as mock_dispatch,
+        patch.object(redis_svc, "get_redis", AsyncMock(return_value=fake_redis)),
+    ):
+        await create_notification(db, user.id, "system", "One")
+        await create_notification(db, user.id, "system", "Two")
+        assert await redis_svc.get_unread_count(str(user.id)) == 2
+
+        stats = await dispatch_outbox(db)
+        assert stats == {"claimed": 2, "sent": 2, "failed": 0, "devices": 2}
+        assert mock_dispatch.await_count == 2
+        assert await redis_svc.get_unread_count(str(user.id)) == 2
+
+        # Drained — a second run claims nothing
+        assert (await dispatch_outbox(db))["claimed"] == 0
+
+    jobs = await _outbox_jobs(db)
+    assert all(j.status == "sent" and j.dispatched_at is not None for j in jobs)
+
+
+async def test_read_before_dispatch_leaves_no_phantom_unread(db: AsyncSession):
+    user = await _create_user(db, "earlyread@example.com")
+
+    fake_redis = FakeRedis(decode_responses=True)
+    with (
+        patch("app.services.push_service._dispatch", new_callable=AsyncMock, return_value=True),
+        patch.object(redis_svc, "get_redis", AsyncMock(return_value=fake_redis)),
+    ):
+        notification = await create_notification(db, user.id, "system", "Read me fast")
+        await mark_as_read(db, notification.id, user.id)
+        await dispatch_outbox(db)
+
+        assert await redis_svc.get_unread_count(str(user.id)) == 0
+
+
+async def test_dispatch_outbox_backs_off_then_parks_failed_jobs(db: AsyncSession):
+    user = await _create_user(db, "retry@example.com")
+    await create_notification(db, user.id, "system", "Flaky")
+
+    with patch(
+        "app.services.notification_service.send_push_batch",
+        new_callable=AsyncMock,
+        side_effect=RuntimeError("APNs down"),
+    ):
+        stats = await dispatch_outbox(db)
+        assert stats["failed"] == 0
+        job = (await _outbox_jobs(db))[0]
+        assert job.status == "pending"
+        assert job.attempts == 1
+        assert job.last_error == "APNs down"
+
+        # Backed off — an immediate rerun does not claim it again
+        assert (await dispatch_outbox(db))["claimed"] == 0
+
+        for _ in range(OUTBOX_MAX_ATTEMPTS - 1):
+            await db.execute(
+                update(NotificationOutbox).values(next_attempt_at=datetime.now(timezone.utc) - timedelta(seconds=1))
+            )
+            await db.commit()
+            assert (await dispatch_outbox(db))["claimed"] == 1
+
+    db.expire_all()
+    job = (await _outbox_jobs(db))[0]
+    assert job.status == "failed"
+    assert job.attempts == OUTBOX_MAX_ATTEMPTS
+
+
+async def test_backed_off_jobs_do_not_block_newer_ones(db: AsyncSession):
+    user = await _create_user(db, "hol@example.com")
+    await create_notification(db, user.id, "system", "Poison")
+    with patch(
+        "app.services.notification_service.send_push_batch",
+        new_callable=AsyncMock,
+        side_effect=RuntimeError("bad payload"),
+    ):
+        await dispatch_outbox(db, batch_size=1)
+
+    await create_notification(db, user.id, "system", "Fresh")
+    with patch("app.services.notification_service.send_push_batch", new_callable=AsyncMock, return_value=1):
+        stats = await dispatch_outbox(db, batch_size=1)
+
+    assert stats["sent"] == 1
+    db.expire_all()
+    assert {j.title: j.status for j in await _outbox_jobs(db)} == {"Poison": "pending", "Fresh": "sent"}
+
+
+async def test_purge_outbox_deletes_only_old_sent_jobs(db: AsyncSession):
+    user = await _create_user(db, "purge@example.com")
+    for title in ("old", "recent", "failed"):
+        await create_notification(db, user.id, "system", title)
+    now = datetime.now(timezone.utc)
+    for title, status, dispatched_at in [
+        ("old", "sent", now - timedelta(days=OUTBOX_RETENTION_DAYS + 1)),
+        ("recent", "sent", now - timedelta(days=1)),
+        ("failed", "failed", None),
+    ]:
+        await db.execute(
+            update(NotificationOutbox)
+            .where(NotificationOutbox.title == title)
+            .values(status=status, dispatched_at=dispatched_at)
+        )
+    await db.commit()
+
+    assert await purge_outbox(db) == 1
+    assert sorted(j.title for j in await _outbox_jobs(db)) == ["failed", "recent"]
+
+
 # ── Push service (device tokens) ─────────────────────────────────────
 
 
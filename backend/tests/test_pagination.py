@@ -0,0 +1,148 @@
+"""Tests for the shared keyset pagination toolkit and the endpoints built on it."""
+
+import uuid
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.notification import Notification
+from app.models.transaction import Transaction
+from app.services.pagination import InvalidCursor, encode_cursor, paginate
+
+pytestmark = pytest.mark.asyncio
+
+START = datetime(2026, 1, 1, tzinfo=timezone.utc)
+NEWEST_FIRST = (Notification.created_at.desc(), Notification.id.desc())
+
+
+async def _notifications(db: AsyncSession, user_id: uuid.UUID, count: int) -> list[Notification]:
+    """``count`` notifications, two per timestamp so pages split on id ties."""
+    rows = [
+        Notification(user_id=user_id, type="test", title=f"n{i}", created_at=START + timedelta(minutes=i // 2))
+        for i in range(count)
+    ]
+    db.add_all(rows)
+    await db.commit()
+    return rows
+
+
+def _query(user_id: uuid.UUID):
+    return select(Notification).where(Notification.user_id == user_id)
+
+
+async def test_cursor_pages_walk_forward_and_back(db: AsyncSession, registered_user):
+    user_id = uuid.UUID(registered_user["user"]["id"])
+    rows = await _notifications(db, user_id, 7)
+    expected = [n.id for n in sorted(rows, key=lambda n: (n.created_at, n.id), reverse=True)]
+
+    pages, cursor = [], None
+    while True:
+        page = await paginate(db, _query(user_id), NEWEST_FIRST, per_page=3, cursor=cursor, total="none")
+        pages.append(page)
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+
+    assert [[n.id for n in p["items"]] for p in pages] == [expected[0:3], expected[3:6], expected[6:7]]
+    assert pages[0]["prev_cursor"] is None
+    assert pages[0]["total"] is None
+
+    back = await paginate(db, _query(user_id), NEWEST_FIRST, per_page=3, cursor=pages[2]["prev_cursor"])
+    assert [n.id for n in back["items"]] == expected[3:6]
+    first = await paginate(db, _query(user_id), NEWEST_FIRST, per_page=3, cursor=back["prev_cursor"])
+    assert [n.id for n in first["items"]] == expected[0:3]
+    assert first["prev_cursor"] is None
+    assert first["next_cursor"] is not None
+
+
+async def test_offset_pages_and_totals(db: AsyncSession, registered_user):
+    user_id = uuid.UUID(registered_user["user"]["id"])
+    await _notifications(db, user_id, 5)
+
+    second = await paginate(db, _query(user_id), NEWEST_FIRST, page=2, per_page=2)
+    assert (second["total"], second["total_estimated"]) == (5, False)
+    assert second["prev_cursor"] is not None
+
+    via_cursor = await paginate(db, _query(user_id), NEWEST_FIRST, per_page=2, cursor=second["next_cursor"])
+    third = await paginate(db, _query(user_id), NEWEST_FIRST, page=3, per_page=2)
+    assert [n.id for n in via_cursor["items"]] == [n.id for n in third["items"]]
+
+    estimated = await paginate(db, _query(user_id), NEWEST_FIRST, per_page=2, total="estimate")
+    assert (estimated["total"], estimated["total_estimated"]) == (5, True)
+
+
+async def test_mixed_direction_sort_key(db: AsyncSession, registered_user):
+    user_id = uuid.UUID(registered_user["user"]["id"])
+    amounts = [Decimal("5.00"), Decimal("1.00"), Decimal("5.00"), Decimal("3.00"), Decimal("1.00")]
+    db.add_all(Transaction(user_id=user_id, type="comp_award", amount=a, status="completed") for a in amounts)
+    await db.commit()
+
+    order = (Transaction.amount.asc(), Transaction.id.desc())
+    query = select(Transaction).where(Transaction.user_id == user_id)
+    seen, cursor = [], None
+    while True:
+        page = await paginate(db, query, order, per_page=2, cursor=cursor, total="none")
+        seen += [(t.amount, t.id) for t in page["items"]]
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+
+    assert seen == sorted(seen, key=lambda row: (row[0], -row[1].int))
+    assert len(seen) == 5
+
+
+async def test_rejects_malformed_cursors(db: AsyncSession, registered_user):
+    user_id = uuid.UUID(registered_user["user"]["id"])
+    for cursor in ("not-a-cursor", encode_cursor([START]), encode_cursor(["yesterday", str(uuid.uuid4())])):
+        with pytest.raises(InvalidCursor):
+            await paginate(db, _query(user_id), NEWEST_FIRST, cursor=cursor)
+
+
+async def test_notifications_endpoint_pages_by_cursor(
+    client: AsyncClient, auth_headers, registered_user, db: AsyncSession,
+):
+    await _notifications(db, uuid.UUID(registered_user["user"]["id"]), 5)
+
+    first = (await client.get("/api/users/me/notifications?page_size=2", headers=auth_headers)).json()
+    assert (first["total"], first["page_size"], len(first["items"])) == (5, 2, 2)
+
+    resp = await client.get(
+        "/api/users/me/notifications",
+        params={"page_size": 2, "cursor": first["next_cursor"]},
+        headers=auth_headers,
+    )
+    second = resp.json()
+    assert second["total"] is None  # totals are lazy on cursor pages
+    assert len(second["items"]) == 2
+    assert {n["id"] for n in second["items"]}.isdisjoint(n["id"] for n in first["items"])
+
+    resp = await client.get("/api/users/me/notifications?cursor=bogus", headers=auth_headers)
+    assert resp.status_code == 400
+    assert resp.json()["detail"] == "Invalid page cursor"
+
+
+async def test_wallet_transactions_keep_limit_offset(
+    client: AsyncClient, auth_headers, registered_user, db: AsyncSession,
+):
+    user_id = uuid.UUID(registered_user["user"]["id"])
+    db.add_all(
+        Transaction(
+            user_id=user_id, type="comp_award", amount=Decimal(i), status="completed",
+            created_at=START + timedelta(minutes=i),
+        )
+        for i in range(1, 6)
+    )
+    await db.commit()
+
+    legacy = (await client.get("/api/wallet/transactions?limit=2&offset=2", headers=auth_headers)).json()
+    assert [float(t["amount"]) for t in legacy["transactions"]] == [3.0, 2.0]
+
+    first = (await client.get("/api/wallet/transactions?limit=2", headers=auth_headers)).json()
+    resp = await client.get(
+        "/api/wallet/transactions", params={"limit": 2, "cursor": first["next_cursor"]}, headers=auth_headers
+    )
+    assert [float(t["amount"]) for t in resp.json()["transactions"]] == [3.0, 2.0]
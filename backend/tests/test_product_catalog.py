@@ -0,0 +1,106 @@
+"""Tests for the in-process product catalog and its versioned invalidation."""
+
+from decimal import Decimal
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from fakeredis.aioredis import FakeRedis
+from fastapi import HTTPException
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession
+
+import app.services.product_catalog as product_catalog
+import app.services.redis_service as redis_service
+from app.models.product import Product
+from app.services.redis_keys import PRODUCT_CATALOG_VERSION
+from app.services.shop_service import get_product, get_products
+from tests.test_governance import _auth_headers_for, _create_user
+
+pytestmark = pytest.mark.asyncio
+
+
+@pytest.fixture
+def fake_redis():
+    fake = FakeRedis(decode_responses=True)
+    with patch.object(redis_service, "get_redis", AsyncMock(return_value=fake)):
+        yield fake
+
+
+async def _seed(db: AsyncSession) -> dict[str, Product]:
+    products = {
+        name: Product(name=name, price=Decimal(price), flavor=flavor, stock=10, is_active=active)
+        for name, price, flavor, active in [
+            ("Spearmint 6mg", "5.00", "spearmint", True),
+            ("Bubblegum 3mg", "4.50", "bubblegum", True),
+            ("Spearmint 12mg", "6.00", "spearmint", True),
+            ("Wintergreen 9mg", "5.50", "wintergreen", False),
+        ]
+    }
+    db.add_all(products.values())
+    await db.commit()
+    return products
+
+
+async def test_listing_indexes_flavor_and_sort_orders(db: AsyncSession, fake_redis):
+    products = await _seed(db)
+
+    names = lambda result: [p.name for p in result["items"]]  # noqa: E731
+    assert names(await get_products(db)) == ["Bubblegum 3mg", "Spearmint 12mg", "Spearmint 6mg"]
+    assert names(await get_products(db, sort_by="price_desc")) == [
+        "Spearmint 12mg", "Spearmint 6mg", "Bubblegum 3mg",
+    ]
+    spearmint = await get_products(db, flavor="spearmint", sort_by="price_asc", per_page=1, page=2)
+    assert (names(spearmint), spearmint["total"]) == (["Spearmint 12mg"], 2)
+    assert (await get_products(db, flavor="wintergreen"))["total"] == 0
+
+    # Inactive products drop out of listings and their detail page
+    with pytest.raises(HTTPException) as exc:
+        await get_product(db, products["Wintergreen 9mg"].id)
+    assert exc.value.status_code == 404
+
+
+async def test_reads_are_served_from_memory_until_the_version_moves(db: AsyncSession, fake_redis):
+    await _seed(db)
+    await get_products(db)
+
+    with patch.object(product_catalog, "_load", wraps=product_catalog._load) as load:
+        await get_products(db, flavor="spearmint")
+        await get_products(db, sort_by="price_asc")
+        load.assert_not_called()
+
+        # Another process bumps the version; this one notices on its next check.
+        await fake_redis.incr(PRODUCT_CATALOG_VERSION)
+        await get_products(db)
+        load.assert_not_called()
+        with patch.object(product_catalog, "CATALOG_CHECK_SECONDS", 0):
+            await get_products(db)
+            await get_products(db)
+        load.assert_called_once()
+
+
+async def test_admin_product_writes_bump_the_catalog_version(
+    client: AsyncClient, db: AsyncSession, fake_redis
+):
+    admin = await _create_user(db, "admin@test.com", is_admin=True)
+    member = await _create_user(db, "member@test.com")
+    headers = _auth_headers_for(admin)
+    body = {"name": "Citrus 6mg", "price": "5.00", "flavor": "citrus", "stock": 50}
+
+    assert (await client.get("/api/shop/products")).json()["total"] == 0
+
+    resp = await client.post("/api/admin/products", json=body, headers=_auth_headers_for(member))
+    assert resp.status_code == 403
+    resp = await client.post("/api/admin/products", json=body, headers=headers)
+    assert resp.status_code == 201
+    product_id = resp.json()["id"]
+    assert await fake_redis.get(PRODUCT_CATALOG_VERSION) == "1"
+    assert (await client.get("/api/shop/products")).json()["total"] == 1
+
+    resp = await client.patch(
+        f"/api/admin/products/{product_id}", json={"price": "5.25", "is_active": False}, headers=headers
+    )
+    assert resp.status_code == 200
+    assert (resp.json()["price"], resp.json()["is_active"]) == ("5.25", False)
+    assert await fake_redis.get(PRODUCT_CATALOG_VERSION) == "2"
+    assert (await client.get("/api/shop/products")).json()["total"] == 0
+    assert (await client.get(f"/api/shop/products/{product_id}")).status_code == 404
@@ -0,0 +1,225 @@
+"""Tests for bulk QR code minting jobs and their streamed export."""
+
+import json
+import uuid
+from datetime import datetime, timedelta, timezone
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.qr_code import QRCode
+from app.models.qr_mint_job import QRMintJob
+from app.services import qr_mint_service
+from app.services.qr_mint_service import (
+    create_mint_job,
+    resumable_mint_jobs,
+    run_mint_job,
+    stream_mint_job_codes,
+)
+from tests.test_scans import create_product, make_admin
+
+pytestmark = pytest.mark.asyncio
+
+
+async def _job_codes(db: AsyncSession, job_id: uuid.UUID) -> list[str]:
+    return list((await db.execute(select(QRCode.unique_id).where(QRCode.mint_job_id == job_id))).scalars())
+
+
+async def test_mint_job_loads_codes_in_chunks(db: AsyncSession):
+    product = await create_product(db)
+    job = await create_mint_job(db, product.id, 25)
+    assert (job.status, job.product_code) == ("queued", "TESTPACK")
+
+    report = await run_mint_job(db, job.id, chunk_size=10)
+
+    assert report["status"] == "completed"
+    assert (report["minted"], report["chunks"], report["collisions"]) == (25, 3, 0)
+    codes = await _job_codes(db, job.id)
+    assert len(set(codes)) == 25
+    assert all(c.startswith("BLAKJAKS-TESTPACK-") for c in codes)
+
+    again = await run_mint_job(db, job.id)
+    assert again["skipped"] is True
+    assert len(await _job_codes(db, job.id)) == 25
+
+
+async def test_collisions_are_counted_and_reminted(db: AsyncSession):
+    product = await create_product(db)
+    db.add(QRCode(product_code="TESTPACK", unique_id="BLAKJAKS-TESTPACK-TAKEN0000000", product_id=product.id))
+    await db.commit()
+    job = await create_mint_job(db, product.id, 5)
+
+    original = qr_mint_service._random_codes
+    calls = 0
+
+    def colliding_codes(product_code, count):
+        nonlocal calls
+        calls += 1
+        codes = original(product_code, count)
+        if calls == 1:
+            codes[0] = "BLAKJAKS-TESTPACK-TAKEN0000000"
+        return codes
+
+    with patch.object(qr_mint_service, "_random_codes", colliding_codes):
+        report = await run_mint_job(db, job.id)
+
+    assert (report["minted"], report["collisions"], report["chunks"]) == (5, 1, 2)
+    assert "BLAKJAKS-TESTPACK-TAKEN0000000" not in await _job_codes(db, job.id)
+    assert await db.scalar(select(func.count()).select_from(QRCode)) == 6
+
+
+async def test_failed_job_resumes_from_committed_chunks(db: AsyncSession):
+    product = await create_product(db)
+    job = await create_mint_job(db, product.id, 6)
+
+    original = qr_mint_service.mint_chunk
+    calls = 0
+
+    async def flaky_chunk(*args, **kwargs):
+        nonlocal calls
+        calls += 1
+        if calls == 2:
+            raise RuntimeError("connection reset")
+        return await original(*args, **kwargs)
+
+    with patch.object(qr_mint_service, "mint_chunk", flaky_chunk):
+        with pytest.raises(RuntimeError):
+            await run_mint_job(db, job.id, chunk_size=2)
+
+    failed = await db.scalar(select(QRMintJob).where(QRMintJob.id == job.id))
+    assert (failed.status, failed.minted, failed.last_error) == ("failed", 2, "connection reset")
+
+    report = await run_mint_job(db, job.id, chunk_size=2)
+    assert (report["status"], report["minted"], report["chunks"]) == ("completed", 6, 2)
+    assert len(await _job_codes(db, job.id)) == 6
+
+
+async def test_running_job_is_not_claimed_twice(db: AsyncSession):
+    product = await create_product(db)
+    job = await create_mint_job(db, product.id, 4)
+    job.status = "running"  # another worker holds the claim
+    await db.commit()
+
+    report = await run_mint_job(db, job.id)
+    assert (report["status"], report["minted"], report["skipped"]) == ("running", 0, True)
+    assert await _job_codes(db, job.id) == []
+
+
+async def test_stale_running_job_is_reclaimed(db: AsyncSession):
+    product = await create_product(db)
+    job = await create_mint_job(db, product.id, 4)
+    # The worker that claimed it died without committing a chunk for an hour.
+    await db.execute(
+        update(QRMintJob)
+        .where(QRMintJob.id == job.id)
+        .values(status="running", attempts=1, updated_at=datetime.now(timezone.utc) - timedelta(hours=1))
+    )
+    await db.commit()
+
+    assert await resumable_mint_jobs(db) == [job.id]
+    report = await run_mint_job(db, job.id)
+    assert (report["status"], report["minted"], report["skipped"]) == ("completed", 4, False)
+    assert await resumable_mint_jobs(db) == []
+
+
+async def test_failed_job_is_resumed_until_attempts_run_out(db: AsyncSession):
+    product = await create_product(db)
+    job = await create_mint_job(db, product.id, 4)
+    job_id = job.id
+
+    with patch.object(qr_mint_service, "mint_chunk", AsyncMock(side_effect=RuntimeError("disk full"))):
+        for _ in range(qr_mint_service.MAX_MINT_ATTEMPTS):
+            assert await resumable_mint_jobs(db) in ([], [job_id])
+            with pytest.raises(RuntimeError):
+                await run_mint_job(db, job_id)
+
+    assert await resumable_mint_jobs(db) == []
+    report = await run_mint_job(db, job_id)
+    assert (report["status"], report["skipped"]) == ("failed", True)
+
+
+async def test_copy_codes_stages_rows_with_copy():
+    rows = [(uuid.uuid4(), "TESTPACK", f"BLAKJAKS-TESTPACK-{i:012d}", uuid.uuid4(), None) for i in range(3)]
+    driver = MagicMock(copy_records_to_table=AsyncMock())
+    raw = MagicMock(driver_connection=driver)
+    connection = MagicMock(get_raw_connection=AsyncMock(return_value=raw))
+    moved = MagicMock()
+    moved.scalars.return_value = [rows[0][2], rows[2][2]]
+
+    db = MagicMock()
+    db.connection = AsyncMock(return_value=connection)
+    db.execute = AsyncMock(side_effect=[MagicMock(), moved, MagicMock()])
+
+    inserted = await qr_mint_service._copy_codes(db, rows)
+
+    assert inserted == [rows[0][2], rows[2][2]]
+    driver.copy_records_to_table.assert_awaited_once_with(
+        "qr_mint_staging", records=rows, columns=["id", "product_code", "unique_id", "product_id", "mint_job_id"]
+    )
+    create, insert, truncate = (str(call.args[0]) for call in db.execute.await_args_list)
+    assert "CREATE TEMP TABLE IF NOT EXISTS qr_mint_staging" in create
+    assert "ON CONFLICT (unique_id) DO NOTHING RETURNING unique_id" in insert
+    assert truncate == "TRUNCATE qr_mint_staging"
+
+
+async def test_export_streams_in_keyset_batches(db: AsyncSession):
+    product = await create_product(db)
+    job = await create_mint_job(db, product.id, 7)
+    await run_mint_job(db, job.id)
+
+    with patch.object(qr_mint_service, "EXPORT_BATCH_SIZE", 3):
+        csv_parts = [part async for part in stream_mint_job_codes(db, job.id, "csv")]
+        ndjson = "".join([part async for part in stream_mint_job_codes(db, job.id, "ndjson")])
+
+    assert len(csv_parts) == 4  # header + 3 + 3 + 1
+    lines = "".join(csv_parts).splitlines()
+    assert lines[0] == "unique_id,product_code"
+    assert sorted(line.split(",")[0] for line in lines[1:]) == sorted(await _job_codes(db, job.id))
+    assert {json.loads(line)["product_code"] for line in ndjson.splitlines()} == {"TESTPACK"}
+
+
+async def test_mint_job_api(client: AsyncClient, registered_user, db: AsyncSession):
+    product = await create_product(db)
+    headers = {"Authorization": f"Bearer {await make_admin(db, registered_user['user']['id'])}"}
+
+    with patch("app.tasks.qr_codes.mint_qr_codes.delay") as delay:
+        resp = await client.post(
+            "/api/admin/qr-codes/mint-jobs",
+            headers=headers,
+            json={"product_id": str(product.id), "quantity": 4},
+        )
+    assert resp.status_code == 202
+    job = resp.json()
+    assert (job["status"], job["minted"], job["progress"]) == ("queued", 0, 0.0)
+    delay.assert_called_once_with(job["id"])
+
+    export_url = f"/api/admin/qr-codes/mint-jobs/{job['id']}/export"
+    assert (await client.get(export_url, headers=headers)).status_code == 409
+
+    await run_mint_job(db, uuid.UUID(job["id"]))
+
+    progress = (await client.get(f"/api/admin/qr-codes/mint-jobs/{job['id']}", headers=headers)).json()
+    assert (progress["status"], progress["minted"], progress["progress"]) == ("completed", 4, 1.0)
+
+    resp = await client.get(export_url, params={"format": "ndjson"}, headers=headers)
+    assert resp.status_code == 200
+    assert resp.headers["content-type"].startswith("application/x-ndjson")
+    assert len(resp.text.splitlines()) == 4
+
+    resp = await client.get(export_url, headers=headers)
+    assert resp.headers["content-type"].startswith("text/csv")
+    assert "attachment" in resp.headers["content-disposition"]
+    assert len(resp.text.splitlines()) == 5
+
+
+async def test_mint_job_unknown_product(client: AsyncClient, registered_user, db: AsyncSession):
+    headers = {"Authorization": f"Bearer {await make_admin(db, registered_user['user']['id'])}"}
+    resp = await client.post(
+        "/api/admin/qr-codes/mint-jobs",
+        headers=headers,
+        json={"product_id": str(uuid.uuid4()), "quantity": 4},
+    )
+    assert resp.status_code == 404
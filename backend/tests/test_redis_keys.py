@@ -12,9 +12,14 @@ from app.services.redis_keys import (
     TTL_SCAN_VELOCITY_HOUR,
     TTL_SCAN_VELOCITY_MINUTE,
     GIF_TRENDING_CACHE,
+    bootstrap_generation,
+    bootstrap_payload,
+    cart,
     emote_set_cache,
     gif_search_cache,
     leaderboard_monthly,
+    translation_cache,
+    treasury_sparklines,
     unread_notifications,
 )
 
@@ -103,3 +108,22 @@ def test_ttl_velocity_minute():
 
 def test_ttl_velocity_hour():
     assert TTL_SCAN_VELOCITY_HOUR == 3600
+
+
+def test_translation_cache_key_format():
+    key = translation_cache("msg-1", "es")
+    assert key == "blakjaks:translation:msg-1:es"
+
+
+def test_treasury_sparklines_key_includes_generation_and_days():
+    assert treasury_sparklines(4, 90) == "blakjaks:treasury:sparklines:4:90"
+    assert treasury_sparklines(5, 90) != treasury_sparklines(4, 90)
+
+
+def test_bootstrap_payload_key_format():
+    assert bootstrap_payload("user-1") == "blakjaks:bootstrap:user-1"
+    assert bootstrap_generation("user-1") == "blakjaks:bootstrap:user-1:generation"
+
+
+def test_cart_key_format():
+    assert cart("user-1") == "blakjaks:cart:user-1"
@@ -240,6 +240,25 @@ async def test_clear_unread_zeros_the_count():
     assert count == 0
 
 
+@pytest.mark.asyncio
+async def test_increment_unread_many_applies_each_delta():
+    """increment_unread_many adds each user's delta in a single pipeline."""
+    await svc.increment_unread("user-a")
+    await svc.increment_unread_many({"user-a": 2, "user-b": 3})
+
+    assert await svc.get_unread_count("user-a") == 3
+    assert await svc.get_unread_count("user-b") == 3
+
+
+@pytest.mark.asyncio
+async def test_decrement_unread_clamps_at_zero():
+    """decrement_unread never leaves a negative counter behind."""
+    await svc.increment_unread("user-c")
+    assert await svc.decrement_unread("user-c") == 0
+    assert await svc.decrement_unread("user-c") == 0
+    assert await svc.get_unread_count("user-c") == 0
+
+
 @pytest.mark.asyncio
 async def test_unread_counters_are_per_user():
     """Unread counts for different users do not interfere with each other."""
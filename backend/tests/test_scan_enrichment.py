@@ -1,7 +1,8 @@
 """Tests for E1 — Scan Submit Enrichment.
 
-Verifies: usdc_earned calculation, tier_multiplier storage, Redis increments,
-comp milestone trigger, and full ScanResponse schema.
+Verifies: usdc_earned calculation, tier_multiplier storage, scan event
+publishing (counters move to consumers), comp milestone trigger, and full
+ScanResponse schema.
 """
 
 import uuid
@@ -61,7 +62,7 @@ def _setup_db(qr, user, wallet=None, product_name="Test Product"):
             # User with tier
             result.scalar_one_or_none.return_value = user
         elif n == 4:
-            # Wallet
+            # Wallet ledger credit
             result.scalar_one_or_none.return_value = wallet or _make_wallet()
         else:
             result.scalar_one_or_none.return_value = None
@@ -197,8 +198,9 @@ async def test_scan_stores_tier_multiplier_on_record():
 
 
 @pytest.mark.asyncio
-async def test_redis_counter_increments():
-    """Global scan counter is incremented via Redis after a scan."""
+async def test_scan_publishes_event_for_consumers():
+    """Counters are left to the scan event consumers; the scan publishes one event."""
+    from app.services import scan_events
     from app.services.qr_code import submit_scan
 
     user = _make_user()
@@ -208,18 +210,19 @@ async def test_redis_counter_increments():
     tier_info = {"quarterly_scans": 1, "tier_name": "Standard", "next_tier": "VIP", "scans_to_next_tier": 49}
 
     mock_increment = AsyncMock()
-    mock_velocity = AsyncMock()
+    stream = scan_events.InMemoryScanEventStream()
 
-    with patch("app.services.qr_code.get_user_tier_info", return_value=tier_info), \
+    with patch.object(scan_events, "_memory_stream", stream), \
+         patch("app.services.qr_code.get_user_tier_info", return_value=tier_info), \
          patch("app.services.qr_code.check_rate_limit", return_value=None), \
-         patch("app.services.comp_engine.check_crypto_comp_milestone", return_value=None), \
          patch("app.services.redis_service.increment_global_scan_counter", mock_increment), \
-         patch("app.services.redis_service.track_scan_velocity", mock_velocity), \
          patch("app.services.redis_service.get_global_scan_count", return_value=42):
         result = await submit_scan(mock_db, user, "BLAKJAKS-PROD-ABCDEF123456")
 
-    mock_increment.assert_called_once()
-    mock_velocity.assert_called_once()
+    mock_increment.assert_not_called()
+    assert len(stream.entries) == 1
+    event = stream.entries[0][1]
+    assert event.user_id == user.id
     assert result["global_scan_count"] == 42
 
 
@@ -232,24 +235,22 @@ async def test_comp_milestone_triggers():
     qr = _make_qr()
     mock_db = _setup_db(qr, user)
 
-    mock_txn = MagicMock()
-    mock_txn.amount = Decimal("100")
-
+    comp_id = uuid.uuid4()
     milestone = {"amount": Decimal("100"), "min_tier": "VIP"}
+    mock_find = AsyncMock(return_value=milestone)
     tier_info = {"quarterly_scans": 55, "tier_name": "VIP", "next_tier": "High Roller", "scans_to_next_tier": 45}
 
     with patch("app.services.qr_code.get_user_tier_info", return_value=tier_info), \
          patch("app.services.qr_code.check_rate_limit", return_value=None), \
-         patch("app.services.comp_engine.check_crypto_comp_milestone", return_value=milestone), \
-         patch("app.services.comp_engine.award_crypto_comp", return_value=mock_txn), \
-         patch("app.services.comp_engine._get_total_comps_received", return_value=Decimal("100")), \
-         patch("app.services.redis_service.increment_global_scan_counter", new_callable=AsyncMock), \
-         patch("app.services.redis_service.track_scan_velocity", new_callable=AsyncMock), \
+         patch("app.services.qr_code.find_crypto_comp_milestone", mock_find), \
+         patch("app.services.qr_code.award_milestone_comp", AsyncMock(return_value=comp_id)), \
          patch("app.services.redis_service.get_global_scan_count", return_value=99):
         result = await submit_scan(mock_db, user, "BLAKJAKS-PROD-ABCDEF123456")
 
+    # Checked against the post-scan tier, not the one the scan was priced at.
+    assert mock_find.call_args.args[2] == "VIP"
     assert result["milestone_hit"] is True
-    assert result["comp_earned"] is not None
+    assert result["comp_earned"]["id"] == comp_id
     assert result["comp_earned"]["amount"] == 100.0
     assert result["comp_earned"]["type"] == "crypto_comp"
 
@@ -266,7 +267,7 @@ async def test_comp_failure_does_not_break_scan():
     tier_info = {"quarterly_scans": 10, "tier_name": "Standard", "next_tier": "VIP", "scans_to_next_tier": 40}
     with patch("app.services.qr_code.get_user_tier_info", return_value=tier_info), \
          patch("app.services.qr_code.check_rate_limit", return_value=None), \
-         patch("app.services.comp_engine.check_crypto_comp_milestone", side_effect=Exception("DB error")), \
+         patch("app.services.qr_code.find_crypto_comp_milestone", side_effect=Exception("DB error")), \
          patch("app.services.redis_service.increment_global_scan_counter", new_callable=AsyncMock), \
          patch("app.services.redis_service.track_scan_velocity", new_callable=AsyncMock), \
          patch("app.services.redis_service.get_global_scan_count", return_value=0):
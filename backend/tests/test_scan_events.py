@@ -0,0 +1,255 @@
+"""Tests for the scan event stream and its side-effect consumers."""
+
+import uuid
+from datetime import datetime, timezone
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from sqlalchemy import func, select
+
+from app.models.affiliate_chip import AffiliateChip
+from app.models.notification import Notification
+from app.models.tier import Tier
+from app.models.tier_history import TierHistory
+from app.models.transaction import Transaction
+from app.models.user import User
+from app.services import scan_events
+from app.services.affiliate_service import attribute_referral, get_or_create_affiliate
+from app.services.scan_events import (
+    MAX_DELIVERIES,
+    InMemoryScanEventStream,
+    RedisScanEventStream,
+    ScanEvent,
+    award_comp_milestone,
+    consume_scan_events,
+    create_affiliate_chip,
+    publish_scan_event,
+    record_tier_change,
+    update_scan_counters,
+)
+from tests.conftest import seed_tiers
+from tests.conftest import test_session_factory as session_factory
+
+pytestmark = pytest.mark.asyncio
+
+
+@pytest.fixture
+def stream():
+    stream = InMemoryScanEventStream()
+    with patch.object(scan_events, "_memory_stream", stream):
+        yield stream
+
+
+@pytest.fixture
+def fake_redis():
+    from fakeredis.aioredis import FakeRedis
+
+    import app.services.redis_service as redis_svc
+
+    fake = FakeRedis(decode_responses=True)
+    with patch.object(redis_svc, "get_redis", AsyncMock(return_value=fake)):
+        yield fake
+
+
+async def _user(db, name: str, tier_name: str | None = None) -> User:
+    tier_id = None
+    if tier_name:
+        tier_id = await db.scalar(select(Tier.id).where(Tier.name == tier_name))
+    user = User(email=f"{name}@example.com", password_hash="x", username=name, username_lower=name, tier_id=tier_id)
+    db.add(user)
+    await db.commit()
+    return user
+
+
+def _event(user_id: uuid.UUID) -> ScanEvent:
+    return ScanEvent(scan_id=uuid.uuid4(), user_id=user_id, scanned_at=datetime.now(timezone.utc))
+
+
+async def _count(db, model, *where) -> int:
+    return await db.scalar(select(func.count()).select_from(model).where(*where))
+
+
+# ── Stream and consumer loop ─────────────────────────────────────────
+
+
+async def test_groups_consume_independently(stream):
+    seen: dict[str, list] = {"comps": [], "leaderboard": []}
+
+    def recorder(group):
+        async def handler(db, event):
+            seen[group].append(event.scan_id)
+        return handler
+
+    events = [_event(uuid.uuid4()) for _ in range(3)]
+    for event in events:
+        await stream.publish(event)
+
+    handlers = {group: recorder(group) for group in seen}
+    with patch.dict(scan_events.HANDLERS, handlers):
+        comps = await consume_scan_events("comps", "w1", session_factory=session_factory, count=2)
+        assert comps == {
+            "group": "comps", "processed": 2, "failed": 0, "retried": 0, "dead_lettered": 0,
+            "pending": 0, "lag": 1,
+        }
+        await consume_scan_events("comps", "w1", session_factory=session_factory)
+        board = await consume_scan_events("leaderboard", "w2", session_factory=session_factory)
+
+    assert board["processed"] == 3
+    assert seen["comps"] == seen["leaderboard"] == [e.scan_id for e in events]
+
+
+async def test_failed_event_is_retried_then_dead_lettered(stream):
+    attempts = 0
+
+    async def failing(db, event):
+        nonlocal attempts
+        attempts += 1
+        raise RuntimeError("comp engine down")
+
+    await stream.publish(_event(uuid.uuid4()))
+    with patch.dict(scan_events.HANDLERS, {"comps": failing}):
+        first = await consume_scan_events("comps", "w1", session_factory=session_factory)
+        assert first["failed"] == 1
+        assert first["pending"] == 1
+
+        for _ in range(MAX_DELIVERIES - 1):
+            report = await consume_scan_events("comps", "w1", session_factory=session_factory, min_idle_ms=0)
+
+    assert attempts == MAX_DELIVERIES
+    assert report["retried"] == 1
+    assert report["dead_lettered"] == 1
+    assert report["pending"] == 0
+    assert stream.dead_letters[0]["group"] == "comps"
+    assert "comp engine down" in stream.dead_letters[0]["error"]
+
+
+async def test_publish_failure_runs_handlers_inline(db, stream):
+    handlers = {group: AsyncMock() for group in scan_events.HANDLERS}
+    handlers["affiliate"].side_effect = RuntimeError("boom")
+    event = _event(uuid.uuid4())
+
+    with patch.object(stream, "publish", AsyncMock(side_effect=ConnectionError("redis down"))), \
+         patch.dict(scan_events.HANDLERS, handlers):
+        await publish_scan_event(db, event)
+
+    for handler in handlers.values():
+        handler.assert_awaited_once_with(db, event)
+
+
+async def test_redis_stream_round_trip(fake_redis):
+    redis_stream = RedisScanEventStream()
+    event = _event(uuid.uuid4())
+
+    await redis_stream.ensure_group("comps")
+    await redis_stream.ensure_group("comps")  # BUSYGROUP is ignored
+    await redis_stream.publish(event)
+
+    [message] = await redis_stream.read("comps", "w1", 10)
+    assert message.event == event
+    assert await redis_stream.read("comps", "w1", 10) == []
+    assert (await redis_stream.lag("comps"))["pending"] == 1
+
+    [reclaimed] = await redis_stream.claim_stale("comps", "w2", 0, 10)
+    assert reclaimed.id == message.id
+    # fakeredis' XPENDING omits times_delivered; delivery counting is covered
+    # by the in-memory retry test.
+
+    await redis_stream.dead_letter("comps", reclaimed, "boom")
+    await redis_stream.ack("comps", [reclaimed.id])
+    assert await redis_stream.lag("comps") == {"pending": 0, "lag": 0}
+    [(_, dead)] = await fake_redis.xrange("blakjaks:scans:events:dead")
+    assert dead["group"] == "comps"
+    assert dead["scan_id"] == str(event.scan_id)
+
+
+async def test_idle_consumers_without_pending_are_pruned(fake_redis):
+    redis_stream = RedisScanEventStream()
+    await redis_stream.ensure_group("comps")
+    await redis_stream.publish(_event(uuid.uuid4()))
+    await redis_stream.read("comps", "holder", 10)
+    assert await redis_stream.read("comps", "idle", 10) == []
+
+    assert await redis_stream.prune_consumers("comps", 0) == 1
+    [consumer] = await fake_redis.xinfo_consumers("blakjaks:scans:events", "comps")
+    assert consumer["name"] == "holder"
+
+
+# ── Handlers ─────────────────────────────────────────────────────────
+
+
+async def test_comp_milestone_awarded_once(db):
+    user = await _user(db, "vip")
+    event = _event(user.id)
+
+    with patch("app.services.comp_engine._get_user_tier_name", AsyncMock(return_value="VIP")):
+        await award_comp_milestone(db, event)
+        await award_comp_milestone(db, event)
+
+    assert await _count(db, Transaction, Transaction.user_id == user.id, Transaction.type == "comp_award") == 1
+    assert await _count(db, Notification, Notification.user_id == user.id, Notification.type == "comp_award") == 1
+
+
+async def test_affiliate_chip_created_once(db):
+    referrer = await _user(db, "referrer")
+    affiliate = await get_or_create_affiliate(db, referrer.id)
+    referred = await _user(db, "referred")
+    await attribute_referral(db, referred.id, affiliate.referral_code)
+    event = _event(referred.id)
+
+    await create_affiliate_chip(db, event)
+    await create_affiliate_chip(db, event)
+
+    assert await _count(db, AffiliateChip, AffiliateChip.source_scan_id == event.scan_id) == 1
+
+
+async def test_counters_updated_once_per_scan(fake_redis):
+    event = _event(uuid.uuid4())
+
+    await update_scan_counters(None, event)
+    await update_scan_counters(None, event)
+
+    assert await fake_redis.get("blakjaks:scans:global_total") == "1"
+    assert await fake_redis.zscore("blakjaks:leaderboard:all_time", str(event.user_id)) == 1
+
+
+async def test_failed_count_is_retried_on_redelivery(fake_redis):
+    import app.services.redis_service as redis_svc
+
+    event = _event(uuid.uuid4())
+    with patch.object(redis_svc, "leaderboard_monthly", side_effect=RuntimeError("boom")):
+        with pytest.raises(RuntimeError):
+            await update_scan_counters(None, event)
+    assert await fake_redis.get("blakjaks:scans:global_total") is None
+
+    await update_scan_counters(None, event)
+    assert await fake_redis.get("blakjaks:scans:global_total") == "1"
+
+
+async def test_tier_upgrade_recorded_once(db):
+    await seed_tiers(db)
+    user = await _user(db, "climber", tier_name="Standard")
+    event = _event(user.id)
+    info = {"tier_name": "VIP", "quarterly_scans": 7}
+
+    with patch("app.services.tier.get_user_tier_info", AsyncMock(return_value=info)):
+        await record_tier_change(db, event)
+        await record_tier_change(db, event)
+
+    history = (await db.execute(select(TierHistory).where(TierHistory.user_id == user.id))).scalars().all()
+    assert [(h.tier_name, h.scan_count) for h in history] == [("VIP", 7)]
+    assert history[0].quarter.startswith(str(datetime.now(timezone.utc).year))
+    vip_id = await db.scalar(select(Tier.id).where(Tier.name == "VIP"))
+    assert await db.scalar(select(User.tier_id).where(User.id == user.id)) == vip_id
+    assert await _count(db, Notification, Notification.user_id == user.id, Notification.type == "tier_change") == 1
+
+
+async def test_base_tier_is_stored_without_history(db):
+    await seed_tiers(db)
+    user = await _user(db, "newcomer")
+
+    with patch("app.services.tier.get_user_tier_info", AsyncMock(return_value={"tier_name": "Standard", "quarterly_scans": 1})):
+        await record_tier_change(db, _event(user.id))
+
+    standard_id = await db.scalar(select(Tier.id).where(Tier.name == "Standard"))
+    assert await db.scalar(select(User.tier_id).where(User.id == user.id)) == standard_id
+    assert await _count(db, TierHistory, TierHistory.user_id == user.id) == 0
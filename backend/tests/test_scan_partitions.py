@@ -0,0 +1,72 @@
+"""Tests for quarterly scans partitions."""
+
+from datetime import date, datetime, timezone
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.services.scan_partitions import ensure_scan_partitions, partition_ddl, partition_name
+from app.services.tier import quarter_range
+
+pytestmark = pytest.mark.asyncio
+
+
+async def test_quarter_bounds_match_partition_bounds():
+    assert quarter_range(date(2026, 12, 31)) == (
+        datetime(2026, 10, 1, tzinfo=timezone.utc),
+        datetime(2027, 1, 1, tzinfo=timezone.utc),
+    )
+    assert partition_name(date(2026, 2, 14)) == "scans_2026_q1"
+    assert partition_ddl(date(2026, 11, 5)) == (
+        "CREATE TABLE IF NOT EXISTS scans_2026_q4 PARTITION OF scans "
+        "FOR VALUES FROM ('2026-10-01 00:00:00+00') TO ('2027-01-01 00:00:00+00')"
+    )
+
+
+def _postgres_db(stragglers: int = 0) -> AsyncMock:
+    """A PostgreSQL session mock: Q3/Q4 2026 exist, DEFAULT holds *stragglers* rows per quarter."""
+    db = AsyncMock()
+    db.get_bind = MagicMock()
+    db.get_bind.return_value.dialect.name = "postgresql"
+    result = MagicMock()
+    result.scalars.return_value = ["scans_2026_q3", "scans_2026_q4", "scans_default"]
+    result.scalar_one.return_value = stragglers
+    db.execute.return_value = result
+    return db
+
+
+def _ddl(db: AsyncMock) -> list[str]:
+    return [str(c.args[0]) for c in db.execute.call_args_list[1:] if not c.args[1:]]
+
+
+async def test_ensure_creates_missing_quarters_across_year_end():
+    db = _postgres_db()
+
+    created = await ensure_scan_partitions(db, quarters_ahead=2, now=datetime(2026, 10, 19, tzinfo=timezone.utc))
+
+    assert created == ["scans_2027_q1", "scans_2027_q2"]
+    assert _ddl(db) == [partition_ddl(date(2027, 1, 1)), partition_ddl(date(2027, 4, 1))]
+    db.commit.assert_awaited_once()
+
+
+async def test_ensure_moves_default_rows_into_new_quarter():
+    db = _postgres_db(stragglers=4)
+
+    created = await ensure_scan_partitions(db, quarters_ahead=1, now=datetime(2026, 12, 31, tzinfo=timezone.utc))
+
+    assert created == ["scans_2027_q1"]
+    assert _ddl(db) == [
+        "ALTER TABLE scans DETACH PARTITION scans_default",
+        partition_ddl(date(2027, 1, 1)),
+        "ALTER TABLE scans ATTACH PARTITION scans_default DEFAULT",
+    ]
+    [move] = [c for c in db.execute.call_args_list if "DELETE FROM scans_default" in str(c.args[0])]
+    assert move.args[1] == {
+        "start": datetime(2027, 1, 1, tzinfo=timezone.utc),
+        "end": datetime(2027, 4, 1, tzinfo=timezone.utc),
+    }
+
+
+async def test_ensure_is_a_noop_off_postgres(db: AsyncSession):
+    assert await ensure_scan_partitions(db) == []
@@ -1,4 +1,6 @@
 import uuid
+from datetime import datetime, timedelta, timezone
+from unittest.mock import AsyncMock, patch
 
 import pytest
 from httpx import AsyncClient
@@ -7,6 +9,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from app.core.security import create_access_token
 from app.models.product import Product
 from app.models.qr_code import QRCode
+from app.models.scan import Scan
 from app.models.user import User
 from tests.conftest import seed_tiers
 
@@ -172,6 +175,83 @@ async def test_scan_history_paginated(client: AsyncClient, auth_headers, registe
     assert len(data["items"]) == 1
 
 
+async def test_scan_history_cursor_pages(client: AsyncClient, auth_headers, registered_user, db: AsyncSession):
+    product = await create_product(db)
+    user_id = uuid.UUID(registered_user["user"]["id"])
+    scanned = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    for i in range(5):
+        qr = await create_qr(db, product)
+        # Pairs share a timestamp, so pages also split on the id tie-breaker.
+        db.add(Scan(user_id=user_id, qr_code_id=qr.id, created_at=scanned + timedelta(minutes=i // 2)))
+    await db.commit()
+
+    seen, cursor = [], None
+    for expected in (2, 2, 1):
+        params = {"per_page": 2, "total": "none"}
+        if cursor:
+            params["cursor"] = cursor
+        data = (await client.get("/api/scans/history", params=params, headers=auth_headers)).json()
+        assert len(data["items"]) == expected
+        assert data["total"] is None
+        seen += [item["id"] for item in data["items"]]
+        cursor = data["next_cursor"]
+    assert cursor is None
+    assert len(set(seen)) == 5
+
+    # Page-number clients get the same rows in the same order.
+    offset_page = (await client.get("/api/scans/history?page=2&per_page=2", headers=auth_headers)).json()
+    assert [item["id"] for item in offset_page["items"]] == seen[2:4]
+    assert (offset_page["total"], offset_page["total_estimated"]) == (5, False)
+
+    with patch("app.services.redis_service.get_user_scan_total", AsyncMock(return_value=4)):
+        data = (await client.get("/api/scans/history?total=estimate", headers=auth_headers)).json()
+    assert (data["total"], data["total_estimated"]) == (4, True)
+
+    resp = await client.get("/api/scans/history?cursor=not-a-cursor", headers=auth_headers)
+    assert resp.status_code == 400
+
+
+# ── GET /admin/qr-codes ─────────────────────────────────────────────
+
+
+async def test_admin_list_qr_codes_cursor_pages(client: AsyncClient, registered_user, db: AsyncSession):
+    product = await create_product(db)
+    other = Product(name="OtherPack", price=5.00, stock=100)
+    db.add(other)
+    await db.commit()
+    minted = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    for i in range(7):
+        db.add(QRCode(
+            product_code="TESTPACK",
+            unique_id=f"BLAKJAKS-TESTPACK-LIST{i:08d}",
+            product_id=product.id,
+            created_at=minted + timedelta(minutes=i // 3),
+        ))
+    db.add(QRCode(product_code="OTHERPACK", unique_id="BLAKJAKS-OTHERPACK-000000000001", product_id=other.id))
+    await db.commit()
+    headers = {"Authorization": f"Bearer {await make_admin(db, registered_user['user']['id'])}"}
+
+    seen, cursor, sizes = [], None, []
+    while True:
+        params = {"per_page": 3, "product_id": str(product.id), "total": "estimate"}
+        if cursor:
+            params["cursor"] = cursor
+        data = (await client.get("/api/admin/qr-codes", params=params, headers=headers)).json()
+        # SQLite has no planner estimate, so the estimate falls back to an exact count.
+        assert (data["total"], data["total_estimated"]) == (7, True)
+        sizes.append(len(data["items"]))
+        seen += [item["id"] for item in data["items"]]
+        cursor = data["next_cursor"]
+        if cursor is None:
+            break
+    assert sizes == [3, 3, 1]
+    assert len(set(seen)) == 7
+
+    data = (await client.get("/api/admin/qr-codes?page=3&per_page=3", headers=headers)).json()
+    assert data["total"] == 8
+    assert len(data["items"]) == 2
+
+
 # ── POST /admin/qr-codes/generate ───────────────────────────────────
 
 
@@ -0,0 +1,71 @@
+"""Tests for the fast JSON path: serializer, chat buffer storage and WebSocket fan-out."""
+
+import json
+import uuid
+from datetime import datetime, timezone
+from decimal import Decimal
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from fakeredis.aioredis import FakeRedis
+
+import app.api.social_ws as social_ws
+from app.core.serialization import _default, dumps, dumps_str, loads
+from app.services.chat_buffer import buffer_message, get_messages_after
+
+pytestmark = pytest.mark.asyncio
+
+
+async def test_dumps_matches_compact_stdlib_output():
+    message = {
+        "id": uuid.UUID("12345678-1234-5678-1234-567812345678"),
+        "created_at": datetime(2026, 3, 1, 12, 30, tzinfo=timezone.utc),
+        "amount": Decimal("12.50"),
+        "content": "héllo 👋",
+        "reactions": [{"emoji": "🔥", "count": 2}],
+    }
+    expected = json.dumps(message, default=_default, ensure_ascii=False, separators=(",", ":"))
+
+    assert dumps(message) == expected.encode()
+    assert dumps_str(message) == expected
+    assert loads(dumps(message))["created_at"] == "2026-03-01T12:30:00+00:00"
+    with pytest.raises(ValueError):
+        loads("{not json")
+
+
+async def test_chat_buffer_round_trip_skips_corrupt_entries():
+    fake = FakeRedis(decode_responses=True)
+    channel_id = uuid.uuid4()
+    with patch("app.services.chat_buffer.get_redis", AsyncMock(return_value=fake)):
+        await buffer_message(channel_id, 1, {"type": "new_message", "sequence": 1, "id": uuid.uuid4()})
+        await fake.zadd(f"channel:{channel_id}:messages", {"{corrupt": 2})
+        await buffer_message(channel_id, 3, {"type": "new_message", "sequence": 3, "content": "hi"})
+
+        messages = await get_messages_after(channel_id, 0)
+
+    assert [m["sequence"] for m in messages] == [1, 3]
+    assert isinstance(messages[0]["id"], str)
+
+
+async def test_deliver_local_encodes_each_message_once():
+    manager = social_ws.ConnectionManager()
+    channel_id = uuid.uuid4()
+    states = []
+    for _ in range(4):
+        websocket = MagicMock()
+        websocket.send_text = AsyncMock()
+        state = social_ws.ConnectionState(websocket=websocket, user_id=uuid.uuid4())
+        manager.register(state)
+        await manager.join(channel_id, state.connection_id)
+        states.append(state)
+
+    message = {"type": "reaction_update", "message_id": str(uuid.uuid4()), "_exclude_connection": states[0].connection_id}
+    with patch.object(social_ws, "dumps_str", wraps=dumps_str) as encode:
+        await manager._deliver_local(channel_id, message)
+
+    encode.assert_called_once()
+    states[0].websocket.send_text.assert_not_awaited()
+    frames = {state.websocket.send_text.await_args.args[0] for state in states[1:]}
+    assert len(frames) == 1
+    assert "_exclude_connection" not in loads(frames.pop())
+
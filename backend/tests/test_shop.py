@@ -289,3 +289,30 @@ async def test_order_detail(client: AsyncClient, auth_headers, db: AsyncSession)
     data = resp.json()
     assert data["id"] == order_id
     assert data["shipping_address"]["state"] == "CA"
+
+
+async def test_admin_update_order_status(client: AsyncClient, auth_headers, db: AsyncSession):
+    from tests.test_governance import _auth_headers_for, _create_user
+
+    products = await _seed_products(db)
+    await client.post(
+        "/api/cart/add", headers=auth_headers,
+        json={"product_id": str(products[0].id), "quantity": 5},
+    )
+    create_resp = await client.post(
+        "/api/orders/create", headers=auth_headers,
+        json={"shipping_address": SHIPPING_ADDRESS, "age_verification_id": "AGE-VERIFIED-123"},
+    )
+    order_id = create_resp.json()["id"]
+    admin = await _create_user(db, "orders-admin@test.com", is_admin=True)
+    url = f"/api/admin/orders/{order_id}/status"
+
+    resp = await client.patch(url, headers=auth_headers, json={"status": "cancelled"})
+    assert resp.status_code == 403
+    resp = await client.patch(url, headers=_auth_headers_for(admin), json={"status": "lost"})
+    assert resp.status_code == 400
+
+    resp = await client.patch(url, headers=_auth_headers_for(admin), json={"status": "cancelled"})
+    assert resp.status_code == 200
+    assert resp.json()["status"] == "cancelled"
+    assert resp.json()["items"][0]["quantity"] == 5
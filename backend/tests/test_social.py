@@ -8,6 +8,7 @@ from httpx import AsyncClient
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.security import create_access_token, hash_password
+from app.core.serialization import loads
 from app.models.channel import Channel
 from app.models.chat_mute import ChatMute
 from app.models.message import Message
@@ -19,6 +20,7 @@ from app.services.chat_service import (
     get_channel_messages,
     get_channels,
     get_pinned_messages,
+    hard_delete_message,
     mute_user,
     pin_message,
     remove_reaction,
@@ -354,6 +356,35 @@ async def test_admin_can_delete_any_message(db: AsyncSession):
     assert deleted is True
 
 
+async def test_hard_delete_removes_dependent_rows(db: AsyncSession):
+    from sqlalchemy import func, select
+
+    from app.models.chat_report import ChatReport
+    from app.models.message_reaction import MessageReaction
+    from app.models.social_message_translation import SocialMessageTranslation
+
+    await seed_tiers(db)
+    user = await _create_user_with_tier(db, "harddel@test.com", "VIP")
+    reporter = await _create_user_with_tier(db, "harddel-reporter@test.com", "VIP")
+    ch = await _create_channel(db, "hard-del-test")
+    msg = await send_message(db, ch.id, user.id, "Remove me entirely")
+    kept = await send_message(db, ch.id, user.id, "Keep me")
+    msg_id = msg.id
+    for target in (msg, kept):
+        await add_reaction(db, target.id, reporter.id, "👎")
+        await report_message(db, target.id, reporter.id, "spam")
+        db.add(SocialMessageTranslation(message_id=target.id, language="es", translated_text="...", translated_at=datetime.now(timezone.utc)))
+    await db.commit()
+
+    deleted = await hard_delete_message(db, msg_id)
+    assert deleted.id == msg_id
+    for model in (Message, MessageReaction, ChatReport, SocialMessageTranslation):
+        column = model.id if model is Message else model.message_id
+        assert await db.scalar(select(func.count()).select_from(model).where(column == msg_id)) == 0
+        assert await db.scalar(select(func.count()).select_from(model).where(column == kept.id)) == 1
+    assert await hard_delete_message(db, msg_id) is None
+
+
 # ── Pin / Unpin ──────────────────────────────────────────────────────
 
 
@@ -454,3 +485,144 @@ async def test_standard_post_message_api_allowed(client: AsyncClient, db: AsyncS
     )
     assert resp.status_code == 201
     assert resp.json()["content"] == "Hello from Standard!"
+
+
+# ── Translated fan-out ───────────────────────────────────────────────
+
+
+def _ws_state(user_id: uuid.UUID, language: str | None):
+    from unittest.mock import AsyncMock, MagicMock
+
+    from app.api.social_ws import ConnectionState
+
+    websocket = MagicMock()
+    websocket.send_text = AsyncMock()
+    return ConnectionState(websocket=websocket, user_id=user_id, preferred_language=language)
+
+
+async def test_broadcast_translates_once_per_language():
+    import asyncio
+    from unittest.mock import AsyncMock, patch
+
+    from app.api.social_ws import ConnectionManager
+
+    manager = ConnectionManager()
+    channel_id = uuid.uuid4()
+    sender = _ws_state(uuid.uuid4(), "es")
+    spanish = [_ws_state(uuid.uuid4(), "es") for _ in range(3)]
+    french = _ws_state(uuid.uuid4(), "fr")
+    english = _ws_state(uuid.uuid4(), "en")
+    untranslated = _ws_state(uuid.uuid4(), None)
+    for state in [sender, *spanish, french, english, untranslated]:
+        manager.register(state)
+        await manager.join(channel_id, state.connection_id)
+
+    message = {
+        "type": "new_message",
+        "id": str(uuid.uuid4()),
+        "user_id": str(sender.user_id),
+        "content": "hello",
+        "original_language": "en",
+        "sequence": 7,
+    }
+
+    async def _fake_translate(db, message_id, text, language, source_language=None):
+        return f"[{language}] {text}"
+
+    with patch(
+        "app.api.social_ws.translate_message", AsyncMock(side_effect=_fake_translate)
+    ) as mock_translate:
+        await manager._deliver_local(channel_id, dict(message))
+        await asyncio.gather(*manager._translation_tasks)
+
+    assert sorted(call.args[3] for call in mock_translate.await_args_list) == ["es", "fr"]
+
+    def _translation_frames(state):
+        frames = [loads(c.args[0]) for c in state.websocket.send_text.await_args_list]
+        return [frame for frame in frames if frame["type"] == "translation"]
+
+    for state in spanish:
+        (frame,) = _translation_frames(state)
+        assert frame["translated_text"] == "[es] hello"
+        assert frame["message_id"] == message["id"]
+        assert frame["sequence"] == 7
+    assert _translation_frames(french)[0]["language"] == "fr"
+    for state in (sender, english, untranslated):
+        assert _translation_frames(state) == []
+
+
+async def test_translation_fanout_translates_once_across_pods():
+    import asyncio
+    from unittest.mock import AsyncMock, patch
+
+    from fakeredis.aioredis import FakeRedis
+
+    import app.services.redis_service as redis_svc
+    from app.api.social_ws import ConnectionManager
+
+    # Two pods, each with a Spanish reader; broadcast stands in for pub/sub.
+    pods = [ConnectionManager(), ConnectionManager()]
+    channel_id = uuid.uuid4()
+    readers = []
+    for pod in pods:
+        reader = _ws_state(uuid.uuid4(), "es")
+        pod.register(reader)
+        await pod.join(channel_id, reader.connection_id)
+        readers.append(reader)
+
+    async def _publish(channel_id, message):
+        for pod in pods:
+            await pod._deliver_local(channel_id, dict(message))
+
+    message = {
+        "type": "new_message", "id": str(uuid.uuid4()), "user_id": str(uuid.uuid4()),
+        "content": "hello", "original_language": "en",
+    }
+    translate = AsyncMock(return_value="hola")
+    with patch.object(redis_svc, "get_redis", AsyncMock(return_value=FakeRedis(decode_responses=True))), \
+         patch("app.api.social_ws.translate_message", translate):
+        for pod in pods:
+            pod.broadcast = _publish
+        await _publish(channel_id, message)
+        await asyncio.gather(*(task for pod in pods for task in list(pod._translation_tasks)))
+
+    translate.assert_awaited_once()
+    for reader in readers:
+        frames = [loads(c.args[0]) for c in reader.websocket.send_text.await_args_list]
+        (frame,) = [f for f in frames if f["type"] == "translation"]
+        assert frame["translated_text"] == "hola"
+        assert "_sender_id" not in frame
+
+
+async def test_translation_fanout_respects_deadline():
+    import asyncio
+    from unittest.mock import patch
+
+    from app.api.social_ws import ConnectionManager
+
+    manager = ConnectionManager()
+    channel_id = uuid.uuid4()
+    reader = _ws_state(uuid.uuid4(), "es")
+    manager.register(reader)
+    await manager.join(channel_id, reader.connection_id)
+
+    async def _slow_translate(*args, **kwargs):
+        await asyncio.sleep(10)
+
+    message = {"type": "new_message", "id": str(uuid.uuid4()), "user_id": "x", "content": "hi"}
+    with patch("app.api.social_ws.translate_message", _slow_translate), \
+         patch("app.api.social_ws.TRANSLATION_FANOUT_DEADLINE", 0.05):
+        await manager._deliver_local(channel_id, dict(message))
+        await asyncio.gather(*manager._translation_tasks)
+
+    frame_types = [loads(c.args[0])["type"] for c in reader.websocket.send_text.await_args_list]
+    assert frame_types == ["new_message"]
+
+
+async def test_normalize_language():
+    from app.api.social_ws import _normalize_language
+
+    assert _normalize_language("es-MX") == "es"
+    assert _normalize_language("FR") == "fr"
+    assert _normalize_language("xx") is None
+    assert _normalize_language(None) is None
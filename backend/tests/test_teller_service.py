@@ -115,6 +115,41 @@ async def test_sync_one_failure_does_not_abort_others():
     assert results["Reserve Account"]["status"] == "error"
 
 
+@pytest.mark.asyncio
+async def test_sync_invalidates_sparklines_after_writing_snapshots():
+    """New treasury snapshots retire the cached sparklines once the sync commits."""
+    from app.models.teller_account import TellerAccount
+    from app.core.config import settings
+
+    def _account(teller_account_id):
+        account = MagicMock(spec=TellerAccount)
+        account.name = f"Account {teller_account_id}"
+        account.teller_account_id = teller_account_id
+        account.account_type = "operating"
+        account.balance = Decimal("0")
+        return account
+
+    mock_db = AsyncMock()
+    mock_db.add = MagicMock()
+    mock_result = MagicMock()
+    mock_result.scalars.return_value.all.return_value = [_account("acc_ok")]
+    mock_db.execute = AsyncMock(return_value=mock_result)
+
+    with patch("app.services.teller_service.invalidate_sparklines", new_callable=AsyncMock) as invalidate, \
+         patch("app.services.teller_service.get_account_balance", AsyncMock(return_value=Decimal("500.00"))), \
+         patch.object(settings, "TELLER_CERT_PATH", "/fake/cert.pem"), \
+         patch.object(settings, "TELLER_KEY_PATH", "/fake/key.pem"):
+        await sync_all_balances(mock_db)
+        mock_db.commit.assert_awaited_once()
+        invalidate.assert_awaited_once()
+
+        # No snapshot written → cache left alone
+        invalidate.reset_mock()
+        mock_result.scalars.return_value.all.return_value = [_account(None)]
+        await sync_all_balances(mock_db)
+        invalidate.assert_not_awaited()
+
+
 @pytest.mark.asyncio
 async def test_get_last_sync_status_returns_all_accounts():
     from app.models.teller_account import TellerAccount
@@ -102,3 +102,167 @@ async def test_get_treasury_sparkline_empty_returns_empty_list():
 
     result = await get_treasury_sparkline(mock_db, "consumer")
     assert result == []
+
+
+# ---------------------------------------------------------------------------
+# TimescaleDB mode
+# ---------------------------------------------------------------------------
+
+
+def _timescale_db(aggregates_exist: bool) -> AsyncMock:
+    """Mock session: first execute() answers the aggregate check, later ones return no rows."""
+    check = MagicMock()
+    check.scalar.return_value = aggregates_exist
+    rows = MagicMock()
+    rows.fetchall.return_value = []
+    mock_db = AsyncMock()
+    mock_db.execute = AsyncMock(side_effect=[check, rows, rows])
+    mock_db.begin_nested = MagicMock()
+    return mock_db
+
+
+@pytest.fixture
+def timescale_enabled():
+    import app.services.timescale_service as svc
+
+    with patch.object(svc.settings, "TIMESCALE_ENABLED", True), patch.object(svc, "_continuous_aggregates", None):
+        yield svc
+
+
+@pytest.mark.asyncio
+async def test_sparkline_reads_daily_aggregate_when_available(timescale_enabled):
+    svc = timescale_enabled
+    mock_db = _timescale_db(aggregates_exist=True)
+
+    await svc.get_treasury_sparkline(mock_db, "consumer", days=30)
+    await svc.get_metric_history(mock_db, "global_scan_count", hours=24)
+
+    # One detection query, then one read per call from the aggregates
+    assert mock_db.execute.await_count == 3
+    assert svc.TREASURY_DAILY_VIEW in str(mock_db.execute.await_args_list[1].args[0])
+    assert svc.METRICS_HOURLY_VIEW in str(mock_db.execute.await_args_list[2].args[0])
+
+
+@pytest.mark.asyncio
+async def test_sparkline_falls_back_when_aggregates_missing(timescale_enabled):
+    svc = timescale_enabled
+    mock_db = _timescale_db(aggregates_exist=False)
+
+    await svc.get_treasury_sparkline(mock_db, "consumer", days=30)
+
+    query = str(mock_db.execute.await_args_list[1].args[0])
+    assert "FROM treasury_snapshots\n" in query
+    assert svc.TREASURY_DAILY_VIEW not in query
+
+
+@pytest.mark.asyncio
+async def test_failed_aggregate_probe_is_not_cached(timescale_enabled):
+    svc = timescale_enabled
+    mock_db = _timescale_db(aggregates_exist=True)
+    check = mock_db.execute.side_effect
+    mock_db.execute.side_effect = [ConnectionError("reset"), *check]
+
+    assert await svc._has_continuous_aggregates(mock_db) is False
+    assert svc._continuous_aggregates is None
+    assert await svc._has_continuous_aggregates(mock_db) is True
+    assert mock_db.begin_nested.call_count == 2  # each probe runs in a SAVEPOINT
+
+
+@pytest.mark.asyncio
+async def test_plain_sql_without_timescale_mode():
+    from app.services.timescale_service import METRICS_HOURLY_VIEW, get_metric_history
+
+    mock_result = MagicMock()
+    mock_result.fetchall.return_value = []
+    mock_db = AsyncMock()
+    mock_db.execute = AsyncMock(return_value=mock_result)
+
+    await get_metric_history(mock_db, "global_scan_count", hours=24)
+
+    mock_db.execute.assert_awaited_once()
+    assert METRICS_HOURLY_VIEW not in str(mock_db.execute.await_args.args[0])
+
+
+# ---------------------------------------------------------------------------
+# Multi-pool sparklines + cache
+# ---------------------------------------------------------------------------
+
+
+@pytest.fixture
+def sparkline_redis():
+    from fakeredis.aioredis import FakeRedis
+
+    import app.services.redis_service as redis_svc
+
+    fake = FakeRedis(decode_responses=True)
+    with patch.object(redis_svc, "get_redis", AsyncMock(return_value=fake)):
+        yield fake
+
+
+def _sparkline_db(*rows) -> AsyncMock:
+    mock_result = MagicMock()
+    mock_result.fetchall.return_value = list(rows)
+    mock_db = AsyncMock()
+    mock_db.execute = AsyncMock(return_value=mock_result)
+    mock_db.add = MagicMock()
+    return mock_db
+
+
+def _pool_row(pool_type, day, onchain):
+    from datetime import date
+
+    row = MagicMock()
+    row.pool_type = pool_type
+    row.day = date(2026, 2, day)
+    row.avg_onchain = Decimal(onchain)
+    row.avg_bank = Decimal("0")
+    return row
+
+
+@pytest.mark.asyncio
+async def test_get_treasury_sparklines_groups_all_pools_in_one_query(sparkline_redis):
+    from app.services.timescale_service import get_treasury_sparklines
+
+    mock_db = _sparkline_db(
+        _pool_row("affiliate", 1, "5"),
+        _pool_row("consumer", 1, "100"),
+        _pool_row("consumer", 2, "110"),
+    )
+
+    result = await get_treasury_sparklines(mock_db, days=90)
+
+    mock_db.execute.assert_awaited_once()
+    assert "GROUP BY pool_type, day" in str(mock_db.execute.await_args.args[0])
+    assert [p["onchain_balance"] for p in result["consumer"]] == [100.0, 110.0]
+    assert result["affiliate"][0]["date"] == "2026-02-01"
+    assert result["wholesale"] == []
+
+
+@pytest.mark.asyncio
+async def test_sparklines_are_cached_until_next_snapshot_write(sparkline_redis):
+    from app.services.timescale_service import get_treasury_sparklines, write_treasury_snapshot
+
+    mock_db = _sparkline_db(_pool_row("consumer", 1, "100"))
+
+    first = await get_treasury_sparklines(mock_db)
+    second = await get_treasury_sparklines(mock_db)
+    assert second == first
+    assert mock_db.execute.await_count == 1
+
+    await write_treasury_snapshot(mock_db, "consumer", Decimal("120"))
+    await get_treasury_sparklines(mock_db)
+    assert mock_db.execute.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_sparklines_query_directly_when_redis_is_down():
+    import app.services.redis_service as redis_svc
+    from app.services.timescale_service import get_treasury_sparklines
+
+    mock_db = _sparkline_db(_pool_row("wholesale", 3, "7"))
+    with patch.object(redis_svc, "get_redis", AsyncMock(side_effect=ConnectionError("down"))):
+        result = await get_treasury_sparklines(mock_db)
+        await get_treasury_sparklines(mock_db)
+
+    assert result["wholesale"][0]["onchain_balance"] == 7.0
+    assert mock_db.execute.await_count == 2
@@ -5,6 +5,8 @@ import pytest
 from decimal import Decimal
 from unittest.mock import AsyncMock, MagicMock, patch
 
+from sqlalchemy.dialects import postgresql
+
 
 @pytest.mark.asyncio
 async def test_translate_message_returns_none_when_disabled():
@@ -63,12 +65,10 @@ async def test_translate_message_calls_google_on_cache_miss():
 
     mock_db = AsyncMock()
     mock_db.execute = AsyncMock(return_value=mock_result)
-    mock_db.add = MagicMock()
     mock_db.commit = AsyncMock()
-    mock_db.refresh = AsyncMock()
 
     mock_client = MagicMock()
-    mock_client.translate.return_value = {"translatedText": "Hola mundo"}
+    mock_client.translate.return_value = [{"translatedText": "Hola mundo"}]
 
     with patch.object(settings, "TRANSLATION_ENABLED", True), \
          patch.object(settings, "TRANSLATION_SUPPORTED_LANGUAGES", ["es"]), \
@@ -76,7 +76,9 @@ async def test_translate_message_calls_google_on_cache_miss():
         result = await translate_message(mock_db, uuid.uuid4(), "Hello world", "es")
 
     assert result == "Hola mundo"
-    mock_db.add.assert_called_once()
+    insert_stmt = mock_db.execute.await_args.args[0]
+    assert insert_stmt.table.name == "social_message_translations"
+    assert "ON CONFLICT" in str(insert_stmt.compile(dialect=postgresql.dialect()))
     mock_db.commit.assert_called_once()
 
 
@@ -155,3 +157,120 @@ async def test_detect_language_returns_en_on_client_failure():
         result = await detect_language("Bonjour")
 
     assert result == "en"
+
+
+# ── Engine: fake provider, Redis tier, batching, coalescing ─────────
+
+
+@pytest.fixture
+def fake_engine():
+    """Route the engine through the offline provider and a FakeRedis cache tier."""
+    from fakeredis.aioredis import FakeRedis
+
+    import app.services.redis_service as redis_svc
+    import app.services.translation_service as svc
+    from app.core.config import settings
+
+    fake_redis = FakeRedis(decode_responses=True)
+    svc._fake_provider = None
+    with patch.object(settings, "TRANSLATION_ENABLED", True), \
+         patch.object(settings, "TRANSLATION_PROVIDER", "fake"), \
+         patch.object(settings, "TRANSLATION_SUPPORTED_LANGUAGES", ["en", "es", "fr"]), \
+         patch.object(redis_svc, "get_redis", AsyncMock(return_value=fake_redis)):
+        yield svc.get_translation_provider()
+    svc._fake_provider = None
+
+
+@pytest.mark.asyncio
+async def test_translate_messages_uses_one_provider_call_per_page(db, fake_engine):
+    from app.services.translation_service import translate_messages
+
+    page = [(uuid.uuid4(), f"message {i}") for i in range(25)]
+    result = await translate_messages(db, page, "es")
+
+    assert fake_engine.calls == 1
+    assert result == {str(mid): f"[es] {text}" for mid, text in page}
+
+
+@pytest.mark.asyncio
+async def test_translate_messages_serves_repeats_from_cache(db, fake_engine):
+    from sqlalchemy import func, select
+
+    from app.models.social_message_translation import SocialMessageTranslation
+    from app.services.translation_service import translate_messages
+
+    page = [(uuid.uuid4(), "hello"), (uuid.uuid4(), "world")]
+    await translate_messages(db, page, "fr")
+    again = await translate_messages(db, page, "fr")
+
+    assert fake_engine.calls == 1
+    assert set(again.values()) == {"[fr] hello", "[fr] world"}
+    stored = await db.execute(select(func.count()).select_from(SocialMessageTranslation))
+    assert stored.scalar_one() == 2
+
+
+@pytest.mark.asyncio
+async def test_translate_messages_only_sends_misses_to_provider(db, fake_engine):
+    from app.services.translation_service import translate_message, translate_messages
+
+    cached_id, fresh_id = uuid.uuid4(), uuid.uuid4()
+    await translate_message(db, cached_id, "cached", "es")
+    assert fake_engine.calls == 1
+
+    with patch.object(fake_engine, "translate", wraps=fake_engine.translate) as spy:
+        result = await translate_messages(db, [(cached_id, "cached"), (fresh_id, "fresh")], "es")
+
+    spy.assert_called_once_with(["fresh"], "es", "en")
+    assert result[str(cached_id)] == "[es] cached"
+    assert result[str(fresh_id)] == "[es] fresh"
+
+
+@pytest.mark.asyncio
+async def test_translate_message_coalesces_concurrent_requests(db, fake_engine):
+    import asyncio
+
+    from app.services.translation_service import translate_message
+
+    message_id = uuid.uuid4()
+    results = await asyncio.gather(
+        *(translate_message(db, message_id, "hi there", "es") for _ in range(5))
+    )
+
+    assert results == ["[es] hi there"] * 5
+    assert fake_engine.calls == 1
+
+
+@pytest.mark.asyncio
+async def test_detect_language_runs_through_provider(fake_engine):
+    from app.services.translation_service import detect_language
+
+    assert await detect_language("hello") == "en"
+
+
+@pytest.mark.asyncio
+async def test_persist_skips_rows_already_stored(db):
+    from datetime import datetime, timezone
+
+    from sqlalchemy import select
+
+    from app.models.social_message_translation import SocialMessageTranslation
+    from app.services.translation_service import _persist
+
+    existing_id, fresh_id = uuid.uuid4(), uuid.uuid4()
+    db.add(SocialMessageTranslation(
+        message_id=existing_id, language="es", translated_text="primero",
+        translated_at=datetime.now(timezone.utc),
+    ))
+    await db.commit()
+
+    await _persist(db, {str(existing_id): "segundo", str(fresh_id): "nuevo"}, "es")
+
+    rows = await db.execute(select(SocialMessageTranslation.message_id, SocialMessageTranslation.translated_text))
+    assert dict(rows.all()) == {existing_id: "primero", fresh_id: "nuevo"}
+
+
+def test_translation_provider_is_abstract():
+    from app.services.translation_service import TranslationProvider
+
+    with pytest.raises(TypeError):
+        TranslationProvider()
@@ -26,7 +26,7 @@ from app.services.comp_engine import (
     get_treasury_stats,
     process_affiliate_reward_match,
 )
-from app.services.wallet_service import create_user_wallet
+from app.services.wallet_service import create_user_wallet, get_available_balance, materialize_wallet_ledger
 from tests.conftest import SIGNUP_PAYLOAD, seed_tiers
 
 pytestmark = pytest.mark.asyncio
@@ -181,12 +181,16 @@ async def test_affiliate_reward_matching(db: AsyncSession):
     assert match_txn.amount == Decimal("21.00")
     assert match_txn.status == "completed"
 
-    # Check affiliate wallet updated
+    # Affiliate wallet credited through the ledger: live balance now, snapshot
+    # and lifetime earnings once materialized
+    assert await get_available_balance(db, affiliate_user.id) == Decimal("21.00")
+    await materialize_wallet_ledger(db)
+
     aff_wallet = await db.execute(select(Wallet).where(Wallet.user_id == affiliate_user.id))
     wallet = aff_wallet.scalar_one()
+    await db.refresh(wallet)
     assert wallet.balance_available == Decimal("21.00")
 
-    # Check affiliate lifetime earnings updated
     await db.refresh(affiliate)
     assert affiliate.lifetime_earnings == Decimal("21.00")
 
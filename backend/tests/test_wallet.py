@@ -9,8 +9,13 @@ from app.services.wallet_service import (
     MIN_WITHDRAWAL_USDC,
     _deterministic_placeholder_address,
     create_user_wallet,
+    credit_wallet,
+    credit_wallets,
+    get_available_balance,
     get_user_transactions,
+    get_user_wallet,
     get_user_wallet_balance,
+    materialize_wallet_ledger,
     record_transaction,
     request_withdrawal,
     update_wallet_address,
@@ -158,7 +163,7 @@ async def test_record_and_get_transactions(registered_user, db: AsyncSession):
     await record_transaction(db, user_id, type="comp_award", amount=Decimal("5.00"), status="completed")
     await record_transaction(db, user_id, type="comp_award", amount=Decimal("3.00"), status="completed")
 
-    txns = await get_user_transactions(db, user_id)
+    txns = (await get_user_transactions(db, user_id))["items"]
     assert len(txns) == 2
     # Newest first
     assert txns[0].amount == Decimal("3.00")
@@ -331,3 +336,38 @@ async def test_wallet_detail_endpoint(client: AsyncClient, auth_headers):
     assert "comp_balance" in data
     assert "pending_comps" in data
     assert "address" in data
+
+
+# ── Wallet ledger ────────────────────────────────────────────────────
+
+
+async def test_credits_are_ledger_entries_until_materialized(registered_user, db: AsyncSession):
+    user_id = uuid.UUID(registered_user["user"]["id"])
+
+    await credit_wallet(db, user_id, Decimal("0.02"), "scan_earning", reference_id=uuid.uuid4())
+    await credit_wallets(db, [(user_id, Decimal("10.00")), (uuid.uuid4(), Decimal("5.00"))], "affiliate_payout")
+    await db.commit()
+
+    wallet = await get_user_wallet(db, user_id)
+    assert wallet.balance_available == Decimal("0")
+    assert await get_available_balance(db, user_id) == Decimal("10.02")
+    assert (await get_user_wallet_balance(db, user_id))["balance_available"] == Decimal("10.02")
+
+    report = await materialize_wallet_ledger(db, batch_size=1)
+    assert (report["entries"], report["batches"]) == (2, 2)
+
+    await db.refresh(wallet)
+    assert wallet.balance_available == Decimal("10.02")
+    assert await get_available_balance(db, user_id) == Decimal("10.02")
+    assert (await materialize_wallet_ledger(db))["entries"] == 0
+
+
+async def test_duplicate_reference_is_rejected(registered_user, db: AsyncSession):
+    from sqlalchemy.exc import IntegrityError
+
+    user_id = uuid.UUID(registered_user["user"]["id"])
+    scan_id = uuid.uuid4()
+    await credit_wallet(db, user_id, Decimal("0.01"), "scan_earning", reference_id=scan_id)
+    with pytest.raises(IntegrityError):
+        await credit_wallet(db, user_id, Decimal("0.01"), "scan_earning", reference_id=scan_id)
+
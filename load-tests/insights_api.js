@@ -1,16 +1,25 @@
 /**
- * Insights API Load Test
- * Simulates app polling behavior — the dashboard refreshes every 5s per Platform spec.
- * Tests all 5 insights endpoints concurrently at 500 VUs.
+ * Insights API Load Test — snapshot cache-read benchmark
+ *
+ * The five dashboard endpoints are served from precomputed Redis snapshots
+ * (insights_snapshot_service, refreshed by the refresh_insights_snapshots
+ * Celery beat task). setup() warms every snapshot once, so the measured
+ * phase is a pure cache read: no aggregate queries, Redis counters or
+ * blockchain calls should run on the request path. The endpoints are
+ * public — no login is needed.
+ *
+ * Every response must carry `X-Snapshot: hit` (served from a stored
+ * snapshot); `miss` means the request fell back to computing inline.
  *
  * Thresholds:
- *   p(95) < 300ms | error rate < 1%
+ *   p(95) < 50ms | p(99) < 150ms | error rate < 1% | snapshot hit rate > 99%
  *
  * Required env vars:
- *   K6_BASE_URL, K6_TEST_EMAIL, K6_TEST_PASSWORD
+ *   K6_BASE_URL
  */
 import http from 'k6/http';
-import { check, sleep } from 'k6';
+import { check } from 'k6';
+import { Rate } from 'k6/metrics';
 
 const BASE_URL = __ENV.K6_BASE_URL || 'https://staging-api.blakjaks.com';
 
@@ -22,44 +31,39 @@ const ENDPOINTS = [
   '/insights/partners',
 ];
 
+const snapshotHits = new Rate('insights_snapshot_hits');
+
 export const options = {
   stages: [
-    { duration: '10s', target: 500 },
-    { duration: '50s', target: 500 },
+    { duration: '10s', target: 1000 },
+    { duration: '50s', target: 1000 },
     { duration: '20s', target: 0 },
   ],
   thresholds: {
-    http_req_duration: ['p(95)<300'],
+    http_req_duration: ['p(95)<50', 'p(99)<150'],
     http_req_failed: ['rate<0.01'],
+    insights_snapshot_hits: ['rate>0.99'],
   },
 };
 
 export function setup() {
-  const res = http.post(
-    `${BASE_URL}/auth/login`,
-    JSON.stringify({
-      email: __ENV.K6_TEST_EMAIL,
-      password: __ENV.K6_TEST_PASSWORD,
-    }),
-    { headers: { 'Content-Type': 'application/json' } }
-  );
-  check(res, { 'insights setup: login ok': (r) => r.status === 200 });
-  const token = res.json('access_token');
-  if (!token) throw new Error(`Insights setup login failed: ${res.status}`);
-  return { token };
+  // Cold reads compute and publish each snapshot; everything after is a cache read.
+  for (const endpoint of ENDPOINTS) {
+    const res = http.get(`${BASE_URL}${endpoint}`);
+    check(res, { [`warmup ${endpoint}: status 200`]: (r) => r.status === 200 });
+  }
 }
 
-export default function (data) {
-  const headers = { Authorization: `Bearer ${data.token}` };
+export default function () {
+  // No think time: measure raw snapshot-serving throughput, not app polling.
+  const responses = http.batch(ENDPOINTS.map((endpoint) => ['GET', `${BASE_URL}${endpoint}`]));
 
-  for (const endpoint of ENDPOINTS) {
-    const res = http.get(`${BASE_URL}${endpoint}`, { headers });
+  responses.forEach((res, i) => {
+    const endpoint = ENDPOINTS[i];
     check(res, {
       [`${endpoint}: status 200`]: (r) => r.status === 200,
       [`${endpoint}: non-empty body`]: (r) => r.body && r.body.length > 2,
     });
-  }
-
-  // Mimic app 5-second polling interval
-  sleep(5);
+    snapshotHits.add(res.headers['X-Snapshot'] === 'hit');
+  });
 }
@@ -1,10 +1,23 @@
 /**
  * Shop Catalog Load Test
- * Tests product listing, cart add, and cart cleanup at 300 VUs.
- * Shop is accessed by all users prior to checkout.
+ * Two scenarios run side by side:
+ *
+ *   catalog — 1,000 VUs browsing: listing (each sort order, flavor filter)
+ *             and product detail. The catalog is held in memory per API
+ *             process (product_catalog) and only reloaded when the Redis
+ *             catalog version moves, so these requests should not touch
+ *             Postgres at all; latency is pure request overhead.
+ *   cart    — 300 VUs adding a product, viewing and clearing the cart.
+ *             Carts are held in Redis and only written to cart_items by
+ *             the idle flush or at checkout, so this flow should not
+ *             generate Postgres writes either.
+ *
+ * To see the invalidation path, PATCH a product through
+ * /admin/products/{id} mid-run: every process reloads once within a few
+ * seconds and catalog latency should not move.
  *
  * Thresholds:
- *   p(95) < 200ms | error rate < 1%
+ *   catalog p(95) < 50ms | cart p(95) < 200ms | error rate < 1%
  *
  * Required env vars:
  *   K6_BASE_URL, K6_TEST_EMAIL, K6_TEST_PASSWORD
@@ -14,14 +27,35 @@ import { check, sleep } from 'k6';
 
 const BASE_URL = __ENV.K6_BASE_URL || 'https://staging-api.blakjaks.com';
 
+const SORTS = ['name', 'price_asc', 'price_desc'];
+const FLAVORS = ['wintergreen', 'spearmint', 'bubblegum', 'bluerazz_ice'];
+
 export const options = {
-  stages: [
-    { duration: '15s', target: 300 },
-    { duration: '45s', target: 300 },
-    { duration: '15s', target: 0 },
-  ],
+  scenarios: {
+    catalog: {
+      executor: 'ramping-vus',
+      exec: 'browseCatalog',
+      stages: [
+        { duration: '15s', target: 1000 },
+        { duration: '45s', target: 1000 },
+        { duration: '15s', target: 0 },
+      ],
+      tags: { flow: 'catalog' },
+    },
+    cart: {
+      executor: 'ramping-vus',
+      exec: 'cartFlow',
+      stages: [
+        { duration: '15s', target: 300 },
+        { duration: '45s', target: 300 },
+        { duration: '15s', target: 0 },
+      ],
+      tags: { flow: 'cart' },
+    },
+  },
   thresholds: {
-    http_req_duration: ['p(95)<200'],
+    'http_req_duration{flow:catalog}': ['p(95)<50', 'p(99)<150'],
+    'http_req_duration{flow:cart}': ['p(95)<200'],
     http_req_failed: ['rate<0.01'],
   },
 };
@@ -38,64 +72,61 @@ export function setup() {
   check(res, { 'shop setup: login ok': (r) => r.status === 200 });
   const token = res.json('access_token');
   if (!token) throw new Error(`Shop setup login failed: ${res.status}`);
-  return { token };
+
+  // First read loads each process's catalog; everything after is served from memory.
+  const products = http.get(`${BASE_URL}/shop/products?per_page=100`).json('items') || [];
+  if (products.length === 0) throw new Error('Shop setup: catalog is empty');
+  return { token, productIds: products.map((p) => p.id) };
 }
 
-export default function (data) {
+function pick(list) {
+  return list[Math.floor(Math.random() * list.length)];
+}
+
+export function browseCatalog(data) {
+  // 1. Browse the full catalog in one of the sort orders
+  const listRes = http.get(`${BASE_URL}/shop/products?sort=${pick(SORTS)}&per_page=20`);
+  check(listRes, {
+    'catalog: list status 200': (r) => r.status === 200,
+    'catalog: list has items': (r) => (r.json('items') || []).length > 0,
+  });
+
+  // 2. Filter by flavor
+  const flavorRes = http.get(`${BASE_URL}/shop/products?flavor=${pick(FLAVORS)}`);
+  check(flavorRes, { 'catalog: flavor status 200': (r) => r.status === 200 });
+
+  // 3. Product detail
+  const detailRes = http.get(`${BASE_URL}/shop/products/${pick(data.productIds)}`);
+  check(detailRes, { 'catalog: detail status 200': (r) => r.status === 200 });
+
+  sleep(1);
+}
+
+export function cartFlow(data) {
   const headers = {
     'Content-Type': 'application/json',
     Authorization: `Bearer ${data.token}`,
   };
 
-  // 1. Browse products
-  const productsRes = http.get(
-    `${BASE_URL}/products?category=nicotine&limit=20`,
-    { headers }
-  );
-  check(productsRes, {
-    'shop: products status 200': (r) => r.status === 200,
-    'shop: products has items': (r) => {
-      const body = r.json();
-      return body && (body.items || body.products || []).length > 0;
-    },
-  });
-
-  // Extract first product ID
-  const body = productsRes.json();
-  const products = body.items || body.products || [];
-  if (products.length === 0) {
-    console.warn('No products returned — skipping cart steps');
-    sleep(2);
-    return;
-  }
-  const productId = products[0].id;
-
-  // 2. Add to cart
+  // 1. Add to cart
   const addRes = http.post(
-    `${BASE_URL}/cart/items`,
-    JSON.stringify({ product_id: productId, quantity: 1 }),
+    `${BASE_URL}/cart/add`,
+    JSON.stringify({ product_id: pick(data.productIds), quantity: 1 }),
     { headers }
   );
-  check(addRes, {
-    'shop: add to cart 200 or 201': (r) => r.status === 200 || r.status === 201,
-  });
+  check(addRes, { 'cart: add status 200': (r) => r.status === 200 });
 
-  // 3. View cart
+  // 2. View cart
   const cartRes = http.get(`${BASE_URL}/cart`, { headers });
   check(cartRes, {
-    'shop: cart status 200': (r) => r.status === 200,
-    'shop: cart total > 0': (r) => {
-      const cart = r.json();
-      return cart && (cart.total || cart.subtotal || 0) > 0;
-    },
+    'cart: status 200': (r) => r.status === 200,
+    'cart: subtotal > 0': (r) => Number(r.json('subtotal') || 0) > 0,
   });
 
-  // 4. Clean up — remove from cart
-  http.del(
-    `${BASE_URL}/cart/items/${productId}`,
-    null,
-    { headers }
-  );
+  // 3. Clean up — remove every line
+  for (const item of cartRes.json('items') || []) {
+    http.del(`${BASE_URL}/cart/${item.id}`, null, { headers });
+  }
 
   sleep(2);
 }
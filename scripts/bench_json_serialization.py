@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Microbenchmark: chat event serialization, stdlib json vs app.core.serialization.
+
+Models one new_message event through the WebSocket path: encode for Redis
+PUBLISH, decode in the subscriber, then deliver to N local sockets. The old
+path re-encoded per socket (Starlette's send_json); the new path encodes
+one text frame and reuses it. Reports bytes per message and CPU time per
+message (process time, so event-loop idle time is not counted).
+
+Usage:
+    cd backend && python ../scripts/bench_json_serialization.py [--sockets 50] [--iterations 20000]
+"""
+import argparse
+import json
+import os
+import sys
+import time
+import uuid
+from datetime import datetime, timezone
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "backend"))
+
+from app.core.serialization import BACKEND, dumps, dumps_str, loads  # noqa: E402
+
+
+def sample_event() -> dict:
+    return {
+        "type": "new_message",
+        "id": str(uuid.uuid4()),
+        "channel_id": str(uuid.uuid4()),
+        "user_id": str(uuid.uuid4()),
+        "username": "jackpot_jules",
+        "avatar_url": "https://cdn.blakjaks.com/avatars/7f3c2a.webp",
+        "content": "Just hit VIP — thanks everyone! 🎉 " * 3,
+        "original_language": "en",
+        "sequence": 184467,
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "reply_to_id": None,
+        "reply_to_content": None,
+        "reply_to_username": None,
+        "is_system": False,
+        "is_pinned": False,
+        "idempotency_key": str(uuid.uuid4()),
+        "status": "sent",
+    }
+
+
+def stdlib_path(event: dict, sockets: int) -> None:
+    payload = json.dumps(event, default=str)                      # publish
+    message = json.loads(payload)                                 # subscriber
+    for _ in range(sockets):                                      # send_json per socket
+        json.dumps(message, ensure_ascii=False, separators=(",", ":"))
+
+
+def fast_path(event: dict, sockets: int) -> None:
+    payload = dumps(event)                                        # publish
+    message = loads(payload)                                      # subscriber
+    dumps_str(message)                                            # one frame for all sockets
+
+
+def cpu_per_message(fn, event: dict, sockets: int, iterations: int) -> float:
+    start = time.process_time()
+    for _ in range(iterations):
+        fn(event, sockets)
+    return (time.process_time() - start) / iterations * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sockets", type=int, default=50, help="Local sockets per channel")
+    parser.add_argument("--iterations", type=int, default=20000)
+    args = parser.parse_args()
+
+    event = sample_event()
+    print(f"Backend: {BACKEND}   sockets/channel: {args.sockets}   iterations: {args.iterations}\n")
+
+    print("Bytes per message")
+    print(f"  pub/sub  json.dumps(default=str) : {len(json.dumps(event, default=str).encode()):>6}")
+    print(f"  pub/sub  dumps                   : {len(dumps(event)):>6}")
+    print(f"  frame    send_json               : {len(json.dumps(event, ensure_ascii=False, separators=(',', ':')).encode()):>6}")
+    print(f"  frame    dumps_str               : {len(dumps_str(event).encode()):>6}\n")
+
+    print("CPU per message (µs): publish + decode + fan-out")
+    for sockets in sorted({1, args.sockets}):
+        old = cpu_per_message(stdlib_path, event, sockets, args.iterations)
+        new = cpu_per_message(fast_path, event, sockets, args.iterations)
+        print(f"  {sockets:>4} socket(s): stdlib {old:8.2f}   fast {new:8.2f}   ({old / new:5.1f}x)")
+
+
+if __name__ == "__main__":
+    main()